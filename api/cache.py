@@ -0,0 +1,230 @@
+"""
+CourtVision Response Cache Module
+In-process TTL + LRU cache for database function results
+Author: CS3620 Student
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from typing import Any, Awaitable, Callable, ContextManager, Dict, Hashable, Optional, Tuple
+
+from replicas import primary_reads
+
+CacheKey = Tuple[str, Tuple[Hashable, ...]]
+
+
+class _CacheEntry:
+    """A cached value with its expiry time and approximate size"""
+
+    __slots__ = ('value', 'expires_at', 'size')
+
+    def __init__(self, value: Any, expires_at: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate the memory cost of a result by its JSON length"""
+    return len(json.dumps(value, default=str))
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache keyed by database function name and parameters.
+
+    Entries expire after their TTL and the least recently used entries are
+    evicted once either the entry or byte budget is exceeded. Concurrent
+    misses on the same key share a single load (single-flight), so a cold
+    leaderboard under load reaches Postgres once.
+
+    The first load of a key after invalidate() removed it runs inside
+    fresh_reads() (primary_reads for the API), so a replica still behind
+    the change cannot put the old result back for a whole TTL.
+
+    The cache is only touched from the event loop, so it needs no locking.
+    Cached values are shared between callers and must not be mutated.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024,
+                 default_ttl: float = 300.0,
+                 fresh_reads: Callable[[], ContextManager] = nullcontext):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.fresh_reads = fresh_reads
+        # Invalidated keys not loaded since, oldest first (at most max_entries)
+        self._invalidated: 'OrderedDict[CacheKey, None]' = OrderedDict()
+        self._entries: 'OrderedDict[CacheKey, _CacheEntry]' = OrderedDict()
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self._bytes = 0
+        # Bumped on every invalidation so in-flight loads that started
+        # before it do not store results that may already be stale
+        self._generation = 0
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'invalidations': 0,
+            'load_errors': 0,
+            'fresh_loads': 0,
+        }
+
+    @staticmethod
+    def make_key(function_name: str, params: Optional[tuple] = None) -> CacheKey:
+        """Build a cache key from a function name and its parameters"""
+        return (function_name, tuple(params) if params else ())
+
+    def _remove(self, key: CacheKey) -> _CacheEntry:
+        """Drop an entry and release its bytes"""
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        return entry
+
+    def _lookup(self, key: CacheKey) -> Optional[_CacheEntry]:
+        """Return a live entry, expiring it if its TTL has passed"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self._stats['expirations'] += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: CacheKey, value: Any, ttl: float):
+        """Insert a value and evict least recently used entries over budget"""
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _CacheEntry(value, time.monotonic() + ttl, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._stats['evictions'] += 1
+
+    async def get_or_load(self, function_name: str, params: Optional[tuple],
+                          loader: Callable[[], Awaitable[Any]],
+                          ttl: Optional[float] = None) -> Any:
+        """
+        Return the cached result for (function_name, params), loading it on a miss
+
+        Args:
+            function_name: Database function the result came from
+            params: Function parameters tuple
+            loader: Coroutine factory that fetches the value on a miss
+            ttl: Seconds to keep the value (defaults to the cache TTL)
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        key = self.make_key(function_name, params)
+
+        entry = self._lookup(key)
+        if entry is not None:
+            self._stats['hits'] += 1
+            return entry.value
+
+        # Another request is already loading this key; wait for its result
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._stats['coalesced'] += 1
+            return await asyncio.shield(inflight)
+
+        self._stats['misses'] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        invalidated = key in self._invalidated
+        try:
+            if invalidated:
+                self._stats['fresh_loads'] += 1
+                with self.fresh_reads():
+                    value = await loader()
+            else:
+                value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as error:
+            self._stats['load_errors'] += 1
+            future.set_exception(error)
+            # Mark the exception retrieved when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            if generation == self._generation:
+                self._store(key, value, self.default_ttl if ttl is None else ttl)
+                if invalidated:
+                    self._invalidated.pop(key, None)
+            future.set_result(value)
+            return value
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def invalidate(self, predicate: Callable[[str, tuple, Any], bool]) -> int:
+        """
+        Evict every entry for which predicate(function_name, params, value) is true
+
+        Returns:
+            Number of entries removed
+        """
+        self._generation += 1
+        keys = [key for key, entry in self._entries.items() if predicate(key[0], key[1], entry.value)]
+        inflight = [key for key in self._inflight if predicate(key[0], key[1], None)]
+        for key in keys:
+            self._remove(key)
+        # Later callers must not join loads that may return pre-invalidation data
+        for key in inflight:
+            del self._inflight[key]
+        for key in keys + inflight:
+            self._invalidated[key] = None
+            self._invalidated.move_to_end(key)
+        while len(self._invalidated) > self.max_entries:
+            self._invalidated.popitem(last=False)
+        self._stats['invalidations'] += len(keys)
+        return len(keys)
+
+    def invalidate_function(self, *function_names: str) -> int:
+        """Evict all cached results of the given functions"""
+        names = set(function_names)
+        return self.invalidate(lambda function_name, params, value: function_name in names)
+
+    def clear(self) -> int:
+        """Evict everything"""
+        return self.invalidate(lambda function_name, params, value: True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of hit/miss/eviction counters and current usage"""
+        stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses'] + stats['coalesced']
+        stats.update({
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'default_ttl': self.default_ttl,
+            'inflight': len(self._inflight),
+            'hit_ratio': round((stats['hits'] + stats['coalesced']) / lookups, 4) if lookups else 0.0,
+        })
+        return stats
+
+
+# Singleton cache instance, sized from environment variables
+response_cache = ResponseCache(
+    max_entries=int(os.getenv('CACHE_MAX_ENTRIES', '1024')),
+    max_bytes=int(os.getenv('CACHE_MAX_BYTES', str(64 * 1024 * 1024))),
+    default_ttl=float(os.getenv('CACHE_TTL', '300')),
+    fresh_reads=primary_reads
+)
@@ -6,51 +6,108 @@ Date: December 2, 2025
 """
 
 import psycopg2
-from psycopg2 import pool
+from psycopg2.extensions import parse_dsn
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+import psycopg
+from psycopg.rows import dict_row
+from psycopg.types.numeric import FloatLoader
+from psycopg_pool import AsyncConnectionPool
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 from dotenv import load_dotenv
+from registry import REPLICA_READ_FUNCTIONS, VALIDATION_QUERY, WRITE_FUNCTIONS, function_registry
+from replicas import ReplicaRouter, get_replica_config
 
 # Load environment variables
 load_dotenv()
 
+def get_db_config() -> Dict[str, str]:
+    """Build connection parameters from environment variables"""
+    db_password = os.getenv('DB_PASSWORD', 'postgres')
+    db_config = {
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'port': os.getenv('DB_PORT', '5432'),
+        'database': os.getenv('DB_NAME', 'courtvision'),
+        'user': os.getenv('DB_USER', 'postgres')
+    }
+    # Only add password if it's not empty
+    if db_password:
+        db_config['password'] = db_password
+    return db_config
+
+def get_pool_config() -> Dict[str, float]:
+    """Read pool sizing and recycling settings from environment variables"""
+    return {
+        'minconn': int(os.getenv('DB_POOL_MIN', '1')),
+        'maxconn': int(os.getenv('DB_POOL_MAX', '10')),
+        # Seconds a request waits for a free connection before PoolTimeout
+        'timeout': float(os.getenv('DB_POOL_TIMEOUT', '30')),
+        # Connections older than this are closed and replaced
+        'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', '3600')),
+        # Connections idle longer than this are closed (down to DB_POOL_MIN)
+        'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '600')),
+    }
+
+def get_replica_db_configs(db_config: Dict[str, str]) -> List[Dict[str, str]]:
+    """Connection parameters for each DB_REPLICA_DSNS entry, defaulting to the primary's"""
+    configs = []
+    for dsn in get_replica_config()['dsns']:
+        replica = parse_dsn(dsn)
+        if 'dbname' in replica:
+            replica['database'] = replica.pop('dbname')
+        configs.append(dict(db_config, **replica))
+    return configs
+
+def get_replica_router() -> ReplicaRouter:
+    """Replica router configured from DB_REPLICA_* settings"""
+    config = get_replica_config()
+    return ReplicaRouter(config['strategy'], config['retry_after'], config['sticky_seconds'])
+
 class Database:
-    """Database connection and query execution helper class"""
+    """
+    Database connection and query execution helper class
+    
+    Synchronous psycopg2 access for scripts; the API serves requests from
+    AsyncDatabase. The pool is created on first use, not on import.
+    """
     
     def __init__(self):
         """Initialize database connection pool"""
         self.connection_pool = None
-        db_password = os.getenv('DB_PASSWORD', 'postgres')
-        self.db_config = {
-            'host': os.getenv('DB_HOST', 'localhost'),
-            'port': os.getenv('DB_PORT', '5432'),
-            'database': os.getenv('DB_NAME', 'courtvision'),
-            'user': os.getenv('DB_USER', 'postgres')
-        }
-        # Only add password if it's not empty
-        if db_password:
-            self.db_config['password'] = db_password
-    
-    def create_pool(self, minconn=1, maxconn=10):
-        """Create connection pool"""
+        self.db_config = get_db_config()
+        # Read-only queries go to these when DB_REPLICA_DSNS is set
+        self.replica_configs = get_replica_db_configs(self.db_config)
+        self.replicas = get_replica_router()
+    
+    def create_pool(self, minconn=None, maxconn=None):
+        """Create connection pool (sizes default to DB_POOL_MIN / DB_POOL_MAX)"""
         try:
-            self.connection_pool = psycopg2.pool.SimpleConnectionPool(
-                minconn,
-                maxconn,
-                **self.db_config
-            )
+            pool_config = get_pool_config()
+            minconn = pool_config['minconn'] if minconn is None else minconn
+            maxconn = pool_config['maxconn'] if maxconn is None else maxconn
+            self.connection_pool = ThreadedConnectionPool(minconn, maxconn, **self.db_config)
             if self.connection_pool:
                 print("✓ Database connection pool created successfully")
+            # Replicas connect on first use, so one that is down cannot stop startup
+            for config in self.replica_configs:
+                self.replicas.add(f"{config['host']}:{config['port']}",
+                                  ThreadedConnectionPool(0, maxconn, **config))
+            if self.replicas.replicas:
+                print(f"✓ Routing reads to {len(self.replicas.replicas)} replica(s) ({self.replicas.strategy})")
         except (Exception, psycopg2.DatabaseError) as error:
             print(f"✗ Error creating connection pool: {error}")
             raise
     
+    def primary_pool(self) -> ThreadedConnectionPool:
+        """The primary's pool, created on first use"""
+        if self.connection_pool is None:
+            self.create_pool()
+        return self.connection_pool
+    
     def get_connection(self):
         """Get a connection from the pool"""
-        if self.connection_pool:
-            return self.connection_pool.getconn()
-        return None
+        return self.primary_pool().getconn()
     
     def return_connection(self, connection):
         """Return a connection to the pool"""
@@ -62,6 +119,39 @@ class Database:
         if self.connection_pool:
             self.connection_pool.closeall()
             print("✓ Database connection pool closed")
+        for replica in self.replicas.replicas:
+            replica.pool.closeall()
+    
+    def get_replica_stats(self) -> Dict[str, Any]:
+        """Return read routing counters and per-replica state"""
+        return self.replicas.get_stats()
+    
+    def _read(self, run):
+        """
+        Run a read-only operation, run(pool), on a replica when one is
+        available, falling back to the next replica and then the primary
+        if a replica cannot be reached or cancels the query
+        """
+        primary = self.primary_pool()
+        fallback = False
+        for replica in self.replicas.candidates():
+            try:
+                with self.replicas.reading(replica):
+                    return run(replica.pool)
+            except (psycopg2.OperationalError, PoolError) as error:
+                self.replicas.mark_failed(replica, error)
+                fallback = True
+        self.replicas.used_primary(fallback)
+        return run(primary)
+    
+    def _route(self, function_name: str, run):
+        """Run a function call on a replica if it only reads, otherwise on the primary"""
+        if function_name in REPLICA_READ_FUNCTIONS:
+            return self._read(run)
+        result = run(self.primary_pool())
+        if function_name in WRITE_FUNCTIONS:
+            self.replicas.note_write()
+        return result
     
     def execute_query(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
         """
@@ -74,24 +164,25 @@ class Database:
         Returns:
             List of dictionaries containing query results
         """
-        connection = None
+        def run(pool):
+            connection = pool.getconn()
+            try:
+                cursor = connection.cursor(cursor_factory=RealDictCursor)
+                cursor.execute(query, params)
+                results = cursor.fetchall()
+                cursor.close()
+                
+                # Convert RealDictRow to regular dict
+                return [dict(row) for row in results]
+            finally:
+                pool.putconn(connection)
+        
         try:
-            connection = self.get_connection()
-            cursor = connection.cursor(cursor_factory=RealDictCursor)
-            cursor.execute(query, params)
-            results = cursor.fetchall()
-            cursor.close()
-            
-            # Convert RealDictRow to regular dict
-            return [dict(row) for row in results]
+            return self._read(run)
         
         except (Exception, psycopg2.DatabaseError) as error:
             print(f"✗ Error executing query: {error}")
             raise
-        
-        finally:
-            if connection:
-                self.return_connection(connection)
     
     def execute_write(self, query: str, params: tuple = None) -> int:
         """
@@ -112,6 +203,7 @@ class Database:
             rows_affected = cursor.rowcount
             connection.commit()
             cursor.close()
+            self.replicas.note_write()
             return rows_affected
         
         except (Exception, psycopg2.DatabaseError) as error:
@@ -135,35 +227,31 @@ class Database:
         Returns:
             Function result
         """
-        connection = None
+        # Only registered functions can be called (raises ValueError otherwise)
+        query = function_registry.statement(function_name, params)
+        
+        def run(pool):
+            # putconn rolls back a transaction left open by an error
+            connection = pool.getconn()
+            try:
+                cursor = connection.cursor(cursor_factory=RealDictCursor)
+                with function_registry.timed(function_name):
+                    cursor.execute(query, params)
+                    results = cursor.fetchall()
+                connection.commit()
+                cursor.close()
+                
+                # Convert RealDictRow to regular dict
+                return [dict(row) for row in results]
+            finally:
+                pool.putconn(connection)
+        
         try:
-            connection = self.get_connection()
-            cursor = connection.cursor(cursor_factory=RealDictCursor)
-            
-            # Build function call with proper number of placeholders
-            if params:
-                placeholders = ', '.join(['%s'] * len(params))
-                query = f"SELECT * FROM {function_name}({placeholders})"
-            else:
-                query = f"SELECT * FROM {function_name}()"
-            
-            cursor.execute(query, params)
-            results = cursor.fetchall()
-            connection.commit()
-            cursor.close()
-            
-            # Convert RealDictRow to regular dict
-            return [dict(row) for row in results]
+            return self._route(function_name, run)
         
         except (Exception, psycopg2.DatabaseError) as error:
-            if connection:
-                connection.rollback()
             print(f"✗ Error executing function: {error}")
             raise
-        
-        finally:
-            if connection:
-                self.return_connection(connection)
     
     def execute_function_scalar(self, function_name: str, params: tuple = None) -> Any:
         """
@@ -176,34 +264,28 @@ class Database:
         Returns:
             Single scalar value
         """
-        connection = None
+        query = function_registry.statement(function_name, params, scalar=True)
+        
+        def run(pool):
+            connection = pool.getconn()
+            try:
+                cursor = connection.cursor()
+                with function_registry.timed(function_name):
+                    cursor.execute(query, params)
+                    result = cursor.fetchone()
+                connection.commit()
+                cursor.close()
+                
+                return result[0] if result else None
+            finally:
+                pool.putconn(connection)
+        
         try:
-            connection = self.get_connection()
-            cursor = connection.cursor()
-            
-            # Build function call with proper number of placeholders
-            if params:
-                placeholders = ', '.join(['%s'] * len(params))
-                query = f"SELECT {function_name}({placeholders})"
-            else:
-                query = f"SELECT {function_name}()"
-            
-            cursor.execute(query, params)
-            result = cursor.fetchone()
-            connection.commit()
-            cursor.close()
-            
-            return result[0] if result else None
+            return self._route(function_name, run)
         
         except (Exception, psycopg2.DatabaseError) as error:
-            if connection:
-                connection.rollback()
             print(f"✗ Error executing scalar function: {error}")
             raise
-        
-        finally:
-            if connection:
-                self.return_connection(connection)
     
     def test_connection(self) -> bool:
         """Test database connection"""
@@ -226,11 +308,298 @@ class Database:
                 self.return_connection(connection)
 
 
-# Singleton database instance
-db = Database()
+class AsyncDatabase:
+    """
+    Asyncio counterpart to Database, backed by a psycopg 3 connection pool.
+    
+    Exposes the same execute_* surface as Database so FastAPI handlers can
+    await queries instead of blocking the event loop on a psycopg2 round-trip.
+    The pool must be opened from a running event loop (see create_pool).
+    """
+    
+    def __init__(self):
+        """Initialize async connection pool settings"""
+        self.connection_pool = None
+        self.db_config = get_db_config()
+        self.replica_configs = get_replica_db_configs(self.db_config)
+        # psycopg 3 only understands the libpq keyword for the database name
+        for config in [self.db_config] + self.replica_configs:
+            config['dbname'] = config.pop('database')
+        self.replicas = get_replica_router()
+    
+    async def create_pool(self, minconn=None, maxconn=None):
+        """Create and open the async connection pool (same DB_POOL_* settings as Database)"""
+        try:
+            pool_config = get_pool_config()
+            self.connection_pool = self._new_pool(
+                self.db_config,
+                pool_config['minconn'] if minconn is None else minconn,
+                pool_config['maxconn'] if maxconn is None else maxconn,
+                pool_config['timeout']
+            )
+            await self.connection_pool.open()
+            print("✓ Async database connection pool created successfully")
+            # Replicas connect on first use, so one that is down cannot stop startup
+            for config in self.replica_configs:
+                replica_pool = self._new_pool(
+                    config, 0,
+                    pool_config['maxconn'] if maxconn is None else maxconn,
+                    get_replica_config()['timeout']
+                )
+                await replica_pool.open()
+                self.replicas.add(f"{config['host']}:{config['port']}", replica_pool)
+            if self.replicas.replicas:
+                print(f"✓ Routing reads to {len(self.replicas.replicas)} replica(s) ({self.replicas.strategy})")
+        except (Exception, psycopg.DatabaseError) as error:
+            print(f"✗ Error creating async connection pool: {error}")
+            raise
+    
+    def _new_pool(self, config: Dict[str, str], min_size: int, max_size: int,
+                  timeout: float) -> AsyncConnectionPool:
+        """Unopened pool for one server, with the shared DB_POOL_* recycling settings"""
+        pool_config = get_pool_config()
+        return AsyncConnectionPool(
+            min_size=min_size,
+            max_size=max_size,
+            kwargs=config,
+            timeout=timeout,
+            max_lifetime=pool_config['max_lifetime'],
+            max_idle=pool_config['max_idle'],
+            # Validate connections on checkout so a Postgres restart is not surfaced to callers
+            check=AsyncConnectionPool.check_connection,
+            configure=self.configure_connection,
+            open=False
+        )
+    
+    @staticmethod
+    async def configure_connection(connection):
+        """
+        Load NUMERIC/DECIMAL columns as float rather than Decimal, so result
+        rows can be serialized as they come (see fast_json.FastJSONResponse)
+        """
+        connection.adapters.register_loader('numeric', FloatLoader)
+        # Room to keep every registered function's statement prepared
+        connection.prepared_max = max(connection.prepared_max, 2 * len(function_registry.signatures))
+    
+    async def validate_functions(self) -> bool:
+        """
+        Check the function registry against pg_proc, once at startup
+        
+        Functions that are missing or have different argument types are
+        reported and refused from then on; the rest of the API keeps working.
+        
+        Returns:
+            True if every registered function matched
+        """
+        rows = await self.execute_query(VALIDATION_QUERY, (list(function_registry.signatures),))
+        problems = function_registry.validate((row['proname'], row['oidvectortypes']) for row in rows)
+        for problem in problems:
+            print(f"✗ Database function unavailable: {problem}")
+        if not problems:
+            print(f"✓ {len(function_registry.signatures)} database functions validated")
+        return not problems
+    
+    async def close_pool(self):
+        """Close all connections in the async pool"""
+        if self.connection_pool:
+            await self.connection_pool.close()
+            print("✓ Async database connection pool closed")
+        for replica in self.replicas.replicas:
+            await replica.pool.close()
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Return psycopg_pool sizing and wait/churn counters"""
+        if self.connection_pool:
+            return self.connection_pool.get_stats()
+        return {}
+    
+    def get_replica_stats(self) -> Dict[str, Any]:
+        """Return read routing counters and per-replica state with its pool counters"""
+        stats = self.replicas.get_stats()
+        for replica, replica_stats in zip(self.replicas.replicas, stats['replicas']):
+            replica_stats['pool'] = replica.pool.get_stats()
+        return stats
+    
+    async def _read(self, run):
+        """
+        Await a read-only operation, run(pool), on a replica when one is
+        available, falling back to the next replica and then the primary
+        if a replica cannot be reached or cancels the query
+        """
+        fallback = False
+        for replica in self.replicas.candidates():
+            try:
+                with self.replicas.reading(replica):
+                    return await run(replica.pool)
+            # Includes pool timeouts and recovery conflicts on a busy standby
+            except psycopg.OperationalError as error:
+                self.replicas.mark_failed(replica, error)
+                fallback = True
+        self.replicas.used_primary(fallback)
+        return await run(self.connection_pool)
+    
+    async def _route(self, function_name: str, run):
+        """Await a function call on a replica if it only reads, otherwise on the primary"""
+        if function_name in REPLICA_READ_FUNCTIONS:
+            return await self._read(run)
+        result = await run(self.connection_pool)
+        if function_name in WRITE_FUNCTIONS:
+            self.replicas.note_write()
+        return result
+    
+    async def execute_query(self, query: str, params: tuple = None) -> List[Dict[str, Any]]:
+        """
+        Execute a SELECT query and return results as list of dictionaries
+        
+        Args:
+            query: SQL query string
+            params: Query parameters tuple
+            
+        Returns:
+            List of dictionaries containing query results
+        """
+        async def run(pool):
+            async with pool.connection() as connection:
+                async with connection.cursor(row_factory=dict_row) as cursor:
+                    await cursor.execute(query, params)
+                    return await cursor.fetchall()
+        
+        try:
+            return await self._read(run)
+        
+        except (Exception, psycopg.DatabaseError) as error:
+            print(f"✗ Error executing query: {error}")
+            raise
+    
+    async def stream_query(self, query: str, params: tuple = None,
+                           itersize: int = 2000) -> AsyncIterator[list]:
+        """
+        Execute a SELECT query through a server-side (named) cursor and
+        yield the results in batches, so only itersize rows are held at once
+        
+        Args:
+            query: SQL query string
+            params: Query parameters tuple
+            itersize: Rows fetched from the server per round-trip
+            
+        Yields:
+            The list of column names, then lists of up to itersize row tuples
+        """
+        try:
+            # Holds one pool connection (and its transaction) until the last batch
+            async with self.connection_pool.connection() as connection:
+                async with connection.cursor(name='courtvision_stream') as cursor:
+                    cursor.itersize = itersize
+                    await cursor.execute(query, params)
+                    yield [column.name for column in cursor.description]
+                    while True:
+                        rows = await cursor.fetchmany(itersize)
+                        if not rows:
+                            break
+                        yield rows
+        
+        except (Exception, psycopg.DatabaseError) as error:
+            print(f"✗ Error streaming query: {error}")
+            raise
+    
+    async def execute_write(self, query: str, params: tuple = None) -> int:
+        """
+        Execute an INSERT, UPDATE, or DELETE query
+        
+        Args:
+            query: SQL query string
+            params: Query parameters tuple
+            
+        Returns:
+            Number of rows affected
+        """
+        try:
+            # The pool context manager commits on success and rolls back on error
+            async with self.connection_pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute(query, params)
+                    rows_affected = cursor.rowcount
+            self.replicas.note_write()
+            return rows_affected
+        
+        except (Exception, psycopg.DatabaseError) as error:
+            print(f"✗ Error executing write: {error}")
+            raise
+    
+    async def execute_function(self, function_name: str, params: tuple = None) -> Any:
+        """
+        Execute a PostgreSQL function and return the result
+        
+        Args:
+            function_name: Name of the function to call
+            params: Function parameters tuple
+            
+        Returns:
+            Function result
+        """
+        # Only registered functions can be called (raises ValueError otherwise)
+        query = function_registry.statement(function_name, params)
+        
+        async def run(pool):
+            async with pool.connection() as connection:
+                async with connection.cursor(row_factory=dict_row) as cursor:
+                    with function_registry.timed(function_name):
+                        # Prepared on this connection's first call, then reused
+                        await cursor.execute(query, params, prepare=True)
+                        return await cursor.fetchall()
+        
+        try:
+            return await self._route(function_name, run)
+        
+        except (Exception, psycopg.DatabaseError) as error:
+            print(f"✗ Error executing function: {error}")
+            raise
+    
+    async def execute_function_scalar(self, function_name: str, params: tuple = None) -> Any:
+        """
+        Execute a PostgreSQL function that returns a single scalar value
+        
+        Args:
+            function_name: Name of the function to call
+            params: Function parameters tuple
+            
+        Returns:
+            Single scalar value
+        """
+        query = function_registry.statement(function_name, params, scalar=True)
+        
+        async def run(pool):
+            async with pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    with function_registry.timed(function_name):
+                        await cursor.execute(query, params, prepare=True)
+                        result = await cursor.fetchone()
+                    return result[0] if result else None
+        
+        try:
+            return await self._route(function_name, run)
+        
+        except (Exception, psycopg.DatabaseError) as error:
+            print(f"✗ Error executing scalar function: {error}")
+            raise
+    
+    async def test_connection(self) -> bool:
+        """Test database connection"""
+        try:
+            async with self.connection_pool.connection() as connection:
+                async with connection.cursor() as cursor:
+                    await cursor.execute("SELECT version();")
+                    db_version = await cursor.fetchone()
+            print(f"✓ Connected to: {db_version[0]}")
+            return True
+        
+        except (Exception, psycopg.DatabaseError) as error:
+            print(f"✗ Connection test failed: {error}")
+            return False
 
-# Initialize connection pool on module import
-try:
-    db.create_pool()
-except Exception as e:
-    print(f"Warning: Could not initialize database pool: {e}")
+
+# Singleton database instances
+# (the async pool needs a running event loop, so the API opens it on startup;
+# the sync pool opens on first use)
+db = Database()
+async_db = AsyncDatabase()
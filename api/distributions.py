@@ -0,0 +1,151 @@
+"""
+CourtVision Distributions Module
+Percentiles, quantiles and histograms from the precomputed stat_distribution rows
+Author: CS3620 Student
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from replicas import primary_reads
+
+# Stats refresh_stat_distributions() in functions.sql keeps, in display order
+DISTRIBUTION_STATS = ('points', 'rebounds', 'assists', 'steals', 'blocks', 'efficiency')
+
+# Position group covering every player
+ALL_POSITIONS = 'ALL'
+
+# Quantiles every distribution summary reports
+SUMMARY_QUANTILES = (10, 25, 50, 75, 90)
+
+
+class Distribution:
+    """
+    One season's sorted values of one stat for one position group
+
+    Every lookup is a binary search over the sorted values, so it costs
+    O(log n) however many players the season has.
+    """
+
+    __slots__ = ('sample_size', 'mean', 'values', 'by_player')
+
+    def __init__(self, sample_size: int, mean: float, sorted_values: List[float], player_ids: List[int]):
+        self.sample_size = sample_size
+        self.mean = mean
+        self.values = list(sorted_values)
+        self.by_player = dict(zip(player_ids, self.values))
+
+    def percentile(self, value: float) -> float:
+        """
+        Percentile (0-100) of value: the share of the other players below it.
+        Matches percent_rank() in compare_players_batch, so the top value is
+        100 and the bottom value 0.
+        """
+        n = len(self.values)
+        if n < 2:
+            return 0.0 if n == 0 or value <= self.values[0] else 100.0
+        below = bisect_left(self.values, value)
+        return round(min(below / (n - 1), 1.0) * 100, 1)
+
+    def quantile(self, percent: float) -> float:
+        """Value at percent (0-100), interpolated like percentile_cont()"""
+        position = percent / 100 * (len(self.values) - 1)
+        lower = math.floor(position)
+        upper = min(lower + 1, len(self.values) - 1)
+        return self.values[lower] + (self.values[upper] - self.values[lower]) * (position - lower)
+
+    def histogram(self, bins: int) -> List[Dict[str, float]]:
+        """Counts in bins equal-width buckets from the lowest to the highest value"""
+        low, high = self.values[0], self.values[-1]
+        if high == low:
+            return [{'low': low, 'high': high, 'count': len(self.values)}]
+        width = (high - low) / bins
+        edges = [low + width * i for i in range(bins)] + [high]
+        buckets = []
+        start = 0
+        for i in range(bins):
+            # The last bucket includes the highest value
+            end = bisect_right(self.values, high) if i == bins - 1 else bisect_left(self.values, edges[i + 1])
+            buckets.append({'low': round(edges[i], 4), 'high': round(edges[i + 1], 4), 'count': end - start})
+            start = end
+        return buckets
+
+    def summary(self, bins: int) -> Dict[str, Any]:
+        """Size, league average, spread, quantiles and histogram"""
+        return {
+            'sample_size': self.sample_size,
+            'league_average': round(self.mean, 2),
+            'min': self.values[0],
+            'max': self.values[-1],
+            'quantiles': {str(q): round(self.quantile(q), 2) for q in SUMMARY_QUANTILES},
+            'histogram': self.histogram(bins),
+        }
+
+
+class DistributionStore:
+    """
+    Each season's distributions, loaded from get_stat_distributions() on
+    first use and kept until a 'stat_distribution' change event (sent by
+    refresh_stat_distributions()) names the season. A season dropped that
+    way is reloaded from the primary, which replicas may still be behind.
+    """
+
+    def __init__(self, load_rows: Callable[[int], Awaitable[List[dict]]]):
+        self._load_rows = load_rows
+        self._seasons: Dict[int, Dict[Tuple[str, str], Distribution]] = {}
+        # Bumped by every event, so a load that overlaps one is not kept
+        self._generation = 0
+        # Seasons dropped by an event and not loaded since
+        self._dropped = set()
+        self._stats = {'hits': 0, 'misses': 0}
+
+    async def season(self, season_id: int) -> Dict[Tuple[str, str], Distribution]:
+        """(position, stat) -> Distribution for one season; empty before the first refresh"""
+        distributions = self._seasons.get(season_id)
+        if distributions is not None:
+            self._stats['hits'] += 1
+            return distributions
+        self._stats['misses'] += 1
+        generation = self._generation
+        if season_id in self._dropped:
+            with primary_reads():
+                rows = await self._load_rows(season_id)
+        else:
+            rows = await self._load_rows(season_id)
+        distributions = {
+            (row['position'], row['stat']): Distribution(
+                row['sample_size'], row['mean'], row['sorted_values'], row['player_ids'])
+            for row in rows
+        }
+        if generation == self._generation and distributions:
+            self._seasons[season_id] = distributions
+            self._dropped.discard(season_id)
+        return distributions
+
+    async def get(self, season_id: int, stat: str, position: Optional[str] = None) -> Optional[Distribution]:
+        """One distribution, or None if the season or position has no players"""
+        distributions = await self.season(season_id)
+        return distributions.get(((position or ALL_POSITIONS).upper(), stat))
+
+    def handle_event(self, event: Dict[str, Any]):
+        """Forget the seasons a refresh rewrote (see CacheInvalidationListener)"""
+        if event.get('table') != 'stat_distribution':
+            return
+        self._generation += 1
+        season_ids = event.get('season_ids')
+        if season_ids is None:
+            self._dropped.update(self._seasons)
+            self._seasons.clear()
+        for season_id in season_ids or []:
+            self._seasons.pop(season_id, None)
+            self._dropped.add(season_id)
+
+    def reset(self):
+        """Refresh events may have been missed; reload every season"""
+        self._generation += 1
+        self._seasons.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Seasons held in memory and lookup counters"""
+        return dict(self._stats, seasons=len(self._seasons))
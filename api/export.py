@@ -0,0 +1,122 @@
+"""
+CourtVision Export Module
+Streams bulk table exports as NDJSON or CSV, optionally gzipped
+Author: CS3620 Student
+"""
+
+import csv
+import io
+import os
+import zlib
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+from fast_json import dumps
+
+# Rows fetched per server-side cursor round-trip and encoded per chunk;
+# this, not the size of the export, bounds the memory an export uses
+EXPORT_ITERSIZE = int(os.getenv('EXPORT_ITERSIZE', '2000'))
+
+EXPORT_GZIP_LEVEL = 6
+
+EXPORT_MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+# Exportable tables: query and the WHERE clause for each filter it accepts.
+# Rows come out in id order so repeated exports of unchanged data match.
+EXPORT_DATASETS = {
+    'player_season_stats': (
+        "SELECT * FROM player_season_stats{where} ORDER BY id",
+        {'season_id': "season_id = %s"}
+    ),
+    'game': (
+        "SELECT * FROM game{where} ORDER BY id",
+        {
+            # game has no season_id; a season's games are those within its dates
+            'season_id': ("game_date_time >= (SELECT start_date FROM season WHERE id = %s) "
+                          "AND game_date_time < (SELECT end_date + 1 FROM season WHERE id = %s)"),
+            'since': "game_date_time >= %s",
+        }
+    ),
+    'audit_log': (
+        "SELECT * FROM audit_log{where} ORDER BY id",
+        {'table_name': "table_name = %s", 'since': "changed_at >= %s"}
+    ),
+}
+
+
+def build_export_query(dataset: str, **filters: Any) -> Tuple[str, tuple]:
+    """
+    SQL and parameters for one dataset export
+
+    Args:
+        dataset: Key of EXPORT_DATASETS
+        **filters: Filter values; None means not filtered
+
+    Raises:
+        ValueError: A filter was given that the dataset does not support
+    """
+    query, clauses_by_filter = EXPORT_DATASETS[dataset]
+    given = {name: value for name, value in filters.items() if value is not None}
+    unsupported = sorted(set(given) - set(clauses_by_filter))
+    if unsupported:
+        raise ValueError(f"{dataset} cannot be filtered by {', '.join(unsupported)}")
+
+    clauses, params = [], []
+    for name, value in given.items():
+        clause = clauses_by_filter[name]
+        clauses.append(clause)
+        params.extend([value] * clause.count('%s'))
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    return query.format(where=where), tuple(params)
+
+
+def _csv_value(value: Any) -> Any:
+    """CSV cell for a value; JSONB columns are written as JSON text"""
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode('utf-8')
+    return value
+
+
+async def encode_rows(batches: AsyncIterator[list], export_format: str) -> AsyncIterator[bytes]:
+    """
+    Encode stream_query() output as NDJSON lines or CSV, one chunk per batch
+
+    The first item of batches is the column names; CSV writes them as the
+    header row, NDJSON uses them as the keys of every object.
+    """
+    columns: Optional[List[str]] = None
+    async for batch in batches:
+        if columns is None:
+            columns = batch
+            if export_format == 'csv':
+                yield _csv_chunk([columns])
+            continue
+        if export_format == 'csv':
+            yield _csv_chunk([[_csv_value(value) for value in row] for row in batch])
+        else:
+            yield b''.join(dumps(dict(zip(columns, row))) + b'\n' for row in batch)
+
+
+def _csv_chunk(rows: List[list]) -> bytes:
+    """Encode rows as CSV lines"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode('utf-8')
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes], level: int = EXPORT_GZIP_LEVEL) -> AsyncIterator[bytes]:
+    """Compress a byte stream into a single gzip member as it is produced"""
+    # wbits=31: deflate with a gzip header and trailer
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_filename(dataset: str, export_format: str, compressed: bool) -> str:
+    """Download name for an export, e.g. game.ndjson.gz"""
+    return f"{dataset}.{export_format}{'.gz' if compressed else ''}"
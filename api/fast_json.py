@@ -0,0 +1,76 @@
+"""
+CourtVision Fast JSON Module
+Direct JSON rendering of query results, bypassing FastAPI's generic encoder
+Author: CS3620 Student
+"""
+
+import functools
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable
+
+from fastapi.routing import APIRoute
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib json fallback gives identical output, slower
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """JSON for values neither encoder handles natively"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        # orjson encodes these itself; only the stdlib fallback gets here
+        return value.isoformat()
+    if hasattr(value, 'model_dump'):
+        return value.model_dump(mode='json')
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, allow_nan=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps() (orjson when installed)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class FastJSONRoute(APIRoute):
+    """
+    Route whose plain return values (dicts and lists) become a
+    FastJSONResponse directly, skipping the jsonable_encoder pass FastAPI
+    otherwise makes over every row. Endpoints with a response_model keep
+    FastAPI's validation path.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        response_model = kwargs.get('response_model')
+        if getattr(response_model, 'value', response_model) is None:
+            endpoint = self._render_directly(endpoint, kwargs.get('status_code'))
+        super().__init__(path, endpoint, **kwargs)
+
+    @staticmethod
+    def _render_directly(endpoint: Callable[..., Any], status_code: Any) -> Callable[..., Any]:
+        """Wrap an async endpoint so its result is returned as a FastJSONResponse"""
+        # FastAPI returns Response objects untouched, so carry the route's status over
+        status = getattr(status_code, 'value', status_code) or 200
+
+        @functools.wraps(endpoint)
+        async def render(*args, **kwargs):
+            result = await endpoint(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
+            return FastJSONResponse(result, status_code=status)
+
+        return render
@@ -0,0 +1,303 @@
+"""
+CourtVision HTTP Cache Module
+Data-version ETags, conditional requests, compression and per-endpoint cache policies
+Author: CS3620 Student
+"""
+
+import gzip
+import hashlib
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # optional: only needed to serve Content-Encoding: br
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+COMPRESS_MIN_BYTES = int(os.getenv('HTTP_COMPRESS_MIN_BYTES', '1024'))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/')
+MUTATING_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+
+
+class CachePolicy:
+    """How responses under one path prefix are cached, validated and compressed"""
+
+    __slots__ = ('cache_control', 'etag', 'compress', 'read_only')
+
+    def __init__(self, cache_control: str, etag: bool = True, compress: bool = True,
+                 read_only: bool = False):
+        self.cache_control = cache_control
+        self.etag = etag
+        self.compress = compress
+        # POSTs under a read_only prefix are queries and leave the data version alone
+        self.read_only = read_only
+
+
+# Longest matching path prefix wins. ETags make revalidation a cheap 304, so
+# most responses are no-cache (revalidate every time); leaderboards change
+# only with loads and box scores, so browsers may reuse them briefly.
+CACHE_POLICIES = {
+    '/leaderboard': CachePolicy('public, max-age=30, stale-while-revalidate=300'),
+    '/dashboard': CachePolicy('public, max-age=30, stale-while-revalidate=300'),
+    '/distribution': CachePolicy('public, max-age=30, stale-while-revalidate=300'),
+    '/compare': CachePolicy('no-cache', read_only=True),
+    # Streamed straight from a server-side cursor; ?gzip=true compresses it
+    '/export': CachePolicy('no-store', etag=False, compress=False),
+    '/health': CachePolicy('no-store', etag=False),
+}
+DEFAULT_POLICY = CachePolicy('no-cache')
+
+
+def policy_for(path: str) -> CachePolicy:
+    """Cache policy for a request path"""
+    matches = [prefix for prefix in CACHE_POLICIES
+               if path == prefix or path.startswith(prefix.rstrip('/') + '/')]
+    return CACHE_POLICIES[max(matches, key=len)] if matches else DEFAULT_POLICY
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best supported content coding the client accepts ('br', 'gzip' or None)"""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        weight = 1.0
+        if params.strip().startswith('q='):
+            try:
+                weight = float(params.strip()[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip().lower()] = weight
+    for coding in ('br', 'gzip'):
+        if coding == 'br' and brotli is None:
+            continue
+        if weights.get(coding, weights.get('*', 0.0)) > 0:
+            return coding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Encode body with the chosen content coding"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+class DataVersion:
+    """
+    The database's data version as last seen by this process
+
+    Read from the database once, then kept current by 'data_version' change
+    events and this process's own bumps, so conditional requests are
+    answered without a query. None means unknown: no 304s are sent until
+    the version has been read again.
+    """
+
+    def __init__(self, load: Callable[[], Awaitable[int]], bump: Callable[[], Awaitable[int]]):
+        self._load = load
+        self._bump = bump
+        self.value: Optional[int] = None
+        self._stats = {
+            'loads': 0,
+            'bumps': 0,
+            'not_modified': 0,
+            'compressed': 0,
+        }
+
+    async def current(self) -> Optional[int]:
+        """The data version, reading it from the database if unknown"""
+        if self.value is None:
+            try:
+                self.observe(await self._load())
+                self._stats['loads'] += 1
+            except Exception as error:
+                print(f"✗ Could not read data version: {error}")
+        return self.value
+
+    async def bump(self):
+        """Advance the data version after a write"""
+        try:
+            self.observe(await self._bump())
+            self._stats['bumps'] += 1
+        except Exception as error:
+            print(f"✗ Could not bump data version: {error}")
+            self.value = None
+
+    def observe(self, version: Optional[int]):
+        """Move to version if it is newer than the one already known"""
+        if version is not None and (self.value is None or version > self.value):
+            self.value = version
+
+    def handle_event(self, event: Dict[str, Any]):
+        """Apply one change notification (see CacheInvalidationListener)"""
+        if event.get('table') == 'data_version':
+            self.observe(event.get('version'))
+
+    def reset(self):
+        """Forget the version; bumps may have been missed"""
+        self.value = None
+
+    def count(self, name: str):
+        """Increment one of the counters reported by get_stats()"""
+        self._stats[name] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Current version and counters"""
+        return dict(self._stats, version=self.value)
+
+
+def _etag_base(version: int, scope: dict, salt: str) -> str:
+    """ETag (without quotes or content coding) for a URL at a data version"""
+    target = f"{scope['path']}?{scope.get('query_string', b'').decode('latin-1')}"
+    digest = hashlib.sha256(f"{salt}|{target}".encode('utf-8')).hexdigest()[:16]
+    return f"{version}-{digest}"
+
+
+def _matching_tag(if_none_match: Optional[str], base: str) -> Optional[str]:
+    """The If-None-Match entry naming this URL at this version, in any coding"""
+    if not if_none_match:
+        return None
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag == '*':
+            return f'"{base}"'
+        opaque = tag[2:] if tag.startswith('W/') else tag
+        opaque = opaque.strip('"')
+        if opaque == base or opaque.startswith(base + '-'):
+            return tag
+    return None
+
+
+class HTTPCacheMiddleware:
+    """
+    ASGI middleware adding ETags, Cache-Control and compression
+
+    GET ETags are built from the data version and the URL, not the body,
+    so a matching If-None-Match is answered with 304 before the endpoint
+    (and Postgres) is reached. Successful writes bump the data version
+    before their response is sent, so a client can never revalidate a
+    pre-write response afterwards.
+    """
+
+    def __init__(self, app, version: DataVersion, salt: str = '',
+                 minimum_size: int = COMPRESS_MIN_BYTES):
+        self.app = app
+        self.version = version
+        self.salt = salt
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        method = scope['method']
+        policy = policy_for(scope['path'])
+        if method in MUTATING_METHODS and not policy.read_only:
+            await self.app(scope, receive, self._bump_on_success(send))
+            return
+
+        request_headers = Headers(scope=scope)
+        base = None
+        if method in ('GET', 'HEAD') and policy.etag:
+            version = await self.version.current()
+            if version is not None:
+                base = _etag_base(version, scope, self.salt)
+                tag = _matching_tag(request_headers.get('if-none-match'), base)
+                if tag is not None:
+                    self.version.count('not_modified')
+                    await send({
+                        'type': 'http.response.start',
+                        'status': 304,
+                        'headers': [(b'etag', tag.encode('latin-1')),
+                                    (b'cache-control', policy.cache_control.encode('latin-1'))],
+                    })
+                    await send({'type': 'http.response.body', 'body': b''})
+                    return
+
+        encoding = None
+        if policy.compress and method != 'HEAD':
+            encoding = choose_encoding(request_headers.get('accept-encoding'))
+        responder = _Responder(send, policy, base, encoding, self.minimum_size, self.version)
+        await self.app(scope, receive, responder.send)
+
+    def _bump_on_success(self, send):
+        """Wrap send so a successful write bumps the data version first"""
+        async def send_after_bump(message):
+            if message['type'] == 'http.response.start' and message['status'] < 400:
+                await self.version.bump()
+                headers = MutableHeaders(scope=message)
+                headers.setdefault('cache-control', 'no-store')
+            await send(message)
+        return send_after_bump
+
+
+class _Responder:
+    """Adds policy headers to one response, buffering it when it may be compressed"""
+
+    def __init__(self, send, policy: CachePolicy, etag_base: Optional[str],
+                 encoding: Optional[str], minimum_size: int, version: DataVersion):
+        self._send = send
+        self.policy = policy
+        self.etag_base = etag_base
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.version = version
+        self.start = None
+        self.chunks = []
+        self.buffering = False
+
+    def _add_cache_headers(self, headers: MutableHeaders, encoding: Optional[str]):
+        """ETag and Cache-Control for a successful response"""
+        if self.start['status'] != 200:
+            return
+        if self.etag_base is not None:
+            suffix = f"-{encoding}" if encoding else ""
+            headers['etag'] = f'"{self.etag_base}{suffix}"'
+        headers.setdefault('cache-control', self.policy.cache_control)
+
+    async def send(self, message):
+        if message['type'] == 'http.response.start':
+            self.start = message
+            headers = MutableHeaders(scope=message)
+            content_length = headers.get('content-length')
+            self.buffering = (
+                self.encoding is not None
+                and 'content-encoding' not in headers
+                and headers.get('content-type', '').startswith(COMPRESSIBLE_TYPES)
+                and (content_length is None or int(content_length) >= self.minimum_size)
+            )
+            if self.policy.compress:
+                headers.add_vary_header('Accept-Encoding')
+            if not self.buffering:
+                self._add_cache_headers(headers, None)
+                await self._send(message)
+            return
+
+        if message['type'] != 'http.response.body' or not self.buffering:
+            await self._send(message)
+            return
+
+        self.chunks.append(message.get('body', b''))
+        if message.get('more_body', False):
+            return
+
+        body = b''.join(self.chunks)
+        headers = MutableHeaders(scope=self.start)
+        encoding = None
+        if len(body) >= self.minimum_size:
+            encoding = self.encoding
+            body = compress(body, encoding)
+            headers['content-encoding'] = encoding
+            self.version.count('compressed')
+        headers['content-length'] = str(len(body))
+        self._add_cache_headers(headers, encoding)
+        await self._send(self.start)
+        await self._send({'type': 'http.response.body', 'body': body})
@@ -0,0 +1,261 @@
+"""
+CourtVision Cache Invalidation Module
+Evicts cached results in response to pg_notify change events
+Author: CS3620 Student
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+
+import psycopg
+
+from cache import ResponseCache
+
+# Channel the audit and stats triggers in schema/functions.sql publish to
+CHANGE_CHANNEL = 'courtvision_changes'
+
+# Cached database functions grouped by what their parameters mean
+# Stat category (refresh_leaderboard() in functions.sql) -> function reading its table
+LEADERBOARD_FUNCTIONS = {
+    'points': 'get_top_scorers',
+    'assists': 'get_top_assists',
+    'rebounds': 'get_top_rebounds',
+    'steals': 'get_top_steals',
+    'blocks': 'get_top_blocks',
+    'efficiency': 'get_efficiency_leaderboard',
+}
+PLAYER_LEADERBOARDS = set(LEADERBOARD_FUNCTIONS.values())  # (season_id, limit)
+# (stat, season_id, limit, position, min_games); ranked from player_season_stats
+FILTERED_LEADERBOARD = 'get_player_leaderboard'
+TEAM_LEADERBOARDS = {'get_team_most_wins', 'get_team_avg_wins_per_season', 'get_team_points_per_game'}  # (limit,)
+PLAYER_SEARCHES = {'get_player_by_name', 'search_players_ranked', 'get_players_page', 'get_all_players', 'get_players_by_position'}
+TEAM_SEARCHES = {'get_team_by_name', 'search_teams_ranked', 'get_all_teams'}
+GAME_LISTS = {'get_recent_games', 'get_games_by_team'}
+# (team_id, opponent_team_id, ...)
+HEAD_TO_HEAD = {'get_games_head_to_head', 'get_head_to_head_record'}
+# (ids tuple, season_ids tuple); league context covers every row in the season
+PLAYER_BATCH_COMPARISON = 'compare_players_batch'
+TEAM_BATCH_COMPARISON = 'compare_teams_batch'
+# (season_id, limit); the season's player leaderboards plus the all-time team ones
+DASHBOARD = 'get_dashboard'
+
+
+def _rows_mention(value: Any, column: str, record_id: int) -> bool:
+    """Check whether a cached result set contains a row for record_id"""
+    if value is None:
+        # Still loading: be conservative
+        return True
+    return any(row.get(column) == record_id for row in value)
+
+
+def _matches(ids: Optional[list], value: Any) -> bool:
+    """A missing id list means the change touched too many rows to enumerate"""
+    return ids is None or value in ids
+
+
+def apply_change(cache: ResponseCache, event: Dict[str, Any]) -> int:
+    """
+    Evict the cache entries affected by one change event
+
+    Args:
+        cache: Cache to evict from
+        event: Decoded notification payload ({"table": ..., "op": ..., ...})
+
+    Returns:
+        Number of entries removed
+    """
+    table = event.get('table')
+    op = event.get('op')
+
+    if table == 'player':
+        player_id = event.get('id')
+
+        def predicate(function_name, params, value):
+            if function_name in PLAYER_SEARCHES:
+                return True
+            # Checked on INSERT too: empty results (a 404 for this id) are cached
+            if function_name in ('get_player_by_id', 'get_player_stats'):
+                return params[0] == player_id
+            if function_name == PLAYER_BATCH_COMPARISON:
+                return player_id in params[0]
+            if op == 'INSERT':
+                return False
+            if function_name in (LEADERBOARD_FUNCTIONS['efficiency'], DASHBOARD, FILTERED_LEADERBOARD):
+                # No player_id to check, or a position change can add the player
+                return True
+            if function_name in PLAYER_LEADERBOARDS:
+                return _rows_mention(value, 'player_id', player_id)
+            return False
+
+    elif table == 'team':
+        team_id = event.get('id')
+
+        def predicate(function_name, params, value):
+            if function_name in TEAM_SEARCHES:
+                return True
+            # Checked on INSERT too: empty results (a 404 for this id) are cached
+            if function_name == 'compare_teams':
+                return team_id in params[:2]
+            if function_name == TEAM_BATCH_COMPARISON:
+                return team_id in params[0]
+            if function_name in HEAD_TO_HEAD:
+                return team_id in params[:2]
+            if op == 'INSERT':
+                return False
+            return function_name in TEAM_LEADERBOARDS or function_name in GAME_LISTS or function_name == DASHBOARD
+
+    elif table == 'player_season_stats':
+        season_ids = event.get('season_ids') or []
+        player_ids = event.get('player_ids')
+
+        def predicate(function_name, params, value):
+            if function_name in PLAYER_LEADERBOARDS or function_name == DASHBOARD:
+                return params[0] in season_ids
+            if function_name == FILTERED_LEADERBOARD:
+                return params[1] in season_ids
+            if function_name == 'get_player_stats':
+                return params[1] in season_ids and _matches(player_ids, params[0])
+            if function_name == PLAYER_BATCH_COMPARISON:
+                # Any change moves the season's averages and percentiles
+                return any(season_id in season_ids for season_id in params[1])
+            return False
+
+    elif table == 'leaderboard':
+        season_ids = event.get('season_ids') or []
+        function = LEADERBOARD_FUNCTIONS.get(event.get('stat'))
+
+        def predicate(function_name, params, value):
+            if function_name == DASHBOARD:
+                return params[0] in season_ids
+            if function is None:
+                return function_name in PLAYER_LEADERBOARDS and params[0] in season_ids
+            return function_name == function and params[0] in season_ids
+
+    elif table == 'team_season_stats':
+        season_ids = event.get('season_ids') or []
+        team_ids = event.get('team_ids')
+
+        def predicate(function_name, params, value):
+            if function_name == 'compare_teams':
+                return params[2] in season_ids and (
+                    _matches(team_ids, params[0]) or _matches(team_ids, params[1])
+                )
+            if function_name == TEAM_BATCH_COMPARISON:
+                return any(season_id in season_ids for season_id in params[1])
+            # Team leaderboards aggregate across all seasons
+            return function_name in TEAM_LEADERBOARDS or function_name == DASHBOARD
+
+    elif table == 'game':
+        team_ids = event.get('team_ids')
+
+        def predicate(function_name, params, value):
+            if function_name == 'get_games_by_team':
+                return _matches(team_ids, params[0])
+            if function_name in HEAD_TO_HEAD:
+                return _matches(team_ids, params[0]) or _matches(team_ids, params[1])
+            return function_name in GAME_LISTS or function_name in TEAM_LEADERBOARDS or function_name == DASHBOARD
+
+    elif table == 'stat_distribution':
+        # Read through distributions.DistributionStore, which reloads the seasons itself
+        return 0
+
+    elif table == 'data_version':
+        # Marks the end of a load or API write; its changes come as their own events
+        return 0
+
+    else:
+        # Unknown source: drop everything rather than risk serving stale data
+        return cache.clear()
+
+    return cache.invalidate(predicate)
+
+
+class CacheInvalidationListener:
+    """
+    Background task that LISTENs on CHANGE_CHANNEL and applies each event.
+
+    Notifications sent while the listener is disconnected are lost, so the
+    whole cache is cleared whenever the connection has to be re-established.
+    Subscribers (objects with handle_event(event) and reset()) see every
+    event too, and are reset on reconnect.
+    """
+
+    def __init__(self, cache: ResponseCache, db_config: Dict[str, str],
+                 reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0,
+                 subscribers: Optional[List[Any]] = None):
+        self.cache = cache
+        self.db_config = db_config
+        self.subscribers = subscribers or []
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._task = None
+        self._stats = {
+            'connected': False,
+            'events': 0,
+            'evictions': 0,
+            'bad_payloads': 0,
+            'reconnects': 0,
+        }
+
+    def start(self):
+        """Start listening in the background on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the background task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def handle_payload(self, payload: str):
+        """Decode and apply one notification payload"""
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            self._stats['bad_payloads'] += 1
+            self.cache.clear()
+            for subscriber in self.subscribers:
+                subscriber.reset()
+            return
+        self._stats['events'] += 1
+        self._stats['evictions'] += apply_change(self.cache, event)
+        for subscriber in self.subscribers:
+            subscriber.handle_event(event)
+
+    async def _run(self):
+        """Listen forever, reconnecting with exponential backoff"""
+        delay = self.reconnect_delay
+        while True:
+            try:
+                connection = await psycopg.AsyncConnection.connect(autocommit=True, **self.db_config)
+                async with connection:
+                    await connection.execute(f"LISTEN {CHANGE_CHANNEL}")
+                    if self._stats['reconnects']:
+                        # Events may have been missed while disconnected
+                        self.cache.clear()
+                        for subscriber in self.subscribers:
+                            subscriber.reset()
+                    self._stats['connected'] = True
+                    print(f"✓ Listening for cache invalidation events on '{CHANGE_CHANNEL}'")
+                    delay = self.reconnect_delay
+                    async for notify in connection.notifies():
+                        self.handle_payload(notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except (Exception, psycopg.DatabaseError) as error:
+                print(f"✗ Cache invalidation listener error: {error}")
+            finally:
+                self._stats['connected'] = False
+            self._stats['reconnects'] += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Listener state and event counters"""
+        return dict(self._stats)
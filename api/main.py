@@ -6,20 +6,72 @@ Date: December 2, 2025
 """
 
 from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-from typing import Optional, List
-from datetime import date
-from db import db
+from typing import Optional, List, Literal
+from datetime import date, datetime
+import asyncio
+from psycopg.types.json import Jsonb
+from db import async_db
+from cache import response_cache
+from fast_json import FastJSONResponse, FastJSONRoute
+from http_cache import DataVersion, HTTPCacheMiddleware
+from invalidation import CacheInvalidationListener, apply_change
+from export import (EXPORT_ITERSIZE, EXPORT_MEDIA_TYPES, build_export_query,
+                    encode_rows, export_filename, gzip_chunks)
+from registry import function_registry
+from replicas import ReplicaClientMiddleware
+from stats_engine import PLAYER_LEADERBOARDS, StatsEngine
+from similarity import SimilaritySearch
+from distributions import ALL_POSITIONS, DISTRIBUTION_STATS, DistributionStore
+from pagination import decode_cursor, next_cursor, parse_fields, project
 import uvicorn
 
 # Initialize FastAPI app
 app = FastAPI(
     title="CourtVision API",
     description="NBA Analytics Application - Checkpoint 2",
-    version="0.2.0"
+    version="0.2.0",
+    default_response_class=FastJSONResponse
 )
 
+# Endpoints return rows whose NUMERIC columns already load as float
+# (AsyncDatabase.configure_connection), so render them directly instead
+# of walking every row through jsonable_encoder. Must be set before the
+# routes below are declared.
+app.router.route_class = FastJSONRoute
+
+# Data version behind the ETags; read once, then kept current by change events
+data_version = DataVersion(
+    load=lambda: async_db.execute_function_scalar("get_data_version"),
+    bump=lambda: async_db.execute_function_scalar("bump_data_version")
+)
+
+# Optional in-memory copy of the season stats tables (STATS_ENGINE=1),
+# used only while it matches the data version
+stats_engine = StatsEngine(
+    load_rows=async_db.execute_query,
+    load_version=lambda: async_db.execute_function_scalar("get_data_version")
+)
+
+# Nearest-neighbour index behind /player/{id}/similar, built on first use
+similarity = SimilaritySearch(load_rows=async_db.execute_query)
+
+# Sorted per-season stat distributions behind the percentile endpoints,
+# loaded a season at a time and dropped when a refresh rewrites them
+distributions = DistributionStore(
+    load_rows=lambda season_id: async_db.execute_function("get_stat_distributions", (season_id,))
+)
+
+# ETags, 304s, Cache-Control and compression (see http_cache.CACHE_POLICIES);
+# added before CORS so CORS headers also reach 304 responses
+app.add_middleware(HTTPCacheMiddleware, version=data_version, salt=app.version)
+
+# Tags requests with their client, so a write pins only that client's reads
+# to the primary (outside HTTPCacheMiddleware, whose version bump is a write)
+app.add_middleware(ReplicaClientMiddleware)
+
 # Enable CORS for Next.js frontend
 app.add_middleware(
     CORSMiddleware,
@@ -29,10 +81,145 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ==========================================
+# LIFECYCLE
+# ==========================================
+
+# Evicts cached results when the database reports a change; evicted entries
+# are reloaded from the primary while the replicas catch up
+cache_listener = CacheInvalidationListener(response_cache, async_db.db_config,
+                                           subscribers=[data_version, async_db.replicas, stats_engine, similarity,
+                                                        distributions])
+
+@app.on_event("startup")
+async def startup():
+    """Open the async database pool, validate the function registry and start the cache listener"""
+    await async_db.create_pool()
+    await async_db.validate_functions()
+    if stats_engine.enabled:
+        try:
+            await stats_engine.reload()
+        except Exception as e:
+            print(f"✗ Stats engine not loaded, serving stats from Postgres: {e}")
+    cache_listener.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop the cache listener and close the async database pool"""
+    await cache_listener.stop()
+    await async_db.close_pool()
+
+# ==========================================
+# CACHING
+# ==========================================
+
+async def cached_function(function_name: str, params: tuple = None) -> list:
+    """
+    Execute a read-only database function through the response cache
+    
+    Tuple parameters (hashable, so they can be part of the cache key) are
+    passed to the function as arrays.
+    """
+    return await response_cache.get_or_load(
+        function_name,
+        params,
+        lambda: async_db.execute_function(function_name, params and tuple(
+            list(param) if isinstance(param, tuple) else param for param in params
+        ))
+    )
+
+async def stats_snapshot():
+    """The stats engine's snapshot if it holds the current data version, else None"""
+    return stats_engine.snapshot(await data_version.current())
+
+async def player_leaderboard(stat: str, season_id: int, limit: int,
+                             position: Optional[str] = None, min_games: Optional[int] = None) -> list:
+    """One stat's leaderboard, from the stats engine or Postgres, optionally filtered"""
+    snapshot = await stats_snapshot()
+    if snapshot is not None:
+        return snapshot.player_leaderboard(stat, season_id, limit, position, min_games)
+    function_name, value_column, columns = PLAYER_LEADERBOARDS[stat]
+    if position is None and min_games is None:
+        return await cached_function(function_name, (season_id, limit))
+    rows = await cached_function("get_player_leaderboard",
+                                 (stat, season_id, limit, position and position.upper(), min_games))
+    return [{column: row["value" if column == value_column else column] for column in columns}
+            for row in rows]
+
+async def team_leaderboard(function_name: str, limit: int) -> list:
+    """An all-time team leaderboard, from the stats engine or Postgres"""
+    snapshot = await stats_snapshot()
+    if snapshot is not None:
+        return snapshot.team_leaderboard(function_name, limit)
+    return await cached_function(function_name, (limit,))
+
+async def player_season_stats(player_id: int, season_id: int) -> list:
+    """get_player_stats() rows, from the stats engine or Postgres"""
+    snapshot = await stats_snapshot()
+    if snapshot is not None:
+        return snapshot.player_stats(player_id, season_id)
+    return await cached_function("get_player_stats", (player_id, season_id))
+
+# ==========================================
+# PAGINATION
+# ==========================================
+
+# Columns each paged endpoint can return, for ?fields= projection
+PLAYER_FIELDS = ('id', 'player_name', 'birth_date', 'height_inches', 'weight_lbs',
+                 'position', 'jersey_number', 'is_active')
+TEAM_FIELDS = ('id', 'team_name', 'abbreviation', 'city', 'conference', 'division', 'is_active')
+GAME_FIELDS = ('id', 'game_id', 'game_date_time', 'home_team', 'away_team',
+               'home_score', 'away_score', 'game_type')
+AUDIT_FIELDS = ('id', 'table_name', 'operation', 'record_id', 'changed_at', 'old_values', 'new_values')
+NOTE_FIELDS = ('id', 'player_id', 'team_id', 'note_title', 'note_content', 'created_at')
+TEAM_GAME_FIELDS = ('id', 'game_id', 'game_date_time', 'opponent_team', 'is_home',
+                    'team_score', 'opponent_score', 'won')
+HEAD_TO_HEAD_FIELDS = ('id', 'game_id', 'game_date_time', 'is_home', 'team_score', 'opponent_score', 'won')
+GAME_LOG_FIELDS = ('game_id', 'game_date', 'season_id', 'team', 'opponent', 'is_home', 'won',
+                   'minutes', 'points', 'rebounds', 'assists', 'steals', 'blocks', 'turnovers',
+                   'field_goals_made', 'field_goals_attempted', 'three_pointers_made',
+                   'three_pointers_attempted', 'free_throws_made', 'free_throws_attempted', 'plus_minus')
+
+# Largest page a ranked name search returns
+MAX_SEARCH_LIMIT = 100
+
+def decode_page_cursor(cursor: Optional[str], *types) -> tuple:
+    """
+    Sort key of the last row already returned, converted with types
+    (one converter per key column), or all None for the first page
+    """
+    if cursor is None:
+        return (None,) * len(types)
+    try:
+        values = decode_cursor(cursor, len(types))
+        return tuple(convert(value) for convert, value in zip(types, values))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def select_fields(fields: Optional[str], allowed: tuple) -> Optional[List[str]]:
+    """Validated ?fields= columns (None for all)"""
+    try:
+        return parse_fields(fields, allowed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def page_response(key: str, rows: list, limit: int, fields: Optional[List[str]], *cursor_columns: str) -> dict:
+    """One page of rows, projected to fields, with the cursor for the next page"""
+    return {
+        key: project(rows, fields),
+        "count": len(rows),
+        "next_cursor": next_cursor(rows, limit, *cursor_columns)
+    }
+
 # ==========================================
 # PYDANTIC MODELS
 # ==========================================
 
+SearchMode = Literal["contains", "prefix"]
+ExportDataset = Literal["player_season_stats", "game", "audit_log"]
+ExportFormat = Literal["ndjson", "csv"]
+DistributionStat = Literal["points", "rebounds", "assists", "steals", "blocks", "efficiency"]
+
 class PlayerCreate(BaseModel):
     player_name: str = Field(..., min_length=1, max_length=255)
     birth_date: Optional[date] = None
@@ -73,6 +260,43 @@ class NoteUpdate(BaseModel):
     note_title: Optional[str] = Field(None, max_length=255)
     note_content: str = Field(..., min_length=1)
 
+class PlayerBoxScore(BaseModel):
+    player_id: int
+    team_id: Optional[int] = None
+    minutes: float = Field(0, ge=0)
+    points: int = Field(0, ge=0)
+    rebounds: int = Field(0, ge=0)
+    assists: int = Field(0, ge=0)
+    steals: int = Field(0, ge=0)
+    blocks: int = Field(0, ge=0)
+    turnovers: int = Field(0, ge=0)
+    field_goals_made: int = Field(0, ge=0)
+    field_goals_attempted: int = Field(0, ge=0)
+    three_pointers_made: int = Field(0, ge=0)
+    three_pointers_attempted: int = Field(0, ge=0)
+    free_throws_made: int = Field(0, ge=0)
+    free_throws_attempted: int = Field(0, ge=0)
+
+class TeamBoxScore(BaseModel):
+    team_id: int
+    win: bool
+    points: int = Field(0, ge=0)
+    points_allowed: int = Field(0, ge=0)
+
+class PlayerComparisonRequest(BaseModel):
+    player_ids: List[int] = Field(..., min_length=1, max_length=50)
+    season_ids: List[int] = Field([1], min_length=1, max_length=20)
+
+class TeamComparisonRequest(BaseModel):
+    team_ids: List[int] = Field(..., min_length=1, max_length=50)
+    season_ids: List[int] = Field([1], min_length=1, max_length=20)
+
+class GameBoxScores(BaseModel):
+    game_id: str = Field(..., min_length=1, max_length=50)
+    season_id: int
+    players: List[PlayerBoxScore] = Field(..., min_length=1)
+    teams: List[TeamBoxScore] = []
+
 # ==========================================
 # HEALTH CHECK
 # ==========================================
@@ -90,7 +314,7 @@ async def root():
 async def health_check():
     """Database health check"""
     try:
-        is_healthy = db.test_connection()
+        is_healthy = await async_db.test_connection()
         if is_healthy:
             return {"status": "healthy", "database": "connected"}
         else:
@@ -98,6 +322,36 @@ async def health_check():
     except Exception as e:
         raise HTTPException(status_code=503, detail=f"Database error: {str(e)}")
 
+@app.get("/health/pool")
+async def pool_stats():
+    """Connection pool sizing, wait time and churn counters"""
+    return {"async_pool": async_db.get_pool_stats()}
+
+@app.get("/health/replicas")
+async def replica_stats():
+    """Read routing counters: reads per replica, primary fallbacks and failures"""
+    return async_db.get_replica_stats()
+
+@app.get("/health/functions")
+async def function_stats():
+    """Per-function call counts and latency, and functions that failed validation"""
+    return {
+        "functions": function_registry.get_stats(),
+        "unavailable": function_registry.unavailable
+    }
+
+@app.get("/health/cache")
+async def cache_stats():
+    """Response cache and HTTP cache counters and invalidation listener state"""
+    return {
+        "cache": response_cache.get_stats(),
+        "listener": cache_listener.get_stats(),
+        "http": data_version.get_stats(),
+        "stats_engine": stats_engine.get_stats(),
+        "similarity": similarity.get_stats(),
+        "distributions": distributions.get_stats()
+    }
+
 # ==========================================
 # PLAYER ENDPOINTS
 # ==========================================
@@ -106,7 +360,7 @@ async def health_check():
 async def create_player(player: PlayerCreate):
     """Create a new player"""
     try:
-        player_id = db.execute_function_scalar(
+        player_id = await async_db.execute_function_scalar(
             "insert_player",
             (
                 player.player_name,
@@ -117,19 +371,38 @@ async def create_player(player: PlayerCreate):
                 player.jersey_number
             )
         )
+        apply_change(response_cache, {"table": "player", "op": "INSERT", "id": player_id})
         return {"message": "Player created successfully", "player_id": player_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create player: {str(e)}")
 
 @app.get("/player")
-async def get_players(name: Optional[str] = Query(None, description="Search by player name")):
-    """Get all players or search by name"""
+async def get_players(
+    name: Optional[str] = Query(None, min_length=1, max_length=255, description="Search by player name"),
+    mode: SearchMode = Query("contains", description="contains: anywhere, typo tolerant; prefix: typeahead"),
+    limit: int = Query(50, ge=1, le=500, description=f"Players per page (at most {MAX_SEARCH_LIMIT} with name)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,player_name")
+):
+    """List players in name order, or search by name (ranked); both paginated"""
     try:
         if name:
-            players = db.execute_function("get_player_by_name", (name,))
-        else:
-            players = db.execute_function("get_all_players")
-        return {"players": players, "count": len(players)}
+            if limit > MAX_SEARCH_LIMIT:
+                raise HTTPException(status_code=422,
+                                    detail=f"limit must be at most {MAX_SEARCH_LIMIT} when searching by name")
+            selected = select_fields(fields, PLAYER_FIELDS + ('score',))
+            after_score, after_id = decode_page_cursor(cursor, float, int)
+            players = await cached_function(
+                "search_players_ranked", (name, mode, limit, after_score, after_id)
+            )
+            return page_response("players", players, limit, selected, "score", "id")
+        
+        selected = select_fields(fields, PLAYER_FIELDS)
+        after_name, after_id = decode_page_cursor(cursor, str, int)
+        players = await cached_function("get_players_page", (limit, after_name, after_id))
+        return page_response("players", players, limit, selected, "player_name", "id")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch players: {str(e)}")
 
@@ -137,7 +410,7 @@ async def get_players(name: Optional[str] = Query(None, description="Search by p
 async def get_player_by_id(player_id: int):
     """Get player by ID"""
     try:
-        players = db.execute_function("get_player_by_id", (player_id,))
+        players = await cached_function("get_player_by_id", (player_id,))
         if not players:
             raise HTTPException(status_code=404, detail="Player not found")
         return {"player": players[0]}
@@ -150,7 +423,7 @@ async def get_player_by_id(player_id: int):
 async def update_player(player_id: int, player: PlayerUpdate):
     """Update player information"""
     try:
-        success = db.execute_function_scalar(
+        success = await async_db.execute_function_scalar(
             "update_player",
             (
                 player_id,
@@ -164,6 +437,8 @@ async def update_player(player_id: int, player: PlayerUpdate):
         )
         if not success:
             raise HTTPException(status_code=404, detail="Player not found")
+        # Evict locally right away; the change notification covers other workers
+        apply_change(response_cache, {"table": "player", "op": "UPDATE", "id": player_id})
         return {"message": "Player updated successfully", "player_id": player_id}
     except HTTPException:
         raise
@@ -174,9 +449,11 @@ async def update_player(player_id: int, player: PlayerUpdate):
 async def delete_player(player_id: int):
     """Delete a player"""
     try:
-        success = db.execute_function_scalar("delete_player", (player_id,))
+        success = await async_db.execute_function_scalar("delete_player", (player_id,))
         if not success:
             raise HTTPException(status_code=404, detail="Player not found")
+        # Evict locally right away; the change notification covers other workers
+        apply_change(response_cache, {"table": "player", "op": "DELETE", "id": player_id})
         return {"message": "Player deleted successfully", "player_id": player_id}
     except HTTPException:
         raise
@@ -191,23 +468,39 @@ async def delete_player(player_id: int):
 async def create_team(team: TeamCreate):
     """Create a new team"""
     try:
-        team_id = db.execute_function_scalar(
+        team_id = await async_db.execute_function_scalar(
             "insert_team",
             (team.team_name, team.abbreviation, team.city, team.conference, team.division)
         )
+        apply_change(response_cache, {"table": "team", "op": "INSERT", "id": team_id})
         return {"message": "Team created successfully", "team_id": team_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create team: {str(e)}")
 
 @app.get("/team")
-async def get_teams(name: Optional[str] = Query(None, description="Search by team name")):
-    """Get all teams or search by name"""
+async def get_teams(
+    name: Optional[str] = Query(None, min_length=1, max_length=255, description="Search by team name"),
+    mode: SearchMode = Query("contains", description="contains: anywhere, typo tolerant; prefix: typeahead"),
+    limit: int = Query(20, ge=1, le=100, description="Search results per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous search page"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,team_name")
+):
+    """Get all teams or search by name (ranked, paginated)"""
     try:
         if name:
-            teams = db.execute_function("get_team_by_name", (name,))
-        else:
-            teams = db.execute_function("get_all_teams")
-        return {"teams": teams, "count": len(teams)}
+            selected = select_fields(fields, TEAM_FIELDS + ('score',))
+            after_score, after_id = decode_page_cursor(cursor, float, int)
+            teams = await cached_function(
+                "search_teams_ranked", (name, mode, limit, after_score, after_id)
+            )
+            return page_response("teams", teams, limit, selected, "score", "id")
+        
+        # Every team fits in one response, so the full list is not paginated
+        selected = select_fields(fields, TEAM_FIELDS)
+        teams = await cached_function("get_all_teams")
+        return {"teams": project(teams, selected), "count": len(teams)}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch teams: {str(e)}")
 
@@ -215,12 +508,14 @@ async def get_teams(name: Optional[str] = Query(None, description="Search by tea
 async def update_team(team_id: int, team: TeamUpdate):
     """Update team information"""
     try:
-        success = db.execute_function_scalar(
+        success = await async_db.execute_function_scalar(
             "update_team",
             (team_id, team.team_name, team.city, team.conference, team.division)
         )
         if not success:
             raise HTTPException(status_code=404, detail="Team not found")
+        # Evict locally right away; the change notification covers other workers
+        apply_change(response_cache, {"table": "team", "op": "UPDATE", "id": team_id})
         return {"message": "Team updated successfully", "team_id": team_id}
     except HTTPException:
         raise
@@ -231,9 +526,11 @@ async def update_team(team_id: int, team: TeamUpdate):
 async def delete_team(team_id: int):
     """Delete a team"""
     try:
-        success = db.execute_function_scalar("delete_team", (team_id,))
+        success = await async_db.execute_function_scalar("delete_team", (team_id,))
         if not success:
             raise HTTPException(status_code=404, detail="Team not found")
+        # Evict locally right away; the change notification covers other workers
+        apply_change(response_cache, {"table": "team", "op": "DELETE", "id": team_id})
         return {"message": "Team deleted successfully", "team_id": team_id}
     except HTTPException:
         raise
@@ -248,7 +545,7 @@ async def delete_team(team_id: int):
 async def create_note(note: NoteCreate):
     """Create a new user note"""
     try:
-        note_id = db.execute_function_scalar(
+        note_id = await async_db.execute_function_scalar(
             "insert_user_note",
             (note.user_id, note.player_id, note.team_id, note.note_title, note.note_content)
         )
@@ -257,11 +554,22 @@ async def create_note(note: NoteCreate):
         raise HTTPException(status_code=500, detail=f"Failed to create note: {str(e)}")
 
 @app.get("/note/{user_id}")
-async def get_user_notes(user_id: int):
-    """Get all notes for a user"""
+async def get_user_notes(
+    user_id: int,
+    limit: int = Query(50, ge=1, le=200, description="Notes per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return")
+):
+    """Get a user's notes, newest first (paginated)"""
     try:
-        notes = db.execute_function("get_user_notes", (user_id,))
-        return {"notes": notes, "count": len(notes)}
+        selected = select_fields(fields, NOTE_FIELDS)
+        after_created_at, after_id = decode_page_cursor(cursor, datetime.fromisoformat, int)
+        notes = await async_db.execute_function(
+            "get_user_notes_page", (user_id, limit, after_created_at, after_id)
+        )
+        return page_response("notes", notes, limit, selected, "created_at", "id")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch notes: {str(e)}")
 
@@ -269,7 +577,7 @@ async def get_user_notes(user_id: int):
 async def update_note(note_id: int, note: NoteUpdate):
     """Update a user note"""
     try:
-        success = db.execute_function_scalar(
+        success = await async_db.execute_function_scalar(
             "update_user_note",
             (note_id, note.note_title, note.note_content)
         )
@@ -285,7 +593,7 @@ async def update_note(note_id: int, note: NoteUpdate):
 async def delete_note(note_id: int):
     """Delete a user note"""
     try:
-        success = db.execute_function_scalar("delete_user_note", (note_id,))
+        success = await async_db.execute_function_scalar("delete_user_note", (note_id,))
         if not success:
             raise HTTPException(status_code=404, detail="Note not found")
         return {"message": "Note deleted successfully", "note_id": note_id}
@@ -301,11 +609,13 @@ async def delete_note(note_id: int):
 @app.get("/leaderboard/points")
 async def get_points_leaderboard(
     season_id: int = Query(1, description="Season ID"),
-    limit: int = Query(10, ge=1, le=50, description="Number of results")
+    limit: int = Query(10, ge=1, le=50, description="Number of results"),
+    position: Optional[str] = Query(None, min_length=1, max_length=10, description="Only players at this position (G also matches G-F)"),
+    min_games: Optional[int] = Query(None, ge=1, description="Only players with at least this many games")
 ):
     """Get points per game leaderboard"""
     try:
-        leaderboard = db.execute_function("get_top_scorers", (season_id, limit))
+        leaderboard = await player_leaderboard("points", season_id, limit, position, min_games)
         return {"leaderboard": leaderboard, "count": len(leaderboard)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch leaderboard: {str(e)}")
@@ -313,11 +623,13 @@ async def get_points_leaderboard(
 @app.get("/leaderboard/assists")
 async def get_assists_leaderboard(
     season_id: int = Query(1, description="Season ID"),
-    limit: int = Query(10, ge=1, le=50, description="Number of results")
+    limit: int = Query(10, ge=1, le=50, description="Number of results"),
+    position: Optional[str] = Query(None, min_length=1, max_length=10, description="Only players at this position (G also matches G-F)"),
+    min_games: Optional[int] = Query(None, ge=1, description="Only players with at least this many games")
 ):
     """Get assists per game leaderboard"""
     try:
-        leaderboard = db.execute_function("get_top_assists", (season_id, limit))
+        leaderboard = await player_leaderboard("assists", season_id, limit, position, min_games)
         return {"leaderboard": leaderboard, "count": len(leaderboard)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch leaderboard: {str(e)}")
@@ -326,7 +638,7 @@ async def get_assists_leaderboard(
 async def get_players_by_position(position: str):
     """Get players by position"""
     try:
-        players = db.execute_function("get_players_by_position", (position.upper(),))
+        players = await cached_function("get_players_by_position", (position.upper(),))
         return {"players": players, "count": len(players)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch players: {str(e)}")
@@ -334,11 +646,13 @@ async def get_players_by_position(position: str):
 @app.get("/leaderboard/rebounds")
 async def get_rebounds_leaderboard(
     season_id: int = Query(1, description="Season ID"),
-    limit: int = Query(10, ge=1, le=50, description="Number of results")
+    limit: int = Query(10, ge=1, le=50, description="Number of results"),
+    position: Optional[str] = Query(None, min_length=1, max_length=10, description="Only players at this position (G also matches G-F)"),
+    min_games: Optional[int] = Query(None, ge=1, description="Only players with at least this many games")
 ):
     """Get rebounds per game leaderboard"""
     try:
-        leaderboard = db.execute_function("get_top_rebounds", (season_id, limit))
+        leaderboard = await player_leaderboard("rebounds", season_id, limit, position, min_games)
         return {"leaderboard": leaderboard, "count": len(leaderboard)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch leaderboard: {str(e)}")
@@ -346,11 +660,41 @@ async def get_rebounds_leaderboard(
 @app.get("/leaderboard/steals")
 async def get_steals_leaderboard(
     season_id: int = Query(1, description="Season ID"),
-    limit: int = Query(10, ge=1, le=50, description="Number of results")
+    limit: int = Query(10, ge=1, le=50, description="Number of results"),
+    position: Optional[str] = Query(None, min_length=1, max_length=10, description="Only players at this position (G also matches G-F)"),
+    min_games: Optional[int] = Query(None, ge=1, description="Only players with at least this many games")
 ):
     """Get steals per game leaderboard"""
     try:
-        leaderboard = db.execute_function("get_top_steals", (season_id, limit))
+        leaderboard = await player_leaderboard("steals", season_id, limit, position, min_games)
+        return {"leaderboard": leaderboard, "count": len(leaderboard)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch leaderboard: {str(e)}")
+
+@app.get("/leaderboard/blocks")
+async def get_blocks_leaderboard(
+    season_id: int = Query(1, description="Season ID"),
+    limit: int = Query(10, ge=1, le=50, description="Number of results"),
+    position: Optional[str] = Query(None, min_length=1, max_length=10, description="Only players at this position (G also matches G-F)"),
+    min_games: Optional[int] = Query(None, ge=1, description="Only players with at least this many games")
+):
+    """Get blocks per game leaderboard"""
+    try:
+        leaderboard = await player_leaderboard("blocks", season_id, limit, position, min_games)
+        return {"leaderboard": leaderboard, "count": len(leaderboard)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch leaderboard: {str(e)}")
+
+@app.get("/leaderboard/efficiency")
+async def get_efficiency_leaderboard(
+    season_id: int = Query(1, description="Season ID"),
+    limit: int = Query(10, ge=1, le=50, description="Number of results"),
+    position: Optional[str] = Query(None, min_length=1, max_length=10, description="Only players at this position (G also matches G-F)"),
+    min_games: Optional[int] = Query(None, ge=1, description="Only players with at least this many games")
+):
+    """Get efficiency (PTS + REB + AST + STL + BLK - misses - TOV per game) leaderboard"""
+    try:
+        leaderboard = await player_leaderboard("efficiency", season_id, limit, position, min_games)
         return {"leaderboard": leaderboard, "count": len(leaderboard)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch leaderboard: {str(e)}")
@@ -362,7 +706,7 @@ async def get_player_stats(
 ):
     """Get detailed statistics for a player"""
     try:
-        stats = db.execute_function("get_player_stats", (player_id, season_id))
+        stats = await player_season_stats(player_id, season_id)
         if not stats:
             raise HTTPException(status_code=404, detail="Player statistics not found")
         return {"player_id": player_id, "stats": stats[0] if stats else {}}
@@ -371,6 +715,120 @@ async def get_player_stats(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch player stats: {str(e)}")
 
+@app.get("/player/{player_id}/similar")
+async def get_similar_players(
+    player_id: int,
+    season_id: int = Query(1, description="Season of the player to match"),
+    k: int = Query(10, ge=1, le=50, description="Number of comparable players"),
+    min_games: int = Query(10, ge=1, description="Ignore player seasons with fewer games"),
+    same_season: bool = Query(False, description="Only compare against the same season")
+):
+    """
+    The k player seasons most like this player's season: nearest by
+    per-game stats, shooting splits, height and weight, each standardized
+    within its season
+    """
+    if not similarity.enabled:
+        raise HTTPException(status_code=503, detail="Similarity search requires numpy")
+    try:
+        index = await similarity.index()
+        similar = index.nearest(player_id, season_id, k, min_games, same_season)
+        if similar is None:
+            raise HTTPException(status_code=404, detail="Player statistics not found")
+        return {
+            "player": index.describe(player_id, season_id),
+            "similar": similar,
+            "count": len(similar)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to find similar players: {str(e)}")
+
+def check_date_range(start_date: Optional[date], end_date: Optional[date]):
+    """400 for a date range that ends before it starts"""
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+
+@app.get("/player/{player_id}/games")
+async def get_player_games(
+    player_id: int,
+    season_id: Optional[int] = Query(None, description="Only games in this season"),
+    start_date: Optional[date] = Query(None, description="Only games on or after this date"),
+    end_date: Optional[date] = Query(None, description="Only games on or before this date"),
+    limit: int = Query(20, ge=1, le=100, description="Games per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. game_date,points")
+):
+    """The player's game-by-game box scores, most recent first (paginated)"""
+    try:
+        check_date_range(start_date, end_date)
+        selected = select_fields(fields, GAME_LOG_FIELDS)
+        after_date, after_game_id = decode_page_cursor(cursor, date.fromisoformat, str)
+        games = await async_db.execute_function(
+            "get_player_game_log",
+            (player_id, season_id, start_date, end_date, after_date, after_game_id, limit)
+        )
+        return page_response("games", games, limit, selected, "game_date", "game_id")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch player games: {str(e)}")
+
+@app.get("/player/{player_id}/splits")
+async def get_player_splits(
+    player_id: int,
+    season_id: Optional[int] = Query(None, description="Only games in this season"),
+    start_date: Optional[date] = Query(None, description="Only games on or after this date"),
+    end_date: Optional[date] = Query(None, description="Only games on or before this date")
+):
+    """Per-game averages overall, home/away, in wins/losses and by month"""
+    try:
+        check_date_range(start_date, end_date)
+        splits = await async_db.execute_function(
+            "get_player_splits", (player_id, season_id, start_date, end_date)
+        )
+        return {"player_id": player_id, "splits": splits, "count": len(splits)}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch player splits: {str(e)}")
+
+@app.get("/player/{player_id}/percentiles")
+async def get_player_percentiles(
+    player_id: int,
+    season_id: int = Query(1, description="Season ID"),
+    position: Optional[str] = Query(None, min_length=1, max_length=10, description="Rank among this position only (G also matches G-F)")
+):
+    """
+    The player's percentile in every leaderboard stat, among all players
+    or one position, with the group's league average. Each stat is a
+    binary search over its precomputed distribution.
+    """
+    try:
+        season = await distributions.season(season_id)
+        group = (position or ALL_POSITIONS).upper()
+        percentiles = {}
+        for stat in DISTRIBUTION_STATS:
+            league = season.get((ALL_POSITIONS, stat))
+            value = league.by_player.get(player_id) if league else None
+            if value is None:
+                continue
+            distribution = season.get((group, stat))
+            percentiles[stat] = {
+                "value": value,
+                "percentile": distribution.percentile(value) if distribution else None,
+                "league_average": round(distribution.mean, 2) if distribution else None,
+                "sample_size": distribution.sample_size if distribution else 0
+            }
+        if not percentiles:
+            raise HTTPException(status_code=404, detail="Player statistics not found")
+        return {"player_id": player_id, "season_id": season_id, "position": group, "percentiles": percentiles}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch player percentiles: {str(e)}")
+
 @app.get("/compare/players")
 async def compare_players(
     player1_id: int = Query(..., description="First player ID"),
@@ -379,8 +837,11 @@ async def compare_players(
 ):
     """Compare two players' statistics"""
     try:
-        player1_stats = db.execute_function("get_player_stats", (player1_id, season_id))
-        player2_stats = db.execute_function("get_player_stats", (player2_id, season_id))
+        # Both lookups run concurrently on separate pool connections
+        player1_stats, player2_stats = await asyncio.gather(
+            player_season_stats(player1_id, season_id),
+            player_season_stats(player2_id, season_id)
+        )
         
         return {
             "player1": player1_stats[0] if player1_stats else None,
@@ -398,7 +859,7 @@ async def compare_teams(
 ):
     """Compare two teams' statistics"""
     try:
-        comparison = db.execute_function("compare_teams", (team1_id, team2_id, season_id))
+        comparison = await cached_function("compare_teams", (team1_id, team2_id, season_id))
         if not comparison:
             raise HTTPException(status_code=404, detail="Team statistics not found")
         return comparison[0] if comparison else {}
@@ -407,13 +868,42 @@ async def compare_teams(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to compare teams: {str(e)}")
 
+@app.post("/compare/players")
+async def compare_players_batch(request: PlayerComparisonRequest):
+    """
+    Compare any number of players across seasons in one query, with each
+    season's league average and the players' percentiles
+    """
+    try:
+        # Duplicates dropped, request order kept
+        player_ids = tuple(dict.fromkeys(request.player_ids))
+        season_ids = tuple(dict.fromkeys(request.season_ids))
+        players = await cached_function("compare_players_batch", (player_ids, season_ids))
+        return {"players": players, "count": len(players), "season_ids": list(season_ids)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to compare players: {str(e)}")
+
+@app.post("/compare/teams")
+async def compare_teams_batch(request: TeamComparisonRequest):
+    """
+    Compare any number of teams across seasons in one query, with each
+    season's league average and the teams' percentiles
+    """
+    try:
+        team_ids = tuple(dict.fromkeys(request.team_ids))
+        season_ids = tuple(dict.fromkeys(request.season_ids))
+        teams = await cached_function("compare_teams_batch", (team_ids, season_ids))
+        return {"teams": teams, "count": len(teams), "season_ids": list(season_ids)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to compare teams: {str(e)}")
+
 @app.get("/leaderboard/team/wins")
 async def get_team_most_wins(
     limit: int = Query(10, ge=1, le=50, description="Number of results")
 ):
     """Get teams by most wins ever (all-time)"""
     try:
-        leaderboard = db.execute_function("get_team_most_wins", (limit,))
+        leaderboard = await team_leaderboard("get_team_most_wins", limit)
         return {"leaderboard": leaderboard, "count": len(leaderboard)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch leaderboard: {str(e)}")
@@ -424,7 +914,7 @@ async def get_team_avg_wins(
 ):
     """Get teams by average wins per season"""
     try:
-        leaderboard = db.execute_function("get_team_avg_wins_per_season", (limit,))
+        leaderboard = await team_leaderboard("get_team_avg_wins_per_season", limit)
         return {"leaderboard": leaderboard, "count": len(leaderboard)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch leaderboard: {str(e)}")
@@ -435,66 +925,223 @@ async def get_team_points_per_game(
 ):
     """Get teams by points per game"""
     try:
-        leaderboard = db.execute_function("get_team_points_per_game", (limit,))
+        leaderboard = await team_leaderboard("get_team_points_per_game", limit)
         return {"leaderboard": leaderboard, "count": len(leaderboard)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch leaderboard: {str(e)}")
 
+# ==========================================
+# DASHBOARD ENDPOINT
+# ==========================================
+
+@app.get("/dashboard")
+async def get_dashboard(
+    season_id: int = Query(1, description="Season ID for the player leaderboards"),
+    limit: int = Query(10, ge=1, le=50, description="Rows per leaderboard")
+):
+    """
+    Every home page leaderboard in one response (one database round-trip
+    on a cache miss); unchanged dashboards revalidate as 304 via the ETag
+    middleware
+    """
+    try:
+        snapshot = await stats_snapshot()
+        if snapshot is not None:
+            return snapshot.dashboard(season_id, limit)
+        rows = await cached_function("get_dashboard", (season_id, limit))
+        return rows[0]["dashboard"]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch dashboard: {str(e)}")
+
+# ==========================================
+# DISTRIBUTION ENDPOINTS
+# ==========================================
+
+@app.get("/distribution/{stat}")
+async def get_stat_distribution(
+    stat: DistributionStat,
+    season_id: int = Query(1, description="Season ID"),
+    position: Optional[str] = Query(None, min_length=1, max_length=10, description="Only this position (G also matches G-F)"),
+    bins: int = Query(20, ge=1, le=100, description="Histogram buckets"),
+    value: Optional[float] = Query(None, description="Also return the percentile of this value")
+):
+    """
+    A season's distribution of one stat: league average, quantiles and a
+    histogram, from the sorted values refresh_stat_distributions() keeps
+    """
+    try:
+        distribution = await distributions.get(season_id, stat, position)
+        if distribution is None:
+            raise HTTPException(status_code=404, detail="No statistics for this season and position")
+        result = {
+            "stat": stat,
+            "season_id": season_id,
+            "position": (position or ALL_POSITIONS).upper(),
+            **distribution.summary(bins)
+        }
+        if value is not None:
+            result["value"] = value
+            result["percentile"] = distribution.percentile(value)
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch distribution: {str(e)}")
+
 # ==========================================
 # GAME ENDPOINTS
 # ==========================================
 
 @app.get("/games")
-async def get_recent_games(limit: int = Query(20, ge=1, le=100, description="Number of games")):
-    """Get recent games"""
+async def get_recent_games(
+    limit: int = Query(20, ge=1, le=100, description="Games per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return")
+):
+    """Get games, most recent first (paginated)"""
     try:
-        games = db.execute_function("get_recent_games", (limit,))
-        return {"games": games, "count": len(games)}
+        selected = select_fields(fields, GAME_FIELDS)
+        after_date, after_id = decode_page_cursor(cursor, datetime.fromisoformat, int)
+        games = await async_db.execute_function("get_games_page", (limit, after_date, after_id))
+        return page_response("games", games, limit, selected, "game_date_time", "id")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch games: {str(e)}")
 
 @app.get("/games/team/{team_id}")
 async def get_team_games(
     team_id: int,
-    limit: int = Query(20, ge=1, le=100, description="Number of games")
+    limit: int = Query(20, ge=1, le=100, description="Games per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return")
 ):
-    """Get games for a specific team"""
+    """Get games for a specific team, most recent first (paginated)"""
     try:
-        games = db.execute_function("get_games_by_team", (team_id, limit))
-        return {"games": games, "count": len(games)}
+        selected = select_fields(fields, TEAM_GAME_FIELDS)
+        after_date, after_id = decode_page_cursor(cursor, datetime.fromisoformat, int)
+        games = await async_db.execute_function("get_games_by_team", (team_id, limit, after_date, after_id))
+        return page_response("games", games, limit, selected, "game_date_time", "id")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch team games: {str(e)}")
 
+@app.get("/games/h2h")
+async def get_head_to_head(
+    team1: int = Query(..., description="Team whose side the games are reported from"),
+    team2: int = Query(..., description="Opponent team"),
+    limit: int = Query(20, ge=1, le=100, description="Games per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return")
+):
+    """Games between two teams, most recent first (paginated), with team1's all-time record against team2"""
+    if team1 == team2:
+        raise HTTPException(status_code=400, detail="team1 and team2 must be different teams")
+    try:
+        selected = select_fields(fields, HEAD_TO_HEAD_FIELDS)
+        after_date, after_id = decode_page_cursor(cursor, datetime.fromisoformat, int)
+        record, games = await asyncio.gather(
+            cached_function("get_head_to_head_record", (team1, team2)),
+            async_db.execute_function("get_games_head_to_head", (team1, team2, limit, after_date, after_id))
+        )
+        if not record:
+            raise HTTPException(status_code=404, detail="Team not found")
+        return dict(page_response("games", games, limit, selected, "game_date_time", "id"), record=record[0])
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch head-to-head games: {str(e)}")
+
+@app.post("/games/box-scores")
+async def apply_box_scores(game: GameBoxScores):
+    """Add one game's box scores to the season totals and leaderboard ranks (once per game_id)"""
+    try:
+        result = await async_db.execute_function(
+            "apply_game_box_scores",
+            (
+                game.game_id,
+                game.season_id,
+                Jsonb([player.model_dump() for player in game.players]),
+                Jsonb([team.model_dump() for team in game.teams])
+            )
+        )
+        if not result:
+            raise HTTPException(status_code=404, detail="Game not found")
+        if result[0]["already_applied"]:
+            return {"message": "Box scores already applied", **result[0]}
+        apply_change(response_cache, {
+            "table": "player_season_stats", "op": "UPDATE", "season_ids": [game.season_id],
+            "player_ids": sorted({player.player_id for player in game.players})
+        })
+        if game.teams:
+            apply_change(response_cache, {
+                "table": "team_season_stats", "op": "UPDATE", "season_ids": [game.season_id],
+                "team_ids": sorted({team.team_id for team in game.teams})
+            })
+        return {"message": "Box scores applied successfully", **result[0]}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to apply box scores: {str(e)}")
+
 # ==========================================
 # AUDIT LOG ENDPOINTS
 # ==========================================
 
 @app.get("/audit")
 async def get_audit_logs(
-    limit: int = Query(50, ge=1, le=200, description="Number of logs"),
-    table_name: Optional[str] = Query(None, description="Filter by table name")
+    limit: int = Query(50, ge=1, le=200, description="Logs per page"),
+    table_name: Optional[str] = Query(None, description="Filter by table name"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return")
 ):
-    """Get audit logs"""
-    try:
-        query = """
-            SELECT id, table_name, operation, record_id, changed_at,
-                   old_values::text as old_values, new_values::text as new_values
-            FROM audit_log
-        """
-        params = []
-        
-        if table_name:
-            query += " WHERE table_name = %s"
-            params.append(table_name)
-        
-        query += " ORDER BY changed_at DESC LIMIT %s"
-        params.append(limit)
-        
-        logs = db.execute_query(query, tuple(params))
-        return {"logs": logs, "count": len(logs)}
+    """Get audit logs, newest first (paginated)"""
+    try:
+        selected = select_fields(fields, AUDIT_FIELDS)
+        after_changed_at, after_id = decode_page_cursor(cursor, datetime.fromisoformat, int)
+        logs = await async_db.execute_function(
+            "get_audit_log_page", (limit, table_name, after_changed_at, after_id)
+        )
+        return page_response("logs", logs, limit, selected, "changed_at", "id")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch audit logs: {str(e)}")
 
+# ==========================================
+# EXPORT ENDPOINTS
+# ==========================================
+
+@app.get("/export/{dataset}")
+async def export_dataset(
+    dataset: ExportDataset,
+    format: ExportFormat = Query("ndjson", description="ndjson: one JSON object per line; csv: header row first"),
+    gzip: bool = Query(False, description="Compress the stream (the download is a .gz file)"),
+    season_id: Optional[int] = Query(None, description="Only this season (player_season_stats, game)"),
+    table_name: Optional[str] = Query(None, description="Only changes to this table (audit_log)"),
+    since: Optional[datetime] = Query(None, description="Only rows from this time on (game, audit_log)")
+):
+    """
+    Stream a whole table as NDJSON or CSV
+    
+    Rows are read through a server-side cursor and sent as they are
+    encoded, so memory use does not grow with the size of the export.
+    """
+    try:
+        query, params = build_export_query(dataset, season_id=season_id, table_name=table_name, since=since)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    body = encode_rows(async_db.stream_query(query, params, EXPORT_ITERSIZE), format)
+    if gzip:
+        body = gzip_chunks(body)
+    return StreamingResponse(
+        body,
+        media_type="application/gzip" if gzip else EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{export_filename(dataset, format, gzip)}"'}
+    )
+
 # ==========================================
 # MAIN
 # ==========================================
@@ -0,0 +1,76 @@
+"""
+CourtVision Pagination Module
+Opaque keyset cursors and field projection for paged list and search endpoints
+Author: CS3620 Student
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, Iterable, List, Optional
+
+
+def _json_default(value: Any) -> Any:
+    """Timestamps travel as ISO 8601 strings, which PostgreSQL casts back exactly"""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Pack the sort key of the last row on a page into an opaque cursor"""
+    data = json.dumps(values, separators=(',', ':'), default=_json_default).encode('utf-8')
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Unpack a cursor made by encode_cursor()
+
+    Args:
+        cursor: Cursor string from a previous response
+        size: Number of sort key values the endpoint expects
+
+    Raises:
+        ValueError: The cursor is malformed or was made by another endpoint
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(data)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def next_cursor(rows: List[dict], limit: int, *columns: str) -> Optional[str]:
+    """Cursor for the page after rows, or None when rows was the last page"""
+    if len(rows) < limit:
+        return None
+    return encode_cursor([rows[-1][column] for column in columns])
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """
+    Columns requested with ?fields=a,b (None when every column is wanted)
+
+    Raises:
+        ValueError: A requested column is not one the endpoint returns
+    """
+    if fields is None:
+        return None
+    requested = [field.strip() for field in fields.split(',') if field.strip()]
+    unknown = [field for field in requested if field not in allowed]
+    if unknown or not requested:
+        raise ValueError(f"Unknown fields: {', '.join(unknown) or '(none given)'}; "
+                         f"choose from {', '.join(allowed)}")
+    return requested
+
+
+def project(rows: List[dict], fields: Optional[List[str]]) -> List[dict]:
+    """Keep only the requested columns of each row"""
+    if fields is None:
+        return rows
+    return [{field: row[field] for field in fields} for row in rows]
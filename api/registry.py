@@ -0,0 +1,195 @@
+"""
+CourtVision Function Registry Module
+Allowed database functions, their SQL statements and per-function call stats
+Author: CS3620 Student
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Every function the API may call, with its argument types as PostgreSQL
+# reports them (oidvectortypes(pg_proc.proargtypes)). Only these names can
+# reach the database, and callers must pass every argument.
+FUNCTION_SIGNATURES = {
+    # Players
+    'get_player_by_id': ('integer',),
+    'get_players_page': ('integer', 'character varying', 'integer'),
+    'get_players_by_position': ('character varying',),
+    'search_players_ranked': ('character varying', 'character varying', 'integer',
+                              'double precision', 'integer'),
+    'insert_player': ('character varying', 'date', 'integer', 'integer', 'character varying', 'integer'),
+    'update_player': ('integer', 'character varying', 'date', 'integer', 'integer',
+                      'character varying', 'integer'),
+    'delete_player': ('integer',),
+    'get_player_stats': ('integer', 'integer'),
+    'get_player_game_log': ('integer', 'integer', 'date', 'date', 'date', 'character varying', 'integer'),
+    'get_player_splits': ('integer', 'integer', 'date', 'date'),
+    # Teams
+    'get_all_teams': (),
+    'search_teams_ranked': ('character varying', 'character varying', 'integer',
+                            'double precision', 'integer'),
+    'insert_team': ('character varying', 'character varying', 'character varying',
+                    'character varying', 'character varying'),
+    'update_team': ('integer', 'character varying', 'character varying', 'character varying',
+                    'character varying'),
+    'delete_team': ('integer',),
+    # Notes
+    'get_user_notes_page': ('integer', 'integer', 'timestamp without time zone', 'integer'),
+    'insert_user_note': ('integer', 'integer', 'integer', 'character varying', 'text'),
+    'update_user_note': ('integer', 'character varying', 'text'),
+    'delete_user_note': ('integer',),
+    # Leaderboards and comparisons
+    'get_top_scorers': ('integer', 'integer'),
+    'get_top_assists': ('integer', 'integer'),
+    'get_top_rebounds': ('integer', 'integer'),
+    'get_top_steals': ('integer', 'integer'),
+    'get_top_blocks': ('integer', 'integer'),
+    'get_efficiency_leaderboard': ('integer', 'integer'),
+    'get_player_leaderboard': ('character varying', 'integer', 'integer', 'character varying', 'integer'),
+    'get_team_most_wins': ('integer',),
+    'get_team_avg_wins_per_season': ('integer',),
+    'get_team_points_per_game': ('integer',),
+    'get_dashboard': ('integer', 'integer'),
+    'get_stat_distributions': ('integer',),
+    'compare_teams': ('integer', 'integer', 'integer'),
+    'compare_players_batch': ('integer[]', 'integer[]'),
+    'compare_teams_batch': ('integer[]', 'integer[]'),
+    # Games and audit log
+    'get_games_page': ('integer', 'timestamp without time zone', 'integer'),
+    'get_games_by_team': ('integer', 'integer', 'timestamp without time zone', 'integer'),
+    'get_games_head_to_head': ('integer', 'integer', 'integer', 'timestamp without time zone', 'integer'),
+    'get_head_to_head_record': ('integer', 'integer'),
+    'apply_game_box_scores': ('character varying', 'integer', 'jsonb', 'jsonb'),
+    'get_audit_log_page': ('integer', 'character varying', 'timestamp without time zone', 'integer'),
+    # HTTP cache data version
+    'get_data_version': (),
+    'bump_data_version': (),
+}
+
+# Functions that change data: always run on the primary, and pin the reads
+# that follow to it for a moment (see replicas.ReplicaRouter)
+WRITE_FUNCTIONS = frozenset(
+    name for name in FUNCTION_SIGNATURES
+    if name.startswith(('insert_', 'update_', 'delete_', 'apply_', 'bump_'))
+)
+
+# Read-only functions a replica may answer. get_data_version is not one:
+# ETags must carry the primary's version.
+REPLICA_READ_FUNCTIONS = frozenset(
+    name for name in FUNCTION_SIGNATURES
+    if name.startswith(('get_', 'search_', 'compare_')) and name != 'get_data_version'
+)
+
+# Argument types of every registered function that exists in the search path
+VALIDATION_QUERY = """
+    SELECT p.proname, oidvectortypes(p.proargtypes)
+    FROM pg_proc p
+    JOIN pg_namespace n ON n.oid = p.pronamespace
+    WHERE n.nspname = ANY(current_schemas(false)) AND p.proname = ANY(%s)
+"""
+
+
+class _FunctionStats:
+    """Call counters for one function"""
+
+    __slots__ = ('calls', 'errors', 'total', 'max')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+
+class FunctionRegistry:
+    """
+    Builds the SQL for each allowed function once and times every call
+
+    Statements cast each placeholder to the registered argument type, so a
+    statement's text and parameter types never change between calls and
+    psycopg can prepare it once per connection and reuse it.
+    """
+
+    def __init__(self, signatures: Dict[str, Tuple[str, ...]]):
+        self.signatures = dict(signatures)
+        self.unavailable: Dict[str, str] = {}
+        self._statements = {}
+        for name, arg_types in self.signatures.items():
+            arguments = ', '.join(f"%s::{arg_type}" for arg_type in arg_types)
+            self._statements[name, False] = f"SELECT * FROM {name}({arguments})"
+            self._statements[name, True] = f"SELECT {name}({arguments})"
+        self._stats = {name: _FunctionStats() for name in self.signatures}
+
+    def statement(self, function_name: str, params: Optional[tuple], scalar: bool = False) -> str:
+        """
+        SQL calling function_name with params
+
+        Raises:
+            ValueError: The function is not registered or params has the wrong length
+            RuntimeError: The function did not match pg_proc at startup
+        """
+        arg_types = self.signatures.get(function_name)
+        if arg_types is None:
+            raise ValueError(f"Function {function_name!r} is not registered")
+        if function_name in self.unavailable:
+            raise RuntimeError(f"Function {function_name} is unavailable: {self.unavailable[function_name]}")
+        if len(params or ()) != len(arg_types):
+            raise ValueError(f"{function_name} takes {len(arg_types)} arguments, got {len(params or ())}")
+        return self._statements[function_name, scalar]
+
+    @contextmanager
+    def timed(self, function_name: str):
+        """Count one call of function_name and its latency"""
+        stats = self._stats[function_name]
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            stats.errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            stats.calls += 1
+            stats.total += elapsed
+            stats.max = max(stats.max, elapsed)
+
+    def validate(self, rows: Iterable[Tuple[str, str]]) -> List[str]:
+        """
+        Check the registry against VALIDATION_QUERY results
+
+        Functions that are missing or whose argument types differ are marked
+        unavailable, so calling them fails fast instead of in Postgres.
+
+        Returns:
+            One problem description per unavailable function
+        """
+        found = {}
+        for name, arg_types in rows:
+            found.setdefault(name, []).append(tuple(filter(None, (t.strip() for t in arg_types.split(',')))))
+
+        self.unavailable = {}
+        for name, arg_types in self.signatures.items():
+            overloads = found.get(name)
+            if not overloads:
+                self.unavailable[name] = "not found in the database"
+            elif arg_types not in overloads:
+                self.unavailable[name] = (f"expected ({', '.join(arg_types)}), found "
+                                          + "; ".join(f"({', '.join(o)})" for o in overloads))
+        return [f"{name}: {reason}" for name, reason in sorted(self.unavailable.items())]
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Calls, errors and latency (ms) for every function called so far"""
+        return {
+            name: {
+                'calls': stats.calls,
+                'errors': stats.errors,
+                'avg_ms': round(stats.total / stats.calls * 1000, 3),
+                'max_ms': round(stats.max * 1000, 3),
+                'total_ms': round(stats.total * 1000, 3),
+            }
+            for name, stats in sorted(self._stats.items()) if stats.calls
+        }
+
+
+function_registry = FunctionRegistry(FUNCTION_SIGNATURES)
@@ -0,0 +1,215 @@
+"""
+CourtVision Replica Routing Module
+Chooses a read replica (or the primary) for each read-only query
+Author: CS3620 Student
+"""
+
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+STRATEGIES = ('round_robin', 'least_busy')
+
+_primary_reads = contextvars.ContextVar('courtvision_primary_reads', default=False)
+# Address of the client the current request came from (ReplicaClientMiddleware)
+_client = contextvars.ContextVar('courtvision_replica_client', default=None)
+
+# Pinned clients kept before expired pins are swept
+MAX_PINNED_CLIENTS = 10000
+
+
+def get_replica_config() -> Dict[str, Any]:
+    """Read replica DSNs and routing settings from environment variables"""
+    return {
+        # Comma-separated libpq DSNs; keys they leave out come from DB_HOST, DB_USER, ...
+        'dsns': [dsn.strip() for dsn in os.getenv('DB_REPLICA_DSNS', '').split(',') if dsn.strip()],
+        'strategy': os.getenv('DB_REPLICA_STRATEGY', 'round_robin'),
+        # Seconds a read waits for a replica connection before falling back to the primary
+        'timeout': float(os.getenv('DB_REPLICA_TIMEOUT', '2')),
+        # Seconds a failed replica is skipped before it is tried again
+        'retry_after': float(os.getenv('DB_REPLICA_RETRY_AFTER', '30')),
+        # Seconds after a write during which the writing client reads from the primary
+        'sticky_seconds': float(os.getenv('DB_REPLICA_STICKY_SECONDS', '5')),
+    }
+
+
+@contextmanager
+def primary_reads():
+    """Send every read made inside this block (and its tasks) to the primary"""
+    token = _primary_reads.set(True)
+    try:
+        yield
+    finally:
+        _primary_reads.reset(token)
+
+
+class ReplicaClientMiddleware:
+    """Tag each request with its client address, so writes pin only that client's reads"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        client = scope.get('client')
+        token = _client.set(client[0] if client else None)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _client.reset(token)
+
+
+class Replica:
+    """One replica's pool and counters"""
+
+    __slots__ = ('name', 'pool', 'in_flight', 'reads', 'failures', 'down_until', 'last_error')
+
+    def __init__(self, name: str, pool):
+        self.name = name
+        self.pool = pool
+        self.in_flight = 0
+        self.reads = 0
+        self.failures = 0
+        self.down_until = 0.0
+        self.last_error = None
+
+
+class ReplicaRouter:
+    """
+    Picks the replicas a read may use, in the order to try them
+
+    An empty list means "read from the primary": there are no replicas,
+    every replica has failed recently, the caller is inside primary_reads(),
+    or the client making the request wrote less than sticky_seconds ago.
+    Replicas may lag the primary by a moment, so a write pins the rest of
+    its request, and that client's requests for sticky_seconds, to the
+    primary; other clients keep reading from the replicas. Cache entries
+    a change evicts are reloaded from the primary (see cache.ResponseCache),
+    so a lagging replica cannot be cached in their place.
+    """
+
+    def __init__(self, strategy: str = 'round_robin', retry_after: float = 30.0,
+                 sticky_seconds: float = 5.0):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"DB_REPLICA_STRATEGY must be one of {', '.join(STRATEGIES)}, got {strategy!r}")
+        self.strategy = strategy
+        self.retry_after = retry_after
+        self.sticky_seconds = sticky_seconds
+        self.replicas: List[Replica] = []
+        self._next = 0
+        # Until when everything reads from the primary (after reset())
+        self._sticky_until = 0.0
+        # Client address -> until when that client reads from the primary
+        self._pinned_clients: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            'primary_reads': 0,
+            'primary_pinned': 0,
+            'clients_pinned': 0,
+            'primary_fallbacks': 0,
+        }
+
+    def add(self, name: str, pool):
+        """Route reads to another replica pool"""
+        self.replicas.append(Replica(name, pool))
+
+    def candidates(self) -> List[Replica]:
+        """Replicas to try for one read, best first; empty means use the primary"""
+        if not self.replicas:
+            return []
+        now = time.monotonic()
+        with self._lock:
+            if _primary_reads.get() or now < self._sticky_until or now < self._client_pin(_client.get()):
+                self._stats['primary_pinned'] += 1
+                return []
+            healthy = [replica for replica in self.replicas if replica.down_until <= now]
+            if self.strategy == 'least_busy':
+                # Fewest reads in flight; total reads breaks ties so idle replicas share the load
+                healthy.sort(key=lambda replica: (replica.in_flight, replica.reads))
+            elif healthy:
+                start = self._next % len(healthy)
+                healthy = healthy[start:] + healthy[:start]
+                self._next += 1
+        return healthy
+
+    @contextmanager
+    def reading(self, replica: Replica):
+        """Count one read in flight on replica"""
+        with self._lock:
+            replica.in_flight += 1
+            replica.reads += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                replica.in_flight -= 1
+
+    def mark_failed(self, replica: Replica, error: Exception):
+        """Skip replica for retry_after seconds after a connection or recovery error"""
+        with self._lock:
+            replica.failures += 1
+            replica.down_until = time.monotonic() + self.retry_after
+            replica.last_error = str(error).strip()
+        print(f"✗ Replica {replica.name} failed, reading from another server: {replica.last_error}")
+
+    def used_primary(self, fallback: bool = False):
+        """Count a read served by the primary"""
+        with self._lock:
+            self._stats['primary_reads'] += 1
+            if fallback:
+                self._stats['primary_fallbacks'] += 1
+
+    def _client_pin(self, client: Optional[str]) -> float:
+        """Until when client reads from the primary (0 if it is not pinned)"""
+        return self._pinned_clients.get(client, 0.0) if client is not None else 0.0
+
+    def note_write(self):
+        """Pin the rest of this request, and its client for sticky_seconds, to the primary"""
+        if not self.replicas:
+            return
+        _primary_reads.set(True)
+        client = _client.get()
+        if client is None or not self.sticky_seconds:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._pinned_clients) >= MAX_PINNED_CLIENTS:
+                self._pinned_clients = {name: until for name, until in self._pinned_clients.items() if until > now}
+            self._pinned_clients[client] = now + self.sticky_seconds
+            self._stats['clients_pinned'] += 1
+
+    def handle_event(self, event: Dict[str, Any]):
+        """
+        Change events need nothing here (see CacheInvalidationListener):
+        the entries they evict are reloaded from the primary
+        """
+
+    def reset(self):
+        """Change events may have been missed; read from the primary for a while"""
+        if self.replicas and self.sticky_seconds:
+            with self._lock:
+                self._sticky_until = time.monotonic() + self.sticky_seconds
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Routing counters and per-replica state"""
+        now = time.monotonic()
+        with self._lock:
+            return dict(
+                self._stats,
+                strategy=self.strategy,
+                pinned_to_primary=now < self._sticky_until,
+                clients_pinned_now=sum(1 for until in self._pinned_clients.values() if until > now),
+                replicas=[{
+                    'name': replica.name,
+                    'reads': replica.reads,
+                    'in_flight': replica.in_flight,
+                    'failures': replica.failures,
+                    'available': replica.down_until <= now,
+                    'last_error': replica.last_error,
+                } for replica in self.replicas],
+            )
@@ -0,0 +1,305 @@
+"""
+CourtVision Similarity Module
+Nearest-neighbour search over standardized player-season stat vectors
+Author: CS3620 Student
+"""
+
+import asyncio
+import time
+import warnings
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from replicas import primary_reads
+
+try:
+    import numpy as np
+except ImportError:  # optional: /player/{id}/similar answers 503 without it
+    np = None
+
+# Vector components, in order. Each is standardized within its season, so a
+# player is compared with comparables relative to the league of their era.
+FEATURES = (
+    'points', 'rebounds', 'assists', 'steals', 'blocks',
+    'field_goal_percentage', 'three_point_percentage', 'free_throw_percentage',
+    'height_inches', 'weight_lbs',
+)
+
+# Shooting splits: feature -> (made column, attempted column)
+SPLITS = {
+    'field_goal_percentage': ('field_goals_made', 'field_goals_attempted'),
+    'three_point_percentage': ('three_pointers_made', 'three_pointers_attempted'),
+    'free_throw_percentage': ('free_throws_made', 'free_throws_attempted'),
+}
+
+# Every player season with a game, or only those in the given seasons
+VECTOR_QUERY = """
+    SELECT pss.player_id, pss.season_id, pss.games_played,
+           pss.points, pss.rebounds, pss.assists, pss.steals, pss.blocks,
+           pss.field_goals_made, pss.field_goals_attempted,
+           pss.three_pointers_made, pss.three_pointers_attempted,
+           pss.free_throws_made, pss.free_throws_attempted,
+           p.player_name, p.position, p.height_inches, p.weight_lbs
+    FROM player_season_stats pss
+    JOIN player p ON p.id = pss.player_id
+    WHERE pss.games_played > 0
+      AND (%s::integer[] IS NULL OR pss.season_id = ANY(%s::integer[]))
+"""
+
+
+class SeasonBlock:
+    """One season's player vectors, standardized against that season only"""
+
+    def __init__(self, season_id: int, rows: List[dict]):
+        self.season_id = season_id
+        self.player_ids = np.array([row['player_id'] for row in rows], dtype=np.int64)
+        self.games_played = np.array([row['games_played'] for row in rows], dtype=np.int64)
+        self.player_names = [row['player_name'] for row in rows]
+        self.positions = [row['position'] for row in rows]
+        self.rows_by_player = {player_id: i for i, player_id in enumerate(self.player_ids.tolist())}
+
+        raw = np.empty((len(rows), len(FEATURES)), dtype=np.float64)
+        for j, feature in enumerate(FEATURES):
+            if feature in SPLITS:
+                made, attempted = SPLITS[feature]
+                made = np.array([row[made] or 0 for row in rows], dtype=np.float64)
+                attempted = np.array([row[attempted] or 0 for row in rows], dtype=np.float64)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    raw[:, j] = np.where(attempted > 0, made / attempted, np.nan)
+            else:
+                raw[:, j] = [np.nan if row[feature] is None else float(row[feature]) for row in rows]
+        self.raw = raw
+
+        # z-scores; a missing value (no attempts, unknown height) sits at the
+        # season mean so it neither attracts nor repels
+        with warnings.catch_warnings():
+            # A feature nobody has (no three-point attempts) is all NaN
+            warnings.simplefilter('ignore', RuntimeWarning)
+            mean = np.nanmean(raw, axis=0)
+            std = np.nanstd(raw, axis=0)
+        mean = np.nan_to_num(mean)
+        std = np.where(np.nan_to_num(std) > 0, np.nan_to_num(std), 1.0)
+        self.vectors = np.nan_to_num((raw - mean) / std).astype(np.float32)
+
+    def __len__(self):
+        return len(self.player_ids)
+
+
+def build_blocks(rows: Iterable[dict]) -> Dict[int, SeasonBlock]:
+    """Group VECTOR_QUERY rows into one SeasonBlock per season"""
+    seasons: Dict[int, List[dict]] = {}
+    for row in rows:
+        seasons.setdefault(row['season_id'], []).append(row)
+    return {season_id: SeasonBlock(season_id, season_rows) for season_id, season_rows in seasons.items()}
+
+
+class SimilarityIndex:
+    """
+    Immutable index over every player season
+
+    The season blocks are concatenated into one float32 matrix with its
+    row norms precomputed, so a query is one matrix-vector product for the
+    squared distances plus an argpartition for the k smallest.
+    """
+
+    def __init__(self, blocks: Dict[int, SeasonBlock]):
+        self.blocks = blocks
+        ordered = [blocks[season_id] for season_id in sorted(blocks)]
+        self.seasons = {}
+        offset = 0
+        for block in ordered:
+            self.seasons[block.season_id] = (offset, offset + len(block))
+            offset += len(block)
+        self.rows = offset
+
+        if ordered:
+            self.vectors = np.concatenate([block.vectors for block in ordered])
+            self.player_ids = np.concatenate([block.player_ids for block in ordered])
+            self.games_played = np.concatenate([block.games_played for block in ordered])
+        else:
+            self.vectors = np.zeros((0, len(FEATURES)), dtype=np.float32)
+            self.player_ids = np.zeros(0, dtype=np.int64)
+            self.games_played = np.zeros(0, dtype=np.int64)
+        self.norms = np.einsum('ij,ij->i', self.vectors, self.vectors)
+        self.season_ids = np.repeat([block.season_id for block in ordered],
+                                    [len(block) for block in ordered]).astype(np.int64)
+
+    def replace_seasons(self, blocks: Dict[int, SeasonBlock], season_ids: Iterable[int]) -> 'SimilarityIndex':
+        """
+        A new index with season_ids rebuilt from blocks; seasons in
+        season_ids without a block (no rows any more) are dropped. Other
+        seasons' blocks are reused as they are.
+        """
+        merged = {season_id: block for season_id, block in self.blocks.items() if season_id not in season_ids}
+        merged.update(blocks)
+        return SimilarityIndex(merged)
+
+    def seasons_of(self, player_id: int) -> List[int]:
+        """Seasons in which player_id has a vector"""
+        return [season_id for season_id, block in self.blocks.items() if player_id in block.rows_by_player]
+
+    def _row(self, player_id: int, season_id: int) -> Optional[int]:
+        """Index row of player_id's season_id vector, if it has one"""
+        block = self.blocks.get(season_id)
+        i = None if block is None else block.rows_by_player.get(player_id)
+        return None if i is None else self.seasons[season_id][0] + i
+
+    def _describe(self, row: int) -> Dict[str, Any]:
+        """Identity and headline stats of one indexed player season"""
+        season_id = int(self.season_ids[row])
+        block = self.blocks[season_id]
+        i = row - self.seasons[season_id][0]
+        raw = block.raw[i]
+        return {
+            'player_id': int(self.player_ids[row]),
+            'player_name': block.player_names[i],
+            'position': block.positions[i],
+            'season_id': season_id,
+            'games_played': int(self.games_played[row]),
+            'points_per_game': float(raw[0]),
+            'rebounds_per_game': float(raw[1]),
+            'assists_per_game': float(raw[2]),
+        }
+
+    def nearest(self, player_id: int, season_id: int, k: int, min_games: int = 1,
+                same_season: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """
+        The k player seasons closest to player_id's season_id vector, nearest
+        first, excluding the player's own seasons and seasons with fewer than
+        min_games games. None if the player has no stats that season.
+        """
+        row = self._row(player_id, season_id)
+        if row is None:
+            return None
+        start, end = self.seasons[season_id] if same_season else (0, self.rows)
+
+        query = self.vectors[row]
+        distances = self.norms[start:end] + self.norms[row] - 2 * (self.vectors[start:end] @ query)
+        eligible = (self.player_ids[start:end] != player_id) & (self.games_played[start:end] >= min_games)
+        distances = np.where(eligible, distances, np.inf)
+
+        k = min(k, int(np.count_nonzero(eligible)))
+        if k == 0:
+            return []
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.argsort(distances[nearest], kind='stable')]
+
+        similar = []
+        for candidate in nearest.tolist():
+            entry = self._describe(start + candidate)
+            # Rounding can leave a tiny negative squared distance
+            entry['distance'] = round(float(np.sqrt(max(distances[candidate], 0.0))), 4)
+            similar.append(entry)
+        return similar
+
+    def describe(self, player_id: int, season_id: int) -> Optional[Dict[str, Any]]:
+        """The query player's own season, as nearest() describes results"""
+        row = self._row(player_id, season_id)
+        return None if row is None else self._describe(row)
+
+
+class SimilaritySearch:
+    """
+    Owns the SimilarityIndex and keeps it current
+
+    The index is built on first use. After that, change events mark the
+    seasons they touch, and the next query (or the 'data_version' event
+    that ends a load or write) rebuilds only those seasons and swaps the
+    new index in. Queries wait for a pending rebuild, so they never answer
+    from vectors older than the last change the listener has seen.
+    """
+
+    def __init__(self, load_rows: Callable[[str, tuple], Awaitable[List[dict]]]):
+        self._load_rows = load_rows
+        self.enabled = np is not None
+        self._index: Optional[SimilarityIndex] = None
+        self._dirty_seasons = set()
+        self._rebuild_all = False
+        self._task = None
+        self._stats = {
+            'builds': 0,
+            'incremental_updates': 0,
+            'seasons_rebuilt': 0,
+            'last_build_ms': 0.0,
+        }
+
+    async def index(self) -> SimilarityIndex:
+        """The current index, building or updating it first if needed"""
+        while self._index is None or self._dirty_seasons or self._rebuild_all:
+            await self._update()
+        return self._index
+
+    async def _update(self):
+        """Run (or join) the one rebuild in flight"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._rebuild())
+        # shield: a cancelled request must not cancel the rebuild others wait on
+        await asyncio.shield(self._task)
+
+    async def _rebuild(self):
+        """Rebuild the whole index, or just the seasons marked dirty"""
+        started = time.perf_counter()
+        full = self._index is None or self._rebuild_all
+        season_ids = None if full else sorted(self._dirty_seasons)
+        self._rebuild_all = False
+        self._dirty_seasons = set()
+        try:
+            with primary_reads():
+                rows = await self._load_rows(VECTOR_QUERY, (season_ids, season_ids))
+            loop = asyncio.get_running_loop()
+            if full:
+                self._index = await loop.run_in_executor(None, lambda: SimilarityIndex(build_blocks(rows)))
+                self._stats['builds'] += 1
+            else:
+                current = self._index
+                self._index = await loop.run_in_executor(
+                    None, lambda: current.replace_seasons(build_blocks(rows), season_ids))
+                self._stats['incremental_updates'] += 1
+                self._stats['seasons_rebuilt'] += len(season_ids)
+        except BaseException:
+            # Try again on the next query
+            if full:
+                self._rebuild_all = True
+            else:
+                self._dirty_seasons.update(season_ids)
+            raise
+        self._stats['last_build_ms'] = round((time.perf_counter() - started) * 1000, 3)
+
+    def handle_event(self, event: Dict[str, Any]):
+        """Mark the seasons a change event touches (see CacheInvalidationListener)"""
+        if self._index is None:
+            return
+        table = event.get('table')
+        if table == 'player_season_stats':
+            season_ids = event.get('season_ids')
+            if season_ids:
+                self._dirty_seasons.update(season_ids)
+            else:
+                self._rebuild_all = True
+        elif table == 'player' and event.get('op') != 'INSERT':
+            # Names, positions, height and weight live in the vectors too
+            player_id = event.get('id')
+            if player_id is None:
+                self._rebuild_all = True
+            else:
+                self._dirty_seasons.update(self._index.seasons_of(player_id))
+        elif table == 'data_version' and (self._dirty_seasons or self._rebuild_all):
+            # A load or write finished: rebuild now rather than on the next query
+            if self._task is None or self._task.done():
+                self._task = asyncio.get_running_loop().create_task(self._rebuild())
+                self._task.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    def reset(self):
+        """Change events may have been missed; rebuild everything"""
+        if self._index is not None:
+            self._rebuild_all = True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Index size and rebuild counters"""
+        index = self._index
+        return dict(
+            self._stats,
+            enabled=self.enabled,
+            player_seasons=index.rows if index else 0,
+            seasons=len(index.seasons) if index else 0,
+            dirty_seasons=len(self._dirty_seasons),
+        )
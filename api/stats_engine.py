@@ -0,0 +1,379 @@
+"""
+CourtVision Stats Engine Module
+In-memory columnar copy of the season stats tables, serving leaderboards and player lookups
+Author: CS3620 Student
+"""
+
+import asyncio
+import os
+import time
+from decimal import ROUND_HALF_UP, Decimal
+from fractions import Fraction
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from replicas import primary_reads
+
+try:
+    import numpy as np
+except ImportError:  # optional: without it every read goes to Postgres
+    np = None
+
+# Off unless STATS_ENGINE=1; needs numpy
+STATS_ENGINE_ENABLED = os.getenv('STATS_ENGINE', '0') == '1'
+
+# Seconds to wait before retrying a failed load
+RELOAD_RETRY_DELAY = 5.0
+
+# Stat category -> (SQL function it replaces, value column, output columns).
+# Rows come out exactly as that function returns them.
+PLAYER_LEADERBOARDS = {
+    'points': ('get_top_scorers', 'points_per_game',
+               ('rank', 'player_id', 'player_name', 'points_per_game', 'games_played')),
+    'assists': ('get_top_assists', 'assists_per_game',
+                ('rank', 'player_id', 'player_name', 'assists_per_game', 'games_played')),
+    'rebounds': ('get_top_rebounds', 'rebounds_per_game',
+                 ('rank', 'player_id', 'player_name', 'rebounds_per_game', 'games_played')),
+    'steals': ('get_top_steals', 'steals_per_game',
+               ('rank', 'player_id', 'player_name', 'steals_per_game', 'games_played')),
+    'blocks': ('get_top_blocks', 'blocks_per_game',
+               ('rank', 'player_id', 'player_name', 'blocks_per_game', 'games_played')),
+    'efficiency': ('get_efficiency_leaderboard', 'efficiency_rating',
+                   ('rank', 'player_name', 'efficiency_rating', 'games_played', 'minutes_played')),
+}
+
+PLAYER_QUERY = "SELECT id, player_name, position, height_inches, weight_lbs FROM player"
+
+PLAYER_STATS_QUERY = """
+    SELECT player_id, season_id, games_played, minutes_played,
+           points, rebounds, assists, steals, blocks,
+           field_goals_made, field_goals_attempted, three_pointers_made, three_pointers_attempted,
+           free_throws_made, free_throws_attempted,
+           total_points, total_rebounds, total_assists, total_steals, total_blocks, total_turnovers
+    FROM player_season_stats
+"""
+
+TEAM_STATS_QUERY = """
+    SELECT tss.team_id, t.team_name, tss.wins, tss.losses, tss.games_played, tss.total_points
+    FROM team_season_stats tss
+    JOIN team t ON t.id = tss.team_id
+"""
+
+FLOAT_COLUMNS = ('minutes_played', 'points', 'rebounds', 'assists', 'steals', 'blocks')
+INT_COLUMNS = (
+    'player_id', 'season_id', 'games_played',
+    'field_goals_made', 'field_goals_attempted', 'three_pointers_made', 'three_pointers_attempted',
+    'free_throws_made', 'free_throws_attempted',
+    'total_points', 'total_rebounds', 'total_assists', 'total_steals', 'total_blocks', 'total_turnovers'
+)
+
+
+def round_half_up(value: Fraction, places: int) -> float:
+    """ROUND(value, places) as Postgres rounds NUMERIC (halves away from zero)"""
+    return float((Decimal(value.numerator) / Decimal(value.denominator)).quantize(
+        Decimal(1).scaleb(-places), rounding=ROUND_HALF_UP))
+
+
+class StatsSnapshot:
+    """
+    One immutable, fully built copy of player_season_stats and
+    team_season_stats, as of one data version
+
+    Player rows are stored as typed column arrays sorted by (season_id,
+    player_id), so a season is a contiguous slice and a leaderboard is a
+    mask, a partition and a small sort over that slice.
+    """
+
+    def __init__(self, version: Optional[int], players: List[dict], player_stats: List[dict],
+                 team_stats: List[dict]):
+        self.version = version
+        self.players = {row['id']: row for row in players}
+
+        player_stats = sorted(player_stats, key=lambda row: (row['season_id'], row['player_id']))
+        self.columns = {}
+        for column in FLOAT_COLUMNS:
+            self.columns[column] = np.array([row[column] or 0 for row in player_stats], dtype=np.float64)
+        for column in INT_COLUMNS:
+            self.columns[column] = np.array([row[column] or 0 for row in player_stats], dtype=np.int64)
+        self.columns['efficiency'] = self._efficiency(self.columns)
+        for stat in ('points', 'assists', 'rebounds', 'steals', 'blocks'):
+            self.columns[stat + '_per_game'] = self.columns[stat]
+        self.columns['efficiency_rating'] = self.columns['efficiency']
+        self.rows = len(player_stats)
+
+        # Names and positions are looked up once per row here, not per request
+        names = [self.players.get(row['player_id'], {}).get('player_name') for row in player_stats]
+        self.player_names = np.array(names, dtype=object)
+        positions = [self.players.get(row['player_id'], {}).get('position') or '' for row in player_stats]
+        self.position_names, codes = np.unique(np.array(positions, dtype=object).astype(str),
+                                               return_inverse=True)
+        self.position_codes = codes.astype(np.int32)
+
+        seasons, starts, counts = np.unique(self.columns['season_id'], return_index=True, return_counts=True)
+        self.seasons = {int(season): (int(start), int(start + count))
+                        for season, start, count in zip(seasons, starts, counts)}
+        self.player_seasons = {(row['player_id'], row['season_id']): i for i, row in enumerate(player_stats)}
+
+        self.team_leaderboards = self._team_leaderboards(team_stats)
+
+    @staticmethod
+    def _efficiency(columns: Dict[str, Any]) -> Any:
+        """
+        Per-game NBA efficiency rounded to 2 places, computed in integers so
+        it matches refresh_leaderboard's NUMERIC result exactly
+        """
+        games = columns['games_played']
+        total = (columns['total_points'] + columns['total_rebounds'] + columns['total_assists']
+                 + columns['total_steals'] + columns['total_blocks']
+                 - (columns['field_goals_attempted'] - columns['field_goals_made'])
+                 - (columns['free_throws_attempted'] - columns['free_throws_made'])
+                 - columns['total_turnovers'])
+        divisor = np.maximum(games, 1)
+        hundredths = (200 * np.abs(total) + divisor) // (2 * divisor)
+        return np.where(games > 0, np.sign(total) * hundredths / 100.0, 0.0)
+
+    @staticmethod
+    def _team_leaderboards(team_stats: List[dict]) -> Dict[str, List[dict]]:
+        """The three all-time team leaderboards, fully ranked (there are only ~30 teams)"""
+        teams = {}
+        for row in team_stats:
+            team = teams.setdefault(row['team_id'], {
+                'team_name': row['team_name'], 'wins': 0, 'losses': 0,
+                'played_wins': 0, 'seasons_played': 0, 'games_played': 0, 'total_points': 0,
+            })
+            team['wins'] += row['wins'] or 0
+            team['losses'] += row['losses'] or 0
+            if (row['games_played'] or 0) > 0:
+                team['played_wins'] += row['wins'] or 0
+                team['seasons_played'] += 1
+                team['games_played'] += row['games_played']
+                team['total_points'] += row['total_points'] or 0
+
+        most_wins = sorted(teams, key=lambda team_id: (-teams[team_id]['wins'], team_id))
+        played = [team_id for team_id in teams if teams[team_id]['seasons_played']]
+        avg_wins = {team_id: Fraction(teams[team_id]['played_wins'], teams[team_id]['seasons_played'])
+                    for team_id in played}
+        ppg = {team_id: Fraction(teams[team_id]['total_points'], teams[team_id]['games_played'])
+               for team_id in played}
+
+        return {
+            'get_team_most_wins': [{
+                'rank': rank, 'team_id': team_id, 'team_name': teams[team_id]['team_name'],
+                'total_wins': teams[team_id]['wins'], 'total_losses': teams[team_id]['losses'],
+            } for rank, team_id in enumerate(most_wins, 1)],
+            'get_team_avg_wins_per_season': [{
+                'rank': rank, 'team_id': team_id, 'team_name': teams[team_id]['team_name'],
+                'avg_wins': round_half_up(avg_wins[team_id], 2),
+                'seasons_played': teams[team_id]['seasons_played'],
+            } for rank, team_id in enumerate(sorted(played, key=lambda t: (-avg_wins[t], t)), 1)],
+            'get_team_points_per_game': [{
+                'rank': rank, 'team_id': team_id, 'team_name': teams[team_id]['team_name'],
+                'avg_ppg': round_half_up(ppg[team_id], 2),
+                'games_played': teams[team_id]['games_played'],
+            } for rank, team_id in enumerate(sorted(played, key=lambda t: (-ppg[t], t)), 1)],
+        }
+
+    def _position_mask(self, position: str, rows: slice) -> Any:
+        """Rows whose position includes position ('G' matches 'G' and 'G-F')"""
+        wanted = position.upper()
+        codes = [code for code, name in enumerate(self.position_names)
+                 if wanted in name.upper().split('-')]
+        return np.isin(self.position_codes[rows], codes)
+
+    def player_leaderboard(self, stat: str, season_id: int, limit: int,
+                           position: Optional[str] = None, min_games: Optional[int] = None) -> List[dict]:
+        """
+        Top limit players in one stat for one season, ranked like
+        refresh_leaderboard (value descending, then player id); with filters,
+        ranks count only the players that pass them
+        """
+        _, value_column, columns = PLAYER_LEADERBOARDS[stat]
+        bounds = self.seasons.get(season_id)
+        if bounds is None:
+            return []
+        rows = slice(*bounds)
+        values = self.columns[value_column][rows]
+        games = self.columns['games_played'][rows]
+
+        mask = games > 0
+        if min_games:
+            mask &= games >= min_games
+        if position:
+            mask &= self._position_mask(position, rows)
+        candidates = np.flatnonzero(mask)
+
+        if len(candidates) > limit:
+            # Keep everything tied with the limit-th best value, so the
+            # player id tiebreak below sees all of them
+            cutoff = -np.partition(-values[candidates], limit - 1)[limit - 1]
+            candidates = candidates[values[candidates] >= cutoff]
+        player_ids = self.columns['player_id'][rows][candidates]
+        top = candidates[np.lexsort((player_ids, -values[candidates]))[:limit]] + bounds[0]
+
+        leaderboard = []
+        for rank, row in enumerate(top.tolist(), 1):
+            entry = {
+                'rank': rank,
+                'player_id': int(self.columns['player_id'][row]),
+                'player_name': self.player_names[row],
+                value_column: float(self.columns[value_column][row]),
+                'games_played': int(self.columns['games_played'][row]),
+                'minutes_played': float(self.columns['minutes_played'][row]),
+            }
+            leaderboard.append({column: entry[column] for column in columns})
+        return leaderboard
+
+    def team_leaderboard(self, function_name: str, limit: int) -> List[dict]:
+        """First limit rows of an all-time team leaderboard"""
+        return [dict(row) for row in self.team_leaderboards[function_name][:limit]]
+
+    def player_stats(self, player_id: int, season_id: int) -> List[dict]:
+        """get_player_stats(): the player and their season averages (None when they did not play)"""
+        player = self.players.get(player_id)
+        if player is None:
+            return []
+        row = self.player_seasons.get((player_id, season_id))
+
+        def value(column, kind=float):
+            return None if row is None else kind(self.columns[column][row])
+
+        def percentage(made, attempted):
+            if row is None or not self.columns[attempted][row]:
+                return None
+            return round_half_up(Fraction(int(self.columns[made][row]), int(self.columns[attempted][row])), 4)
+
+        return [{
+            'player_id': player_id,
+            'player_name': player['player_name'],
+            'position': player['position'],
+            'height_inches': player['height_inches'],
+            'weight_lbs': player['weight_lbs'],
+            'games_played': value('games_played', int),
+            'points_per_game': value('points'),
+            'assists_per_game': value('assists'),
+            'rebounds_per_game': value('rebounds'),
+            'steals_per_game': value('steals'),
+            'blocks_per_game': value('blocks'),
+            'field_goal_percentage': percentage('field_goals_made', 'field_goals_attempted'),
+            'three_point_percentage': percentage('three_pointers_made', 'three_pointers_attempted'),
+            'free_throw_percentage': percentage('free_throws_made', 'free_throws_attempted'),
+        }]
+
+    def dashboard(self, season_id: int, limit: int) -> Dict[str, Any]:
+        """get_dashboard()'s document"""
+        return {
+            'season_id': season_id,
+            'points': self.player_leaderboard('points', season_id, limit),
+            'assists': self.player_leaderboard('assists', season_id, limit),
+            'rebounds': self.player_leaderboard('rebounds', season_id, limit),
+            'steals': self.player_leaderboard('steals', season_id, limit),
+            'team_wins': self.team_leaderboard('get_team_most_wins', limit),
+            'team_avg_wins': self.team_leaderboard('get_team_avg_wins_per_season', limit),
+            'team_points': self.team_leaderboard('get_team_points_per_game', limit),
+        }
+
+
+class StatsEngine:
+    """
+    Keeps a StatsSnapshot of the current data version
+
+    A snapshot is only used while its version is the data version the
+    request sees, so answers never lag the database: after a load or write
+    the engine misses (and callers read Postgres) until the replacement
+    snapshot, built off the event loop, is swapped in with one assignment.
+    Reloads start on 'data_version' change events (this is a
+    CacheInvalidationListener subscriber) or on the first miss.
+    """
+
+    def __init__(self, load_rows: Callable[[str], Awaitable[List[dict]]],
+                 load_version: Callable[[], Awaitable[int]], enabled: bool = STATS_ENGINE_ENABLED):
+        self._load_rows = load_rows
+        self._load_version = load_version
+        self.enabled = enabled and np is not None
+        if enabled and np is None:
+            print("✗ STATS_ENGINE=1 but numpy is not installed; serving stats from Postgres")
+        self._snapshot: Optional[StatsSnapshot] = None
+        self._reload_task = None
+        self._reload_pending = False
+        self._retry_at = 0.0
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'loads': 0,
+            'load_errors': 0,
+            'last_load_ms': 0.0,
+        }
+
+    def snapshot(self, version: Optional[int]) -> Optional[StatsSnapshot]:
+        """The snapshot for version, or None (read Postgres) if it is not loaded yet"""
+        if not self.enabled:
+            return None
+        snapshot = self._snapshot
+        if snapshot is not None and version is not None and snapshot.version == version:
+            self._stats['hits'] += 1
+            return snapshot
+        self._stats['misses'] += 1
+        if snapshot is None or version is None or snapshot.version is None or snapshot.version < version:
+            if time.monotonic() >= self._retry_at:
+                self.schedule_reload()
+        return None
+
+    async def reload(self):
+        """Build a snapshot of the current data and swap it in"""
+        started = time.perf_counter()
+        # Replicas may lag the version read from the primary
+        with primary_reads():
+            # Read before the tables: data newer than the version only
+            # causes one more reload when its change event arrives
+            version = await self._load_version()
+            players = await self._load_rows(PLAYER_QUERY)
+            player_stats = await self._load_rows(PLAYER_STATS_QUERY)
+            team_stats = await self._load_rows(TEAM_STATS_QUERY)
+        snapshot = await asyncio.get_running_loop().run_in_executor(
+            None, StatsSnapshot, version, players, player_stats, team_stats)
+        self._snapshot = snapshot
+        self._stats['loads'] += 1
+        self._stats['last_load_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        print(f"✓ Stats engine loaded {snapshot.rows:,} player seasons at data version {version} "
+              f"in {self._stats['last_load_ms']:.0f} ms")
+
+    def schedule_reload(self):
+        """Reload in the background, once more after the current reload if one is running"""
+        if not self.enabled:
+            return
+        if self._reload_task is not None and not self._reload_task.done():
+            self._reload_pending = True
+            return
+        self._reload_task = asyncio.get_running_loop().create_task(self._reload_until_current())
+
+    async def _reload_until_current(self):
+        """Reload, repeating while change events arrived during the previous reload"""
+        while True:
+            self._reload_pending = False
+            try:
+                await self.reload()
+            except Exception as error:
+                self._stats['load_errors'] += 1
+                self._retry_at = time.monotonic() + RELOAD_RETRY_DELAY
+                print(f"✗ Stats engine reload failed: {error}")
+                return
+            if not self._reload_pending:
+                return
+
+    def handle_event(self, event: Dict[str, Any]):
+        """A finished load or API write (see CacheInvalidationListener)"""
+        if event.get('table') == 'data_version':
+            self.schedule_reload()
+
+    def reset(self):
+        """Change events may have been missed; rebuild the snapshot"""
+        self.schedule_reload()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot version and size, hit/miss and load counters"""
+        snapshot = self._snapshot
+        return dict(
+            self._stats,
+            enabled=self.enabled,
+            version=snapshot.version if snapshot else None,
+            player_seasons=snapshot.rows if snapshot else 0,
+        )
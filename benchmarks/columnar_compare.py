@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+CourtVision Columnar Engine Comparison
+Checks that --engine columnar yields bit-for-bit identical player_season_stats
+rows to the row engine, and times both
+Author: CS3620 Student
+
+Usage (from the repository root, after teams and players are loaded):
+    python3 benchmarks/columnar_compare.py
+    python3 benchmarks/columnar_compare.py --chunk-rows 50000
+
+Exits with status 1 if any row differs.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import columnar_stats
+import load_data
+from loader_scaling import DATASETS, load_context, run
+
+
+def time_columnar(kind, context, chunk_rows):
+    """Aggregate one dataset with the columnar engine; returns (seconds, rows read)"""
+    path, totals_class = DATASETS[kind]
+    partials = columnar_stats.ColumnarAggregation(kind, path, context, chunk_rows)
+    start = time.perf_counter()
+    load_data.aggregate(partials, totals_class, float('inf'), lambda totals: None, partials=True)
+    return time.perf_counter() - start, partials.rows_read
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar vs row engine comparison")
+    parser.add_argument('--chunk-rows', type=int, default=columnar_stats.COLUMNAR_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    if columnar_stats.np is None:
+        print("✗ NumPy is not installed (pip install numpy)")
+        sys.exit(2)
+
+    conn = load_data.get_connection()
+    try:
+        context = load_context(conn)
+    finally:
+        conn.close()
+
+    print("=" * 60)
+    print("🏀 CourtVision Columnar Engine Comparison")
+    print("=" * 60)
+
+    compared, mismatch = columnar_stats.compare_player_rows(DATASETS['player'][0], context, args.chunk_rows)
+    if mismatch:
+        print(f"\n✗ player_season_stats rows differ (of {compared}):")
+        print(f"  rows:     {mismatch[0]!r}")
+        print(f"  columnar: {mismatch[1]!r}")
+        sys.exit(1)
+    print(f"\n✓ {compared} player_season_stats rows identical")
+
+    for kind in ('player', 'team'):
+        row_seconds, rows_read, _ = run(kind, 1, context)
+        columnar_seconds, _ = time_columnar(kind, context, args.chunk_rows)
+        print(f"\n{kind} statistics ({rows_read} rows)")
+        print(f"  rows:     {row_seconds:>8.2f}s | {rows_read / row_seconds:>10.0f} rows/s")
+        print(f"  columnar: {columnar_seconds:>8.2f}s | {rows_read / columnar_seconds:>10.0f} rows/s | "
+              f"{row_seconds / columnar_seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
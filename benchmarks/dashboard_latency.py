@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+CourtVision Dashboard Latency Benchmark
+Times a home page load as seven leaderboard requests versus one /dashboard request
+Author: CS3620 Student
+
+Each sample is one full page load: every request the page makes, timed
+from the first request to the last response. Run it against a seeded
+database; start the API with CACHE_TTL=0 to time the database work
+rather than the response cache.
+
+Usage:
+    python3 benchmarks/dashboard_latency.py --url http://localhost:8000
+    python3 benchmarks/dashboard_latency.py --season-id 3 --repeat 200
+"""
+
+import argparse
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# What frontend/pages/index.js requested before /dashboard existed
+LEADERBOARD_ENDPOINTS = [
+    '/leaderboard/points?season_id={season_id}&limit={limit}',
+    '/leaderboard/assists?season_id={season_id}&limit={limit}',
+    '/leaderboard/rebounds?season_id={season_id}&limit={limit}',
+    '/leaderboard/steals?season_id={season_id}&limit={limit}',
+    '/leaderboard/team/wins?limit={limit}',
+    '/leaderboard/team/avg-wins?limit={limit}',
+    '/leaderboard/team/points?limit={limit}',
+]
+
+DASHBOARD_ENDPOINT = '/dashboard?season_id={season_id}&limit={limit}'
+
+
+def fetch(url, etag=None):
+    """GET url (revalidating with etag if given); returns (status, ETag header)"""
+    request = urllib.request.Request(url, headers={'If-None-Match': etag} if etag else {})
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            response.read()
+            return response.status, response.headers.get('ETag')
+    except urllib.error.HTTPError as error:
+        # urllib reports 304 Not Modified as an error
+        if error.code == 304:
+            return 304, error.headers.get('ETag')
+        raise
+
+
+def time_page(load, repeat):
+    """Run load() repeat times after one warm-up; returns sorted latencies in ms"""
+    load()
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load()
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Home page load latency: fan-out vs /dashboard")
+    parser.add_argument('--url', default='http://localhost:8000', help="API under test")
+    parser.add_argument('--season-id', type=int, default=3, help="Season the home page shows")
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=100)
+    args = parser.parse_args()
+
+    base = args.url.rstrip('/')
+    fan_out = [base + endpoint.format(season_id=args.season_id, limit=args.limit)
+               for endpoint in LEADERBOARD_ENDPOINTS]
+    dashboard = base + DASHBOARD_ENDPOINT.format(season_id=args.season_id, limit=args.limit)
+
+    status, etag = fetch(dashboard)
+    if status != 200 or not etag:
+        raise SystemExit(f"✗ {dashboard} returned {status} without an ETag")
+
+    executor = ThreadPoolExecutor(max_workers=len(fan_out))
+    scenarios = [
+        ('7 requests, one after another', lambda: [fetch(url) for url in fan_out]),
+        ('7 requests, concurrent', lambda: list(executor.map(fetch, fan_out))),
+        ('/dashboard', lambda: fetch(dashboard)),
+        ('/dashboard revalidated (304)', lambda: fetch(dashboard, etag)),
+    ]
+
+    print("=" * 60)
+    print("🏀 CourtVision Dashboard Latency Benchmark")
+    print(f"   season {args.season_id}, {args.repeat} page loads per scenario")
+    print("=" * 60)
+    print(f"  {'page load':<32} | {'p50 ms':>8} | {'p95 ms':>8}")
+
+    results = {}
+    try:
+        for label, load in scenarios:
+            latencies = time_page(load, args.repeat)
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            results[label] = statistics.median(latencies)
+            print(f"  {label:<32} | {results[label]:>8.2f} | {p95:>8.2f}")
+    finally:
+        executor.shutdown()
+
+    before = results['7 requests, one after another']
+    print(f"\n📊 /dashboard p50 is {before / results['/dashboard']:.1f}x faster than the old page load, "
+          f"{before / results['/dashboard revalidated (304)']:.1f}x when revalidated")
+
+
+if __name__ == "__main__":
+    main()
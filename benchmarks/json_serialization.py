@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+CourtVision JSON Serialization Benchmark
+Times response serialization per 10k rows: FastAPI's default path vs fast_json
+Author: CS3620 Student
+
+Rows are synthetic but shaped like the API's results: a player list row
+(dates, text, integers) and a season stats row (DECIMAL(10, 2) columns,
+which the API now loads as float). No database or server is needed.
+
+Usage (from the repository root, with the API requirements installed):
+    python3 benchmarks/json_serialization.py
+    python3 benchmarks/json_serialization.py --rows 100000 --repeat 5
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'api'))
+
+from fastapi.encoders import jsonable_encoder
+
+import fast_json
+
+STAT_COLUMNS = ('minutes_played', 'points', 'rebounds', 'assists', 'steals', 'blocks', 'turnovers')
+
+
+def synthetic_rows(count, numeric, seed=3620):
+    """Rows like get_players_page joined with player_season_stats; numeric builds the stat values"""
+    rng = random.Random(seed)
+    start = datetime(2024, 10, 22, 19, 30)
+    rows = []
+    for i in range(count):
+        row = {
+            'id': i + 1,
+            'player_name': f"Player {i:06d}",
+            'birth_date': date(1990, 1, 1) + timedelta(days=rng.randrange(5000)),
+            'height_inches': rng.randrange(70, 90),
+            'weight_lbs': rng.randrange(170, 290),
+            'position': rng.choice(['G', 'F', 'C', 'G-F', 'F-C']),
+            'jersey_number': rng.randrange(100),
+            'is_active': rng.random() < 0.8,
+            'games_played': rng.randrange(1, 83),
+            'updated_at': start + timedelta(minutes=i),
+        }
+        for column in STAT_COLUMNS:
+            row[column] = numeric(f"{rng.uniform(0, 40):.2f}")
+        rows.append(row)
+    return rows
+
+
+def fastapi_default(rows):
+    """What FastAPI does with a returned dict: jsonable_encoder, then JSONResponse.render"""
+    content = jsonable_encoder({"players": rows, "count": len(rows)})
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(rows):
+    """FastJSONResponse.render"""
+    return fast_json.dumps({"players": rows, "count": len(rows)})
+
+
+def stdlib_fast_path(rows):
+    """FastJSONResponse.render when orjson is not installed"""
+    orjson, fast_json.orjson = fast_json.orjson, None
+    try:
+        return fast_json.dumps({"players": rows, "count": len(rows)})
+    finally:
+        fast_json.orjson = orjson
+
+
+def time_serializer(serialize, rows, repeat):
+    """Median milliseconds for one serialization of rows"""
+    serialize(rows)
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        serialize(rows)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON serialization time per 10k rows")
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    decimal_rows = synthetic_rows(args.rows, Decimal)
+    float_rows = synthetic_rows(args.rows, float)
+    if json.loads(fastapi_default(decimal_rows)) != json.loads(fast_path(float_rows)):
+        raise SystemExit("✗ fast_json output differs from FastAPI's")
+
+    runs = [
+        ('FastAPI default (Decimal rows)', fastapi_default, decimal_rows),
+        ('fast_json, Decimal rows', fast_path, decimal_rows),
+        ('fast_json, float rows', fast_path, float_rows),
+        ('fast_json stdlib fallback, float rows', stdlib_fast_path, float_rows),
+    ]
+
+    print("=" * 60)
+    print("🏀 CourtVision JSON Serialization Benchmark")
+    print(f"   {args.rows:,} rows, orjson {'installed' if fast_json.orjson else 'NOT installed'}")
+    print("=" * 60)
+    print(f"  {'path':<40} | {'ms/10k rows':>11}")
+
+    baseline = None
+    for label, serialize, rows in runs:
+        per_10k = time_serializer(serialize, rows, args.repeat) * 10000 / args.rows
+        baseline = baseline or per_10k
+        print(f"  {label:<40} | {per_10k:>11.2f}  ({baseline / per_10k:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+CourtVision Leaderboard Load Benchmark
+Measures concurrent /leaderboard/points throughput against a running API
+Author: CS3620 Student
+
+Usage:
+    # Current API on :8000
+    python3 benchmarks/leaderboard_load.py --url http://localhost:8000
+
+    # Compare against a baseline checkout served on :8001
+    python3 benchmarks/leaderboard_load.py --url http://localhost:8000 \\
+        --baseline-url http://localhost:8001
+"""
+
+import argparse
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def fetch(url):
+    """Issue one GET request and return its latency in seconds"""
+    start = time.perf_counter()
+    with urllib.request.urlopen(url, timeout=30) as response:
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"Unexpected status {response.status}")
+    return time.perf_counter() - start
+
+
+def run_load(base_url, endpoint, total_requests, concurrency):
+    """Fire total_requests GETs with the given concurrency and collect timings"""
+    url = f"{base_url.rstrip('/')}{endpoint}"
+
+    # Warm up connections and any server-side caches
+    for _ in range(min(concurrency, 10)):
+        fetch(url)
+
+    latencies = []
+    errors = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(fetch, url) for _ in range(total_requests)]
+        for future in futures:
+            try:
+                latencies.append(future.result())
+            except Exception:
+                errors += 1
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'url': url,
+        'requests': total_requests,
+        'errors': errors,
+        'elapsed': elapsed,
+        'throughput': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else 0.0,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0.0,
+        'p99_ms': latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0,
+    }
+
+
+def print_result(label, result):
+    """Print a single benchmark run"""
+    print(f"\n{label}: {result['url']}")
+    print(f"  requests:   {result['requests']} ({result['errors']} errors)")
+    print(f"  elapsed:    {result['elapsed']:.2f}s")
+    print(f"  throughput: {result['throughput']:.1f} req/s")
+    print(f"  latency:    p50 {result['p50_ms']:.1f}ms | "
+          f"p95 {result['p95_ms']:.1f}ms | p99 {result['p99_ms']:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent leaderboard load benchmark")
+    parser.add_argument('--url', default='http://localhost:8000', help="API under test")
+    parser.add_argument('--baseline-url', help="Optional baseline API to compare against")
+    parser.add_argument('--endpoint', default='/leaderboard/points?season_id=1&limit=10')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🏀 CourtVision Leaderboard Load Benchmark")
+    print(f"   {args.requests} requests, concurrency {args.concurrency}")
+    print("=" * 60)
+
+    baseline = None
+    if args.baseline_url:
+        baseline = run_load(args.baseline_url, args.endpoint, args.requests, args.concurrency)
+        print_result("Before", baseline)
+
+    current = run_load(args.url, args.endpoint, args.requests, args.concurrency)
+    print_result("After" if baseline else "Result", current)
+
+    if baseline and baseline['throughput']:
+        print(f"\nSpeedup: {current['throughput'] / baseline['throughput']:.2f}x throughput")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+CourtVision Loader Scaling Benchmark
+Times parsing and aggregating the statistics CSVs with 1/2/4/8 worker processes
+Author: CS3620 Student
+
+Usage (from the repository root, after teams and players are loaded):
+    python3 benchmarks/loader_scaling.py
+    python3 benchmarks/loader_scaling.py --workers 1 2 4 8 16 --dataset player
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import load_data
+from parallel_ingest import ParallelAggregation
+
+DATASETS = {
+    'player': ('datasets/PlayerStatistics.csv', load_data.PlayerStatTotals),
+    'team': ('datasets/TeamStatistics.csv', load_data.TeamStatTotals),
+}
+
+
+def load_context(conn):
+    """Fetch the lookup tables the loader would use"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT id, player_name FROM player")
+    players = {row[1]: row[0] for row in cursor.fetchall()}
+    teams = load_data.get_team_ids(cursor)
+    cursor.close()
+    return {'players': players, 'teams': teams, 'season_id': 1}
+
+
+def serial_keyed_rows(kind, path, context, counter):
+    """The single-process loader path: one DictReader over the whole file"""
+    for row in load_data.read_csv_rows(path):
+        counter[0] += 1
+        if kind == 'player':
+            key = load_data.player_stat_key(row, context['players'], context['teams'], context['season_id'])
+        else:
+            key = load_data.team_stat_key(row, context['teams'])
+        if key:
+            yield key, row
+
+
+def run(kind, workers, context):
+    """Aggregate one dataset fully in memory; returns (seconds, rows read, keys)"""
+    path, totals_class = DATASETS[kind]
+    never_spill = lambda totals: None
+    start = time.perf_counter()
+    if workers == 1:
+        counter = [0]
+        totals = load_data.aggregate(serial_keyed_rows(kind, path, context, counter),
+                                     totals_class, float('inf'), never_spill)
+        rows_read = counter[0]
+    else:
+        partials = ParallelAggregation(kind, path, workers, context)
+        totals = load_data.aggregate(partials, totals_class, float('inf'), never_spill, partials=True)
+        rows_read = partials.rows_read
+    return time.perf_counter() - start, rows_read, len(totals)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel CSV ingest scaling benchmark")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--dataset', choices=sorted(DATASETS) + ['all'], default='all')
+    args = parser.parse_args()
+
+    conn = load_data.get_connection()
+    try:
+        context = load_context(conn)
+    finally:
+        conn.close()
+
+    kinds = sorted(DATASETS) if args.dataset == 'all' else [args.dataset]
+
+    print("=" * 60)
+    print("🏀 CourtVision Loader Scaling Benchmark")
+    print(f"   {os.cpu_count()} CPUs available")
+    print("=" * 60)
+
+    for kind in kinds:
+        print(f"\n{DATASETS[kind][0]}")
+        print(f"  {'workers':>7} | {'seconds':>8} | {'rows/s':>10} | {'keys':>7} | speedup")
+        baseline = None
+        for workers in args.workers:
+            seconds, rows_read, keys = run(kind, workers, context)
+            if baseline is None:
+                baseline = seconds
+            print(f"  {workers:>7} | {seconds:>8.2f} | {rows_read / seconds:>10.0f} | "
+                  f"{keys:>7} | {baseline / seconds:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+CourtVision Percentile Lookup Benchmark
+Times binary-search percentile lookups on a precomputed distribution against ranking the season per query
+Author: CS3620 Student
+
+Values are synthetic, one season of one stat at each size. The per-query
+baseline counts the values below the player's, as percent_rank() over the
+season does, without the SQL overhead. No database or server is needed.
+
+Usage (from the repository root):
+    python3 benchmarks/percentile_latency.py
+    python3 benchmarks/percentile_latency.py --sizes 500 5000 50000 500000 --repeat 2000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'api'))
+
+from distributions import Distribution
+
+
+def time_query(query, repeat):
+    """p50 and p99 microseconds of query()"""
+    query()
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        query()
+        latencies.append((time.perf_counter() - start) * 1000000)
+    latencies.sort()
+    return statistics.median(latencies), latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+
+
+def rank_season(values, value):
+    """percent_rank() of value, computed from the unsorted season"""
+    below = sum(1 for other in values if other < value)
+    return round(min(below / (len(values) - 1), 1.0) * 100, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Percentile lookup latency")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 5000, 50000])
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("🏀 CourtVision Percentile Lookup Benchmark")
+    print("=" * 70)
+    print(f"  {'players':>8} | {'lookup p50 µs':>13} | {'rank season p50 µs':>18} | {'histogram(20) p50 µs':>20}")
+
+    rng = random.Random(3620)
+    for size in args.sizes:
+        values = [round(rng.gammavariate(2.0, 4.0), 2) for _ in range(size)]
+        distribution = Distribution(size, statistics.fmean(values), sorted(values), range(size))
+        probes = iter(values * (args.repeat * 2 // size + 2))
+
+        lookup, _ = time_query(lambda: distribution.percentile(next(probes)), args.repeat)
+        ranked, _ = time_query(lambda: rank_season(values, next(probes)), min(args.repeat, 50))
+        histogram, _ = time_query(lambda: distribution.histogram(20), args.repeat)
+        print(f"  {size:>8,} | {lookup:>13.2f} | {ranked:>18.1f} | {histogram:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
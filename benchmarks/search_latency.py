@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+CourtVision Name Search Benchmark
+Times ranked trigram search against the legacy ILIKE scan at 10k/100k/1M players
+Author: CS3620 Student
+
+Runs against a scratch copy of the player table (schema search_bench, with
+the same indexes as player) filled with synthetic names, so the real data
+is untouched. The schema is dropped afterwards.
+
+Usage (from the repository root, after schema/functions.sql is loaded):
+    python3 benchmarks/search_latency.py
+    python3 benchmarks/search_latency.py --sizes 10000 100000 --repeat 50
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import load_data
+
+BENCH_SCHEMA = 'search_bench'
+
+FIRST_NAMES = [
+    'LeBron', 'Stephen', 'Kevin', 'Giannis', 'Luka', 'Joel', 'Nikola', 'Jayson', 'Damian',
+    'Anthony', 'James', 'Chris', 'Kawhi', 'Jimmy', 'Devin', 'Trae', 'Zion', 'Ja', 'Jalen',
+    'Tyrese', 'Shai', 'Donovan', 'Karl-Anthony', 'Bam', 'Paul', 'Russell', 'Kyrie', 'Bradley',
+]
+LAST_NAMES = [
+    'James', 'Curry', 'Durant', 'Antetokounmpo', 'Doncic', 'Embiid', 'Jokic', 'Tatum',
+    'Lillard', 'Davis', 'Harden', 'Paul', 'Leonard', 'Butler', 'Booker', 'Young', 'Williamson',
+    'Morant', 'Brunson', 'Haliburton', 'Gilgeous-Alexander', 'Mitchell', 'Towns', 'Adebayo',
+    'George', 'Westbrook', 'Irving', 'Beal',
+]
+
+# (label, function, arguments) run at every size
+QUERIES = [
+    ('legacy ILIKE "curry"', 'get_player_by_name', ('curry',)),
+    ('contains "curry"', 'search_players_ranked', ('curry', 'contains', 20)),
+    ('contains typo "antetokoumpo"', 'search_players_ranked', ('antetokoumpo', 'contains', 20)),
+    ('prefix "jok"', 'search_players_ranked', ('jok', 'prefix', 20)),
+    ('prefix "st"', 'search_players_ranked', ('st', 'prefix', 20)),
+]
+
+
+def synthetic_names(start, count, seed=3620):
+    """Deterministic 'First Last' names with a numeric suffix to keep them distinct"""
+    rng = random.Random(seed + start)
+    for i in range(start, start + count):
+        yield f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}"
+
+
+def create_bench_table(conn):
+    """Create search_bench.player with player's columns and indexes"""
+    cursor = conn.cursor()
+    cursor.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+    cursor.execute(f"CREATE SCHEMA {BENCH_SCHEMA}")
+    cursor.execute(f"CREATE TABLE {BENCH_SCHEMA}.player (LIKE public.player INCLUDING ALL)")
+    # The copied id default would draw from the real player sequence
+    cursor.execute(f"ALTER TABLE {BENCH_SCHEMA}.player ALTER COLUMN id DROP DEFAULT")
+    conn.commit()
+
+
+def grow_to(conn, size):
+    """Insert synthetic players until the bench table holds size rows"""
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT COUNT(*) FROM {BENCH_SCHEMA}.player")
+    current = cursor.fetchone()[0]
+    if current < size:
+        cursor.execute(f"""
+            INSERT INTO {BENCH_SCHEMA}.player (id, player_name)
+            SELECT %s + n, name FROM unnest(%s::TEXT[]) WITH ORDINALITY AS names(name, n)
+        """, (current, list(synthetic_names(current, size - current))))
+    conn.commit()
+    conn.autocommit = True
+    cursor.execute(f"VACUUM (ANALYZE) {BENCH_SCHEMA}.player")
+    conn.autocommit = False
+
+
+def time_query(conn, function, args, repeat):
+    """Call one search function repeat times; returns (latencies in ms, rows returned)"""
+    cursor = conn.cursor()
+    placeholders = ', '.join(['%s'] * len(args))
+    sql = f"SELECT * FROM {function}({placeholders})"
+    # Warm up the plan cache and shared buffers
+    cursor.execute(sql, args)
+    rows = len(cursor.fetchall())
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cursor.execute(sql, args)
+        cursor.fetchall()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Player name search latency benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    conn = load_data.get_connection()
+    print("=" * 60)
+    print("🏀 CourtVision Name Search Benchmark")
+    print("=" * 60)
+
+    try:
+        create_bench_table(conn)
+        cursor = conn.cursor()
+        # Unqualified 'player' in the search functions now resolves to the bench table
+        cursor.execute(f"SET search_path = {BENCH_SCHEMA}, public")
+        conn.commit()
+
+        for size in sorted(args.sizes):
+            started = time.perf_counter()
+            grow_to(conn, size)
+            print(f"\n{size:,} players (filled in {time.perf_counter() - started:.1f}s)")
+            print(f"  {'query':<32} | {'p50 ms':>8} | {'p95 ms':>8} | rows")
+            for label, function, query_args in QUERIES:
+                latencies, rows = time_query(conn, function, query_args, args.repeat)
+                latencies.sort()
+                p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+                print(f"  {label:<32} | {statistics.median(latencies):>8.2f} | {p95:>8.2f} | {rows}")
+    finally:
+        conn.rollback()
+        cursor = conn.cursor()
+        cursor.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+        conn.commit()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
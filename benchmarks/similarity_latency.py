@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+CourtVision Similarity Search Benchmark
+Times /player/{id}/similar's index build, one-season update and k-nearest queries
+Author: CS3620 Student
+
+Player seasons are synthetic but shaped like VECTOR_QUERY rows, 500 per
+season, at 5k and 500k player seasons by default. No database or server
+is needed.
+
+Usage (from the repository root, with numpy installed):
+    python3 benchmarks/similarity_latency.py
+    python3 benchmarks/similarity_latency.py --sizes 5000 50000 500000 --repeat 200
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'api'))
+
+import similarity
+from similarity import SeasonBlock, SimilarityIndex
+
+PLAYERS_PER_SEASON = 500
+
+
+def synthetic_season(season_id, rng):
+    """One season of VECTOR_QUERY rows"""
+    rows = []
+    for player_id in rng.sample(range(1, PLAYERS_PER_SEASON * 8), PLAYERS_PER_SEASON):
+        field_goals_attempted = rng.randrange(0, 1600)
+        three_pointers_attempted = rng.randrange(0, 600)
+        free_throws_attempted = rng.randrange(0, 600)
+        rows.append({
+            'player_id': player_id,
+            'season_id': season_id,
+            'games_played': rng.randrange(1, 83),
+            'points': rng.uniform(0, 35),
+            'rebounds': rng.uniform(0, 14),
+            'assists': rng.uniform(0, 11),
+            'steals': rng.uniform(0, 2.5),
+            'blocks': rng.uniform(0, 3),
+            'field_goals_made': rng.randrange(0, field_goals_attempted + 1),
+            'field_goals_attempted': field_goals_attempted,
+            'three_pointers_made': rng.randrange(0, three_pointers_attempted + 1),
+            'three_pointers_attempted': three_pointers_attempted,
+            'free_throws_made': rng.randrange(0, free_throws_attempted + 1),
+            'free_throws_attempted': free_throws_attempted,
+            'player_name': f"Player {player_id:06d}",
+            'position': rng.choice(['G', 'F', 'C', 'G-F', 'F-C']),
+            'height_inches': rng.randrange(70, 90),
+            'weight_lbs': rng.randrange(170, 290),
+        })
+    return rows
+
+
+def time_calls(call, repeat):
+    """p50 and p99 milliseconds of call()"""
+    call()
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return statistics.median(latencies), latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+
+
+def run(size, repeat, rng):
+    """Build an index of about size player seasons and time it"""
+    seasons = max(1, size // PLAYERS_PER_SEASON)
+    # Blocks are built season by season, as a full rebuild does; only the
+    # block builds are timed, not generating the rows, and the rows are not
+    # all held at once
+    blocks = {}
+    build_seconds = 0.0
+    for season_id in range(1, seasons + 1):
+        rows = synthetic_season(season_id, rng)
+        start = time.perf_counter()
+        blocks[season_id] = SeasonBlock(season_id, rows)
+        build_seconds += time.perf_counter() - start
+    start = time.perf_counter()
+    index = SimilarityIndex(blocks)
+    build_ms = (build_seconds + time.perf_counter() - start) * 1000
+
+    changed = seasons // 2 + 1
+    rows = synthetic_season(changed, rng)
+    start = time.perf_counter()
+    index.replace_seasons({changed: SeasonBlock(changed, rows)}, [changed])
+    update_ms = (time.perf_counter() - start) * 1000
+
+    probes = []
+    for _ in range(64):
+        row = rng.randrange(index.rows)
+        probes.append((int(index.player_ids[row]), int(index.season_ids[row])))
+    cycle = iter(probes * (repeat + 2))
+
+    all_p50, all_p99 = time_calls(lambda: index.nearest(*next(cycle), k=10, min_games=10), repeat)
+    same_p50, same_p99 = time_calls(lambda: index.nearest(*next(cycle), k=10, min_games=10,
+                                                          same_season=True), repeat)
+    return index.rows, build_ms, update_ms, (all_p50, all_p99), (same_p50, same_p99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Similarity index build and query latency")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5000, 500000],
+                        help="Player seasons to index")
+    parser.add_argument('--repeat', type=int, default=100)
+    args = parser.parse_args()
+
+    if similarity.np is None:
+        raise SystemExit("✗ numpy is not installed")
+
+    print("=" * 78)
+    print("🏀 CourtVision Similarity Search Benchmark")
+    print(f"   {len(similarity.FEATURES)} features, {PLAYERS_PER_SEASON} players per season, k=10")
+    print("=" * 78)
+    print(f"  {'player seasons':>14} | {'full build':>10} | {'1-season update':>15} | "
+          f"{'query p50/p99 ms':>16} | {'same season':>11}")
+
+    rng = random.Random(3620)
+    for size in args.sizes:
+        rows, build_ms, update_ms, every, same = run(size, args.repeat, rng)
+        print(f"  {rows:>14,} | {build_ms:>8.0f}ms | {update_ms:>13.1f}ms | "
+              f"{every[0]:>7.2f}/{every[1]:<8.2f} | {same[0]:>5.2f}/{same[1]:<5.2f}")
+
+
+if __name__ == "__main__":
+    main()
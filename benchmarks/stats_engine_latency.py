@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+CourtVision Stats Engine Benchmark
+Times in-memory leaderboard, player lookup and dashboard queries on a synthetic snapshot
+Author: CS3620 Student
+
+Rows are synthetic but shaped like player_season_stats (about 500 players
+per season, so the default is 60 seasons). No database or server is
+needed; compare against dashboard_latency.py or leaderboard_load.py for
+the Postgres-backed times.
+
+Usage (from the repository root, with numpy installed):
+    python3 benchmarks/stats_engine_latency.py
+    python3 benchmarks/stats_engine_latency.py --seasons 80 --players-per-season 600
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'api'))
+
+import stats_engine
+from stats_engine import INT_COLUMNS, StatsSnapshot
+
+
+def synthetic_tables(seasons, players_per_season, seed=3620):
+    """player, player_season_stats and team_season_stats rows as the engine loads them"""
+    rng = random.Random(seed)
+    player_count = players_per_season * 4
+    players = [{
+        'id': i,
+        'player_name': f"Player {i:06d}",
+        'position': rng.choice(['G', 'F', 'C', 'G-F', 'F-C']),
+        'height_inches': rng.randrange(70, 90),
+        'weight_lbs': rng.randrange(170, 290),
+    } for i in range(1, player_count + 1)]
+
+    player_stats = []
+    for season_id in range(1, seasons + 1):
+        for player_id in rng.sample(range(1, player_count + 1), players_per_season):
+            row = {'player_id': player_id, 'season_id': season_id, 'games_played': rng.randrange(0, 83)}
+            for column in stats_engine.FLOAT_COLUMNS:
+                row[column] = Decimal(f"{rng.uniform(0, 35):.2f}")
+            for column in INT_COLUMNS[3:]:
+                row[column] = rng.randrange(0, 2000)
+            player_stats.append(row)
+
+    team_stats = [{
+        'team_id': team_id, 'team_name': f"Team {team_id}", 'wins': rng.randrange(15, 65),
+        'losses': rng.randrange(15, 65), 'games_played': 82, 'total_points': rng.randrange(8000, 10000),
+    } for team_id in range(1, 31) for _ in range(seasons)]
+    return players, player_stats, team_stats
+
+
+def time_query(query, repeat):
+    """p50 and p99 microseconds of query()"""
+    query()
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        query()
+        latencies.append((time.perf_counter() - start) * 1000000)
+    latencies.sort()
+    return statistics.median(latencies), latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stats engine query latency")
+    parser.add_argument('--seasons', type=int, default=60)
+    parser.add_argument('--players-per-season', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    if stats_engine.np is None:
+        raise SystemExit("✗ numpy is not installed")
+
+    players, player_stats, team_stats = synthetic_tables(args.seasons, args.players_per_season)
+    start = time.perf_counter()
+    snapshot = StatsSnapshot(1, players, player_stats, team_stats)
+    build_ms = (time.perf_counter() - start) * 1000
+    season_id = args.seasons // 2
+    player_id = player_stats[season_id * args.players_per_season]['player_id']
+
+    queries = [
+        ('points top 10', lambda: snapshot.player_leaderboard('points', season_id, 10)),
+        ('efficiency top 50', lambda: snapshot.player_leaderboard('efficiency', season_id, 50)),
+        ('assists top 10, G, 20+ games', lambda: snapshot.player_leaderboard('assists', season_id, 10, 'G', 20)),
+        ('team points per game top 10', lambda: snapshot.team_leaderboard('get_team_points_per_game', 10)),
+        ('player stats lookup', lambda: snapshot.player_stats(player_id, season_id + 1)),
+        ('dashboard', lambda: snapshot.dashboard(season_id, 10)),
+    ]
+
+    print("=" * 60)
+    print("🏀 CourtVision Stats Engine Benchmark")
+    print(f"   {snapshot.rows:,} player seasons, snapshot built in {build_ms:.0f} ms")
+    print("=" * 60)
+    print(f"  {'query':<32} | {'p50 µs':>8} | {'p99 µs':>8}")
+    for label, query in queries:
+        p50, p99 = time_query(query, args.repeat)
+        print(f"  {label:<32} | {p50:>8.1f} | {p99:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
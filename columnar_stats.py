@@ -0,0 +1,272 @@
+"""
+CourtVision Columnar Aggregation Module
+NumPy-backed parsing and grouped aggregation of the statistics CSVs
+Author: CS3620 Student
+"""
+
+import csv
+from itertools import islice, zip_longest
+
+import load_data
+
+try:
+    import numpy as np
+except ImportError:  # optional: only needed for --engine columnar
+    np = None
+
+# Rows parsed per batch; bounds the size of the temporary column arrays
+COLUMNAR_CHUNK_ROWS = 262144
+
+# csv.DictReader fills short rows with None, which the row path formats as
+# 'None' in names and treats as missing in numbers; this string does both
+SHORT_ROW_FILL = 'None'
+
+# Summed integer columns, in PlayerStatTotals.partial_row() order after minutes
+PLAYER_INT_COLUMNS = (
+    'points', 'reboundsTotal', 'assists', 'steals', 'blocks', 'turnovers',
+    'fieldGoalsMade', 'fieldGoalsAttempted', 'threePointersMade', 'threePointersAttempted',
+    'freeThrowsMade', 'freeThrowsAttempted'
+)
+
+TEAM_INT_COLUMNS = ('teamScore', 'opponentScore')
+
+# Distinct values a Lookup remembers before starting over, bounding memory
+# on high-cardinality columns
+LOOKUP_MAX_ENTRIES = 1000000
+
+
+def read_column_chunks(path, chunk_rows=COLUMNAR_CHUNK_ROWS):
+    """
+    Yield a CSV in batches of columns rather than rows
+
+    Blank lines are skipped like csv.DictReader does. Each batch is a
+    (row count, column lookup) pair, where column(name, missing) returns the
+    values of one column as a tuple, or missing for every row when the file
+    has no such column (the row path's row.get(name, missing)).
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        # Later duplicates win, as in the dictionaries DictReader builds
+        positions = {name: i for i, name in enumerate(next(reader, []))}
+
+        while True:
+            batch = list(islice(reader, chunk_rows))
+            if not batch:
+                break
+            rows = [row for row in batch if row]
+            if not rows:
+                continue
+            columns = list(zip_longest(*rows, fillvalue=SHORT_ROW_FILL))
+
+            def column(name, missing, columns=columns, count=len(rows)):
+                position = positions.get(name)
+                if position is None or position >= len(columns):
+                    return (missing,) * count
+                return columns[position]
+
+            yield len(rows), column
+
+
+class Lookup(dict):
+    """
+    Converts values with convert(value), calling it once per distinct value
+
+    Box score columns repeat a small set of values (points, rebounds, team
+    names), so converting through the loader's own parse functions keeps
+    the row path's exact semantics while the per-row work is a dict hit.
+    """
+
+    def __init__(self, convert):
+        super().__init__()
+        self.convert = convert
+
+    def __missing__(self, value):
+        result = self[value] = self.convert(value)
+        return result
+
+    def array(self, values, dtype):
+        """Converted values as a typed array"""
+        if len(self) > LOOKUP_MAX_ENTRIES:
+            self.clear()
+        return np.fromiter(map(self.__getitem__, values), dtype=dtype, count=len(values))
+
+
+def float_or_zero(value):
+    """`parse_float(value) or 0`, the row path's handling of a float stat"""
+    return load_data.parse_float(value) or 0.0
+
+
+def int_or_zero(value):
+    """`parse_int(value) or 0`, the row path's handling of an integer stat"""
+    return load_data.parse_int(value) or 0
+
+
+class ColumnarTotals:
+    """
+    Per-key sums held in growable arrays, one slot per key
+
+    Slots are assigned in order of first appearance, matching the insertion
+    order of the dictionaries aggregate() builds.
+    """
+
+    def __init__(self, int_columns):
+        self.slots = {}
+        self.capacity = 1024
+        self.games = np.zeros(self.capacity, dtype=np.int64)
+        self.ints = np.zeros((int_columns, self.capacity), dtype=np.int64)
+        self.floats = np.zeros(self.capacity, dtype=np.float64)
+
+    def slot(self, key):
+        """Slot number for key, allocating the next one on first sight"""
+        slot = self.slots.get(key)
+        if slot is None:
+            slot = self.slots[key] = len(self.slots)
+            if slot >= self.capacity:
+                self._grow(slot + 1)
+        return slot
+
+    def _grow(self, needed):
+        """Resize the arrays to hold at least needed slots"""
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        self.games = np.concatenate([self.games, np.zeros(capacity - self.capacity, dtype=np.int64)])
+        self.ints = np.concatenate(
+            [self.ints, np.zeros((self.ints.shape[0], capacity - self.capacity), dtype=np.int64)], axis=1
+        )
+        self.floats = np.concatenate([self.floats, np.zeros(capacity - self.capacity, dtype=np.float64)])
+        self.capacity = capacity
+
+    def add(self, slots, ints, floats=None):
+        """
+        Accumulate one batch
+
+        np.add.at applies the additions one row at a time in row order, so
+        float sums round exactly like the row path's running `+=`.
+        """
+        np.add.at(self.games, slots, 1)
+        for sums, values in zip(self.ints, ints):
+            np.add.at(sums, slots, values)
+        if floats is not None:
+            np.add.at(self.floats, slots, floats)
+
+
+class ColumnarAggregation:
+    """
+    Iterates (key, partial_row) pairs for a whole CSV, aggregated with NumPy
+
+    A drop-in alternative to ParallelAggregation: keys come out in order of
+    first appearance and are the same keys the row path uses ('player'
+    keys by (player_id, season_id, team_id), 'team' keys by (team_id,
+    season label)). For 'player', each partial_row() equals the row path's,
+    so the player_season_stats rows written are bit-for-bit identical.
+    rows_read is complete once iteration finishes.
+    """
+
+    def __init__(self, kind, path, context, chunk_rows=COLUMNAR_CHUNK_ROWS):
+        if np is None:
+            raise RuntimeError("The columnar engine requires NumPy (pip install numpy)")
+        self.kind = kind
+        self.path = path
+        self.context = context
+        self.chunk_rows = chunk_rows
+        self.rows_read = 0
+
+    def __iter__(self):
+        if self.kind == 'player':
+            totals = self._aggregate_players()
+        else:
+            totals = self._aggregate_teams()
+
+        count = len(totals.slots)
+        games = totals.games[:count].tolist()
+        ints = totals.ints[:, :count].tolist()
+        floats = totals.floats[:count].tolist()
+        for slot, key in enumerate(totals.slots):
+            if self.kind == 'player':
+                yield key, (games[slot], floats[slot]) + tuple(column[slot] for column in ints)
+            else:
+                wins = ints[0][slot]
+                yield key, (games[slot], wins, games[slot] - wins, ints[1][slot], ints[2][slot])
+
+    def _aggregate_players(self):
+        """Sum PlayerStatistics.csv by (player_id, season_id, team_id)"""
+        players, teams, season_id = self.context['players'], self.context['teams'], self.context['season_id']
+        totals = ColumnarTotals(len(PLAYER_INT_COLUMNS))
+        player_ids = Lookup(lambda name: players.get(f"{name[0]} {name[1]}".strip()))
+        team_ids = Lookup(lambda name: teams.get(f"{name[0]} {name[1]}".strip()))
+        # Unknown players map to -1 and are masked out, like the row path's None key
+        slots = Lookup(lambda ids: totals.slot((ids[0], season_id, ids[1])) if ids[0] else -1)
+        ints = [Lookup(int_or_zero) for _ in PLAYER_INT_COLUMNS]
+        minutes = Lookup(float_or_zero)
+
+        for count, column in read_column_chunks(self.path, self.chunk_rows):
+            self.rows_read += count
+            row_players = map(player_ids.__getitem__, zip(column('firstName', ''), column('lastName', '')))
+            row_teams = map(team_ids.__getitem__, zip(column('playerteamCity', ''), column('playerteamName', '')))
+            row_slots = np.fromiter(map(slots.__getitem__, zip(row_players, row_teams)),
+                                    dtype=np.int64, count=count)
+
+            keep = row_slots >= 0
+            totals.add(
+                row_slots[keep],
+                [lookup.array(column(name, 0), np.int64)[keep] for lookup, name in zip(ints, PLAYER_INT_COLUMNS)],
+                minutes.array(column('numMinutes', 0), np.float64)[keep]
+            )
+        return totals
+
+    def _aggregate_teams(self):
+        """Sum TeamStatistics.csv by (team_id, season label)"""
+        teams = self.context['teams']
+        totals = ColumnarTotals(1 + len(TEAM_INT_COLUMNS))
+        team_ids = Lookup(lambda name: teams.get(f"{name[0]} {name[1]}".strip()))
+        seasons = Lookup(lambda value: load_data.season_year_for(load_data.parse_datetime(value)))
+        slots = Lookup(lambda key: totals.slot(key) if key[0] else -1)
+        wins = Lookup(lambda value: int(load_data.parse_bool(value)))
+        ints = [Lookup(int_or_zero) for _ in TEAM_INT_COLUMNS]
+
+        for count, column in read_column_chunks(self.path, self.chunk_rows):
+            self.rows_read += count
+            row_teams = map(team_ids.__getitem__, zip(column('teamCity', ''), column('teamName', '')))
+            row_seasons = map(seasons.__getitem__, column('gameDateTimeEst', None))
+            row_slots = np.fromiter(map(slots.__getitem__, zip(row_teams, row_seasons)),
+                                    dtype=np.int64, count=count)
+
+            keep = row_slots >= 0
+            totals.add(
+                row_slots[keep],
+                [wins.array(column('win', None), np.int64)[keep]] +
+                [lookup.array(column(name, 0), np.int64)[keep] for lookup, name in zip(ints, TEAM_INT_COLUMNS)]
+            )
+        return totals
+
+
+def compare_player_rows(path, context, chunk_rows=COLUMNAR_CHUNK_ROWS):
+    """
+    Check the columnar path against the row path for PlayerStatistics.csv
+
+    Both paths are aggregated fully in memory and the resulting
+    player_season_stats rows compared by repr, which round-trips floats
+    exactly, so any difference in value, type or order counts.
+
+    Returns:
+        Tuple of (number of rows compared, first mismatch as (row path
+        row, columnar row) or None)
+    """
+    players, teams, season_id = context['players'], context['teams'], context['season_id']
+    never_spill = lambda totals: None
+
+    keyed_rows = (
+        (key, row) for row in load_data.read_csv_rows(path)
+        for key in [load_data.player_stat_key(row, players, teams, season_id)] if key
+    )
+    by_row = load_data.aggregate(keyed_rows, load_data.PlayerStatTotals, float('inf'), never_spill)
+    by_column = load_data.aggregate(ColumnarAggregation('player', path, context, chunk_rows),
+                                    load_data.PlayerStatTotals, float('inf'), never_spill, partials=True)
+
+    row_rows = [key + stats.season_row() for key, stats in by_row.items() if stats.games > 0]
+    column_rows = [key + stats.season_row() for key, stats in by_column.items() if stats.games > 0]
+    for row_row, column_row in zip_longest(row_rows, column_rows):
+        if repr(row_row) != repr(column_row):
+            return len(row_rows), (row_row, column_row)
+    return len(row_rows), None
@@ -0,0 +1,600 @@
+"""
+CourtVision COPY Ingestion Module
+Streams rows into unlogged staging tables with COPY FROM STDIN and merges
+them into the core tables with set-based upserts
+Author: CS3620 Student
+"""
+
+import io
+
+from psycopg2.extras import execute_batch
+
+# Unlogged staging tables skip WAL, so loading them costs little more than
+# the COPY itself. stage_seq preserves input order for "last row wins" merges.
+STAGING_TABLES = {
+    'staging_players_raw': """
+        player_name VARCHAR(255),
+        birth_date DATE,
+        height_inches INTEGER,
+        weight_lbs INTEGER,
+        college VARCHAR(255),
+        country VARCHAR(100),
+        draft_year INTEGER,
+        draft_round INTEGER,
+        draft_number INTEGER
+    """,
+    'staging_player': """
+        player_name VARCHAR(255),
+        birth_date DATE,
+        height_inches INTEGER,
+        weight_lbs INTEGER,
+        position VARCHAR(10),
+        jersey_number INTEGER
+    """,
+    'staging_game': """
+        game_id VARCHAR(50),
+        game_date_time TIMESTAMP,
+        home_team_id INTEGER,
+        away_team_id INTEGER,
+        home_score INTEGER,
+        away_score INTEGER,
+        winner_team_id INTEGER,
+        game_type VARCHAR(50),
+        attendance INTEGER,
+        game_label VARCHAR(255),
+        game_sublabel VARCHAR(255)
+    """,
+    'staging_player_game_stats': """
+        stage_seq BIGSERIAL,
+        player_id INTEGER,
+        game_id VARCHAR(50),
+        game_date DATE,
+        season_id INTEGER,
+        team_id INTEGER,
+        opponent_team_id INTEGER,
+        is_home BOOLEAN,
+        won BOOLEAN,
+        minutes DECIMAL(6, 2),
+        points INTEGER,
+        rebounds INTEGER,
+        assists INTEGER,
+        steals INTEGER,
+        blocks INTEGER,
+        turnovers INTEGER,
+        field_goals_made INTEGER,
+        field_goals_attempted INTEGER,
+        three_pointers_made INTEGER,
+        three_pointers_attempted INTEGER,
+        free_throws_made INTEGER,
+        free_throws_attempted INTEGER,
+        plus_minus INTEGER
+    """,
+    'staging_player_season_stats': """
+        stage_seq BIGSERIAL,
+        player_id INTEGER,
+        season_id INTEGER,
+        team_id INTEGER,
+        games_played INTEGER,
+        minutes_played DECIMAL(10, 2),
+        points DECIMAL(10, 2),
+        rebounds DECIMAL(10, 2),
+        assists DECIMAL(10, 2),
+        steals DECIMAL(10, 2),
+        blocks DECIMAL(10, 2),
+        turnovers DECIMAL(10, 2),
+        field_goals_made INTEGER,
+        field_goals_attempted INTEGER,
+        three_pointers_made INTEGER,
+        three_pointers_attempted INTEGER,
+        free_throws_made INTEGER,
+        free_throws_attempted INTEGER,
+        total_minutes DECIMAL(12, 2),
+        total_points INTEGER,
+        total_rebounds INTEGER,
+        total_assists INTEGER,
+        total_steals INTEGER,
+        total_blocks INTEGER,
+        total_turnovers INTEGER
+    """,
+    'staging_team_season_stats': """
+        stage_seq BIGSERIAL,
+        team_id INTEGER,
+        season_id INTEGER,
+        wins INTEGER,
+        losses INTEGER,
+        win_percentage DECIMAL(5, 3),
+        points_per_game DECIMAL(10, 2),
+        points_allowed_per_game DECIMAL(10, 2),
+        games_played INTEGER,
+        total_points INTEGER,
+        total_points_allowed INTEGER
+    """,
+    # Partial box score sums spilled by load_data.py when aggregation
+    # exceeds its memory ceiling; several rows may share a key
+    'staging_player_stat_partials': """
+        stage_seq BIGSERIAL,
+        player_id INTEGER,
+        season_id INTEGER,
+        team_id INTEGER,
+        games INTEGER,
+        minutes DOUBLE PRECISION,
+        points BIGINT,
+        rebounds BIGINT,
+        assists BIGINT,
+        steals BIGINT,
+        blocks BIGINT,
+        turnovers BIGINT,
+        fg_made BIGINT,
+        fg_attempted BIGINT,
+        three_made BIGINT,
+        three_attempted BIGINT,
+        ft_made BIGINT,
+        ft_attempted BIGINT
+    """,
+    'staging_team_stat_partials': """
+        stage_seq BIGSERIAL,
+        team_id INTEGER,
+        season_id INTEGER,
+        games INTEGER,
+        wins INTEGER,
+        losses INTEGER,
+        points BIGINT,
+        points_allowed BIGINT
+    """,
+    # New-row deltas from incremental loads (incremental_ingest.py);
+    # first_row is the CSV row number where the key first appeared
+    'staging_player_stat_deltas': """
+        player_id INTEGER,
+        season_id INTEGER,
+        team_id INTEGER,
+        first_row BIGINT,
+        games INTEGER,
+        minutes DOUBLE PRECISION,
+        points BIGINT,
+        rebounds BIGINT,
+        assists BIGINT,
+        steals BIGINT,
+        blocks BIGINT,
+        turnovers BIGINT,
+        fg_made BIGINT,
+        fg_attempted BIGINT,
+        three_made BIGINT,
+        three_attempted BIGINT,
+        ft_made BIGINT,
+        ft_attempted BIGINT
+    """,
+    'staging_team_stat_deltas': """
+        team_id INTEGER,
+        season_id INTEGER,
+        games INTEGER,
+        wins INTEGER,
+        losses INTEGER,
+        points BIGINT,
+        points_allowed BIGINT
+    """,
+}
+
+# Set-based merges from staging into the core tables. Conflict handling
+# mirrors the row-by-row INSERTs in load_data.py so both modes agree.
+MERGE_SQL = {
+    'staging_players_raw': """
+        INSERT INTO players_raw (player_name, birth_date, height_inches, weight_lbs, college, country,
+                                 draft_year, draft_round, draft_number)
+        SELECT player_name, birth_date, height_inches, weight_lbs, college, country,
+               draft_year, draft_round, draft_number
+        FROM staging_players_raw
+        ON CONFLICT DO NOTHING
+    """,
+    'staging_player': """
+        INSERT INTO player (player_name, birth_date, height_inches, weight_lbs, position, jersey_number)
+        SELECT player_name, birth_date, height_inches, weight_lbs, position, jersey_number
+        FROM staging_player
+        ON CONFLICT DO NOTHING
+    """,
+    'staging_game': """
+        INSERT INTO game (game_id, game_date_time, home_team_id, away_team_id, home_score, away_score,
+                          winner_team_id, game_type, attendance, game_label, game_sublabel)
+        SELECT game_id, game_date_time, home_team_id, away_team_id, home_score, away_score,
+               winner_team_id, game_type, attendance, game_label, game_sublabel
+        FROM staging_game
+        ON CONFLICT (game_id) DO NOTHING
+    """,
+    # Inserted in game date order so each partition's rows stay clustered by
+    # date for the BRIN index; a box score loaded again replaces the old row
+    'staging_player_game_stats': """
+        INSERT INTO player_game_stats
+        (player_id, game_id, game_date, season_id, team_id, opponent_team_id, is_home, won,
+         minutes, points, rebounds, assists, steals, blocks, turnovers,
+         field_goals_made, field_goals_attempted, three_pointers_made, three_pointers_attempted,
+         free_throws_made, free_throws_attempted, plus_minus)
+        SELECT player_id, game_id, game_date, season_id, team_id, opponent_team_id, is_home, won,
+               minutes, points, rebounds, assists, steals, blocks, turnovers,
+               field_goals_made, field_goals_attempted, three_pointers_made, three_pointers_attempted,
+               free_throws_made, free_throws_attempted, plus_minus
+        FROM (
+            SELECT DISTINCT ON (player_id, game_date, game_id) *
+            FROM staging_player_game_stats
+            ORDER BY player_id, game_date, game_id, stage_seq DESC
+        ) latest
+        ORDER BY game_date, game_id
+        ON CONFLICT (player_id, game_date, game_id)
+        DO UPDATE SET
+            season_id = EXCLUDED.season_id,
+            team_id = EXCLUDED.team_id,
+            opponent_team_id = EXCLUDED.opponent_team_id,
+            is_home = EXCLUDED.is_home,
+            won = EXCLUDED.won,
+            minutes = EXCLUDED.minutes,
+            points = EXCLUDED.points,
+            rebounds = EXCLUDED.rebounds,
+            assists = EXCLUDED.assists,
+            steals = EXCLUDED.steals,
+            blocks = EXCLUDED.blocks,
+            turnovers = EXCLUDED.turnovers,
+            field_goals_made = EXCLUDED.field_goals_made,
+            field_goals_attempted = EXCLUDED.field_goals_attempted,
+            three_pointers_made = EXCLUDED.three_pointers_made,
+            three_pointers_attempted = EXCLUDED.three_pointers_attempted,
+            free_throws_made = EXCLUDED.free_throws_made,
+            free_throws_attempted = EXCLUDED.free_throws_attempted,
+            plus_minus = EXCLUDED.plus_minus
+    """,
+    # A player traded mid-season has one staged row per team but only one
+    # (player_id, season_id) row; the last staged row wins, as in batch mode
+    'staging_player_season_stats': """
+        INSERT INTO player_season_stats
+        (player_id, season_id, team_id, games_played, minutes_played, points, rebounds, assists,
+         steals, blocks, turnovers, field_goals_made, field_goals_attempted,
+         three_pointers_made, three_pointers_attempted, free_throws_made, free_throws_attempted,
+         total_minutes, total_points, total_rebounds, total_assists, total_steals, total_blocks,
+         total_turnovers)
+        SELECT DISTINCT ON (player_id, season_id)
+               player_id, season_id, team_id, games_played, minutes_played, points, rebounds, assists,
+               steals, blocks, turnovers, field_goals_made, field_goals_attempted,
+               three_pointers_made, three_pointers_attempted, free_throws_made, free_throws_attempted,
+               total_minutes, total_points, total_rebounds, total_assists, total_steals,
+               total_blocks, total_turnovers
+        FROM staging_player_season_stats
+        ORDER BY player_id, season_id, stage_seq DESC
+        ON CONFLICT (player_id, season_id)
+        DO UPDATE SET
+            team_id = EXCLUDED.team_id,
+            games_played = EXCLUDED.games_played,
+            minutes_played = EXCLUDED.minutes_played,
+            points = EXCLUDED.points,
+            rebounds = EXCLUDED.rebounds,
+            assists = EXCLUDED.assists,
+            steals = EXCLUDED.steals,
+            blocks = EXCLUDED.blocks,
+            turnovers = EXCLUDED.turnovers,
+            field_goals_made = EXCLUDED.field_goals_made,
+            field_goals_attempted = EXCLUDED.field_goals_attempted,
+            three_pointers_made = EXCLUDED.three_pointers_made,
+            three_pointers_attempted = EXCLUDED.three_pointers_attempted,
+            free_throws_made = EXCLUDED.free_throws_made,
+            free_throws_attempted = EXCLUDED.free_throws_attempted,
+            total_minutes = EXCLUDED.total_minutes,
+            total_points = EXCLUDED.total_points,
+            total_rebounds = EXCLUDED.total_rebounds,
+            total_assists = EXCLUDED.total_assists,
+            total_steals = EXCLUDED.total_steals,
+            total_blocks = EXCLUDED.total_blocks,
+            total_turnovers = EXCLUDED.total_turnovers,
+            updated_at = CURRENT_TIMESTAMP
+    """,
+    'staging_team_season_stats': """
+        INSERT INTO team_season_stats
+        (team_id, season_id, wins, losses, win_percentage, points_per_game, points_allowed_per_game,
+         games_played, total_points, total_points_allowed)
+        SELECT DISTINCT ON (team_id, season_id)
+               team_id, season_id, wins, losses, win_percentage, points_per_game, points_allowed_per_game,
+               games_played, total_points, total_points_allowed
+        FROM staging_team_season_stats
+        ORDER BY team_id, season_id, stage_seq DESC
+        ON CONFLICT (team_id, season_id)
+        DO UPDATE SET
+            wins = EXCLUDED.wins,
+            losses = EXCLUDED.losses,
+            win_percentage = EXCLUDED.win_percentage,
+            points_per_game = EXCLUDED.points_per_game,
+            points_allowed_per_game = EXCLUDED.points_allowed_per_game,
+            games_played = EXCLUDED.games_played,
+            total_points = EXCLUDED.total_points,
+            total_points_allowed = EXCLUDED.total_points_allowed,
+            updated_at = CURRENT_TIMESTAMP
+    """,
+    # Sum spilled partials per key, then keep the key that first appeared
+    # last, which is the row the in-memory path would have written last
+    'staging_player_stat_partials': """
+        INSERT INTO player_season_stats
+        (player_id, season_id, team_id, games_played, minutes_played, points, rebounds, assists,
+         steals, blocks, turnovers, field_goals_made, field_goals_attempted,
+         three_pointers_made, three_pointers_attempted, free_throws_made, free_throws_attempted,
+         total_minutes, total_points, total_rebounds, total_assists, total_steals, total_blocks,
+         total_turnovers)
+        SELECT DISTINCT ON (player_id, season_id)
+               player_id, season_id, team_id, games,
+               minutes / games, points::DOUBLE PRECISION / games, rebounds::DOUBLE PRECISION / games,
+               assists::DOUBLE PRECISION / games, steals::DOUBLE PRECISION / games,
+               blocks::DOUBLE PRECISION / games, turnovers::DOUBLE PRECISION / games,
+               fg_made, fg_attempted, three_made, three_attempted, ft_made, ft_attempted,
+               minutes, points, rebounds, assists, steals, blocks, turnovers
+        FROM (
+            SELECT player_id, season_id, team_id, MIN(stage_seq) AS first_seq,
+                   SUM(games) AS games, SUM(minutes) AS minutes, SUM(points) AS points,
+                   SUM(rebounds) AS rebounds, SUM(assists) AS assists, SUM(steals) AS steals,
+                   SUM(blocks) AS blocks, SUM(turnovers) AS turnovers,
+                   SUM(fg_made) AS fg_made, SUM(fg_attempted) AS fg_attempted,
+                   SUM(three_made) AS three_made, SUM(three_attempted) AS three_attempted,
+                   SUM(ft_made) AS ft_made, SUM(ft_attempted) AS ft_attempted
+            FROM staging_player_stat_partials
+            GROUP BY player_id, season_id, team_id
+        ) totals
+        WHERE games > 0
+        ORDER BY player_id, season_id, first_seq DESC
+        ON CONFLICT (player_id, season_id)
+        DO UPDATE SET
+            team_id = EXCLUDED.team_id,
+            games_played = EXCLUDED.games_played,
+            minutes_played = EXCLUDED.minutes_played,
+            points = EXCLUDED.points,
+            rebounds = EXCLUDED.rebounds,
+            assists = EXCLUDED.assists,
+            steals = EXCLUDED.steals,
+            blocks = EXCLUDED.blocks,
+            turnovers = EXCLUDED.turnovers,
+            field_goals_made = EXCLUDED.field_goals_made,
+            field_goals_attempted = EXCLUDED.field_goals_attempted,
+            three_pointers_made = EXCLUDED.three_pointers_made,
+            three_pointers_attempted = EXCLUDED.three_pointers_attempted,
+            free_throws_made = EXCLUDED.free_throws_made,
+            free_throws_attempted = EXCLUDED.free_throws_attempted,
+            total_minutes = EXCLUDED.total_minutes,
+            total_points = EXCLUDED.total_points,
+            total_rebounds = EXCLUDED.total_rebounds,
+            total_assists = EXCLUDED.total_assists,
+            total_steals = EXCLUDED.total_steals,
+            total_blocks = EXCLUDED.total_blocks,
+            total_turnovers = EXCLUDED.total_turnovers,
+            updated_at = CURRENT_TIMESTAMP
+    """,
+    'staging_team_stat_partials': """
+        INSERT INTO team_season_stats
+        (team_id, season_id, wins, losses, win_percentage, points_per_game, points_allowed_per_game,
+         games_played, total_points, total_points_allowed)
+        SELECT team_id, season_id, SUM(wins), SUM(losses),
+               SUM(wins)::DOUBLE PRECISION / SUM(games),
+               SUM(points)::DOUBLE PRECISION / SUM(games),
+               SUM(points_allowed)::DOUBLE PRECISION / SUM(games),
+               SUM(games), SUM(points), SUM(points_allowed)
+        FROM staging_team_stat_partials
+        GROUP BY team_id, season_id
+        HAVING SUM(games) > 0
+        ON CONFLICT (team_id, season_id)
+        DO UPDATE SET
+            wins = EXCLUDED.wins,
+            losses = EXCLUDED.losses,
+            win_percentage = EXCLUDED.win_percentage,
+            points_per_game = EXCLUDED.points_per_game,
+            points_allowed_per_game = EXCLUDED.points_allowed_per_game,
+            games_played = EXCLUDED.games_played,
+            total_points = EXCLUDED.total_points,
+            total_points_allowed = EXCLUDED.total_points_allowed,
+            updated_at = CURRENT_TIMESTAMP
+    """,
+    # Deltas add onto the running totals kept by incremental loads; the
+    # season stats rows are then recomputed from the totals
+    'staging_player_stat_deltas': """
+        INSERT INTO load_player_stat_totals AS t
+        (player_id, season_id, team_id, first_row, games, minutes, points, rebounds, assists,
+         steals, blocks, turnovers, fg_made, fg_attempted, three_made, three_attempted,
+         ft_made, ft_attempted)
+        SELECT player_id, season_id, team_id, first_row, games, minutes, points, rebounds, assists,
+               steals, blocks, turnovers, fg_made, fg_attempted, three_made, three_attempted,
+               ft_made, ft_attempted
+        FROM staging_player_stat_deltas
+        ON CONFLICT (player_id, season_id, COALESCE(team_id, 0))
+        DO UPDATE SET
+            first_row = LEAST(t.first_row, EXCLUDED.first_row),
+            games = t.games + EXCLUDED.games,
+            minutes = t.minutes + EXCLUDED.minutes,
+            points = t.points + EXCLUDED.points,
+            rebounds = t.rebounds + EXCLUDED.rebounds,
+            assists = t.assists + EXCLUDED.assists,
+            steals = t.steals + EXCLUDED.steals,
+            blocks = t.blocks + EXCLUDED.blocks,
+            turnovers = t.turnovers + EXCLUDED.turnovers,
+            fg_made = t.fg_made + EXCLUDED.fg_made,
+            fg_attempted = t.fg_attempted + EXCLUDED.fg_attempted,
+            three_made = t.three_made + EXCLUDED.three_made,
+            three_attempted = t.three_attempted + EXCLUDED.three_attempted,
+            ft_made = t.ft_made + EXCLUDED.ft_made,
+            ft_attempted = t.ft_attempted + EXCLUDED.ft_attempted
+    """,
+    'staging_team_stat_deltas': """
+        INSERT INTO load_team_stat_totals AS t
+        (team_id, season_id, games, wins, losses, points, points_allowed)
+        SELECT team_id, season_id, games, wins, losses, points, points_allowed
+        FROM staging_team_stat_deltas
+        ON CONFLICT (team_id, season_id)
+        DO UPDATE SET
+            games = t.games + EXCLUDED.games,
+            wins = t.wins + EXCLUDED.wins,
+            losses = t.losses + EXCLUDED.losses,
+            points = t.points + EXCLUDED.points,
+            points_allowed = t.points_allowed + EXCLUDED.points_allowed
+    """,
+}
+
+
+def format_copy_value(value):
+    """Encode one value for COPY's text format"""
+    if value is None:
+        return '\\N'
+    text = str(value)
+    return (text.replace('\\', '\\\\')
+                .replace('\t', '\\t')
+                .replace('\n', '\\n')
+                .replace('\r', '\\r'))
+
+
+class CopyRowStream(io.TextIOBase):
+    """
+    Read-only file object that encodes rows into COPY text format on demand.
+
+    copy_expert pulls fixed-size chunks via read(), so rows are formatted
+    lazily and the full payload is never materialized in memory.
+    """
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._buffer = ''
+        self.rows_written = 0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._buffer += '\t'.join(format_copy_value(value) for value in row) + '\n'
+            self.rows_written += 1
+        if size < 0:
+            chunk, self._buffer = self._buffer, ''
+        else:
+            chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+
+def ensure_staging_tables(conn):
+    """Create the unlogged staging tables, adding columns missing from older copies"""
+    cursor = conn.cursor()
+    for table, columns in STAGING_TABLES.items():
+        cursor.execute(f"CREATE UNLOGGED TABLE IF NOT EXISTS {table} ({columns})")
+        for column in filter(None, (line.strip().rstrip(',') for line in columns.splitlines())):
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column}")
+    conn.commit()
+
+
+def copy_rows(cursor, table, columns, rows):
+    """
+    Stream rows into a table with COPY FROM STDIN
+
+    Args:
+        cursor: psycopg2 cursor
+        table: Target table name
+        columns: Column names, in row order
+        rows: Iterable of row tuples
+
+    Returns:
+        Number of rows copied
+    """
+    stream = CopyRowStream(rows)
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT text)",
+        stream
+    )
+    return stream.rows_written
+
+
+def copy_merge(conn, staging_table, columns, rows, before_merge=None, after_merge=None):
+    """
+    Load rows into a staging table and merge them into the core table
+    in a single transaction
+
+    Args:
+        conn: psycopg2 connection
+        staging_table: Key of STAGING_TABLES / MERGE_SQL
+        columns: Column names, in row order
+        rows: Iterable of row tuples
+        before_merge: Optional callable(cursor) run in the same transaction
+            before the staged rows are merged
+        after_merge: Optional callable(cursor) run in the same transaction
+            after the merge, while the staged rows are still readable
+
+    Returns:
+        Tuple of (rows copied, rows inserted or updated)
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"TRUNCATE {staging_table} RESTART IDENTITY")
+        copied = copy_rows(cursor, staging_table, columns, rows)
+        if before_merge is not None:
+            before_merge(cursor)
+        cursor.execute(MERGE_SQL[staging_table])
+        merged = cursor.rowcount
+        if after_merge is not None:
+            after_merge(cursor)
+        cursor.execute(f"TRUNCATE {staging_table}")
+        conn.commit()
+        return copied, merged
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def truncate_staging(conn, staging_table):
+    """Empty a staging table and reset its sequence"""
+    cursor = conn.cursor()
+    cursor.execute(f"TRUNCATE {staging_table} RESTART IDENTITY")
+    conn.commit()
+    cursor.close()
+
+
+def append_staging(conn, staging_table, columns, rows, mode='copy'):
+    """
+    Append rows to a staging table without merging, committing once
+
+    Args:
+        conn: psycopg2 connection
+        staging_table: Staging table name
+        columns: Column names, in row order
+        rows: Iterable of row tuples
+        mode: 'copy' for COPY FROM STDIN, 'batch' for execute_batch INSERTs
+
+    Returns:
+        Number of rows appended
+    """
+    cursor = conn.cursor()
+    try:
+        if mode == 'copy':
+            appended = copy_rows(cursor, staging_table, columns, rows)
+        else:
+            rows = list(rows)
+            placeholders = ', '.join(['%s'] * len(columns))
+            execute_batch(cursor, f"INSERT INTO {staging_table} ({', '.join(columns)}) "
+                                  f"VALUES ({placeholders})", rows)
+            appended = len(rows)
+        conn.commit()
+        return appended
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def merge_staging(conn, staging_table):
+    """
+    Merge everything accumulated in a staging table into its core table
+    and empty the staging table, in one transaction
+
+    Returns:
+        Number of rows inserted or updated
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(MERGE_SQL[staging_table])
+        merged = cursor.rowcount
+        cursor.execute(f"TRUNCATE {staging_table}")
+        conn.commit()
+        return merged
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
@@ -15,6 +15,8 @@ export default function ComparePlayers() {
   const [error, setError] = useState(null)
   const [searchTerm1, setSearchTerm1] = useState('')
   const [searchTerm2, setSearchTerm2] = useState('')
+  const [similar, setSimilar] = useState(null)
+  const [similarLoading, setSimilarLoading] = useState(false)
 
   useEffect(() => {
     fetchPlayers()
@@ -39,9 +41,18 @@ export default function ComparePlayers() {
 
   const fetchPlayers = async () => {
     try {
-      const response = await fetch(`${API_BASE}/player`)
-      const data = await response.json()
-      setPlayers(data.players || [])
+      // The list is paginated; follow next_cursor to fill the dropdown
+      const all = []
+      let cursor = null
+      do {
+        const params = new URLSearchParams({ limit: '500', fields: 'id,player_name,position' })
+        if (cursor) params.set('cursor', cursor)
+        const response = await fetch(`${API_BASE}/player?${params}`)
+        const data = await response.json()
+        all.push(...(data.players || []))
+        cursor = data.next_cursor
+      } while (cursor)
+      setPlayers(all)
     } catch (err) {
       console.error('Error fetching players:', err)
     }
@@ -75,6 +86,29 @@ export default function ComparePlayers() {
     }
   }
 
+  const findSimilarPlayers = async () => {
+    if (!player1Id) return
+
+    try {
+      setSimilarLoading(true)
+      setError(null)
+
+      const response = await fetch(`${API_BASE}/player/${player1Id}/similar?season_id=3&k=5`)
+      if (!response.ok) {
+        const data = await response.json()
+        throw new Error(data.detail || 'Failed to find comparable players')
+      }
+      const data = await response.json()
+      setSimilar(data.similar)
+    } catch (err) {
+      setSimilar(null)
+      setError(err.message)
+      console.error('Error finding similar players:', err)
+    } finally {
+      setSimilarLoading(false)
+    }
+  }
+
   const filteredPlayers1 = players.filter(p => 
     p.player_name.toLowerCase().includes(searchTerm1.toLowerCase())
   )
@@ -167,7 +201,10 @@ export default function ComparePlayers() {
             />
             <select
               value={player1Id}
-              onChange={(e) => setPlayer1Id(e.target.value)}
+              onChange={(e) => {
+                setPlayer1Id(e.target.value)
+                setSimilar(null)
+              }}
               style={{
                 width: '100%',
                 padding: '10px',
@@ -183,6 +220,52 @@ export default function ComparePlayers() {
                 </option>
               ))}
             </select>
+            <button
+              className="btn btn-secondary"
+              onClick={findSimilarPlayers}
+              disabled={similarLoading || !player1Id}
+              style={{ width: '100%', marginTop: '12px' }}
+            >
+              {similarLoading ? 'Searching...' : '🔍 Find comparable players'}
+            </button>
+            {similar && (
+              <div style={{ marginTop: '12px' }}>
+                {similar.length === 0 && (
+                  <p style={{ color: '#6b7280', fontSize: '14px' }}>No comparable players found.</p>
+                )}
+                {similar.map((match) => (
+                  <div
+                    key={`${match.player_id}-${match.season_id}`}
+                    style={{
+                      display: 'flex',
+                      justifyContent: 'space-between',
+                      alignItems: 'center',
+                      padding: '8px 0',
+                      borderBottom: '1px solid #e5e7eb',
+                      fontSize: '14px'
+                    }}
+                  >
+                    <span>
+                      <strong>{match.player_name}</strong>{' '}
+                      <span style={{ color: '#6b7280' }}>
+                        {match.position || 'N/A'} | Season {match.season_id} | {match.points_per_game?.toFixed(1)} PPG
+                      </span>
+                    </span>
+                    <button
+                      className="btn btn-primary"
+                      onClick={() => {
+                        // Narrow the Player 2 list so the dropdown shows the match
+                        setSearchTerm2(match.player_name)
+                        setPlayer2Id(String(match.player_id))
+                      }}
+                      style={{ padding: '4px 12px', fontSize: '12px' }}
+                    >
+                      Compare
+                    </button>
+                  </div>
+                ))}
+              </div>
+            )}
           </div>
 
           {/* Player 2 Selection */}
@@ -25,36 +25,18 @@ export default function Dashboard() {
     try {
       setLoading(true)
       
-      // Fetch player leaderboards
-      const pointsRes = await fetch(`${API_BASE}/leaderboard/points?season_id=3&limit=10`)
-      const pointsData = await pointsRes.json()
+      // Every leaderboard in one request; repeat visits revalidate with
+      // the ETag and get a 304 when nothing has changed
+      const res = await fetch(`${API_BASE}/dashboard?season_id=3&limit=10`)
+      const data = await res.json()
       
-      const assistsRes = await fetch(`${API_BASE}/leaderboard/assists?season_id=3&limit=10`)
-      const assistsData = await assistsRes.json()
-      
-      const reboundsRes = await fetch(`${API_BASE}/leaderboard/rebounds?season_id=3&limit=10`)
-      const reboundsData = await reboundsRes.json()
-      
-      const stealsRes = await fetch(`${API_BASE}/leaderboard/steals?season_id=3&limit=10`)
-      const stealsData = await stealsRes.json()
-      
-      // Fetch team leaderboards
-      const teamWinsRes = await fetch(`${API_BASE}/leaderboard/team/wins?limit=10`)
-      const teamWinsData = await teamWinsRes.json()
-      
-      const teamAvgWinsRes = await fetch(`${API_BASE}/leaderboard/team/avg-wins?limit=10`)
-      const teamAvgWinsData = await teamAvgWinsRes.json()
-      
-      const teamPointsRes = await fetch(`${API_BASE}/leaderboard/team/points?limit=10`)
-      const teamPointsData = await teamPointsRes.json()
-      
-      setPointsLeaderboard(pointsData.leaderboard || [])
-      setAssistsLeaderboard(assistsData.leaderboard || [])
-      setReboundsLeaderboard(reboundsData.leaderboard || [])
-      setStealsLeaderboard(stealsData.leaderboard || [])
-      setTeamWinsLeaderboard(teamWinsData.leaderboard || [])
-      setTeamAvgWinsLeaderboard(teamAvgWinsData.leaderboard || [])
-      setTeamPointsLeaderboard(teamPointsData.leaderboard || [])
+      setPointsLeaderboard(data.points || [])
+      setAssistsLeaderboard(data.assists || [])
+      setReboundsLeaderboard(data.rebounds || [])
+      setStealsLeaderboard(data.steals || [])
+      setTeamWinsLeaderboard(data.team_wins || [])
+      setTeamAvgWinsLeaderboard(data.team_avg_wins || [])
+      setTeamPointsLeaderboard(data.team_points || [])
       setError(null)
     } catch (err) {
       setError('Failed to load leaderboards. Make sure the API is running.')
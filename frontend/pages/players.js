@@ -11,22 +11,27 @@ export default function Players() {
   const [searchQuery, setSearchQuery] = useState('')
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState(null)
+  const [nextCursor, setNextCursor] = useState(null)
+  const [activeQuery, setActiveQuery] = useState('')
 
   useEffect(() => {
     fetchPlayers()
   }, [])
 
-  const fetchPlayers = async (query = '') => {
+  const fetchPlayers = async (query = '', cursor = null) => {
     try {
       setLoading(true)
-      const url = query 
-        ? `${API_BASE}/player?name=${encodeURIComponent(query)}`
-        : `${API_BASE}/player`
+      const params = new URLSearchParams()
+      if (query) params.set('name', query)
+      if (cursor) params.set('cursor', cursor)
       
-      const res = await fetch(url)
+      const res = await fetch(`${API_BASE}/player?${params}`)
       const data = await res.json()
       
-      setPlayers(data.players || [])
+      // A cursor means "append the next page" to what is already shown
+      setPlayers(cursor ? (prev) => [...prev, ...(data.players || [])] : (data.players || []))
+      setNextCursor(data.next_cursor || null)
+      setActiveQuery(query)
       setError(null)
     } catch (err) {
       setError('Failed to load players. Make sure the API is running.')
@@ -121,7 +126,7 @@ export default function Players() {
             </div>
           </div>
 
-          {loading ? (
+          {loading && players.length === 0 ? (
             <p>Loading players...</p>
           ) : players.length > 0 ? (
             <table className="table">
@@ -169,6 +174,17 @@ export default function Players() {
               </Link>.
             </p>
           )}
+
+          {nextCursor && (
+            <button
+              className="btn btn-secondary"
+              style={{ marginTop: '16px' }}
+              disabled={loading}
+              onClick={() => fetchPlayers(activeQuery, nextCursor)}
+            >
+              {loading ? 'Loading...' : 'Load More'}
+            </button>
+          )}
         </div>
       </div>
     </div>
@@ -26,9 +26,18 @@ export default function UpdatePlayer() {
 
   const fetchPlayers = async () => {
     try {
-      const res = await fetch(`${API_BASE}/player`)
-      const data = await res.json()
-      setPlayers(data.players || [])
+      // The list is paginated; follow next_cursor to fill the dropdown
+      const all = []
+      let cursor = null
+      do {
+        const params = new URLSearchParams({ limit: '500', fields: 'id,player_name' })
+        if (cursor) params.set('cursor', cursor)
+        const res = await fetch(`${API_BASE}/player?${params}`)
+        const data = await res.json()
+        all.push(...(data.players || []))
+        cursor = data.next_cursor
+      } while (cursor)
+      setPlayers(all)
     } catch (err) {
       console.error('Error fetching players:', err)
     }
@@ -12,28 +12,29 @@ export default function Visualize() {
   const [reboundsLeaders, setReboundsLeaders] = useState([])
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState(null)
+  const [distributionStat, setDistributionStat] = useState('points')
+  const [distributionPosition, setDistributionPosition] = useState('')
+  const [distribution, setDistribution] = useState(null)
 
   useEffect(() => {
     fetchData()
   }, [])
 
+  useEffect(() => {
+    fetchDistribution()
+  }, [distributionStat, distributionPosition])
+
   const fetchData = async () => {
     try {
       setLoading(true)
       
-      const [pointsRes, assistsRes, reboundsRes] = await Promise.all([
-        fetch(`${API_BASE}/leaderboard/points?season_id=3&limit=10`),
-        fetch(`${API_BASE}/leaderboard/assists?season_id=3&limit=10`),
-        fetch(`${API_BASE}/leaderboard/rebounds?season_id=3&limit=10`)
-      ])
-      
-      const pointsData = await pointsRes.json()
-      const assistsData = await assistsRes.json()
-      const reboundsData = await reboundsRes.json()
+      // Same payload as the dashboard, so a visit after it is a 304
+      const res = await fetch(`${API_BASE}/dashboard?season_id=3&limit=10`)
+      const data = await res.json()
       
-      setPointsLeaders(pointsData.leaderboard || [])
-      setAssistsLeaders(assistsData.leaderboard || [])
-      setReboundsLeaders(reboundsData.leaderboard || [])
+      setPointsLeaders(data.points || [])
+      setAssistsLeaders(data.assists || [])
+      setReboundsLeaders(data.rebounds || [])
       setError(null)
     } catch (err) {
       setError('Failed to load data')
@@ -43,6 +44,48 @@ export default function Visualize() {
     }
   }
 
+  const fetchDistribution = async () => {
+    try {
+      const params = new URLSearchParams({ season_id: '3', bins: '15' })
+      if (distributionPosition) params.set('position', distributionPosition)
+      const res = await fetch(`${API_BASE}/distribution/${distributionStat}?${params}`)
+      setDistribution(res.ok ? await res.json() : null)
+    } catch (err) {
+      setDistribution(null)
+      console.error('Error fetching distribution:', err)
+    }
+  }
+
+  const Histogram = ({ data, average, color }) => {
+    const maxCount = Math.max(...data.map((bucket) => bucket.count), 1)
+    return (
+      <div>
+        <div style={{ display: 'flex', alignItems: 'flex-end', gap: '4px', height: '160px' }}>
+          {data.map((bucket, idx) => {
+            const holdsAverage = average >= bucket.low && (average < bucket.high || idx === data.length - 1)
+            return (
+              <div
+                key={idx}
+                title={`${bucket.low.toFixed(1)} - ${bucket.high.toFixed(1)}: ${bucket.count} players`}
+                style={{
+                  flex: 1,
+                  height: `${(bucket.count / maxCount) * 100}%`,
+                  minHeight: bucket.count ? '2px' : '0',
+                  backgroundColor: holdsAverage ? '#f59e0b' : color,
+                  borderRadius: '4px 4px 0 0'
+                }}
+              />
+            )
+          })}
+        </div>
+        <div style={{ display: 'flex', justifyContent: 'space-between', fontSize: '12px', color: '#6b7280', marginTop: '4px' }}>
+          <span>{data[0]?.low.toFixed(1)}</span>
+          <span>{data[data.length - 1]?.high.toFixed(1)}</span>
+        </div>
+      </div>
+    )
+  }
+
   const BarChart = ({ data, valueKey, nameKey, color, maxValue }) => {
     return (
       <div style={{ width: '100%' }}>
@@ -207,6 +250,72 @@ export default function Visualize() {
               </div>
             </div>
 
+            {/* League Distribution */}
+            <div className="card" style={{ marginTop: '20px' }}>
+              <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center', marginBottom: '16px' }}>
+                <h2 style={{ fontSize: '20px', fontWeight: 'bold' }}>
+                  📈 League Distribution
+                </h2>
+                <div style={{ display: 'flex', gap: '8px' }}>
+                  <select
+                    value={distributionStat}
+                    onChange={(e) => setDistributionStat(e.target.value)}
+                    style={{ padding: '6px', border: '1px solid #d1d5db', borderRadius: '8px', fontSize: '14px' }}
+                  >
+                    <option value="points">Points</option>
+                    <option value="rebounds">Rebounds</option>
+                    <option value="assists">Assists</option>
+                    <option value="steals">Steals</option>
+                    <option value="blocks">Blocks</option>
+                    <option value="efficiency">Efficiency</option>
+                  </select>
+                  <select
+                    value={distributionPosition}
+                    onChange={(e) => setDistributionPosition(e.target.value)}
+                    style={{ padding: '6px', border: '1px solid #d1d5db', borderRadius: '8px', fontSize: '14px' }}
+                  >
+                    <option value="">All positions</option>
+                    <option value="G">Guards</option>
+                    <option value="F">Forwards</option>
+                    <option value="C">Centers</option>
+                  </select>
+                </div>
+              </div>
+              {distribution ? (
+                <div>
+                  <Histogram data={distribution.histogram} average={distribution.league_average} color="#8b5cf6" />
+                  <div style={{ display: 'grid', gridTemplateColumns: 'repeat(4, 1fr)', gap: '16px', marginTop: '16px', textAlign: 'center' }}>
+                    <div>
+                      <div style={{ fontSize: '20px', fontWeight: 'bold', color: '#f59e0b' }}>
+                        {distribution.league_average.toFixed(1)}
+                      </div>
+                      <div style={{ fontSize: '13px', color: '#6b7280' }}>League Average</div>
+                    </div>
+                    <div>
+                      <div style={{ fontSize: '20px', fontWeight: 'bold', color: '#1f2937' }}>
+                        {distribution.quantiles['50'].toFixed(1)}
+                      </div>
+                      <div style={{ fontSize: '13px', color: '#6b7280' }}>Median</div>
+                    </div>
+                    <div>
+                      <div style={{ fontSize: '20px', fontWeight: 'bold', color: '#1f2937' }}>
+                        {distribution.quantiles['90'].toFixed(1)}
+                      </div>
+                      <div style={{ fontSize: '13px', color: '#6b7280' }}>90th Percentile</div>
+                    </div>
+                    <div>
+                      <div style={{ fontSize: '20px', fontWeight: 'bold', color: '#1f2937' }}>
+                        {distribution.sample_size}
+                      </div>
+                      <div style={{ fontSize: '13px', color: '#6b7280' }}>Players</div>
+                    </div>
+                  </div>
+                </div>
+              ) : (
+                <p style={{ color: '#6b7280', fontSize: '14px' }}>No distribution available for this selection.</p>
+              )}
+            </div>
+
             {/* Insights */}
             <div className="card" style={{ marginTop: '20px' }}>
               <h2 style={{ fontSize: '20px', fontWeight: 'bold', marginBottom: '16px' }}>
@@ -0,0 +1,497 @@
+"""
+CourtVision Incremental Ingestion Module
+Resumable loads that only process CSV rows added since the last run
+Author: CS3620 Student
+"""
+
+import csv
+import hashlib
+import os
+import time
+
+import load_data
+from copy_ingest import MERGE_SQL, copy_merge, copy_rows
+
+# Loader bookkeeping tables. Unlike the staging tables these are logged:
+# they must survive a crash for the next run to resume from them. The
+# running totals are also in schema.sql, since apply_game_box_scores() adds
+# to them too; they are created here for databases from an older schema.
+LOAD_STATE_TABLES = {
+    # One row per CSV file: how far into it the last committed chunk got
+    'load_state': """
+        file_name VARCHAR(255) PRIMARY KEY,
+        file_size BIGINT NOT NULL,
+        file_mtime DOUBLE PRECISION NOT NULL,
+        content_hash CHAR(64) NOT NULL,
+        byte_offset BIGINT NOT NULL,
+        rows_processed BIGINT NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    """,
+    # Exact running sums behind player_season_stats, which only keeps
+    # rounded averages; first_row orders keys like the full loader does
+    'load_player_stat_totals': """
+        player_id INTEGER NOT NULL,
+        season_id INTEGER NOT NULL,
+        team_id INTEGER,
+        first_row BIGINT NOT NULL,
+        games INTEGER NOT NULL,
+        minutes DOUBLE PRECISION NOT NULL,
+        points BIGINT NOT NULL,
+        rebounds BIGINT NOT NULL,
+        assists BIGINT NOT NULL,
+        steals BIGINT NOT NULL,
+        blocks BIGINT NOT NULL,
+        turnovers BIGINT NOT NULL,
+        fg_made BIGINT NOT NULL,
+        fg_attempted BIGINT NOT NULL,
+        three_made BIGINT NOT NULL,
+        three_attempted BIGINT NOT NULL,
+        ft_made BIGINT NOT NULL,
+        ft_attempted BIGINT NOT NULL
+    """,
+    'load_team_stat_totals': """
+        team_id INTEGER NOT NULL,
+        season_id INTEGER NOT NULL,
+        games INTEGER NOT NULL,
+        wins INTEGER NOT NULL,
+        losses INTEGER NOT NULL,
+        points BIGINT NOT NULL,
+        points_allowed BIGINT NOT NULL,
+        PRIMARY KEY (team_id, season_id)
+    """,
+}
+
+LOAD_STATE_INDEXES = (
+    # team_id is NULL for players whose team is unknown
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_load_player_stat_totals_key "
+    "ON load_player_stat_totals (player_id, season_id, COALESCE(team_id, 0))",
+)
+
+# Recompute the season stats rows touched by the staged deltas from the
+# running totals. Conflict handling matches the full loader's merges.
+RECOMPUTE_PLAYER_SEASON_STATS_SQL = """
+    INSERT INTO player_season_stats
+    (player_id, season_id, team_id, games_played, minutes_played, points, rebounds, assists,
+     steals, blocks, turnovers, field_goals_made, field_goals_attempted,
+     three_pointers_made, three_pointers_attempted, free_throws_made, free_throws_attempted,
+     total_minutes, total_points, total_rebounds, total_assists, total_steals, total_blocks,
+     total_turnovers)
+    SELECT DISTINCT ON (t.player_id, t.season_id)
+           t.player_id, t.season_id, t.team_id, t.games,
+           t.minutes / t.games, t.points::DOUBLE PRECISION / t.games,
+           t.rebounds::DOUBLE PRECISION / t.games, t.assists::DOUBLE PRECISION / t.games,
+           t.steals::DOUBLE PRECISION / t.games, t.blocks::DOUBLE PRECISION / t.games,
+           t.turnovers::DOUBLE PRECISION / t.games,
+           t.fg_made, t.fg_attempted, t.three_made, t.three_attempted, t.ft_made, t.ft_attempted,
+           t.minutes, t.points, t.rebounds, t.assists, t.steals, t.blocks, t.turnovers
+    FROM load_player_stat_totals t
+    WHERE (t.player_id, t.season_id) IN (SELECT player_id, season_id FROM staging_player_stat_deltas)
+      AND t.games > 0
+    ORDER BY t.player_id, t.season_id, t.first_row DESC
+    ON CONFLICT (player_id, season_id)
+    DO UPDATE SET
+        team_id = EXCLUDED.team_id,
+        games_played = EXCLUDED.games_played,
+        minutes_played = EXCLUDED.minutes_played,
+        points = EXCLUDED.points,
+        rebounds = EXCLUDED.rebounds,
+        assists = EXCLUDED.assists,
+        steals = EXCLUDED.steals,
+        blocks = EXCLUDED.blocks,
+        turnovers = EXCLUDED.turnovers,
+        field_goals_made = EXCLUDED.field_goals_made,
+        field_goals_attempted = EXCLUDED.field_goals_attempted,
+        three_pointers_made = EXCLUDED.three_pointers_made,
+        three_pointers_attempted = EXCLUDED.three_pointers_attempted,
+        free_throws_made = EXCLUDED.free_throws_made,
+        free_throws_attempted = EXCLUDED.free_throws_attempted,
+        total_minutes = EXCLUDED.total_minutes,
+        total_points = EXCLUDED.total_points,
+        total_rebounds = EXCLUDED.total_rebounds,
+        total_assists = EXCLUDED.total_assists,
+        total_steals = EXCLUDED.total_steals,
+        total_blocks = EXCLUDED.total_blocks,
+        total_turnovers = EXCLUDED.total_turnovers,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+RECOMPUTE_TEAM_SEASON_STATS_SQL = """
+    INSERT INTO team_season_stats
+    (team_id, season_id, wins, losses, win_percentage, points_per_game, points_allowed_per_game,
+     games_played, total_points, total_points_allowed)
+    SELECT t.team_id, t.season_id, t.wins, t.losses,
+           t.wins::DOUBLE PRECISION / t.games,
+           t.points::DOUBLE PRECISION / t.games,
+           t.points_allowed::DOUBLE PRECISION / t.games,
+           t.games, t.points, t.points_allowed
+    FROM load_team_stat_totals t
+    JOIN staging_team_stat_deltas d ON d.team_id = t.team_id AND d.season_id = t.season_id
+    WHERE t.games > 0
+    ON CONFLICT (team_id, season_id)
+    DO UPDATE SET
+        wins = EXCLUDED.wins,
+        losses = EXCLUDED.losses,
+        win_percentage = EXCLUDED.win_percentage,
+        points_per_game = EXCLUDED.points_per_game,
+        points_allowed_per_game = EXCLUDED.points_allowed_per_game,
+        games_played = EXCLUDED.games_played,
+        total_points = EXCLUDED.total_points,
+        total_points_allowed = EXCLUDED.total_points_allowed,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+# Season stats rows built from a file's running totals, deleted with the
+# totals when the file is rewritten so keys missing from the new file go too
+RESET_SEASON_STATS_SQL = {
+    'load_player_stat_totals': """
+        DELETE FROM player_season_stats s
+        USING load_player_stat_totals t
+        WHERE s.player_id = t.player_id AND s.season_id = t.season_id
+    """,
+    'load_team_stat_totals': """
+        DELETE FROM team_season_stats s
+        USING load_team_stat_totals t
+        WHERE s.team_id = t.team_id AND s.season_id = t.season_id
+    """,
+}
+
+# Bytes before the checkpoint that are hashed to detect a rewritten file
+ANCHOR_BYTES = 1024 * 1024
+
+PLAYERS_CSV = 'datasets/Players.csv'
+GAMES_CSV = 'datasets/Games.csv'
+PLAYER_STATS_CSV = 'datasets/PlayerStatistics.csv'
+TEAM_STATS_CSV = 'datasets/TeamStatistics.csv'
+
+
+def ensure_load_state_tables(conn):
+    """Create the load-state and running-total tables if they do not exist yet"""
+    cursor = conn.cursor()
+    for table, columns in LOAD_STATE_TABLES.items():
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+    for statement in LOAD_STATE_INDEXES:
+        cursor.execute(statement)
+    conn.commit()
+
+
+class FileCheckpoint:
+    """
+    Load progress for one CSV file, persisted in load_state
+
+    The file is fingerprinted by size, mtime and a hash of its header plus
+    the ANCHOR_BYTES before the checkpoint. A file that only grew past the
+    checkpoint is resumed from it; a file whose checkpointed prefix changed
+    is treated as rewritten and loaded again from the start.
+    """
+
+    def __init__(self, conn, path):
+        self.conn = conn
+        self.path = path
+        stat = os.stat(path)
+        # Rows appended while this run is in progress are left for the next one
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        with open(path, 'rb') as f:
+            self.header = f.readline()
+
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT file_size, file_mtime, content_hash, byte_offset, rows_processed
+            FROM load_state WHERE file_name = %s
+        """, (path,))
+        state = cursor.fetchone()
+        cursor.close()
+
+        if state is None:
+            self.status = 'new'
+            self.byte_offset, self.rows_processed = 0, 0
+            self.read_offset = 0
+            return
+
+        size, mtime, content_hash, byte_offset, rows_processed = state
+        if size == self.size and mtime == self.mtime and byte_offset == self.size:
+            self.status = 'unchanged'
+        elif byte_offset <= self.size and self.content_hash(byte_offset) == content_hash:
+            self.status = 'resume' if byte_offset < size else 'append'
+        else:
+            self.status = 'rewritten'
+            byte_offset, rows_processed = 0, 0
+        self.byte_offset, self.rows_processed = byte_offset, rows_processed
+        self.read_offset = byte_offset
+
+    @property
+    def pending(self):
+        """Whether there is anything past the checkpoint to load"""
+        return self.status != 'unchanged' and self.byte_offset < self.size
+
+    def content_hash(self, byte_offset):
+        """Hash of the header line and the ANCHOR_BYTES preceding byte_offset"""
+        digest = hashlib.sha256(self.header)
+        start = max(len(self.header), byte_offset - ANCHOR_BYTES)
+        if byte_offset > start:
+            with open(self.path, 'rb') as f:
+                f.seek(start)
+                digest.update(f.read(byte_offset - start))
+        return digest.hexdigest()
+
+    def read_rows(self):
+        """
+        Yield (row, byte offset after the row) for each row past the checkpoint
+
+        Rows are parsed line by line so every row has a resumable offset,
+        which assumes no quoted field contains a newline. Blank lines are
+        skipped and short rows padded with None, as csv.DictReader does.
+        A final line without its newline is still being written and is left
+        for the next run.
+        """
+        fieldnames = next(csv.reader([self.header.decode('utf-8')]), [])
+        with open(self.path, 'rb') as f:
+            offset = max(self.byte_offset, len(self.header))
+            f.seek(offset)
+            while offset < self.size:
+                line = f.readline()
+                if not line.endswith(b'\n'):
+                    break
+                offset += len(line)
+                self.read_offset = offset
+                values = next(csv.reader([line.decode('utf-8')]), [])
+                if not values:
+                    continue
+                row = dict(zip(fieldnames, values))
+                for name in fieldnames[len(values):]:
+                    row[name] = None
+                yield row, offset
+
+    def advance(self, cursor, byte_offset, rows):
+        """Record progress inside the caller's transaction, so it commits with the chunk"""
+        self.byte_offset = byte_offset
+        self.rows_processed += rows
+        cursor.execute("""
+            INSERT INTO load_state (file_name, file_size, file_mtime, content_hash, byte_offset,
+                                    rows_processed, updated_at)
+            VALUES (%s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
+            ON CONFLICT (file_name)
+            DO UPDATE SET
+                file_size = EXCLUDED.file_size,
+                file_mtime = EXCLUDED.file_mtime,
+                content_hash = EXCLUDED.content_hash,
+                byte_offset = EXCLUDED.byte_offset,
+                rows_processed = EXCLUDED.rows_processed,
+                updated_at = CURRENT_TIMESTAMP
+        """, (self.path, self.size, self.mtime, self.content_hash(byte_offset), byte_offset,
+              self.rows_processed))
+
+    def complete(self, before=None):
+        """
+        Mark every complete line read as processed in its own transaction
+
+        Args:
+            before: Optional callable(cursor) run first in the same transaction
+        """
+        cursor = self.conn.cursor()
+        if before is not None:
+            before(cursor)
+        # Covers trailing blank lines, which no chunk advanced past
+        self.advance(cursor, max(self.byte_offset, self.read_offset), 0)
+        self.conn.commit()
+        cursor.close()
+
+    def describe(self):
+        """One-line summary for progress output"""
+        if self.status in ('new', 'rewritten'):
+            return f"{self.status} file, loading from the start"
+        if self.status == 'unchanged':
+            return "unchanged, skipping"
+        return (f"{self.status} from byte {self.byte_offset:,} "
+                f"({self.size - self.byte_offset:,} new bytes, {self.rows_processed:,} rows done)")
+
+
+def incremental_players(conn, mode='copy'):
+    """Reload Players.csv only if it changed (the loader keeps its first 1000 rows)"""
+    checkpoint = FileCheckpoint(conn, PLAYERS_CSV)
+    print(f"\n📊 Players: {checkpoint.describe()}")
+    if not checkpoint.pending:
+        return False
+    load_data.load_players(conn, mode)
+    checkpoint.complete()
+    return True
+
+
+def incremental_teams(conn):
+    """Insert teams from TeamStatistics.csv rows past the team stats checkpoint"""
+    checkpoint = FileCheckpoint(conn, TEAM_STATS_CSV)
+    if not checkpoint.pending:
+        return
+    load_data.load_teams(conn, (row for row, _ in checkpoint.read_rows()))
+
+
+def incremental_games(conn, chunk_size=load_data.DEFAULT_CHUNK_SIZE):
+    """Merge Games.csv rows added since the last run, checkpointing every chunk"""
+    checkpoint = FileCheckpoint(conn, GAMES_CSV)
+    print(f"\n📊 Games: {checkpoint.describe()}")
+    if not checkpoint.pending:
+        return 0
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    teams = load_data.get_team_ids(cursor)
+
+    games_loaded = 0
+    rows_read = 0
+    for chunk in load_data.chunked(checkpoint.read_rows(), chunk_size):
+        games = [game for game in (load_data.game_row(row, teams) for row, _ in chunk) if game]
+        end_offset = chunk[-1][1]
+        copy_merge(conn, 'staging_game', load_data.GAME_COLUMNS, games,
+                   after_merge=lambda cursor: checkpoint.advance(cursor, end_offset, len(chunk)))
+        games_loaded += len(games)
+        rows_read += len(chunk)
+    checkpoint.complete()
+    print(f"✓ Merged {games_loaded} games from {rows_read} new rows "
+          f"{load_data.format_rate(rows_read, started)}")
+    return games_loaded
+
+
+def _reset_totals(cursor, table):
+    """
+    Drop running totals built from a file that has since been rewritten,
+    with the season stats rows they produced
+
+    Runs in the transaction of the new file's first chunk, so readers never
+    see the old totals mixed with the new rows.
+
+    Returns:
+        Number of season stats rows deleted
+    """
+    cursor.execute(RESET_SEASON_STATS_SQL[table])
+    deleted = cursor.rowcount
+    cursor.execute(f"TRUNCATE {table}")
+    return deleted
+
+
+def incremental_team_statistics(conn, chunk_size=load_data.DEFAULT_CHUNK_SIZE):
+    """Apply TeamStatistics.csv rows added since the last run as deltas to team_season_stats"""
+    checkpoint = FileCheckpoint(conn, TEAM_STATS_CSV)
+    print(f"\n📊 Team Statistics: {checkpoint.describe()}")
+    if not checkpoint.pending:
+        return 0
+    reset_pending = checkpoint.status == 'rewritten'
+    started = time.perf_counter()
+    teams = load_data.get_team_ids(conn.cursor())
+    seasons = load_data.SeasonResolver(conn)
+
+    updated = 0
+    rows_read = 0
+
+    def reset(cursor):
+        nonlocal updated
+        updated += _reset_totals(cursor, 'load_team_stat_totals')
+
+    for chunk in load_data.chunked(checkpoint.read_rows(), chunk_size):
+        # Resolve (and create) seasons first: SeasonResolver commits
+        keyed = []
+        for row, _ in chunk:
+            key = load_data.team_stat_key(row, teams)
+            if key:
+                team_id, season_year = key
+                keyed.append(((team_id, seasons.for_season_year(season_year)), row))
+        totals = load_data.aggregate(keyed, load_data.TeamStatTotals, float('inf'), None)
+
+        def apply(cursor, end_offset=chunk[-1][1], rows=len(chunk)):
+            nonlocal updated
+            cursor.execute(RECOMPUTE_TEAM_SEASON_STATS_SQL)
+            updated += cursor.rowcount
+            checkpoint.advance(cursor, end_offset, rows)
+
+        copy_merge(conn, 'staging_team_stat_deltas', load_data.TEAM_PARTIAL_COLUMNS,
+                   (key + acc.partial_row() for key, acc in totals.items()),
+                   before_merge=reset if reset_pending else None, after_merge=apply)
+        reset_pending = False
+        rows_read += len(chunk)
+    # A rewritten file with no complete rows still drops its old totals
+    checkpoint.complete(reset if reset_pending else None)
+    print(f"✓ Applied {rows_read} new team box scores, {updated} team-season rows updated "
+          f"{load_data.format_rate(rows_read, started)}")
+    return updated
+
+
+def incremental_player_statistics(conn, chunk_size=load_data.DEFAULT_CHUNK_SIZE):
+    """Apply PlayerStatistics.csv rows added since the last run as deltas to player_season_stats"""
+    checkpoint = FileCheckpoint(conn, PLAYER_STATS_CSV)
+    print(f"\n📊 Player Statistics: {checkpoint.describe()}")
+    if not checkpoint.pending:
+        return 0
+    reset_pending = checkpoint.status == 'rewritten'
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    cursor.execute("SELECT id, player_name FROM player")
+    players = {row[1]: row[0] for row in cursor.fetchall()}
+    teams = load_data.get_team_ids(cursor)
+    # Same season choice as load_player_statistics
+    cursor.execute("SELECT id FROM season WHERE season_year = '2023-24'")
+    season_result = cursor.fetchone()
+    season_id = season_result[0] if season_result else 1
+    cursor.close()
+    # Game logs go to the season of their game date, as in load_player_game_stats
+    seasons = load_data.SeasonResolver(conn)
+    partitions = load_data.GamePartitions(conn)
+
+    updated = 0
+    rows_read = 0
+
+    def reset(cursor):
+        nonlocal updated
+        updated += _reset_totals(cursor, 'load_player_stat_totals')
+
+    for chunk in load_data.chunked(checkpoint.read_rows(), chunk_size):
+        first_rows = {}
+        keyed = []
+        games = []
+        for number, (row, _) in enumerate(chunk, start=checkpoint.rows_processed):
+            key = load_data.player_stat_key(row, players, teams, season_id)
+            if key:
+                first_rows.setdefault(key, number)
+                keyed.append((key, row))
+            game = load_data.player_game_row(row, players, teams, seasons)
+            if game:
+                games.append(game)
+        totals = load_data.aggregate(keyed, load_data.PlayerStatTotals, float('inf'), None)
+        partitions.ensure(games)
+        games.sort(key=lambda game: (game[2], game[1]))
+
+        def apply(cursor, end_offset=chunk[-1][1], rows=len(chunk), games=games):
+            nonlocal updated
+            cursor.execute(RECOMPUTE_PLAYER_SEASON_STATS_SQL)
+            updated += cursor.rowcount
+            # The chunk's game log rows commit with its season deltas
+            cursor.execute("TRUNCATE staging_player_game_stats RESTART IDENTITY")
+            copy_rows(cursor, 'staging_player_game_stats', load_data.PLAYER_GAME_COLUMNS, games)
+            cursor.execute(MERGE_SQL['staging_player_game_stats'])
+            cursor.execute("TRUNCATE staging_player_game_stats")
+            checkpoint.advance(cursor, end_offset, rows)
+
+        copy_merge(conn, 'staging_player_stat_deltas',
+                   load_data.PLAYER_PARTIAL_COLUMNS[:3] + ('first_row',) + load_data.PLAYER_PARTIAL_COLUMNS[3:],
+                   (key + (first_rows[key],) + acc.partial_row() for key, acc in totals.items()),
+                   before_merge=reset if reset_pending else None, after_merge=apply)
+        reset_pending = False
+        rows_read += len(chunk)
+    checkpoint.complete(reset if reset_pending else None)
+    print(f"✓ Applied {rows_read} new box scores, {updated} player-season rows updated "
+          f"{load_data.format_rate(rows_read, started)}")
+    return updated
+
+
+def run_incremental(conn, mode='copy', chunk_size=load_data.DEFAULT_CHUNK_SIZE):
+    """
+    Load only what changed since the last incremental run
+
+    Each chunk's rows, running-total deltas and checkpoint commit together,
+    so an interrupted run resumes after its last committed chunk.
+    """
+    ensure_load_state_tables(conn)
+    incremental_players(conn, mode)
+    incremental_teams(conn)
+    incremental_games(conn, chunk_size)
+    incremental_team_statistics(conn, chunk_size)
+    if incremental_player_statistics(conn, chunk_size):
+        load_data.refresh_leaderboards(conn)
+        load_data.refresh_stat_distributions(conn)
@@ -8,10 +8,20 @@ Date: December 11, 2025
 
 import psycopg2
 from psycopg2.extras import execute_batch
+import argparse
 import csv
 import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
+from copy_ingest import append_staging, copy_merge, ensure_staging_tables, merge_staging, truncate_staging
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 # Load environment variables
 load_dotenv('api/.env')
@@ -25,10 +35,42 @@ DB_CONFIG = {
     'password': os.getenv('DB_PASSWORD', 'postgres')
 }
 
+# Write modes: 'copy' streams rows through COPY into staging tables and merges
+# them set-based; 'batch' is the original row-by-row execute_batch path
+LOAD_MODES = ('copy', 'batch')
+
+# Statistics parsing engines: 'rows' aggregates one csv.DictReader row at a
+# time; 'columnar' parses column batches into NumPy arrays (columnar_stats.py)
+STATS_ENGINES = ('rows', 'columnar')
+
+# Rows per write for streamed tables and spilled partial aggregates
+DEFAULT_CHUNK_SIZE = 10000
+
+# Memory ceiling for in-memory aggregation; beyond it partial sums are
+# spilled to staging tables and combined in the database
+DEFAULT_MEMORY_LIMIT_MB = 256
+
+# Approximate cost of one aggregation key (slots accumulator, key tuple, dict slot)
+ACCUMULATOR_BYTES = 400
+
 def get_connection():
     """Create database connection"""
     return psycopg2.connect(**DB_CONFIG)
 
+def run_with_connection(load_function, *args):
+    """Run a load step on its own connection (psycopg2 connections are not shared across threads)"""
+    conn = get_connection()
+    try:
+        return load_function(conn, *args)
+    finally:
+        conn.close()
+
+def format_rate(rows, started):
+    """Format elapsed time and throughput since started (a time.perf_counter value)"""
+    elapsed = time.perf_counter() - started
+    rate = rows / elapsed if elapsed > 0 else 0
+    return f"in {elapsed:.2f}s ({rate:,.0f} rows/sec)"
+
 def parse_date(date_str):
     """Parse date string to date object"""
     if not date_str or date_str == '':
@@ -75,9 +117,10 @@ def parse_bool(value):
         return False
     return value.lower() in ('true', 't', '1', 'yes')
 
-def load_players(conn):
+def load_players(conn, mode='copy'):
     """Load Players.csv into players_raw and player tables"""
     print("\n📊 Loading Players...")
+    started = time.perf_counter()
     cursor = conn.cursor()
     
     with open('datasets/Players.csv', 'r', encoding='utf-8') as f:
@@ -127,41 +170,52 @@ def load_players(conn):
                     None  # jersey_number
                 ))
         
-        # Insert into players_raw
-        execute_batch(cursor, """
-            INSERT INTO players_raw (player_name, birth_date, height_inches, weight_lbs, college, country, 
-                                    draft_year, draft_round, draft_number)
-            VALUES (%s || ' ' || %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT DO NOTHING
-        """, [(r[0], r[1], r[2], r[3], r[4], r[5], r[6], r[7], r[8], r[9]) for r in raw_data[:1000]])
-        
-        # Insert into player table (avoiding duplicates)
-        execute_batch(cursor, """
-            INSERT INTO player (player_name, birth_date, height_inches, weight_lbs, position, jersey_number)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            ON CONFLICT DO NOTHING
-        """, player_data[:1000])
-        
-        conn.commit()
+        if mode == 'copy':
+            copy_merge(conn, 'staging_players_raw', (
+                'player_name', 'birth_date', 'height_inches', 'weight_lbs', 'college', 'country',
+                'draft_year', 'draft_round', 'draft_number'
+            ), ((f"{r[0]} {r[1]}",) + r[2:] for r in raw_data[:1000]))
+            copy_merge(conn, 'staging_player', (
+                'player_name', 'birth_date', 'height_inches', 'weight_lbs', 'position', 'jersey_number'
+            ), player_data[:1000])
+        else:
+            # Insert into players_raw
+            execute_batch(cursor, """
+                INSERT INTO players_raw (player_name, birth_date, height_inches, weight_lbs, college, country, 
+                                        draft_year, draft_round, draft_number)
+                VALUES (%s || ' ' || %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT DO NOTHING
+            """, [(r[0], r[1], r[2], r[3], r[4], r[5], r[6], r[7], r[8], r[9]) for r in raw_data[:1000]])
+            
+            # Insert into player table (avoiding duplicates)
+            execute_batch(cursor, """
+                INSERT INTO player (player_name, birth_date, height_inches, weight_lbs, position, jersey_number)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON CONFLICT DO NOTHING
+            """, player_data[:1000])
+            
+            conn.commit()
         print(f"✓ Loaded {len(raw_data[:1000])} players into raw table")
-        print(f"✓ Loaded {len(player_data[:1000])} players into player table")
+        print(f"✓ Loaded {len(player_data[:1000])} players into player table "
+              f"{format_rate(len(raw_data[:1000]) + len(player_data[:1000]), started)}")
 
-def load_teams(conn):
-    """Load team data from TeamStatistics.csv"""
+def load_teams(conn, rows=None):
+    """Load team data from TeamStatistics.csv (or just the given rows of it)"""
     print("\n📊 Loading Teams...")
     cursor = conn.cursor()
     
+    if rows is None:
+        rows = read_csv_rows('datasets/TeamStatistics.csv')
+    
     teams = {}
-    with open('datasets/TeamStatistics.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            team_id = row.get('teamId')
-            if team_id and team_id not in teams:
-                teams[team_id] = {
-                    'name': row.get('teamName', ''),
-                    'city': row.get('teamCity', ''),
-                    'id': team_id
-                }
+    for row in rows:
+        team_id = row.get('teamId')
+        if team_id and team_id not in teams:
+            teams[team_id] = {
+                'name': row.get('teamName', ''),
+                'city': row.get('teamCity', ''),
+                'id': team_id
+            }
     
     # Determine conference and division based on city/team name
     conferences = {
@@ -205,63 +259,395 @@ def load_teams(conn):
     conn.commit()
     print(f"✓ Loaded {len(team_data)} teams")
 
-def load_games(conn):
-    """Load Games.csv into game table"""
+# ==========================================
+# STREAMING PIPELINE HELPERS
+# ==========================================
+
+def read_csv_rows(path):
+    """Yield CSV rows one at a time as dictionaries"""
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from csv.DictReader(f)
+
+def chunked(rows, size):
+    """Group an iterable into lists of at most size rows"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None where unsupported)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def format_peak_rss():
+    """Format peak RSS for progress output"""
+    peak = peak_rss_mb()
+    return f"peak RSS {peak:.1f} MB" if peak is not None else "peak RSS n/a"
+
+def max_keys_for(memory_limit_mb):
+    """Translate a memory ceiling into a maximum number of in-memory aggregation keys"""
+    return max(1, int(memory_limit_mb * 1024 * 1024) // ACCUMULATOR_BYTES)
+
+def get_team_ids(cursor):
+    """Map full team name (city + name) to team ID"""
+    cursor.execute("SELECT id, team_name FROM team")
+    return {row[1]: row[0] for row in cursor.fetchall()}
+
+def season_year_for(game_date):
+    """Map a game date to its season label (e.g. '2023-24'), or None without a date"""
+    if not game_date:
+        return None
+    
+    year = game_date.year
+    month = game_date.month
+    
+    # NBA season runs Oct-June, so Oct-Dec belong to season starting that year
+    # Jan-June belong to season that started previous year
+    if month >= 10:
+        return f"{year}-{str(year + 1)[2:]}"
+    return f"{year - 1}-{str(year)[2:]}"
+
+class SeasonResolver:
+    """Maps season labels to season IDs, creating seasons as needed"""
+    
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.seasons_cache = {}
+    
+    def for_date(self, game_date):
+        """Get or create season based on game date"""
+        return self.for_season_year(season_year_for(game_date))
+    
+    def for_season_year(self, season_year):
+        """Get or create season by label; games without a date fall back to season 1"""
+        if not season_year:
+            return 1
+        
+        if season_year in self.seasons_cache:
+            return self.seasons_cache[season_year]
+        
+        # Check if season exists
+        self.cursor.execute("SELECT id FROM season WHERE season_year = %s", (season_year,))
+        result = self.cursor.fetchone()
+        if result:
+            self.seasons_cache[season_year] = result[0]
+            return result[0]
+        
+        # Create new season with placeholder dates
+        start_year = int(season_year.split('-')[0])
+        start_date = f"{start_year}-10-01"
+        end_date = f"{start_year + 1}-06-30"
+        
+        self.cursor.execute("""
+            INSERT INTO season (season_year, start_date, end_date, is_current)
+            VALUES (%s, %s, %s, FALSE)
+            RETURNING id
+        """, (season_year, start_date, end_date))
+        season_id = self.cursor.fetchone()[0]
+        self.conn.commit()
+        self.seasons_cache[season_year] = season_id
+        return season_id
+
+class PlayerStatTotals:
+    """Running per-(player, season, team) box score sums"""
+    
+    __slots__ = ('games', 'minutes', 'points', 'assists', 'rebounds', 'steals', 'blocks',
+                 'turnovers', 'fg_made', 'fg_attempted', 'three_made', 'three_attempted',
+                 'ft_made', 'ft_attempted')
+    
+    def __init__(self):
+        self.games = 0
+        self.minutes = 0
+        self.points = 0
+        self.assists = 0
+        self.rebounds = 0
+        self.steals = 0
+        self.blocks = 0
+        self.turnovers = 0
+        self.fg_made = 0
+        self.fg_attempted = 0
+        self.three_made = 0
+        self.three_attempted = 0
+        self.ft_made = 0
+        self.ft_attempted = 0
+    
+    def add_row(self, row):
+        """Add one PlayerStatistics.csv box score"""
+        self.games += 1
+        self.minutes += parse_float(row.get('numMinutes', 0)) or 0
+        self.points += parse_int(row.get('points', 0)) or 0
+        self.assists += parse_int(row.get('assists', 0)) or 0
+        self.rebounds += parse_int(row.get('reboundsTotal', 0)) or 0
+        self.steals += parse_int(row.get('steals', 0)) or 0
+        self.blocks += parse_int(row.get('blocks', 0)) or 0
+        self.turnovers += parse_int(row.get('turnovers', 0)) or 0
+        self.fg_made += parse_int(row.get('fieldGoalsMade', 0)) or 0
+        self.fg_attempted += parse_int(row.get('fieldGoalsAttempted', 0)) or 0
+        self.three_made += parse_int(row.get('threePointersMade', 0)) or 0
+        self.three_attempted += parse_int(row.get('threePointersAttempted', 0)) or 0
+        self.ft_made += parse_int(row.get('freeThrowsMade', 0)) or 0
+        self.ft_attempted += parse_int(row.get('freeThrowsAttempted', 0)) or 0
+    
+    def partial_row(self):
+        """Raw sums, for spilling to staging_player_stat_partials"""
+        return (self.games, self.minutes, self.points, self.rebounds, self.assists, self.steals,
+                self.blocks, self.turnovers, self.fg_made, self.fg_attempted, self.three_made,
+                self.three_attempted, self.ft_made, self.ft_attempted)
+    
+    def add_partial(self, partial):
+        """Add sums produced by another accumulator's partial_row()"""
+        (games, minutes, points, rebounds, assists, steals, blocks, turnovers, fg_made,
+         fg_attempted, three_made, three_attempted, ft_made, ft_attempted) = partial
+        self.games += games
+        self.minutes += minutes
+        self.points += points
+        self.rebounds += rebounds
+        self.assists += assists
+        self.steals += steals
+        self.blocks += blocks
+        self.turnovers += turnovers
+        self.fg_made += fg_made
+        self.fg_attempted += fg_attempted
+        self.three_made += three_made
+        self.three_attempted += three_attempted
+        self.ft_made += ft_made
+        self.ft_attempted += ft_attempted
+    
+    def season_row(self):
+        """Per-game averages, shooting totals and running totals, in player_season_stats column order"""
+        return (
+            self.games,
+            self.minutes / self.games,
+            self.points / self.games,
+            self.rebounds / self.games,
+            self.assists / self.games,
+            self.steals / self.games,
+            self.blocks / self.games,
+            self.turnovers / self.games,
+            self.fg_made,
+            self.fg_attempted,
+            self.three_made,
+            self.three_attempted,
+            self.ft_made,
+            self.ft_attempted,
+            self.minutes,
+            self.points,
+            self.rebounds,
+            self.assists,
+            self.steals,
+            self.blocks,
+            self.turnovers
+        )
+
+class TeamStatTotals:
+    """Running per-(team, season) results"""
+    
+    __slots__ = ('games', 'wins', 'losses', 'points', 'points_allowed')
+    
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.losses = 0
+        self.points = 0
+        self.points_allowed = 0
+    
+    def add_row(self, row):
+        """Add one TeamStatistics.csv game"""
+        self.games += 1
+        if parse_bool(row.get('win')):
+            self.wins += 1
+        else:
+            self.losses += 1
+        self.points += parse_int(row.get('teamScore', 0)) or 0
+        self.points_allowed += parse_int(row.get('opponentScore', 0)) or 0
+    
+    def partial_row(self):
+        """Raw sums, for spilling to staging_team_stat_partials"""
+        return (self.games, self.wins, self.losses, self.points, self.points_allowed)
+    
+    def add_partial(self, partial):
+        """Add sums produced by another accumulator's partial_row()"""
+        games, wins, losses, points, points_allowed = partial
+        self.games += games
+        self.wins += wins
+        self.losses += losses
+        self.points += points
+        self.points_allowed += points_allowed
+    
+    def season_row(self):
+        """Record, per-game averages and running totals, in team_season_stats column order"""
+        return (
+            self.wins,
+            self.losses,
+            self.wins / self.games,
+            self.points / self.games,
+            self.points_allowed / self.games,
+            self.games,
+            self.points,
+            self.points_allowed
+        )
+
+def aggregate(keyed_rows, totals_class, max_keys, spill, partials=False):
+    """
+    Fold (key, row) pairs into per-key totals under a key budget
+    
+    When a new key would exceed max_keys, the current totals are handed to
+    spill() and aggregation restarts empty, so memory stays bounded no
+    matter how large the input grows. With partials=True the rows are
+    partial_row() tuples from other accumulators rather than CSV rows.
+    
+    Returns:
+        Dict of key -> totals still held in memory
+    """
+    totals = {}
+    for key, row in keyed_rows:
+        acc = totals.get(key)
+        if acc is None:
+            if len(totals) >= max_keys:
+                spill(totals)
+                totals = {}
+            acc = totals[key] = totals_class()
+        if partials:
+            acc.add_partial(row)
+        else:
+            acc.add_row(row)
+    return totals
+
+class PartialSpiller:
+    """Writes partial aggregates to a staging table when the key budget is exceeded"""
+    
+    def __init__(self, conn, staging_table, columns, mode, chunk_size):
+        self.conn = conn
+        self.staging_table = staging_table
+        self.columns = columns
+        self.mode = mode
+        self.chunk_size = chunk_size
+        self.spills = 0
+        self.rows_spilled = 0
+    
+    def __call__(self, totals):
+        if self.spills == 0:
+            truncate_staging(self.conn, self.staging_table)
+        rows = (key + acc.partial_row() for key, acc in totals.items())
+        for chunk in chunked(rows, self.chunk_size):
+            self.rows_spilled += append_staging(self.conn, self.staging_table, self.columns, chunk, self.mode)
+        self.spills += 1
+        print(f"  ↳ spilled {len(totals)} partial aggregates ({format_peak_rss()})")
+
+def player_stat_key(row, players, teams, season_id):
+    """Aggregation key (player_id, season_id, team_id) for a box score, or None if the player is unknown"""
+    player_name = f"{row.get('firstName', '')} {row.get('lastName', '')}".strip()
+    player_id = players.get(player_name)
+    
+    if not player_id:
+        return None
+    
+    team_name = f"{row.get('playerteamCity', '')} {row.get('playerteamName', '')}".strip()
+    return (player_id, season_id, teams.get(team_name))
+
+def team_stat_key(row, teams):
+    """Aggregation key (team_id, season label) for a team game, or None if the team is unknown"""
+    team_name = f"{row.get('teamCity', '')} {row.get('teamName', '')}".strip()
+    team_id = teams.get(team_name)
+    
+    if not team_id:
+        return None
+    
+    # Season label from the game date; resolved to an ID by the caller
+    return (team_id, season_year_for(parse_datetime(row.get('gameDateTimeEst'))))
+
+PLAYER_PARTIAL_COLUMNS = (
+    'player_id', 'season_id', 'team_id', 'games', 'minutes', 'points', 'rebounds', 'assists',
+    'steals', 'blocks', 'turnovers', 'fg_made', 'fg_attempted', 'three_made', 'three_attempted',
+    'ft_made', 'ft_attempted'
+)
+
+TEAM_PARTIAL_COLUMNS = ('team_id', 'season_id', 'games', 'wins', 'losses', 'points', 'points_allowed')
+
+GAME_COLUMNS = (
+    'game_id', 'game_date_time', 'home_team_id', 'away_team_id', 'home_score', 'away_score',
+    'winner_team_id', 'game_type', 'attendance', 'game_label', 'game_sublabel'
+)
+
+def game_row(row, teams):
+    """game table row for a Games.csv row, or None if its date or either team is unknown"""
+    # Skip rows without valid game datetime
+    game_dt = parse_datetime(row.get('gameDateTimeEst'))
+    if not game_dt:
+        return None
+    
+    home_team_name = f"{row.get('hometeamCity', '')} {row.get('hometeamName', '')}".strip()
+    away_team_name = f"{row.get('awayteamCity', '')} {row.get('awayteamName', '')}".strip()
+    
+    home_team_id = teams.get(home_team_name)
+    away_team_id = teams.get(away_team_name)
+    
+    # Skip if we don't have both teams
+    if not home_team_id or not away_team_id:
+        return None
+    
+    winner_id = teams.get(home_team_name) if row.get('homeScore', 0) > row.get('awayScore', 0) else teams.get(away_team_name)
+    
+    return (
+        row.get('gameId'),
+        game_dt,
+        home_team_id,
+        away_team_id,
+        parse_int(row.get('homeScore')),
+        parse_int(row.get('awayScore')),
+        winner_id,
+        row.get('gameType', ''),
+        parse_int(row.get('attendance')),
+        row.get('gameLabel', ''),
+        row.get('gameSubLabel', '')
+    )
+
+def load_games(conn, mode='copy', chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream Games.csv into the game table in fixed-size chunks"""
     print("\n📊 Loading Games...")
+    started = time.perf_counter()
     cursor = conn.cursor()
     
     # First get team ID mapping - team_name in DB already includes city name
-    cursor.execute("SELECT id, team_name FROM team")
-    teams = {row[1]: row[0] for row in cursor.fetchall()}
+    teams = get_team_ids(cursor)
     
-    game_data = []
-    with open('datasets/Games.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Skip rows without valid game datetime
-            game_dt = parse_datetime(row.get('gameDateTimeEst'))
-            if not game_dt:
-                continue
-            
-            home_team_name = f"{row.get('hometeamCity', '')} {row.get('hometeamName', '')}".strip()
-            away_team_name = f"{row.get('awayteamCity', '')} {row.get('awayteamName', '')}".strip()
-            
-            home_team_id = teams.get(home_team_name)
-            away_team_id = teams.get(away_team_name)
-            
-            # Skip if we don't have both teams
-            if not home_team_id or not away_team_id:
-                continue
-            
-            winner_id = teams.get(home_team_name) if row.get('homeScore', 0) > row.get('awayScore', 0) else teams.get(away_team_name)
-            
-            game_data.append((
-                row.get('gameId'),
-                game_dt,
-                home_team_id,
-                away_team_id,
-                parse_int(row.get('homeScore')),
-                parse_int(row.get('awayScore')),
-                winner_id,
-                row.get('gameType', ''),
-                parse_int(row.get('attendance')),
-                row.get('gameLabel', ''),
-                row.get('gameSubLabel', '')
-            ))
+    def iter_games():
+        for row in read_csv_rows('datasets/Games.csv'):
+            game = game_row(row, teams)
+            if game:
+                yield game
     
-    execute_batch(cursor, """
-        INSERT INTO game (game_id, game_date_time, home_team_id, away_team_id, home_score, away_score,
-                         winner_team_id, game_type, attendance, game_label, game_sublabel)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (game_id) DO NOTHING
-    """, game_data)
-    
-    conn.commit()
-    print(f"✓ Loaded {len(game_data)} games")
+    games_loaded = 0
+    for chunk in chunked(iter_games(), chunk_size):
+        if mode == 'copy':
+            copy_merge(conn, 'staging_game', GAME_COLUMNS, chunk)
+        else:
+            execute_batch(cursor, """
+                INSERT INTO game (game_id, game_date_time, home_team_id, away_team_id, home_score, away_score,
+                                 winner_team_id, game_type, attendance, game_label, game_sublabel)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (game_id) DO NOTHING
+            """, chunk)
+            
+            conn.commit()
+        games_loaded += len(chunk)
+    print(f"✓ Loaded {games_loaded} games {format_rate(games_loaded, started)}, {format_peak_rss()}")
 
-def load_player_statistics(conn):
-    """Load PlayerStatistics.csv into player_season_stats"""
+def load_player_statistics(conn, mode='copy', chunk_size=DEFAULT_CHUNK_SIZE,
+                           memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB, workers=1, engine='rows'):
+    """Stream PlayerStatistics.csv into player_season_stats (parsed by `workers` processes or `engine`)"""
     print("\n📊 Loading Player Statistics...")
+    started = time.perf_counter()
+    rows_read = 0
     cursor = conn.cursor()
     
     # Get player ID mapping
@@ -269,295 +655,529 @@ def load_player_statistics(conn):
     players = {row[1]: row[0] for row in cursor.fetchall()}
     
     # Get team ID mapping - team_name in DB already includes city name
-    cursor.execute("SELECT id, team_name FROM team")
-    teams = {row[1]: row[0] for row in cursor.fetchall()}
+    teams = get_team_ids(cursor)
     
     # Get season ID (assume season 1 for now)
     cursor.execute("SELECT id FROM season WHERE season_year = '2023-24'")
     season_result = cursor.fetchone()
     season_id = season_result[0] if season_result else 1
     
-    stats_data = {}
-    with open('datasets/PlayerStatistics.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            player_name = f"{row.get('firstName', '')} {row.get('lastName', '')}".strip()
-            player_id = players.get(player_name)
-            
-            if not player_id:
-                continue
-            
-            team_name = f"{row.get('playerteamCity', '')} {row.get('playerteamName', '')}".strip()
-            team_id = teams.get(team_name)
-            
-            # Aggregate stats per player
-            key = (player_id, season_id, team_id)
-            if key not in stats_data:
-                stats_data[key] = {
-                    'games': 0,
-                    'minutes': 0,
-                    'points': 0,
-                    'assists': 0,
-                    'rebounds': 0,
-                    'steals': 0,
-                    'blocks': 0,
-                    'turnovers': 0,
-                    'fg_made': 0,
-                    'fg_attempted': 0,
-                    'three_made': 0,
-                    'three_attempted': 0,
-                    'ft_made': 0,
-                    'ft_attempted': 0
-                }
-            
-            stats = stats_data[key]
-            stats['games'] += 1
-            stats['minutes'] += parse_float(row.get('numMinutes', 0)) or 0
-            stats['points'] += parse_int(row.get('points', 0)) or 0
-            stats['assists'] += parse_int(row.get('assists', 0)) or 0
-            stats['rebounds'] += parse_int(row.get('reboundsTotal', 0)) or 0
-            stats['steals'] += parse_int(row.get('steals', 0)) or 0
-            stats['blocks'] += parse_int(row.get('blocks', 0)) or 0
-            stats['turnovers'] += parse_int(row.get('turnovers', 0)) or 0
-            stats['fg_made'] += parse_int(row.get('fieldGoalsMade', 0)) or 0
-            stats['fg_attempted'] += parse_int(row.get('fieldGoalsAttempted', 0)) or 0
-            stats['three_made'] += parse_int(row.get('threePointersMade', 0)) or 0
-            stats['three_attempted'] += parse_int(row.get('threePointersAttempted', 0)) or 0
-            stats['ft_made'] += parse_int(row.get('freeThrowsMade', 0)) or 0
-            stats['ft_attempted'] += parse_int(row.get('freeThrowsAttempted', 0)) or 0
-    
-    # Insert aggregated stats
-    insert_data = []
-    for (player_id, season_id, team_id), stats in stats_data.items():
-        if stats['games'] > 0:
-            insert_data.append((
-                player_id,
-                season_id,
-                team_id,
-                stats['games'],
-                stats['minutes'] / stats['games'],
-                stats['points'] / stats['games'],
-                stats['rebounds'] / stats['games'],
-                stats['assists'] / stats['games'],
-                stats['steals'] / stats['games'],
-                stats['blocks'] / stats['games'],
-                stats['turnovers'] / stats['games'],
-                stats['fg_made'],
-                stats['fg_attempted'],
-                stats['three_made'],
-                stats['three_attempted'],
-                stats['ft_made'],
-                stats['ft_attempted']
-            ))
+    def iter_box_scores():
+        nonlocal rows_read
+        for row in read_csv_rows('datasets/PlayerStatistics.csv'):
+            rows_read += 1
+            key = player_stat_key(row, players, teams, season_id)
+            if key:
+                yield key, row
+    
+    spiller = PartialSpiller(conn, 'staging_player_stat_partials', PLAYER_PARTIAL_COLUMNS, mode, chunk_size)
+    context = {'players': players, 'teams': teams, 'season_id': season_id}
+    if engine == 'columnar':
+        from columnar_stats import ColumnarAggregation
+        partials = ColumnarAggregation('player', 'datasets/PlayerStatistics.csv', context)
+    elif workers > 1:
+        from parallel_ingest import ParallelAggregation
+        partials = ParallelAggregation('player', 'datasets/PlayerStatistics.csv', workers, context)
+    else:
+        partials = None
     
+    if partials is not None:
+        stats_data = aggregate(partials, PlayerStatTotals, max_keys_for(memory_limit_mb), spiller,
+                               partials=True)
+        rows_read = partials.rows_read
+    else:
+        stats_data = aggregate(iter_box_scores(), PlayerStatTotals, max_keys_for(memory_limit_mb), spiller)
+    
+    if spiller.spills:
+        # Part of the aggregate is already in staging; finish it there
+        spiller(stats_data)
+        loaded = merge_staging(conn, 'staging_player_stat_partials')
+    else:
+        # Insert aggregated stats
+        insert_data = (
+            key + stats.season_row()
+            for key, stats in stats_data.items()
+            if stats.games > 0
+        )
+        loaded = write_player_season_stats(conn, insert_data, mode)
+    print(f"✓ Loaded statistics for {loaded} player-season combinations "
+          f"from {rows_read} box scores {format_rate(rows_read, started)}, {format_peak_rss()}")
+
+def write_player_season_stats(conn, rows, mode):
+    """Upsert finished player_season_stats rows; returns the number written"""
+    if mode == 'copy':
+        copied, _ = copy_merge(conn, 'staging_player_season_stats', (
+            'player_id', 'season_id', 'team_id', 'games_played', 'minutes_played', 'points',
+            'rebounds', 'assists', 'steals', 'blocks', 'turnovers', 'field_goals_made',
+            'field_goals_attempted', 'three_pointers_made', 'three_pointers_attempted',
+            'free_throws_made', 'free_throws_attempted', 'total_minutes', 'total_points',
+            'total_rebounds', 'total_assists', 'total_steals', 'total_blocks', 'total_turnovers'
+        ), rows)
+        return copied
+    
+    counted = CountingIterator(rows)
+    cursor = conn.cursor()
     execute_batch(cursor, """
         INSERT INTO player_season_stats 
         (player_id, season_id, team_id, games_played, minutes_played, points, rebounds, assists, 
          steals, blocks, turnovers, field_goals_made, field_goals_attempted, 
-         three_pointers_made, three_pointers_attempted, free_throws_made, free_throws_attempted)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+         three_pointers_made, three_pointers_attempted, free_throws_made, free_throws_attempted,
+         total_minutes, total_points, total_rebounds, total_assists, total_steals, total_blocks, total_turnovers)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
+                %s, %s, %s, %s, %s, %s, %s)
         ON CONFLICT (player_id, season_id) 
         DO UPDATE SET
+            team_id = EXCLUDED.team_id,
             games_played = EXCLUDED.games_played,
             minutes_played = EXCLUDED.minutes_played,
             points = EXCLUDED.points,
             rebounds = EXCLUDED.rebounds,
-            assists = EXCLUDED.assists
-    """, insert_data)
+            assists = EXCLUDED.assists,
+            steals = EXCLUDED.steals,
+            blocks = EXCLUDED.blocks,
+            turnovers = EXCLUDED.turnovers,
+            field_goals_made = EXCLUDED.field_goals_made,
+            field_goals_attempted = EXCLUDED.field_goals_attempted,
+            three_pointers_made = EXCLUDED.three_pointers_made,
+            three_pointers_attempted = EXCLUDED.three_pointers_attempted,
+            free_throws_made = EXCLUDED.free_throws_made,
+            free_throws_attempted = EXCLUDED.free_throws_attempted,
+            total_minutes = EXCLUDED.total_minutes,
+            total_points = EXCLUDED.total_points,
+            total_rebounds = EXCLUDED.total_rebounds,
+            total_assists = EXCLUDED.total_assists,
+            total_steals = EXCLUDED.total_steals,
+            total_blocks = EXCLUDED.total_blocks,
+            total_turnovers = EXCLUDED.total_turnovers,
+            updated_at = CURRENT_TIMESTAMP
+    """, counted)
+    
+    conn.commit()
+    return counted.count
+
+PLAYER_GAME_COLUMNS = (
+    'player_id', 'game_id', 'game_date', 'season_id', 'team_id', 'opponent_team_id', 'is_home', 'won',
+    'minutes', 'points', 'rebounds', 'assists', 'steals', 'blocks', 'turnovers',
+    'field_goals_made', 'field_goals_attempted', 'three_pointers_made', 'three_pointers_attempted',
+    'free_throws_made', 'free_throws_attempted', 'plus_minus'
+)
+
+def player_game_row(row, players, teams, seasons):
+    """player_game_stats row for a PlayerStatistics.csv box score, or None if its game, date or player is unknown"""
+    game_dt = parse_datetime(row.get('gameDateTimeEst'))
+    if not game_dt or not row.get('gameId'):
+        return None
+    
+    player_name = f"{row.get('firstName', '')} {row.get('lastName', '')}".strip()
+    player_id = players.get(player_name)
+    if not player_id:
+        return None
+    
+    team_name = f"{row.get('playerteamCity', '')} {row.get('playerteamName', '')}".strip()
+    opponent_name = f"{row.get('opponentteamCity', '')} {row.get('opponentteamName', '')}".strip()
+    return (
+        player_id,
+        row.get('gameId'),
+        game_dt.date(),
+        seasons.for_date(game_dt),
+        teams.get(team_name),
+        teams.get(opponent_name),
+        parse_bool(row.get('home')),
+        parse_bool(row.get('win')),
+        parse_float(row.get('numMinutes', 0)) or 0,
+        parse_int(row.get('points', 0)) or 0,
+        parse_int(row.get('reboundsTotal', 0)) or 0,
+        parse_int(row.get('assists', 0)) or 0,
+        parse_int(row.get('steals', 0)) or 0,
+        parse_int(row.get('blocks', 0)) or 0,
+        parse_int(row.get('turnovers', 0)) or 0,
+        parse_int(row.get('fieldGoalsMade', 0)) or 0,
+        parse_int(row.get('fieldGoalsAttempted', 0)) or 0,
+        parse_int(row.get('threePointersMade', 0)) or 0,
+        parse_int(row.get('threePointersAttempted', 0)) or 0,
+        parse_int(row.get('freeThrowsMade', 0)) or 0,
+        parse_int(row.get('freeThrowsAttempted', 0)) or 0,
+        parse_int(row.get('plusMinusPoints'))
+    )
+
+class GamePartitions:
+    """Creates the player_game_stats partition of each season box scores fall in, once per season"""
+    
+    def __init__(self, conn):
+        self.conn = conn
+        self.created = set()
+    
+    def ensure(self, rows):
+        """Create missing partitions for player_game_stats rows (committed before the rows are written)"""
+        missing = {}
+        for row in rows:
+            season_year = season_year_for(row[2])
+            if season_year not in self.created:
+                missing.setdefault(season_year, row[2])
+        if not missing:
+            return
+        cursor = self.conn.cursor()
+        for game_date in missing.values():
+            cursor.execute("SELECT ensure_player_game_stats_partition(%s)", (game_date,))
+        self.conn.commit()
+        cursor.close()
+        self.created.update(missing)
+
+def write_player_games(conn, rows, mode):
+    """Upsert one chunk of player_game_stats rows; returns the number written"""
+    # Date order keeps each partition's pages clustered for the BRIN index
+    rows = sorted(rows, key=lambda row: (row[2], row[1]))
+    if mode == 'copy':
+        copied, _ = copy_merge(conn, 'staging_player_game_stats', PLAYER_GAME_COLUMNS, rows)
+        return copied
     
+    cursor = conn.cursor()
+    execute_batch(cursor, f"""
+        INSERT INTO player_game_stats ({', '.join(PLAYER_GAME_COLUMNS)})
+        VALUES ({', '.join(['%s'] * len(PLAYER_GAME_COLUMNS))})
+        ON CONFLICT (player_id, game_date, game_id)
+        DO UPDATE SET {', '.join(f"{column} = EXCLUDED.{column}" for column in PLAYER_GAME_COLUMNS[3:])}
+    """, rows)
     conn.commit()
-    print(f"✓ Loaded statistics for {len(insert_data)} player-season combinations")
+    return len(rows)
 
-def load_team_statistics(conn):
-    """Load TeamStatistics.csv into team_season_stats"""
+def load_player_game_stats(conn, mode='copy', chunk_size=DEFAULT_CHUNK_SIZE):
+    """Stream every PlayerStatistics.csv box score into the partitioned player_game_stats table"""
+    print("\n📊 Loading Player Game Logs...")
+    started = time.perf_counter()
+    rows_read = 0
+    cursor = conn.cursor()
+    
+    cursor.execute("SELECT id, player_name FROM player")
+    players = {row[1]: row[0] for row in cursor.fetchall()}
+    teams = get_team_ids(cursor)
+    # Box scores go to the season of their game date, creating seasons as needed
+    seasons = SeasonResolver(conn)
+    partitions = GamePartitions(conn)
+    
+    def iter_games():
+        nonlocal rows_read
+        for row in read_csv_rows('datasets/PlayerStatistics.csv'):
+            rows_read += 1
+            game = player_game_row(row, players, teams, seasons)
+            if game:
+                yield game
+    
+    loaded = 0
+    for chunk in chunked(iter_games(), chunk_size):
+        partitions.ensure(chunk)
+        loaded += write_player_games(conn, chunk, mode)
+    
+    # Summarize the new BRIN ranges and refresh planner statistics
+    conn.autocommit = True
+    cursor.execute("VACUUM (ANALYZE) player_game_stats")
+    conn.autocommit = False
+    print(f"✓ Loaded {loaded} player box scores into {len(partitions.created)} season partitions "
+          f"from {rows_read} rows {format_rate(rows_read, started)}, {format_peak_rss()}")
+
+def load_team_statistics(conn, mode='copy', chunk_size=DEFAULT_CHUNK_SIZE,
+                         memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB, workers=1, engine='rows'):
+    """Stream TeamStatistics.csv into team_season_stats (parsed by `workers` processes or `engine`)"""
     print("\n📊 Loading Team Statistics...")
+    started = time.perf_counter()
+    rows_read = 0
     cursor = conn.cursor()
     
     # Get team ID mapping - team_name in DB already includes city name
-    cursor.execute("SELECT id, team_name FROM team")
-    teams = {row[1]: row[0] for row in cursor.fetchall()}
+    teams = get_team_ids(cursor)
     
     # Create seasons as needed
-    seasons_cache = {}
+    seasons = SeasonResolver(conn)
     
-    def get_or_create_season(game_date):
-        """Get or create season based on game date"""
-        if not game_date:
-            return 1
-        
-        year = game_date.year
-        month = game_date.month
-        
-        # NBA season runs Oct-June, so Oct-Dec belong to season starting that year
-        # Jan-June belong to season that started previous year
-        if month >= 10:
-            season_year = f"{year}-{str(year + 1)[2:]}"
-        else:
-            season_year = f"{year - 1}-{str(year)[2:]}"
-        
-        if season_year in seasons_cache:
-            return seasons_cache[season_year]
-        
-        # Check if season exists
-        cursor.execute("SELECT id FROM season WHERE season_year = %s", (season_year,))
-        result = cursor.fetchone()
-        if result:
-            seasons_cache[season_year] = result[0]
-            return result[0]
-        
-        # Create new season with placeholder dates
-        start_year = int(season_year.split('-')[0])
-        start_date = f"{start_year}-10-01"
-        end_date = f"{start_year + 1}-06-30"
-        
-        cursor.execute("""
-            INSERT INTO season (season_year, start_date, end_date, is_current)
-            VALUES (%s, %s, %s, FALSE)
-            RETURNING id
-        """, (season_year, start_date, end_date))
-        season_id = cursor.fetchone()[0]
-        conn.commit()
-        seasons_cache[season_year] = season_id
-        return season_id
+    def iter_team_games():
+        nonlocal rows_read
+        for row in read_csv_rows('datasets/TeamStatistics.csv'):
+            rows_read += 1
+            key = team_stat_key(row, teams)
+            if key:
+                team_id, season_year = key
+                yield (team_id, seasons.for_season_year(season_year)), row
     
-    stats_data = {}
-    with open('datasets/TeamStatistics.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            team_name = f"{row.get('teamCity', '')} {row.get('teamName', '')}".strip()
-            team_id = teams.get(team_name)
-            
-            if not team_id:
-                continue
-            
-            # Get season based on game date
-            game_date = parse_datetime(row.get('gameDateTimeEst'))
-            season_id = get_or_create_season(game_date)
-            
-            key = (team_id, season_id)
-            if key not in stats_data:
-                stats_data[key] = {
-                    'wins': 0,
-                    'losses': 0,
-                    'points': 0,
-                    'points_allowed': 0,
-                    'games': 0
-                }
-            
-            stats = stats_data[key]
-            stats['games'] += 1
-            if parse_bool(row.get('win')):
-                stats['wins'] += 1
-            else:
-                stats['losses'] += 1
-            stats['points'] += parse_int(row.get('teamScore', 0)) or 0
-            stats['points_allowed'] += parse_int(row.get('opponentScore', 0)) or 0
-    
-    insert_data = []
-    for (team_id, season_id), stats in stats_data.items():
-        if stats['games'] > 0:
-            win_pct = stats['wins'] / stats['games']
-            ppg = stats['points'] / stats['games']
-            papg = stats['points_allowed'] / stats['games']
-            
-            insert_data.append((
-                team_id,
-                season_id,
-                stats['wins'],
-                stats['losses'],
-                win_pct,
-                ppg,
-                papg
-            ))
+    spiller = PartialSpiller(conn, 'staging_team_stat_partials', TEAM_PARTIAL_COLUMNS, mode, chunk_size)
+    if engine == 'columnar':
+        from columnar_stats import ColumnarAggregation
+        partials = ColumnarAggregation('team', 'datasets/TeamStatistics.csv', {'teams': teams})
+    elif workers > 1:
+        from parallel_ingest import ParallelAggregation
+        partials = ParallelAggregation('team', 'datasets/TeamStatistics.csv', workers, {'teams': teams})
+    else:
+        partials = None
+    
+    if partials is not None:
+        # Partials are keyed by season label; resolve to IDs here, where seasons can be created
+        keyed = (
+            ((team_id, seasons.for_season_year(season_year)), partial)
+            for (team_id, season_year), partial in partials
+        )
+        stats_data = aggregate(keyed, TeamStatTotals, max_keys_for(memory_limit_mb), spiller,
+                               partials=True)
+        rows_read = partials.rows_read
+    else:
+        stats_data = aggregate(iter_team_games(), TeamStatTotals, max_keys_for(memory_limit_mb), spiller)
+    
+    if spiller.spills:
+        spiller(stats_data)
+        loaded = merge_staging(conn, 'staging_team_stat_partials')
+    else:
+        insert_data = (
+            key + stats.season_row()
+            for key, stats in stats_data.items()
+            if stats.games > 0
+        )
+        loaded = write_team_season_stats(conn, insert_data, mode)
+    print(f"✓ Loaded statistics for {loaded} team-season combinations "
+          f"from {rows_read} team box scores {format_rate(rows_read, started)}, {format_peak_rss()}")
+
+def write_team_season_stats(conn, rows, mode):
+    """Upsert finished team_season_stats rows; returns the number written"""
+    if mode == 'copy':
+        copied, _ = copy_merge(conn, 'staging_team_season_stats', (
+            'team_id', 'season_id', 'wins', 'losses', 'win_percentage',
+            'points_per_game', 'points_allowed_per_game', 'games_played', 'total_points',
+            'total_points_allowed'
+        ), rows)
+        return copied
     
+    counted = CountingIterator(rows)
+    cursor = conn.cursor()
     execute_batch(cursor, """
         INSERT INTO team_season_stats 
-        (team_id, season_id, wins, losses, win_percentage, points_per_game, points_allowed_per_game)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        (team_id, season_id, wins, losses, win_percentage, points_per_game, points_allowed_per_game,
+         games_played, total_points, total_points_allowed)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         ON CONFLICT (team_id, season_id)
         DO UPDATE SET
             wins = EXCLUDED.wins,
             losses = EXCLUDED.losses,
-            win_percentage = EXCLUDED.win_percentage
-    """, insert_data)
+            win_percentage = EXCLUDED.win_percentage,
+            points_per_game = EXCLUDED.points_per_game,
+            points_allowed_per_game = EXCLUDED.points_allowed_per_game,
+            games_played = EXCLUDED.games_played,
+            total_points = EXCLUDED.total_points,
+            total_points_allowed = EXCLUDED.total_points_allowed,
+            updated_at = CURRENT_TIMESTAMP
+    """, counted)
     
     conn.commit()
-    print(f"✓ Loaded statistics for {len(insert_data)} team-season combinations")
+    return counted.count
 
-def refresh_leaderboards(conn):
-    """Refresh leaderboard tables"""
-    print("\n📊 Refreshing Leaderboards...")
+class CountingIterator:
+    """Wrap an iterable and count the items consumed from it"""
+    
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self.count = 0
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        row = next(self._rows)
+        self.count += 1
+        return row
+
+# Running-total columns and how to backfill them from the per-game averages,
+# for databases created before schema.sql carried them
+RUNNING_TOTAL_COLUMNS = {
+    'player_season_stats': (
+        ('total_minutes', 'DECIMAL(12, 2)', 'minutes_played * games_played'),
+        ('total_points', 'INTEGER', 'ROUND(points * games_played)'),
+        ('total_rebounds', 'INTEGER', 'ROUND(rebounds * games_played)'),
+        ('total_assists', 'INTEGER', 'ROUND(assists * games_played)'),
+        ('total_steals', 'INTEGER', 'ROUND(steals * games_played)'),
+        ('total_blocks', 'INTEGER', 'ROUND(blocks * games_played)'),
+        ('total_turnovers', 'INTEGER', 'ROUND(turnovers * games_played)'),
+    ),
+    'team_season_stats': (
+        ('games_played', 'INTEGER', 'wins + losses'),
+        ('total_points', 'INTEGER', 'ROUND(points_per_game * (wins + losses))'),
+        ('total_points_allowed', 'INTEGER', 'ROUND(points_allowed_per_game * (wins + losses))'),
+    ),
+}
+
+def ensure_running_totals(conn):
+    """Add any missing running-total columns to the season stats tables"""
     cursor = conn.cursor()
+    for table, columns in RUNNING_TOTAL_COLUMNS.items():
+        cursor.execute("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = %s
+        """, (table,))
+        existing = {row[0] for row in cursor.fetchall()}
+        missing = [column for column in columns if column[0] not in existing]
+        if not missing:
+            continue
+        
+        cursor.execute(f"ALTER TABLE {table} " + ", ".join(
+            f"ADD COLUMN {name} {sql_type} DEFAULT 0" for name, sql_type, _ in missing
+        ))
+        cursor.execute(f"UPDATE {table} SET " + ", ".join(
+            f"{name} = COALESCE({backfill}, 0)" for name, _, backfill in missing
+        ))
+        print(f"✓ Added running totals to {table} ({cursor.rowcount} rows backfilled)")
+    conn.commit()
+
+# Stat category -> leaderboard table, as defined by leaderboard_columns() in functions.sql
+LEADERBOARD_TABLES = {
+    'points': 'leaderboard_pts',
+    'assists': 'leaderboard_ast',
+    'rebounds': 'leaderboard_reb',
+    'steals': 'leaderboard_stl',
+    'blocks': 'leaderboard_blk',
+    'efficiency': 'leaderboard_efficiency',
+}
+
+def refresh_leaderboard(conn, stat):
+    """Re-rank one stat's leaderboard for every season; returns rows changed"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT refresh_leaderboard(%s)", (stat,))
+    changed = cursor.fetchone()[0]
+    conn.commit()
+    return changed
+
+def refresh_leaderboards(conn, workers=1):
+    """
+    Refresh every leaderboard table for every season
     
-    # Get season ID
-    cursor.execute("SELECT id FROM season WHERE season_year = '2023-24'")
-    season_result = cursor.fetchone()
-    season_id = season_result[0] if season_result else 1
+    Each stat commits on its own and only rewrites rows whose rank or value
+    changed; readers are never blocked and see the old ranking until then.
+    With workers > 1 the stats refresh side by side on separate connections.
+    """
+    print("\n📊 Refreshing Leaderboards...")
+    started = time.perf_counter()
     
-    # Refresh points leaderboard
-    cursor.execute("""
-        INSERT INTO leaderboard_pts (player_id, season_id, rank, points_per_game, games_played, total_points)
-        SELECT 
-            player_id,
-            season_id,
-            ROW_NUMBER() OVER (ORDER BY points DESC) as rank,
-            points,
-            games_played,
-            (points * games_played)::INTEGER as total_points
-        FROM player_season_stats
-        WHERE season_id = %s AND games_played > 0
-        ORDER BY points DESC
-        ON CONFLICT (player_id, season_id) 
-        DO UPDATE SET
-            rank = EXCLUDED.rank,
-            points_per_game = EXCLUDED.points_per_game,
-            total_points = EXCLUDED.total_points
-    """, (season_id,))
-    
-    # Refresh assists leaderboard
-    cursor.execute("""
-        INSERT INTO leaderboard_ast (player_id, season_id, rank, assists_per_game, games_played, total_assists)
-        SELECT 
-            player_id,
-            season_id,
-            ROW_NUMBER() OVER (ORDER BY assists DESC) as rank,
-            assists,
-            games_played,
-            (assists * games_played)::INTEGER as total_assists
-        FROM player_season_stats
-        WHERE season_id = %s AND games_played > 0
-        ORDER BY assists DESC
-        ON CONFLICT (player_id, season_id)
-        DO UPDATE SET
-            rank = EXCLUDED.rank,
-            assists_per_game = EXCLUDED.assists_per_game,
-            total_assists = EXCLUDED.total_assists
-    """, (season_id,))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(LEADERBOARD_TABLES))) as executor:
+            changed = list(executor.map(
+                lambda stat: run_with_connection(refresh_leaderboard, stat), LEADERBOARD_TABLES
+            ))
+    else:
+        changed = [refresh_leaderboard(conn, stat) for stat in LEADERBOARD_TABLES]
+    
+    # Index-only top-N scans skip the heap only for pages the visibility map
+    # marks all-visible, so vacuum the rows the refresh just rewrote
+    conn.autocommit = True
+    cursor = conn.cursor()
+    for table in LEADERBOARD_TABLES.values():
+        cursor.execute(f"VACUUM (ANALYZE) {table}")
+    conn.autocommit = False
     
+    print(f"✓ Leaderboards refreshed: {sum(changed)} rows changed across "
+          f"{len(LEADERBOARD_TABLES)} stats {format_rate(sum(changed), started)}")
+
+def refresh_stat_distributions(conn):
+    """Rebuild the sorted per-season stat distributions behind percentile lookups"""
+    print("\n📊 Refreshing Stat Distributions...")
+    started = time.perf_counter()
+    cursor = conn.cursor()
+    cursor.execute("SELECT refresh_stat_distributions()")
+    changed = cursor.fetchone()[0]
     conn.commit()
-    print("✓ Leaderboards refreshed")
+    print(f"✓ Stat distributions refreshed: {changed} rows changed {format_rate(changed, started)}")
 
-def main():
+def bump_data_version(conn):
+    """Advance the data version so the API stops serving 304s for pre-load responses"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT bump_data_version()")
+    version = cursor.fetchone()[0]
+    conn.commit()
+    print(f"✓ Data version is now {version}")
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Load CourtVision CSV datasets into PostgreSQL")
+    parser.add_argument('--mode', choices=LOAD_MODES, default='copy',
+                        help="copy: COPY into staging tables + set-based merge (default); "
+                             "batch: original row-by-row INSERTs")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="rows per write when streaming games and spilled aggregates")
+    parser.add_argument('--memory-limit-mb', type=float, default=DEFAULT_MEMORY_LIMIT_MB,
+                        help="memory ceiling for in-memory stat aggregation before spilling")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes for parsing the statistics CSVs; above 1, games and team "
+                             "statistics also load concurrently")
+    parser.add_argument('--engine', choices=STATS_ENGINES, default='rows',
+                        help="rows: per-row aggregation (default); columnar: NumPy column batches "
+                             "in one process (requires numpy, takes precedence over --workers parsing)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only load rows added since the last incremental run, resuming "
+                             "from the last committed chunk after a crash")
+    args = parser.parse_args(argv)
+    if args.incremental and (args.workers > 1 or args.engine != 'rows'):
+        parser.error("--incremental processes new rows in checkpointed chunks and cannot be "
+                     "combined with --workers or --engine")
+    if args.incremental and args.mode != 'copy':
+        parser.error("--incremental merges each chunk through the COPY staging tables and "
+                     "cannot be combined with --mode batch")
+    if args.engine == 'columnar':
+        import columnar_stats
+        if columnar_stats.np is None:
+            parser.error("--engine columnar requires NumPy (pip install numpy)")
+    return args
+
+def main(argv=None):
     """Main execution function"""
+    args = parse_args(argv)
     print("\n" + "="*60)
     print("🏀 CourtVision Data Loading Script")
+    print(f"   Mode: {args.mode}, stats engine: {args.engine}"
+          f"{', incremental' if args.incremental else ''}")
     print("="*60)
     
     try:
+        started = time.perf_counter()
         conn = get_connection()
         print("✓ Connected to database")
         
+        # Staging tables back COPY mode and spilled aggregates in either mode
+        ensure_staging_tables(conn)
+        ensure_running_totals(conn)
+        
+        if args.incremental:
+            from incremental_ingest import run_incremental
+            run_incremental(conn, args.mode, args.chunk_size)
+            bump_data_version(conn)
+            conn.close()
+            print("\n" + "="*60)
+            print(f"✓ Incremental load completed in {time.perf_counter() - started:.2f}s! "
+                  f"({format_peak_rss()})")
+            print("="*60 + "\n")
+            return
+        
         # Load data in order
         load_teams(conn)
-        load_players(conn)
-        load_games(conn)
-        load_team_statistics(conn)  # Load team stats first to create seasons
-        load_player_statistics(conn)
-        refresh_leaderboards(conn)
+        load_players(conn, args.mode)
+        if args.workers > 1:
+            # Games and team stats only depend on the team map, so run them side by side
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futures = [
+                    executor.submit(run_with_connection, load_games, args.mode, args.chunk_size),
+                    executor.submit(run_with_connection, load_team_statistics, args.mode,
+                                    args.chunk_size, args.memory_limit_mb, args.workers, args.engine)
+                ]
+                for future in futures:
+                    future.result()
+        else:
+            load_games(conn, args.mode, args.chunk_size)
+            # Load team stats first to create seasons
+            load_team_statistics(conn, args.mode, args.chunk_size, args.memory_limit_mb,
+                                 engine=args.engine)
+        load_player_statistics(conn, args.mode, args.chunk_size, args.memory_limit_mb, args.workers,
+                               args.engine)
+        load_player_game_stats(conn, args.mode, args.chunk_size)
+        refresh_leaderboards(conn, args.workers)
+        refresh_stat_distributions(conn)
+        bump_data_version(conn)
         
         conn.close()
         print("\n" + "="*60)
-        print("✓ Data loading completed successfully!")
+        print(f"✓ Data loading completed successfully in {time.perf_counter() - started:.2f}s! "
+              f"({format_peak_rss()})")
         print("="*60 + "\n")
         
     except Exception as e:
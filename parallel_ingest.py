@@ -0,0 +1,131 @@
+"""
+CourtVision Parallel Ingestion Module
+Splits large CSVs into byte ranges at line boundaries and parses and
+partially aggregates each range in a worker process
+Author: CS3620 Student
+"""
+
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import load_data
+
+# Ranges smaller than this are not worth a round trip to a worker
+MIN_CHUNK_BYTES = 4 * 1024 * 1024
+
+# More ranges than workers keeps every worker busy until the end of the file
+CHUNKS_PER_WORKER = 4
+
+
+def split_csv(path, workers, min_chunk_bytes=MIN_CHUNK_BYTES):
+    """
+    Split a CSV file into byte ranges that start and end on line boundaries
+
+    Assumes no quoted field contains a newline, which holds for the
+    Kaggle NBA exports.
+
+    Returns:
+        Tuple of (header field names, list of (start, end) byte offsets)
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header = f.readline()
+        data_start = f.tell()
+        target = max(min_chunk_bytes, (size - data_start) // (workers * CHUNKS_PER_WORKER) or 1)
+
+        ranges = []
+        start = data_start
+        while start < size:
+            end = start + target
+            if end >= size:
+                end = size
+            else:
+                # Extend to the end of the line the cut landed in
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            ranges.append((start, end))
+            start = end
+
+    fieldnames = next(csv.reader([header.decode('utf-8')]))
+    return fieldnames, ranges
+
+
+# Lookup tables shared by every task in a worker, set once by _init_worker
+_context = {}
+
+
+def _init_worker(context):
+    """Install the lookup tables in this worker process"""
+    _context.update(context)
+
+
+def _read_range(path, start, end, fieldnames):
+    """Yield CSV rows as dictionaries for one byte range"""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    yield from csv.DictReader(io.StringIO(data.decode('utf-8')), fieldnames=fieldnames)
+
+
+def _aggregate_range(task):
+    """
+    Parse and aggregate one byte range
+
+    Returns:
+        Tuple of (rows read, [(key, partial_row), ...] in first-appearance order)
+    """
+    kind, path, start, end, fieldnames = task
+    rows_read = 0
+    totals = {}
+
+    if kind == 'player':
+        players, teams, season_id = _context['players'], _context['teams'], _context['season_id']
+        totals_class = load_data.PlayerStatTotals
+        key_for = lambda row: load_data.player_stat_key(row, players, teams, season_id)
+    else:
+        teams = _context['teams']
+        totals_class = load_data.TeamStatTotals
+        key_for = lambda row: load_data.team_stat_key(row, teams)
+
+    for row in _read_range(path, start, end, fieldnames):
+        rows_read += 1
+        key = key_for(row)
+        if not key:
+            continue
+        acc = totals.get(key)
+        if acc is None:
+            acc = totals[key] = totals_class()
+        acc.add_row(row)
+
+    return rows_read, [(key, acc.partial_row()) for key, acc in totals.items()]
+
+
+class ParallelAggregation:
+    """
+    Iterates (key, partial_row) pairs for a whole CSV, aggregated in parallel
+
+    Ranges are handed to a process pool and their results consumed in file
+    order, so merging them reproduces the serial first-appearance order of
+    keys. rows_read is complete once iteration finishes.
+    """
+
+    def __init__(self, kind, path, workers, context):
+        self.kind = kind
+        self.path = path
+        self.workers = workers
+        self.context = context
+        self.rows_read = 0
+        self.ranges = 0
+
+    def __iter__(self):
+        fieldnames, ranges = split_csv(self.path, self.workers)
+        self.ranges = len(ranges)
+        tasks = [(self.kind, self.path, start, end, fieldnames) for start, end in ranges]
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.context,)) as executor:
+            for rows_read, partials in executor.map(_aggregate_range, tasks):
+                self.rows_read += rows_read
+                yield from partials
@@ -1,4 +1,4 @@
--- Additional functions for rebounds, steals, and player comparison
+-- Additional functions for rebounds, steals, blocks, and player comparison
 
 -- Get top rebounds leaders by season
 CREATE OR REPLACE FUNCTION get_top_rebounds(p_season_id INTEGER, p_limit INTEGER DEFAULT 10)
@@ -12,15 +12,15 @@ RETURNS TABLE (
 BEGIN
     RETURN QUERY
     SELECT 
-        ROW_NUMBER() OVER (ORDER BY pss.rebounds DESC)::INTEGER as rank,
-        p.id,
+        l.rank,
+        l.player_id,
         p.player_name,
-        pss.rebounds,
-        pss.games_played
-    FROM player_season_stats pss
-    JOIN player p ON pss.player_id = p.id
-    WHERE pss.season_id = p_season_id AND pss.games_played > 0
-    ORDER BY pss.rebounds DESC
+        l.rebounds_per_game,
+        l.games_played
+    FROM leaderboard_reb l
+    JOIN player p ON l.player_id = p.id
+    WHERE l.season_id = p_season_id
+    ORDER BY l.rank
     LIMIT p_limit;
 END;
 $$ LANGUAGE plpgsql;
@@ -37,15 +37,40 @@ RETURNS TABLE (
 BEGIN
     RETURN QUERY
     SELECT 
-        ROW_NUMBER() OVER (ORDER BY pss.steals DESC)::INTEGER as rank,
-        p.id,
+        l.rank,
+        l.player_id,
         p.player_name,
-        pss.steals,
-        pss.games_played
-    FROM player_season_stats pss
-    JOIN player p ON pss.player_id = p.id
-    WHERE pss.season_id = p_season_id AND pss.games_played > 0
-    ORDER BY pss.steals DESC
+        l.steals_per_game,
+        l.games_played
+    FROM leaderboard_stl l
+    JOIN player p ON l.player_id = p.id
+    WHERE l.season_id = p_season_id
+    ORDER BY l.rank
+    LIMIT p_limit;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Get top blocks leaders by season
+CREATE OR REPLACE FUNCTION get_top_blocks(p_season_id INTEGER, p_limit INTEGER DEFAULT 10)
+RETURNS TABLE (
+    rank INTEGER,
+    player_id INTEGER,
+    player_name VARCHAR(255),
+    blocks_per_game DECIMAL(10, 2),
+    games_played INTEGER
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        l.rank,
+        l.player_id,
+        p.player_name,
+        l.blocks_per_game,
+        l.games_played
+    FROM leaderboard_blk l
+    JOIN player p ON l.player_id = p.id
+    WHERE l.season_id = p_season_id
+    ORDER BY l.rank
     LIMIT p_limit;
 END;
 $$ LANGUAGE plpgsql;
@@ -91,6 +91,36 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- READ: Get one page of players in name order.
+-- Keyset pagination: pass the name and id of the last player of the
+-- previous page (NULL for the first page), so every page costs the same
+-- index range scan no matter how deep it is.
+CREATE OR REPLACE FUNCTION get_players_page(
+    p_limit INTEGER DEFAULT 50,
+    p_after_name VARCHAR(255) DEFAULT NULL,
+    p_after_id INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+    id INTEGER,
+    player_name VARCHAR(255),
+    birth_date DATE,
+    height_inches INTEGER,
+    weight_lbs INTEGER,
+    position VARCHAR(10),
+    jersey_number INTEGER,
+    is_active BOOLEAN
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT p.id, p.player_name, p.birth_date, p.height_inches, p.weight_lbs, 
+           p.position, p.jersey_number, p.is_active
+    FROM player p
+    WHERE (p.player_name, p.id) > (COALESCE(p_after_name, ''), COALESCE(p_after_id, 0))
+    ORDER BY p.player_name, p.id
+    LIMIT p_limit;
+END;
+$$ LANGUAGE plpgsql;
+
 -- UPDATE: Update player height
 CREATE OR REPLACE FUNCTION update_player_height(
     p_id INTEGER,
@@ -289,6 +319,32 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- READ: Get one page of a user's notes, newest first (keyset pagination)
+CREATE OR REPLACE FUNCTION get_user_notes_page(
+    p_user_id INTEGER,
+    p_limit INTEGER DEFAULT 50,
+    p_after_created_at TIMESTAMP DEFAULT NULL,
+    p_after_id INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+    id INTEGER,
+    player_id INTEGER,
+    team_id INTEGER,
+    note_title VARCHAR(255),
+    note_content TEXT,
+    created_at TIMESTAMP
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT n.id, n.player_id, n.team_id, n.note_title, n.note_content, n.created_at
+    FROM user_notes n
+    WHERE n.user_id = p_user_id
+      AND (n.created_at, n.id) < (COALESCE(p_after_created_at, 'infinity'), COALESCE(p_after_id, 2147483647))
+    ORDER BY n.created_at DESC, n.id DESC
+    LIMIT p_limit;
+END;
+$$ LANGUAGE plpgsql;
+
 -- UPDATE: Update user note
 CREATE OR REPLACE FUNCTION update_user_note(
     p_id INTEGER,
@@ -390,24 +446,16 @@ RETURNS TABLE (
 ) AS $$
 BEGIN
     RETURN QUERY
-    WITH aggregated_stats AS (
-        SELECT 
-            pss.player_id,
-            MAX(pss.points) as max_points,
-            MAX(pss.games_played) as max_games
-        FROM player_season_stats pss
-        WHERE pss.season_id = p_season_id AND pss.games_played > 0
-        GROUP BY pss.player_id
-    )
     SELECT 
-        ROW_NUMBER() OVER (ORDER BY a.max_points DESC)::INTEGER as rank,
-        p.id,
+        l.rank,
+        l.player_id,
         p.player_name,
-        a.max_points,
-        a.max_games
-    FROM aggregated_stats a
-    JOIN player p ON a.player_id = p.id
-    ORDER BY a.max_points DESC
+        l.points_per_game,
+        l.games_played
+    FROM leaderboard_pts l
+    JOIN player p ON l.player_id = p.id
+    WHERE l.season_id = p_season_id
+    ORDER BY l.rank
     LIMIT p_limit;
 END;
 $$ LANGUAGE plpgsql;
@@ -423,24 +471,16 @@ RETURNS TABLE (
 ) AS $$
 BEGIN
     RETURN QUERY
-    WITH aggregated_stats AS (
-        SELECT 
-            pss.player_id,
-            MAX(pss.assists) as max_assists,
-            MAX(pss.games_played) as max_games
-        FROM player_season_stats pss
-        WHERE pss.season_id = p_season_id AND pss.games_played > 0
-        GROUP BY pss.player_id
-    )
     SELECT 
-        ROW_NUMBER() OVER (ORDER BY a.max_assists DESC)::INTEGER as rank,
-        p.id,
+        l.rank,
+        l.player_id,
         p.player_name,
-        a.max_assists,
-        a.max_games
-    FROM aggregated_stats a
-    JOIN player p ON a.player_id = p.id
-    ORDER BY a.max_assists DESC
+        l.assists_per_game,
+        l.games_played
+    FROM leaderboard_ast l
+    JOIN player p ON l.player_id = p.id
+    WHERE l.season_id = p_season_id
+    ORDER BY l.rank
     LIMIT p_limit;
 END;
 $$ LANGUAGE plpgsql;
@@ -456,24 +496,16 @@ RETURNS TABLE (
 ) AS $$
 BEGIN
     RETURN QUERY
-    WITH aggregated_stats AS (
-        SELECT 
-            pss.player_id,
-            MAX(pss.rebounds) as max_rebounds,
-            MAX(pss.games_played) as max_games
-        FROM player_season_stats pss
-        WHERE pss.season_id = p_season_id AND pss.games_played > 0
-        GROUP BY pss.player_id
-    )
     SELECT 
-        ROW_NUMBER() OVER (ORDER BY a.max_rebounds DESC)::INTEGER as rank,
-        p.id,
+        l.rank,
+        l.player_id,
         p.player_name,
-        a.max_rebounds,
-        a.max_games
-    FROM aggregated_stats a
-    JOIN player p ON a.player_id = p.id
-    ORDER BY a.max_rebounds DESC
+        l.rebounds_per_game,
+        l.games_played
+    FROM leaderboard_reb l
+    JOIN player p ON l.player_id = p.id
+    WHERE l.season_id = p_season_id
+    ORDER BY l.rank
     LIMIT p_limit;
 END;
 $$ LANGUAGE plpgsql;
@@ -489,24 +521,41 @@ RETURNS TABLE (
 ) AS $$
 BEGIN
     RETURN QUERY
-    WITH aggregated_stats AS (
-        SELECT 
-            pss.player_id,
-            MAX(pss.steals) as max_steals,
-            MAX(pss.games_played) as max_games
-        FROM player_season_stats pss
-        WHERE pss.season_id = p_season_id AND pss.games_played > 0
-        GROUP BY pss.player_id
-    )
     SELECT 
-        ROW_NUMBER() OVER (ORDER BY a.max_steals DESC)::INTEGER as rank,
-        p.id,
+        l.rank,
+        l.player_id,
+        p.player_name,
+        l.steals_per_game,
+        l.games_played
+    FROM leaderboard_stl l
+    JOIN player p ON l.player_id = p.id
+    WHERE l.season_id = p_season_id
+    ORDER BY l.rank
+    LIMIT p_limit;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Get top blocks leaders by season
+CREATE OR REPLACE FUNCTION get_top_blocks(p_season_id INTEGER, p_limit INTEGER DEFAULT 10)
+RETURNS TABLE (
+    rank INTEGER,
+    player_id INTEGER,
+    player_name VARCHAR(255),
+    blocks_per_game DECIMAL(10, 2),
+    games_played INTEGER
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        l.rank,
+        l.player_id,
         p.player_name,
-        a.max_steals,
-        a.max_games
-    FROM aggregated_stats a
-    JOIN player p ON a.player_id = p.id
-    ORDER BY a.max_steals DESC
+        l.blocks_per_game,
+        l.games_played
+    FROM leaderboard_blk l
+    JOIN player p ON l.player_id = p.id
+    WHERE l.season_id = p_season_id
+    ORDER BY l.rank
     LIMIT p_limit;
 END;
 $$ LANGUAGE plpgsql;
@@ -624,20 +673,194 @@ RETURNS TABLE (
 BEGIN
     RETURN QUERY
     SELECT 
-        ROW_NUMBER() OVER (ORDER BY am.player_efficiency_rating DESC NULLS LAST)::INTEGER as rank,
+        l.rank,
         p.player_name,
-        am.player_efficiency_rating,
-        pss.games_played,
-        pss.minutes_played
-    FROM advanced_metrics am
-    JOIN player p ON am.player_id = p.id
-    JOIN player_season_stats pss ON am.player_id = pss.player_id AND am.season_id = pss.season_id
-    WHERE am.season_id = p_season_id AND pss.games_played > 0
-    ORDER BY am.player_efficiency_rating DESC NULLS LAST
+        l.efficiency_rating,
+        l.games_played,
+        l.minutes_played
+    FROM leaderboard_efficiency l
+    JOIN player p ON l.player_id = p.id
+    WHERE l.season_id = p_season_id
+    ORDER BY l.rank
     LIMIT p_limit;
 END;
 $$ LANGUAGE plpgsql;
 
+-- Get one stat's leaderboard restricted to a position ('G' also matches
+-- 'G-F') and/or a minimum number of games. Ranked like refresh_leaderboard,
+-- but ranks count only the players that pass the filters.
+CREATE OR REPLACE FUNCTION get_player_leaderboard(
+    p_stat VARCHAR(20),
+    p_season_id INTEGER,
+    p_limit INTEGER DEFAULT 10,
+    p_position VARCHAR(10) DEFAULT NULL,
+    p_min_games INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+    rank INTEGER,
+    player_id INTEGER,
+    player_name VARCHAR(255),
+    value DECIMAL(10, 2),
+    games_played INTEGER,
+    minutes_played DECIMAL(10, 2)
+) AS $$
+DECLARE
+    v_def RECORD;
+BEGIN
+    SELECT * INTO v_def FROM leaderboard_columns(p_stat);
+
+    RETURN QUERY EXECUTE format(
+        'SELECT ROW_NUMBER() OVER (ORDER BY %1$s DESC, pss.player_id)::INTEGER,
+                pss.player_id,
+                p.player_name,
+                (%1$s)::DECIMAL(10, 2),
+                pss.games_played,
+                pss.minutes_played
+         FROM player_season_stats pss
+         JOIN player p ON pss.player_id = p.id
+         WHERE pss.season_id = $1
+           AND pss.games_played > 0
+           AND pss.games_played >= COALESCE($2, 0)
+           AND ($3 IS NULL OR upper($3) = ANY(string_to_array(upper(p.position), ''-'')))
+         ORDER BY 1
+         LIMIT $4',
+        v_def.value_expression
+    ) USING p_season_id, p_min_games, p_position, p_limit;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ==========================================
+-- NAME SEARCH FUNCTIONS
+-- ==========================================
+-- Ranked name search served by the pg_trgm indexes in schema.sql.
+-- 'contains' mode matches anywhere in the name and tolerates typos;
+-- 'prefix' mode (typeahead) matches the start of the name or of any word
+-- in it. Results come best first and are paged with a keyset cursor: pass
+-- the score and id of the last row of one page to get the next.
+
+-- Escape LIKE wildcards so user input matches literally
+CREATE OR REPLACE FUNCTION escape_like(p_text TEXT)
+RETURNS TEXT AS $$
+BEGIN
+    RETURN replace(replace(replace(p_text, '\', '\\'), '%', '\%'), '_', '\_');
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+-- Search players by name, best match first
+CREATE OR REPLACE FUNCTION search_players_ranked(
+    p_query VARCHAR(255),
+    p_mode VARCHAR(10) DEFAULT 'contains',
+    p_limit INTEGER DEFAULT 20,
+    p_after_score DOUBLE PRECISION DEFAULT NULL,
+    p_after_id INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+    id INTEGER,
+    player_name VARCHAR(255),
+    birth_date DATE,
+    height_inches INTEGER,
+    weight_lbs INTEGER,
+    position VARCHAR(10),
+    jersey_number INTEGER,
+    is_active BOOLEAN,
+    score DOUBLE PRECISION
+) AS $$
+DECLARE
+    v_pattern TEXT := escape_like(p_query);
+BEGIN
+    IF p_mode = 'prefix' THEN
+        -- Whole-name prefixes first, then shorter (closer) names
+        RETURN QUERY
+        SELECT m.* FROM (
+            SELECT p.id, p.player_name, p.birth_date, p.height_inches, p.weight_lbs,
+                   p.position, p.jersey_number, p.is_active,
+                   ((CASE WHEN p.player_name ILIKE v_pattern || '%' THEN 1 ELSE 0 END)
+                    + similarity(p.player_name, p_query))::DOUBLE PRECISION as score
+            FROM player p
+            WHERE p.player_name ILIKE v_pattern || '%'
+               OR p.player_name ILIKE '% ' || v_pattern || '%'
+        ) m
+        WHERE p_after_score IS NULL
+           OR m.score < p_after_score
+           OR (m.score = p_after_score AND m.id > p_after_id)
+        ORDER BY m.score DESC, m.id
+        LIMIT p_limit;
+    ELSE
+        -- Substring matches plus names containing a word similar to the query
+        RETURN QUERY
+        SELECT m.* FROM (
+            SELECT p.id, p.player_name, p.birth_date, p.height_inches, p.weight_lbs,
+                   p.position, p.jersey_number, p.is_active,
+                   (word_similarity(p_query, p.player_name)
+                    + similarity(p.player_name, p_query))::DOUBLE PRECISION as score
+            FROM player p
+            WHERE p.player_name ILIKE '%' || v_pattern || '%'
+               OR p_query <% p.player_name
+        ) m
+        WHERE p_after_score IS NULL
+           OR m.score < p_after_score
+           OR (m.score = p_after_score AND m.id > p_after_id)
+        ORDER BY m.score DESC, m.id
+        LIMIT p_limit;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Search teams by name, best match first
+CREATE OR REPLACE FUNCTION search_teams_ranked(
+    p_query VARCHAR(255),
+    p_mode VARCHAR(10) DEFAULT 'contains',
+    p_limit INTEGER DEFAULT 20,
+    p_after_score DOUBLE PRECISION DEFAULT NULL,
+    p_after_id INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+    id INTEGER,
+    team_name VARCHAR(255),
+    abbreviation VARCHAR(10),
+    city VARCHAR(100),
+    conference VARCHAR(20),
+    division VARCHAR(50),
+    is_active BOOLEAN,
+    score DOUBLE PRECISION
+) AS $$
+DECLARE
+    v_pattern TEXT := escape_like(p_query);
+BEGIN
+    IF p_mode = 'prefix' THEN
+        RETURN QUERY
+        SELECT m.* FROM (
+            SELECT t.id, t.team_name, t.abbreviation, t.city, t.conference, t.division, t.is_active,
+                   ((CASE WHEN t.team_name ILIKE v_pattern || '%' THEN 1 ELSE 0 END)
+                    + similarity(t.team_name, p_query))::DOUBLE PRECISION as score
+            FROM team t
+            WHERE t.team_name ILIKE v_pattern || '%'
+               OR t.team_name ILIKE '% ' || v_pattern || '%'
+        ) m
+        WHERE p_after_score IS NULL
+           OR m.score < p_after_score
+           OR (m.score = p_after_score AND m.id > p_after_id)
+        ORDER BY m.score DESC, m.id
+        LIMIT p_limit;
+    ELSE
+        RETURN QUERY
+        SELECT m.* FROM (
+            SELECT t.id, t.team_name, t.abbreviation, t.city, t.conference, t.division, t.is_active,
+                   (word_similarity(p_query, t.team_name)
+                    + similarity(t.team_name, p_query))::DOUBLE PRECISION as score
+            FROM team t
+            WHERE t.team_name ILIKE '%' || v_pattern || '%'
+               OR p_query <% t.team_name
+        ) m
+        WHERE p_after_score IS NULL
+           OR m.score < p_after_score
+           OR (m.score = p_after_score AND m.id > p_after_id)
+        ORDER BY m.score DESC, m.id
+        LIMIT p_limit;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
 -- ==========================================
 -- AUDIT LOG TRIGGER FUNCTIONS
 -- ==========================================
@@ -656,6 +879,13 @@ BEGIN
         INSERT INTO audit_log (table_name, operation, record_id, old_values)
         VALUES ('player', 'DELETE', OLD.id, row_to_json(OLD)::jsonb);
     END IF;
+    
+    -- Tell API caches which player changed (delivered on commit)
+    PERFORM pg_notify('courtvision_changes', json_build_object(
+        'table', 'player',
+        'op', TG_OP,
+        'id', CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END
+    )::text);
     RETURN NULL;
 END;
 $$ LANGUAGE plpgsql;
@@ -679,6 +909,13 @@ BEGIN
         INSERT INTO audit_log (table_name, operation, record_id, old_values)
         VALUES ('team', 'DELETE', OLD.id, row_to_json(OLD)::jsonb);
     END IF;
+    
+    -- Tell API caches which team changed (delivered on commit)
+    PERFORM pg_notify('courtvision_changes', json_build_object(
+        'table', 'team',
+        'op', TG_OP,
+        'id', CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END
+    )::text);
     RETURN NULL;
 END;
 $$ LANGUAGE plpgsql;
@@ -688,6 +925,229 @@ CREATE TRIGGER team_audit_trigger
 AFTER INSERT OR UPDATE OR DELETE ON team
 FOR EACH ROW EXECUTE FUNCTION log_team_changes();
 
+-- Get one page of audit log entries, newest first (keyset pagination).
+-- The table filter picks between two queries so each can use its own
+-- (table_name, changed_at, id) or (changed_at, id) index.
+CREATE OR REPLACE FUNCTION get_audit_log_page(
+    p_limit INTEGER DEFAULT 50,
+    p_table_name VARCHAR(100) DEFAULT NULL,
+    p_after_changed_at TIMESTAMP DEFAULT NULL,
+    p_after_id INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+    id INTEGER,
+    table_name VARCHAR(100),
+    operation VARCHAR(20),
+    record_id INTEGER,
+    changed_at TIMESTAMP,
+    old_values TEXT,
+    new_values TEXT
+) AS $$
+BEGIN
+    IF p_table_name IS NULL THEN
+        RETURN QUERY
+        SELECT a.id, a.table_name, a.operation, a.record_id, a.changed_at,
+               a.old_values::text, a.new_values::text
+        FROM audit_log a
+        WHERE (a.changed_at, a.id) < (COALESCE(p_after_changed_at, 'infinity'), COALESCE(p_after_id, 2147483647))
+        ORDER BY a.changed_at DESC, a.id DESC
+        LIMIT p_limit;
+    ELSE
+        RETURN QUERY
+        SELECT a.id, a.table_name, a.operation, a.record_id, a.changed_at,
+               a.old_values::text, a.new_values::text
+        FROM audit_log a
+        WHERE a.table_name = p_table_name
+          AND (a.changed_at, a.id) < (COALESCE(p_after_changed_at, 'infinity'), COALESCE(p_after_id, 2147483647))
+        ORDER BY a.changed_at DESC, a.id DESC
+        LIMIT p_limit;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ==========================================
+-- CHANGE NOTIFICATION TRIGGERS
+-- ==========================================
+-- Statement-level triggers so bulk loads send one notification per
+-- statement instead of one per row. Id lists are omitted (NULL) when a
+-- statement touches too many rows to fit in a notification payload.
+-- UPDATE triggers also see the rows as they were (old_rows), so a row
+-- moved to another season or team invalidates both.
+
+-- Notify which seasons/players a player_season_stats statement touched
+CREATE OR REPLACE FUNCTION notify_player_stats_changes()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_season_ids INTEGER[];
+    v_player_ids INTEGER[];
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        SELECT array_agg(DISTINCT season_id),
+               CASE WHEN COUNT(DISTINCT player_id) <= 200 THEN array_agg(DISTINCT player_id) END
+        INTO v_season_ids, v_player_ids
+        FROM (SELECT season_id, player_id FROM changed_rows
+              UNION ALL
+              SELECT season_id, player_id FROM old_rows) c;
+    ELSE
+        SELECT array_agg(DISTINCT season_id),
+               CASE WHEN COUNT(DISTINCT player_id) <= 200 THEN array_agg(DISTINCT player_id) END
+        INTO v_season_ids, v_player_ids
+        FROM changed_rows;
+    END IF;
+    
+    IF v_season_ids IS NOT NULL THEN
+        PERFORM pg_notify('courtvision_changes', json_build_object(
+            'table', 'player_season_stats',
+            'op', TG_OP,
+            'season_ids', v_season_ids,
+            'player_ids', v_player_ids
+        )::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER player_stats_insert_notify_trigger
+AFTER INSERT ON player_season_stats
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_player_stats_changes();
+
+CREATE TRIGGER player_stats_update_notify_trigger
+AFTER UPDATE ON player_season_stats
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_player_stats_changes();
+
+CREATE TRIGGER player_stats_delete_notify_trigger
+AFTER DELETE ON player_season_stats
+REFERENCING OLD TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_player_stats_changes();
+
+-- Notify which seasons/teams a team_season_stats statement touched
+CREATE OR REPLACE FUNCTION notify_team_stats_changes()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_season_ids INTEGER[];
+    v_team_ids INTEGER[];
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        SELECT array_agg(DISTINCT season_id),
+               CASE WHEN COUNT(DISTINCT team_id) <= 200 THEN array_agg(DISTINCT team_id) END
+        INTO v_season_ids, v_team_ids
+        FROM (SELECT season_id, team_id FROM changed_rows
+              UNION ALL
+              SELECT season_id, team_id FROM old_rows) c;
+    ELSE
+        SELECT array_agg(DISTINCT season_id),
+               CASE WHEN COUNT(DISTINCT team_id) <= 200 THEN array_agg(DISTINCT team_id) END
+        INTO v_season_ids, v_team_ids
+        FROM changed_rows;
+    END IF;
+    
+    IF v_season_ids IS NOT NULL THEN
+        PERFORM pg_notify('courtvision_changes', json_build_object(
+            'table', 'team_season_stats',
+            'op', TG_OP,
+            'season_ids', v_season_ids,
+            'team_ids', v_team_ids
+        )::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER team_stats_insert_notify_trigger
+AFTER INSERT ON team_season_stats
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_team_stats_changes();
+
+CREATE TRIGGER team_stats_update_notify_trigger
+AFTER UPDATE ON team_season_stats
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_team_stats_changes();
+
+CREATE TRIGGER team_stats_delete_notify_trigger
+AFTER DELETE ON team_season_stats
+REFERENCING OLD TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_team_stats_changes();
+
+-- Notify which teams a game statement touched
+CREATE OR REPLACE FUNCTION notify_game_changes()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_row_count INTEGER;
+    v_team_ids INTEGER[];
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        SELECT COUNT(*),
+               CASE WHEN COUNT(*) <= 200
+                    THEN array_agg(DISTINCT t.team_id) FILTER (WHERE t.team_id IS NOT NULL) END
+        INTO v_row_count, v_team_ids
+        FROM (SELECT home_team_id, away_team_id FROM changed_rows
+              UNION ALL
+              SELECT home_team_id, away_team_id FROM old_rows) c
+        CROSS JOIN LATERAL (VALUES (c.home_team_id), (c.away_team_id)) AS t(team_id);
+    ELSE
+        SELECT COUNT(*),
+               CASE WHEN COUNT(*) <= 100
+                    THEN array_agg(DISTINCT t.team_id) FILTER (WHERE t.team_id IS NOT NULL) END
+        INTO v_row_count, v_team_ids
+        FROM changed_rows c
+        CROSS JOIN LATERAL (VALUES (c.home_team_id), (c.away_team_id)) AS t(team_id);
+    END IF;
+    
+    IF v_row_count > 0 THEN
+        PERFORM pg_notify('courtvision_changes', json_build_object(
+            'table', 'game',
+            'op', TG_OP,
+            'team_ids', v_team_ids
+        )::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER game_insert_notify_trigger
+AFTER INSERT ON game
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_game_changes();
+
+CREATE TRIGGER game_update_notify_trigger
+AFTER UPDATE ON game
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_game_changes();
+
+CREATE TRIGGER game_delete_notify_trigger
+AFTER DELETE ON game
+REFERENCING OLD TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_game_changes();
+
+-- Advance the data version and announce it, so API processes stop
+-- answering If-None-Match with 304 for responses built from older data
+CREATE OR REPLACE FUNCTION bump_data_version()
+RETURNS BIGINT AS $$
+DECLARE
+    v_version BIGINT;
+BEGIN
+    v_version := nextval('data_version_seq');
+    PERFORM pg_notify('courtvision_changes', json_build_object(
+        'table', 'data_version',
+        'op', 'BUMP',
+        'version', v_version
+    )::text);
+    RETURN v_version;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Current data version (the last bump, or 0 before any). A new sequence
+-- already reports last_value 1, which the first bump also returns, so
+-- is_called tells the two apart.
+CREATE OR REPLACE FUNCTION get_data_version()
+RETURNS BIGINT AS $$
+BEGIN
+    RETURN (SELECT CASE WHEN is_called THEN last_value ELSE 0 END FROM data_version_seq);
+END;
+$$ LANGUAGE plpgsql;
+
 -- ==========================================
 -- TEAM COMPARISON & LEADERBOARDS
 -- ==========================================
@@ -814,69 +1274,1397 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
--- ==========================================
--- GAME FUNCTIONS
--- ==========================================
+-- All-time team leaderboards (the home page's team tables), summed over
+-- every season in team_season_stats
 
--- Get recent games
-CREATE OR REPLACE FUNCTION get_recent_games(p_limit INTEGER DEFAULT 10)
+-- Get teams by total wins
+CREATE OR REPLACE FUNCTION get_team_most_wins(p_limit INTEGER DEFAULT 10)
 RETURNS TABLE (
-    id INTEGER,
-    game_id VARCHAR(50),
-    game_date_time TIMESTAMP,
-    home_team VARCHAR(255),
-    away_team VARCHAR(255),
-    home_score INTEGER,
-    away_score INTEGER,
-    game_type VARCHAR(50)
+    rank INTEGER,
+    team_id INTEGER,
+    team_name VARCHAR(255),
+    total_wins INTEGER,
+    total_losses INTEGER
 ) AS $$
 BEGIN
     RETURN QUERY
     SELECT 
-        g.id,
-        g.game_id,
-        g.game_date_time,
-        t1.team_name as home_team,
-        t2.team_name as away_team,
-        g.home_score,
-        g.away_score,
-        g.game_type
-    FROM game g
-    LEFT JOIN team t1 ON g.home_team_id = t1.id
-    LEFT JOIN team t2 ON g.away_team_id = t2.id
-    ORDER BY g.game_date_time DESC
+        ROW_NUMBER() OVER (ORDER BY SUM(tss.wins) DESC, t.id)::INTEGER as rank,
+        t.id,
+        t.team_name,
+        SUM(tss.wins)::INTEGER,
+        SUM(tss.losses)::INTEGER
+    FROM team_season_stats tss
+    JOIN team t ON tss.team_id = t.id
+    GROUP BY t.id, t.team_name
+    ORDER BY SUM(tss.wins) DESC, t.id
     LIMIT p_limit;
 END;
 $$ LANGUAGE plpgsql;
 
--- Get games by team
-CREATE OR REPLACE FUNCTION get_games_by_team(p_team_id INTEGER, p_limit INTEGER DEFAULT 20)
+-- Get teams by average wins per season played
+CREATE OR REPLACE FUNCTION get_team_avg_wins_per_season(p_limit INTEGER DEFAULT 10)
 RETURNS TABLE (
-    id INTEGER,
-    game_id VARCHAR(50),
-    game_date_time TIMESTAMP,
-    opponent_team VARCHAR(255),
-    is_home BOOLEAN,
-    team_score INTEGER,
-    opponent_score INTEGER,
-    won BOOLEAN
+    rank INTEGER,
+    team_id INTEGER,
+    team_name VARCHAR(255),
+    avg_wins DECIMAL(10, 2),
+    seasons_played INTEGER
 ) AS $$
 BEGIN
     RETURN QUERY
     SELECT 
-        g.id,
-        g.game_id,
+        ROW_NUMBER() OVER (ORDER BY AVG(tss.wins) DESC, t.id)::INTEGER as rank,
+        t.id,
+        t.team_name,
+        ROUND(AVG(tss.wins), 2)::DECIMAL(10, 2),
+        COUNT(*)::INTEGER
+    FROM team_season_stats tss
+    JOIN team t ON tss.team_id = t.id
+    WHERE tss.games_played > 0
+    GROUP BY t.id, t.team_name
+    ORDER BY AVG(tss.wins) DESC, t.id
+    LIMIT p_limit;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Get teams by points per game over all their games
+CREATE OR REPLACE FUNCTION get_team_points_per_game(p_limit INTEGER DEFAULT 10)
+RETURNS TABLE (
+    rank INTEGER,
+    team_id INTEGER,
+    team_name VARCHAR(255),
+    avg_ppg DECIMAL(10, 2),
+    games_played INTEGER
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        ROW_NUMBER() OVER (ORDER BY SUM(tss.total_points)::DECIMAL / SUM(tss.games_played) DESC, t.id)::INTEGER as rank,
+        t.id,
+        t.team_name,
+        ROUND(SUM(tss.total_points)::DECIMAL / SUM(tss.games_played), 2)::DECIMAL(10, 2),
+        SUM(tss.games_played)::INTEGER
+    FROM team_season_stats tss
+    JOIN team t ON tss.team_id = t.id
+    WHERE tss.games_played > 0
+    GROUP BY t.id, t.team_name
+    ORDER BY SUM(tss.total_points)::DECIMAL / SUM(tss.games_played) DESC, t.id
+    LIMIT p_limit;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ==========================================
+-- BATCH COMPARISON FUNCTIONS
+-- ==========================================
+-- Compare any number of players or teams across any number of seasons in
+-- one query. Each row carries the season's league average and the row's
+-- percentile among every player/team with games that season, computed in
+-- the same scan of the season's stats. Rows come back in the order of the
+-- ids passed in; ids with no stats for a season get a row of NULL stats.
+
+-- Compare players (percentiles run 0-100, higher is better)
+CREATE OR REPLACE FUNCTION compare_players_batch(
+    p_player_ids INTEGER[],
+    p_season_ids INTEGER[]
+)
+RETURNS TABLE (
+    player_id INTEGER,
+    player_name VARCHAR(255),
+    position VARCHAR(10),
+    season_id INTEGER,
+    team_id INTEGER,
+    games_played INTEGER,
+    minutes_played DECIMAL(10, 2),
+    points DECIMAL(10, 2),
+    rebounds DECIMAL(10, 2),
+    assists DECIMAL(10, 2),
+    steals DECIMAL(10, 2),
+    blocks DECIMAL(10, 2),
+    turnovers DECIMAL(10, 2),
+    field_goal_percentage DECIMAL(5, 4),
+    three_point_percentage DECIMAL(5, 4),
+    free_throw_percentage DECIMAL(5, 4),
+    league_points DECIMAL(10, 2),
+    league_rebounds DECIMAL(10, 2),
+    league_assists DECIMAL(10, 2),
+    league_steals DECIMAL(10, 2),
+    league_blocks DECIMAL(10, 2),
+    points_percentile DECIMAL(4, 1),
+    rebounds_percentile DECIMAL(4, 1),
+    assists_percentile DECIMAL(4, 1),
+    steals_percentile DECIMAL(4, 1),
+    blocks_percentile DECIMAL(4, 1)
+) AS $$
+BEGIN
+    RETURN QUERY
+    WITH league AS (
+        SELECT 
+            pss.*,
+            percent_rank() OVER (PARTITION BY pss.season_id ORDER BY pss.points) AS points_rank,
+            percent_rank() OVER (PARTITION BY pss.season_id ORDER BY pss.rebounds) AS rebounds_rank,
+            percent_rank() OVER (PARTITION BY pss.season_id ORDER BY pss.assists) AS assists_rank,
+            percent_rank() OVER (PARTITION BY pss.season_id ORDER BY pss.steals) AS steals_rank,
+            percent_rank() OVER (PARTITION BY pss.season_id ORDER BY pss.blocks) AS blocks_rank
+        FROM player_season_stats pss
+        WHERE pss.season_id = ANY(p_season_ids) AND pss.games_played > 0
+    ),
+    averages AS (
+        SELECT 
+            l.season_id,
+            AVG(l.points) AS points,
+            AVG(l.rebounds) AS rebounds,
+            AVG(l.assists) AS assists,
+            AVG(l.steals) AS steals,
+            AVG(l.blocks) AS blocks
+        FROM league l
+        GROUP BY l.season_id
+    )
+    SELECT 
+        p.id,
+        p.player_name,
+        p.position,
+        s.season_id,
+        l.team_id,
+        l.games_played,
+        l.minutes_played,
+        l.points,
+        l.rebounds,
+        l.assists,
+        l.steals,
+        l.blocks,
+        l.turnovers,
+        ROUND(l.field_goals_made::DECIMAL / NULLIF(l.field_goals_attempted, 0), 4)::DECIMAL(5, 4),
+        ROUND(l.three_pointers_made::DECIMAL / NULLIF(l.three_pointers_attempted, 0), 4)::DECIMAL(5, 4),
+        ROUND(l.free_throws_made::DECIMAL / NULLIF(l.free_throws_attempted, 0), 4)::DECIMAL(5, 4),
+        ROUND(a.points, 2)::DECIMAL(10, 2),
+        ROUND(a.rebounds, 2)::DECIMAL(10, 2),
+        ROUND(a.assists, 2)::DECIMAL(10, 2),
+        ROUND(a.steals, 2)::DECIMAL(10, 2),
+        ROUND(a.blocks, 2)::DECIMAL(10, 2),
+        ROUND((l.points_rank * 100)::DECIMAL, 1)::DECIMAL(4, 1),
+        ROUND((l.rebounds_rank * 100)::DECIMAL, 1)::DECIMAL(4, 1),
+        ROUND((l.assists_rank * 100)::DECIMAL, 1)::DECIMAL(4, 1),
+        ROUND((l.steals_rank * 100)::DECIMAL, 1)::DECIMAL(4, 1),
+        ROUND((l.blocks_rank * 100)::DECIMAL, 1)::DECIMAL(4, 1)
+    FROM player p
+    CROSS JOIN unnest(p_season_ids) AS s(season_id)
+    LEFT JOIN league l ON l.player_id = p.id AND l.season_id = s.season_id
+    LEFT JOIN averages a ON a.season_id = s.season_id
+    WHERE p.id = ANY(p_player_ids)
+    ORDER BY array_position(p_player_ids, p.id), array_position(p_season_ids, s.season_id);
+END;
+$$ LANGUAGE plpgsql;
+
+-- Compare teams (percentiles run 0-100, higher is better, so fewer
+-- points allowed ranks higher)
+CREATE OR REPLACE FUNCTION compare_teams_batch(
+    p_team_ids INTEGER[],
+    p_season_ids INTEGER[]
+)
+RETURNS TABLE (
+    team_id INTEGER,
+    team_name VARCHAR(255),
+    abbreviation VARCHAR(10),
+    season_id INTEGER,
+    games_played INTEGER,
+    wins INTEGER,
+    losses INTEGER,
+    win_percentage DECIMAL(5, 3),
+    points_per_game DECIMAL(10, 2),
+    points_allowed_per_game DECIMAL(10, 2),
+    point_differential DECIMAL(10, 2),
+    league_win_percentage DECIMAL(5, 3),
+    league_points_per_game DECIMAL(10, 2),
+    league_points_allowed_per_game DECIMAL(10, 2),
+    win_percentage_percentile DECIMAL(4, 1),
+    points_per_game_percentile DECIMAL(4, 1),
+    points_allowed_percentile DECIMAL(4, 1),
+    point_differential_percentile DECIMAL(4, 1)
+) AS $$
+BEGIN
+    RETURN QUERY
+    WITH league AS (
+        SELECT 
+            tss.*,
+            tss.points_per_game - tss.points_allowed_per_game AS differential,
+            percent_rank() OVER (PARTITION BY tss.season_id ORDER BY tss.win_percentage) AS win_rank,
+            percent_rank() OVER (PARTITION BY tss.season_id ORDER BY tss.points_per_game) AS points_rank,
+            percent_rank() OVER (PARTITION BY tss.season_id ORDER BY tss.points_allowed_per_game DESC) AS allowed_rank,
+            percent_rank() OVER (PARTITION BY tss.season_id
+                                 ORDER BY tss.points_per_game - tss.points_allowed_per_game) AS differential_rank
+        FROM team_season_stats tss
+        WHERE tss.season_id = ANY(p_season_ids) AND tss.games_played > 0
+    ),
+    averages AS (
+        SELECT 
+            l.season_id,
+            AVG(l.win_percentage) AS win_percentage,
+            AVG(l.points_per_game) AS points_per_game,
+            AVG(l.points_allowed_per_game) AS points_allowed_per_game
+        FROM league l
+        GROUP BY l.season_id
+    )
+    SELECT 
+        t.id,
+        t.team_name,
+        t.abbreviation,
+        s.season_id,
+        l.games_played,
+        l.wins,
+        l.losses,
+        l.win_percentage,
+        l.points_per_game,
+        l.points_allowed_per_game,
+        l.differential::DECIMAL(10, 2),
+        ROUND(a.win_percentage, 3)::DECIMAL(5, 3),
+        ROUND(a.points_per_game, 2)::DECIMAL(10, 2),
+        ROUND(a.points_allowed_per_game, 2)::DECIMAL(10, 2),
+        ROUND((l.win_rank * 100)::DECIMAL, 1)::DECIMAL(4, 1),
+        ROUND((l.points_rank * 100)::DECIMAL, 1)::DECIMAL(4, 1),
+        ROUND((l.allowed_rank * 100)::DECIMAL, 1)::DECIMAL(4, 1),
+        ROUND((l.differential_rank * 100)::DECIMAL, 1)::DECIMAL(4, 1)
+    FROM team t
+    CROSS JOIN unnest(p_season_ids) AS s(season_id)
+    LEFT JOIN league l ON l.team_id = t.id AND l.season_id = s.season_id
+    LEFT JOIN averages a ON a.season_id = s.season_id
+    WHERE t.id = ANY(p_team_ids)
+    ORDER BY array_position(p_team_ids, t.id), array_position(p_season_ids, s.season_id);
+END;
+$$ LANGUAGE plpgsql;
+
+-- ==========================================
+-- DASHBOARD
+-- ==========================================
+
+-- Every leaderboard the home page shows, as one JSON document, so the page
+-- costs a single round-trip
+CREATE OR REPLACE FUNCTION get_dashboard(p_season_id INTEGER, p_limit INTEGER DEFAULT 10)
+RETURNS TABLE (
+    dashboard JSON
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT json_build_object(
+        'season_id', p_season_id,
+        'points', (SELECT COALESCE(json_agg(l ORDER BY l.rank), '[]') FROM get_top_scorers(p_season_id, p_limit) l),
+        'assists', (SELECT COALESCE(json_agg(l ORDER BY l.rank), '[]') FROM get_top_assists(p_season_id, p_limit) l),
+        'rebounds', (SELECT COALESCE(json_agg(l ORDER BY l.rank), '[]') FROM get_top_rebounds(p_season_id, p_limit) l),
+        'steals', (SELECT COALESCE(json_agg(l ORDER BY l.rank), '[]') FROM get_top_steals(p_season_id, p_limit) l),
+        'team_wins', (SELECT COALESCE(json_agg(l ORDER BY l.rank), '[]') FROM get_team_most_wins(p_limit) l),
+        'team_avg_wins', (SELECT COALESCE(json_agg(l ORDER BY l.rank), '[]') FROM get_team_avg_wins_per_season(p_limit) l),
+        'team_points', (SELECT COALESCE(json_agg(l ORDER BY l.rank), '[]') FROM get_team_points_per_game(p_limit) l)
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- ==========================================
+-- GAME FUNCTIONS
+-- ==========================================
+
+-- Get recent games
+CREATE OR REPLACE FUNCTION get_recent_games(p_limit INTEGER DEFAULT 10)
+RETURNS TABLE (
+    id INTEGER,
+    game_id VARCHAR(50),
+    game_date_time TIMESTAMP,
+    home_team VARCHAR(255),
+    away_team VARCHAR(255),
+    home_score INTEGER,
+    away_score INTEGER,
+    game_type VARCHAR(50)
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        g.id,
+        g.game_id,
         g.game_date_time,
-        CASE WHEN g.home_team_id = p_team_id THEN t2.team_name ELSE t1.team_name END as opponent_team,
-        g.home_team_id = p_team_id as is_home,
-        CASE WHEN g.home_team_id = p_team_id THEN g.home_score ELSE g.away_score END as team_score,
-        CASE WHEN g.home_team_id = p_team_id THEN g.away_score ELSE g.home_score END as opponent_score,
-        g.winner_team_id = p_team_id as won
+        t1.team_name as home_team,
+        t2.team_name as away_team,
+        g.home_score,
+        g.away_score,
+        g.game_type
     FROM game g
     LEFT JOIN team t1 ON g.home_team_id = t1.id
     LEFT JOIN team t2 ON g.away_team_id = t2.id
-    WHERE g.home_team_id = p_team_id OR g.away_team_id = p_team_id
     ORDER BY g.game_date_time DESC
     LIMIT p_limit;
 END;
 $$ LANGUAGE plpgsql;
+
+-- Get one page of games, most recent first (keyset pagination)
+CREATE OR REPLACE FUNCTION get_games_page(
+    p_limit INTEGER DEFAULT 20,
+    p_after_date TIMESTAMP DEFAULT NULL,
+    p_after_id INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+    id INTEGER,
+    game_id VARCHAR(50),
+    game_date_time TIMESTAMP,
+    home_team VARCHAR(255),
+    away_team VARCHAR(255),
+    home_score INTEGER,
+    away_score INTEGER,
+    game_type VARCHAR(50)
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        g.id,
+        g.game_id,
+        g.game_date_time,
+        t1.team_name as home_team,
+        t2.team_name as away_team,
+        g.home_score,
+        g.away_score,
+        g.game_type
+    FROM game g
+    LEFT JOIN team t1 ON g.home_team_id = t1.id
+    LEFT JOIN team t2 ON g.away_team_id = t2.id
+    WHERE (g.game_date_time, g.id) < (COALESCE(p_after_date, 'infinity'), COALESCE(p_after_id, 2147483647))
+    ORDER BY g.game_date_time DESC, g.id DESC
+    LIMIT p_limit;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Keep team_game_log in step with game: every inserted or updated game is
+-- (re)written as one row per side. Deleted games go by ON DELETE CASCADE.
+CREATE OR REPLACE FUNCTION sync_team_game_log()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        DELETE FROM team_game_log l
+        USING changed_rows c
+        WHERE l.game_id = c.id;
+    END IF;
+    
+    INSERT INTO team_game_log
+    (game_id, game_code, game_date_time, team_id, opponent_team_id, is_home, team_score, opponent_score, won)
+    SELECT c.id, c.game_id, c.game_date_time, s.team_id, s.opponent_team_id, s.is_home,
+           s.team_score, s.opponent_score, c.winner_team_id = s.team_id
+    FROM changed_rows c
+    CROSS JOIN LATERAL (VALUES
+        (c.home_team_id, c.away_team_id, TRUE, c.home_score, c.away_score),
+        (c.away_team_id, c.home_team_id, FALSE, c.away_score, c.home_score)
+    ) AS s(team_id, opponent_team_id, is_home, team_score, opponent_score)
+    WHERE s.team_id IS NOT NULL;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER game_insert_team_log_trigger
+AFTER INSERT ON game
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION sync_team_game_log();
+
+CREATE TRIGGER game_update_team_log_trigger
+AFTER UPDATE ON game
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION sync_team_game_log();
+
+-- Get one page of a team's games, most recent first (keyset pagination);
+-- one range scan of idx_team_game_log_team
+CREATE OR REPLACE FUNCTION get_games_by_team(
+    p_team_id INTEGER,
+    p_limit INTEGER DEFAULT 20,
+    p_after_date TIMESTAMP DEFAULT NULL,
+    p_after_id INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+    id INTEGER,
+    game_id VARCHAR(50),
+    game_date_time TIMESTAMP,
+    opponent_team VARCHAR(255),
+    is_home BOOLEAN,
+    team_score INTEGER,
+    opponent_score INTEGER,
+    won BOOLEAN
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        l.game_id,
+        l.game_code,
+        l.game_date_time,
+        o.team_name as opponent_team,
+        l.is_home,
+        l.team_score,
+        l.opponent_score,
+        l.won
+    FROM team_game_log l
+    LEFT JOIN team o ON l.opponent_team_id = o.id
+    WHERE l.team_id = p_team_id
+      AND (l.game_date_time, l.game_id) < (COALESCE(p_after_date, 'infinity'), COALESCE(p_after_id, 2147483647))
+    ORDER BY l.game_date_time DESC, l.game_id DESC
+    LIMIT p_limit;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Get one page of the games between two teams, most recent first, from
+-- p_team_id's side; one range scan of idx_team_game_log_matchup
+CREATE OR REPLACE FUNCTION get_games_head_to_head(
+    p_team_id INTEGER,
+    p_opponent_team_id INTEGER,
+    p_limit INTEGER DEFAULT 20,
+    p_after_date TIMESTAMP DEFAULT NULL,
+    p_after_id INTEGER DEFAULT NULL
+)
+RETURNS TABLE (
+    id INTEGER,
+    game_id VARCHAR(50),
+    game_date_time TIMESTAMP,
+    is_home BOOLEAN,
+    team_score INTEGER,
+    opponent_score INTEGER,
+    won BOOLEAN
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        l.game_id,
+        l.game_code,
+        l.game_date_time,
+        l.is_home,
+        l.team_score,
+        l.opponent_score,
+        l.won
+    FROM team_game_log l
+    WHERE l.team_id = p_team_id
+      AND l.opponent_team_id = p_opponent_team_id
+      AND (l.game_date_time, l.game_id) < (COALESCE(p_after_date, 'infinity'), COALESCE(p_after_id, 2147483647))
+    ORDER BY l.game_date_time DESC, l.game_id DESC
+    LIMIT p_limit;
+END;
+$$ LANGUAGE plpgsql;
+
+-- All-time record between two teams, from p_team_id's side (the same
+-- range of idx_team_game_log_matchup, aggregated)
+CREATE OR REPLACE FUNCTION get_head_to_head_record(p_team_id INTEGER, p_opponent_team_id INTEGER)
+RETURNS TABLE (
+    team VARCHAR(255),
+    opponent VARCHAR(255),
+    games INTEGER,
+    wins INTEGER,
+    losses INTEGER,
+    home_wins INTEGER,
+    away_wins INTEGER,
+    avg_team_score DECIMAL(10, 2),
+    avg_opponent_score DECIMAL(10, 2),
+    last_played TIMESTAMP
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT 
+        t.team_name,
+        o.team_name,
+        COUNT(l.game_id)::INTEGER,
+        COUNT(l.game_id) FILTER (WHERE l.won)::INTEGER,
+        COUNT(l.game_id) FILTER (WHERE NOT l.won)::INTEGER,
+        COUNT(l.game_id) FILTER (WHERE l.won AND l.is_home)::INTEGER,
+        COUNT(l.game_id) FILTER (WHERE l.won AND NOT l.is_home)::INTEGER,
+        ROUND(AVG(l.team_score), 2)::DECIMAL(10, 2),
+        ROUND(AVG(l.opponent_score), 2)::DECIMAL(10, 2),
+        MAX(l.game_date_time)
+    FROM team t
+    CROSS JOIN team o
+    LEFT JOIN team_game_log l ON l.team_id = t.id AND l.opponent_team_id = o.id
+    WHERE t.id = p_team_id AND o.id = p_opponent_team_id
+    GROUP BY t.team_name, o.team_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ==========================================
+-- PLAYER GAME LOG
+-- ==========================================
+-- player_game_stats is partitioned by season on game_date. Every query
+-- below bounds game_date (from a season, a date range or both), so the
+-- planner skips the partitions outside it, and within the rest a player's
+-- games are one range scan of the (player_id, game_date, game_id) key.
+-- Cost stays flat as seasons of history are added.
+
+-- October 1 of the season p_date falls in (seasons run October to June)
+CREATE OR REPLACE FUNCTION season_start(p_date DATE)
+RETURNS DATE AS $$
+BEGIN
+    RETURN make_date(
+        EXTRACT(YEAR FROM p_date)::INTEGER - CASE WHEN EXTRACT(MONTH FROM p_date) >= 10 THEN 0 ELSE 1 END,
+        10, 1
+    );
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+-- Create the player_game_stats partition for the season p_game_date falls
+-- in if it does not exist yet. Returns the partition's name.
+CREATE OR REPLACE FUNCTION ensure_player_game_stats_partition(p_game_date DATE)
+RETURNS TEXT AS $$
+DECLARE
+    v_start DATE := season_start(p_game_date);
+    v_name TEXT;
+BEGIN
+    v_name := format('player_game_stats_%s_%s', EXTRACT(YEAR FROM v_start),
+                     lpad(((EXTRACT(YEAR FROM v_start)::INTEGER + 1) % 100)::TEXT, 2, '0'));
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF player_game_stats FOR VALUES FROM (%L) TO (%L)',
+        v_name, v_start, (v_start + INTERVAL '1 year')::DATE
+    );
+    RETURN v_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Inclusive game_date bounds for a season and/or date range; NULL bounds
+-- are open. A season covers its whole partition, playoffs included.
+CREATE OR REPLACE FUNCTION player_game_date_range(
+    p_season_id INTEGER,
+    p_start_date DATE,
+    p_end_date DATE,
+    OUT first_day DATE,
+    OUT last_day DATE
+) AS $$
+DECLARE
+    v_start DATE;
+BEGIN
+    first_day := p_start_date;
+    last_day := p_end_date;
+    IF p_season_id IS NOT NULL THEN
+        SELECT season_start(s.start_date) INTO v_start FROM season s WHERE s.id = p_season_id;
+        -- GREATEST and LEAST ignore NULLs, so an open bound takes the season's
+        first_day := GREATEST(first_day, v_start);
+        last_day := LEAST(last_day, (v_start + INTERVAL '1 year' - INTERVAL '1 day')::DATE);
+    END IF;
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+-- One page of a player's games, most recent first (keyset pagination on
+-- game_date, game_id)
+CREATE OR REPLACE FUNCTION get_player_game_log(
+    p_player_id INTEGER,
+    p_season_id INTEGER DEFAULT NULL,
+    p_start_date DATE DEFAULT NULL,
+    p_end_date DATE DEFAULT NULL,
+    p_after_date DATE DEFAULT NULL,
+    p_after_game_id VARCHAR(50) DEFAULT NULL,
+    p_limit INTEGER DEFAULT 20
+)
+RETURNS TABLE (
+    game_id VARCHAR(50),
+    game_date DATE,
+    season_id INTEGER,
+    team VARCHAR(255),
+    opponent VARCHAR(255),
+    is_home BOOLEAN,
+    won BOOLEAN,
+    minutes DECIMAL(6, 2),
+    points INTEGER,
+    rebounds INTEGER,
+    assists INTEGER,
+    steals INTEGER,
+    blocks INTEGER,
+    turnovers INTEGER,
+    field_goals_made INTEGER,
+    field_goals_attempted INTEGER,
+    three_pointers_made INTEGER,
+    three_pointers_attempted INTEGER,
+    free_throws_made INTEGER,
+    free_throws_attempted INTEGER,
+    plus_minus INTEGER
+) AS $$
+DECLARE
+    v_range RECORD;
+BEGIN
+    SELECT * INTO v_range FROM player_game_date_range(p_season_id, p_start_date, p_end_date);
+    
+    RETURN QUERY
+    SELECT 
+        g.game_id,
+        g.game_date,
+        g.season_id,
+        t.team_name,
+        o.team_name,
+        g.is_home,
+        g.won,
+        g.minutes,
+        g.points,
+        g.rebounds,
+        g.assists,
+        g.steals,
+        g.blocks,
+        g.turnovers,
+        g.field_goals_made,
+        g.field_goals_attempted,
+        g.three_pointers_made,
+        g.three_pointers_attempted,
+        g.free_throws_made,
+        g.free_throws_attempted,
+        g.plus_minus
+    FROM player_game_stats g
+    LEFT JOIN team t ON g.team_id = t.id
+    LEFT JOIN team o ON g.opponent_team_id = o.id
+    WHERE g.player_id = p_player_id
+      AND g.game_date BETWEEN COALESCE(v_range.first_day, '-infinity') AND COALESCE(v_range.last_day, 'infinity')
+      AND (p_season_id IS NULL OR g.season_id = p_season_id)
+      AND (g.game_date, g.game_id) < (COALESCE(p_after_date, 'infinity'), COALESCE(p_after_game_id, ''))
+    ORDER BY g.game_date DESC, g.game_id DESC
+    LIMIT p_limit;
+END;
+$$ LANGUAGE plpgsql;
+
+-- A player's per-game averages over a season and/or date range: overall,
+-- home/away, wins/losses and by month
+CREATE OR REPLACE FUNCTION get_player_splits(
+    p_player_id INTEGER,
+    p_season_id INTEGER DEFAULT NULL,
+    p_start_date DATE DEFAULT NULL,
+    p_end_date DATE DEFAULT NULL
+)
+RETURNS TABLE (
+    split VARCHAR(20),
+    split_value VARCHAR(20),
+    games INTEGER,
+    minutes_per_game DECIMAL(6, 2),
+    points_per_game DECIMAL(10, 2),
+    rebounds_per_game DECIMAL(10, 2),
+    assists_per_game DECIMAL(10, 2),
+    steals_per_game DECIMAL(10, 2),
+    blocks_per_game DECIMAL(10, 2),
+    turnovers_per_game DECIMAL(10, 2),
+    field_goal_percentage DECIMAL(5, 4),
+    three_point_percentage DECIMAL(5, 4),
+    free_throw_percentage DECIMAL(5, 4),
+    plus_minus_per_game DECIMAL(10, 2)
+) AS $$
+DECLARE
+    v_range RECORD;
+BEGIN
+    SELECT * INTO v_range FROM player_game_date_range(p_season_id, p_start_date, p_end_date);
+    
+    RETURN QUERY
+    WITH played AS (
+        SELECT 
+            g.*,
+            CASE WHEN g.is_home THEN 'home' WHEN NOT g.is_home THEN 'away' END as venue,
+            CASE WHEN g.won THEN 'win' WHEN NOT g.won THEN 'loss' END as result,
+            to_char(g.game_date, 'YYYY-MM') as month
+        FROM player_game_stats g
+        WHERE g.player_id = p_player_id
+          AND g.game_date BETWEEN COALESCE(v_range.first_day, '-infinity') AND COALESCE(v_range.last_day, 'infinity')
+          AND (p_season_id IS NULL OR g.season_id = p_season_id)
+    )
+    SELECT 
+        (CASE WHEN GROUPING(p.venue) = 0 THEN 'venue'
+              WHEN GROUPING(p.result) = 0 THEN 'result'
+              WHEN GROUPING(p.month) = 0 THEN 'month'
+              ELSE 'overall' END)::VARCHAR(20),
+        (CASE WHEN GROUPING(p.venue) = 0 THEN p.venue
+              WHEN GROUPING(p.result) = 0 THEN p.result
+              WHEN GROUPING(p.month) = 0 THEN p.month
+              ELSE 'all' END)::VARCHAR(20),
+        COUNT(*)::INTEGER,
+        ROUND(AVG(p.minutes), 2)::DECIMAL(6, 2),
+        ROUND(AVG(p.points), 2)::DECIMAL(10, 2),
+        ROUND(AVG(p.rebounds), 2)::DECIMAL(10, 2),
+        ROUND(AVG(p.assists), 2)::DECIMAL(10, 2),
+        ROUND(AVG(p.steals), 2)::DECIMAL(10, 2),
+        ROUND(AVG(p.blocks), 2)::DECIMAL(10, 2),
+        ROUND(AVG(p.turnovers), 2)::DECIMAL(10, 2),
+        ROUND(SUM(p.field_goals_made)::DECIMAL / NULLIF(SUM(p.field_goals_attempted), 0), 4)::DECIMAL(5, 4),
+        ROUND(SUM(p.three_pointers_made)::DECIMAL / NULLIF(SUM(p.three_pointers_attempted), 0), 4)::DECIMAL(5, 4),
+        ROUND(SUM(p.free_throws_made)::DECIMAL / NULLIF(SUM(p.free_throws_attempted), 0), 4)::DECIMAL(5, 4),
+        ROUND(AVG(p.plus_minus), 2)::DECIMAL(10, 2)
+    FROM played p
+    GROUP BY GROUPING SETS ((), (p.venue), (p.result), (p.month))
+    ORDER BY GROUPING(p.month, p.result, p.venue) DESC, 2;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ==========================================
+-- LEADERBOARD REFRESH
+-- ==========================================
+-- The leaderboard_* tables hold every season's ranking for each stat
+-- category, so get_top_*() reads the first rows of a covering index instead
+-- of ranking player_season_stats on every call. Refreshes only rewrite rows
+-- whose rank or value changed and never lock the tables, so readers keep
+-- seeing the previous ranking until the refresh commits.
+
+-- Leaderboard table, its value and third column, and the
+-- player_season_stats expressions that fill them, for one stat category
+CREATE OR REPLACE FUNCTION leaderboard_columns(p_stat VARCHAR(20))
+RETURNS TABLE (
+    leaderboard_table TEXT,
+    value_column TEXT,
+    extra_column TEXT,
+    value_expression TEXT,
+    extra_expression TEXT
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT d.tbl, d.val_col, d.extra_col, d.val_expr, d.extra_expr
+    FROM (VALUES
+        ('points', 'leaderboard_pts', 'points_per_game', 'total_points', 'pss.points', 'pss.total_points'),
+        ('assists', 'leaderboard_ast', 'assists_per_game', 'total_assists', 'pss.assists', 'pss.total_assists'),
+        ('rebounds', 'leaderboard_reb', 'rebounds_per_game', 'total_rebounds', 'pss.rebounds', 'pss.total_rebounds'),
+        ('steals', 'leaderboard_stl', 'steals_per_game', 'total_steals', 'pss.steals', 'pss.total_steals'),
+        ('blocks', 'leaderboard_blk', 'blocks_per_game', 'total_blocks', 'pss.blocks', 'pss.total_blocks'),
+        -- NBA efficiency: PTS + REB + AST + STL + BLK - missed FG - missed FT - TOV, per game
+        ('efficiency', 'leaderboard_efficiency', 'efficiency_rating', 'minutes_played',
+         'ROUND((pss.total_points + pss.total_rebounds + pss.total_assists + pss.total_steals'
+         ' + pss.total_blocks - (pss.field_goals_attempted - pss.field_goals_made)'
+         ' - (pss.free_throws_attempted - pss.free_throws_made) - pss.total_turnovers)::DECIMAL'
+         ' / pss.games_played, 2)',
+         'pss.minutes_played')
+    ) AS d(stat, tbl, val_col, extra_col, val_expr, extra_expr)
+    WHERE d.stat = p_stat;
+    
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Unknown leaderboard stat: %', p_stat;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Re-rank one stat's leaderboard for one season, or every season when
+-- p_season_id is NULL. Ties are ranked by player id so repeated refreshes
+-- leave unchanged rows alone. Returns the number of rows written or deleted.
+CREATE OR REPLACE FUNCTION refresh_leaderboard(p_stat VARCHAR(20), p_season_id INTEGER DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    v_def RECORD;
+    v_season_id INTEGER;
+    v_changed INTEGER;
+    v_total INTEGER := 0;
+    v_season_ids INTEGER[] := '{}';
+BEGIN
+    SELECT * INTO v_def FROM leaderboard_columns(p_stat);
+    
+    FOR v_season_id IN EXECUTE format(
+        'SELECT season_id FROM player_season_stats WHERE $1 IS NULL OR season_id = $1
+         UNION
+         SELECT season_id FROM %I WHERE $1 IS NULL OR season_id = $1',
+        v_def.leaderboard_table
+    ) USING p_season_id
+    LOOP
+        -- Serializes with update_leaderboard_entry() on the same season
+        PERFORM pg_advisory_xact_lock(hashtext(v_def.leaderboard_table), v_season_id);
+        
+        EXECUTE format(
+            'WITH ranked AS (
+                SELECT pss.player_id,
+                       ROW_NUMBER() OVER (ORDER BY %1$s DESC, pss.player_id)::INTEGER as rank,
+                       %1$s as value,
+                       pss.games_played,
+                       %2$s as extra
+                FROM player_season_stats pss
+                WHERE pss.season_id = $1 AND pss.games_played > 0
+            ),
+            removed AS (
+                DELETE FROM %3$I l
+                WHERE l.season_id = $1
+                  AND NOT EXISTS (SELECT 1 FROM ranked r WHERE r.player_id = l.player_id)
+                RETURNING 1
+            ),
+            written AS (
+                INSERT INTO %3$I AS l (player_id, season_id, rank, %4$I, games_played, %5$I)
+                SELECT r.player_id, $1, r.rank, r.value, r.games_played, r.extra
+                FROM ranked r
+                ON CONFLICT (player_id, season_id)
+                DO UPDATE SET
+                    rank = EXCLUDED.rank,
+                    %4$I = EXCLUDED.%4$I,
+                    games_played = EXCLUDED.games_played,
+                    %5$I = EXCLUDED.%5$I,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE (l.rank, l.%4$I, l.games_played, l.%5$I)
+                      IS DISTINCT FROM (EXCLUDED.rank, EXCLUDED.%4$I, EXCLUDED.games_played, EXCLUDED.%5$I)
+                RETURNING 1
+            )
+            SELECT (SELECT COUNT(*) FROM removed) + (SELECT COUNT(*) FROM written)',
+            v_def.value_expression, v_def.extra_expression, v_def.leaderboard_table,
+            v_def.value_column, v_def.extra_column
+        ) INTO v_changed USING v_season_id;
+        
+        IF v_changed > 0 THEN
+            v_total := v_total + v_changed;
+            v_season_ids := v_season_ids || v_season_id;
+        END IF;
+    END LOOP;
+    
+    -- Tell API caches which seasons were re-ranked (delivered on commit)
+    IF array_length(v_season_ids, 1) > 0 THEN
+        PERFORM pg_notify('courtvision_changes', json_build_object(
+            'table', 'leaderboard',
+            'op', 'REFRESH',
+            'stat', p_stat,
+            'season_ids', v_season_ids
+        )::text);
+    END IF;
+    
+    RETURN v_total;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ==========================================
+-- STAT DISTRIBUTIONS
+-- ==========================================
+-- stat_distribution keeps each season's values of every leaderboard stat
+-- sorted, for all players ('ALL') and per position, so the API answers
+-- "93rd percentile in assists among guards" with a binary search instead
+-- of a percent_rank() window over the whole season. Refreshed after the
+-- leaderboards, writing only the distributions that changed.
+
+-- Rebuild the distributions of one season, or every season when
+-- p_season_id is NULL. Players need at least one game, like the
+-- leaderboards. Returns the number of rows written or deleted.
+CREATE OR REPLACE FUNCTION refresh_stat_distributions(p_season_id INTEGER DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    v_def RECORD;
+    v_stat VARCHAR(20);
+    v_changed INTEGER;
+    v_changed_seasons INTEGER[];
+    v_total INTEGER := 0;
+    v_season_ids INTEGER[] := '{}';
+BEGIN
+    FOREACH v_stat IN ARRAY ARRAY['points', 'assists', 'rebounds', 'steals', 'blocks', 'efficiency']
+    LOOP
+        SELECT * INTO v_def FROM leaderboard_columns(v_stat);
+        
+        EXECUTE format(
+            'WITH samples AS (
+                SELECT pss.season_id, g.position, pss.player_id, (%1$s)::DOUBLE PRECISION as value
+                FROM player_season_stats pss
+                JOIN player p ON pss.player_id = p.id
+                CROSS JOIN LATERAL unnest(
+                    ARRAY[''ALL''] || string_to_array(upper(COALESCE(p.position, '''')), ''-'')
+                ) AS g(position)
+                WHERE ($1 IS NULL OR pss.season_id = $1)
+                  AND pss.games_played > 0
+                  AND g.position <> ''''
+            ),
+            distributions AS (
+                SELECT season_id, position,
+                       COUNT(*)::INTEGER as sample_size,
+                       AVG(value) as mean,
+                       array_agg(value ORDER BY value, player_id) as sorted_values,
+                       array_agg(player_id ORDER BY value, player_id) as player_ids
+                FROM samples
+                GROUP BY season_id, position
+            ),
+            removed AS (
+                DELETE FROM stat_distribution d
+                WHERE d.stat = $2
+                  AND ($1 IS NULL OR d.season_id = $1)
+                  AND NOT EXISTS (
+                      SELECT 1 FROM distributions x
+                      WHERE x.season_id = d.season_id AND x.position = d.position
+                  )
+                RETURNING d.season_id
+            ),
+            written AS (
+                INSERT INTO stat_distribution AS d
+                (season_id, position, stat, sample_size, mean, sorted_values, player_ids)
+                SELECT x.season_id, x.position, $2, x.sample_size, x.mean, x.sorted_values, x.player_ids
+                FROM distributions x
+                ON CONFLICT (season_id, position, stat)
+                DO UPDATE SET
+                    sample_size = EXCLUDED.sample_size,
+                    mean = EXCLUDED.mean,
+                    sorted_values = EXCLUDED.sorted_values,
+                    player_ids = EXCLUDED.player_ids,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE (d.sorted_values, d.player_ids)
+                      IS DISTINCT FROM (EXCLUDED.sorted_values, EXCLUDED.player_ids)
+                RETURNING d.season_id
+            ),
+            changed AS (
+                SELECT season_id FROM removed
+                UNION ALL
+                SELECT season_id FROM written
+            )
+            SELECT COUNT(*)::INTEGER, array_agg(DISTINCT season_id) FROM changed',
+            v_def.value_expression
+        ) INTO v_changed, v_changed_seasons USING p_season_id, v_stat;
+        
+        v_total := v_total + v_changed;
+        SELECT array_agg(DISTINCT season_id) INTO v_season_ids
+        FROM unnest(v_season_ids || COALESCE(v_changed_seasons, '{}')) AS c(season_id);
+        v_season_ids := COALESCE(v_season_ids, '{}');
+    END LOOP;
+    
+    -- Tell the API which seasons' distributions to reload (delivered on commit)
+    IF array_length(v_season_ids, 1) > 0 THEN
+        PERFORM pg_notify('courtvision_changes', json_build_object(
+            'table', 'stat_distribution',
+            'op', 'REFRESH',
+            'season_ids', v_season_ids
+        )::text);
+    END IF;
+    
+    RETURN v_total;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Every distribution of one season
+CREATE OR REPLACE FUNCTION get_stat_distributions(p_season_id INTEGER)
+RETURNS TABLE (
+    position VARCHAR(10),
+    stat VARCHAR(20),
+    sample_size INTEGER,
+    mean DOUBLE PRECISION,
+    sorted_values DOUBLE PRECISION[],
+    player_ids INTEGER[]
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT d.position, d.stat, d.sample_size, d.mean, d.sorted_values, d.player_ids
+    FROM stat_distribution d
+    WHERE d.season_id = p_season_id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Move some players' entries in one season's distributions to their
+-- current values, leaving everyone else's untouched. Each entry is taken
+-- out of its sorted arrays and put back where a binary search says it
+-- goes, instead of regrouping and re-sorting the whole season. Returns the
+-- number of distribution rows written.
+CREATE OR REPLACE FUNCTION update_stat_distribution_entries(
+    p_season_id INTEGER,
+    p_player_ids INTEGER[]
+)
+RETURNS INTEGER AS $$
+DECLARE
+    v_def RECORD;
+    v_stat VARCHAR(20);
+    v_entry RECORD;
+    v_row RECORD;
+    v_values DOUBLE PRECISION[];
+    v_ids INTEGER[];
+    v_sum DOUBLE PRECISION;
+    v_index INTEGER;
+    v_low INTEGER;
+    v_high INTEGER;
+    v_mid INTEGER;
+    v_changed INTEGER := 0;
+BEGIN
+    -- Concurrent updates to one season would each rewrite the arrays
+    PERFORM pg_advisory_xact_lock(hashtext('stat_distribution'), p_season_id);
+    
+    FOREACH v_stat IN ARRAY ARRAY['points', 'assists', 'rebounds', 'steals', 'blocks', 'efficiency']
+    LOOP
+        SELECT * INTO v_def FROM leaderboard_columns(v_stat);
+        
+        FOR v_entry IN EXECUTE format(
+            'SELECT pss.player_id, g.position, (%s)::DOUBLE PRECISION as value
+             FROM player_season_stats pss
+             JOIN player p ON pss.player_id = p.id
+             CROSS JOIN LATERAL unnest(
+                 ARRAY[''ALL''] || string_to_array(upper(COALESCE(p.position, '''')), ''-'')
+             ) AS g(position)
+             WHERE pss.season_id = $1
+               AND pss.player_id = ANY($2)
+               AND pss.games_played > 0
+               AND g.position <> ''''',
+            v_def.value_expression
+        ) USING p_season_id, p_player_ids
+        LOOP
+            SELECT d.sample_size, d.mean, d.sorted_values, d.player_ids INTO v_row
+            FROM stat_distribution d
+            WHERE d.season_id = p_season_id AND d.position = v_entry.position AND d.stat = v_stat;
+            
+            IF NOT FOUND THEN
+                INSERT INTO stat_distribution
+                (season_id, position, stat, sample_size, mean, sorted_values, player_ids)
+                VALUES (p_season_id, v_entry.position, v_stat, 1, v_entry.value,
+                        ARRAY[v_entry.value], ARRAY[v_entry.player_id]);
+                v_changed := v_changed + 1;
+                CONTINUE;
+            END IF;
+            
+            v_values := v_row.sorted_values;
+            v_ids := v_row.player_ids;
+            v_sum := v_row.mean * v_row.sample_size;
+            
+            -- Take out the player's previous value
+            v_index := array_position(v_ids, v_entry.player_id);
+            IF v_index IS NOT NULL THEN
+                v_sum := v_sum - v_values[v_index];
+                v_values := v_values[:v_index - 1] || v_values[v_index + 1:];
+                v_ids := v_ids[:v_index - 1] || v_ids[v_index + 1:];
+            END IF;
+            
+            -- First position after (value, player_id), in refresh_stat_distributions() order
+            v_low := 1;
+            v_high := COALESCE(array_length(v_values, 1), 0) + 1;
+            WHILE v_low < v_high LOOP
+                v_mid := (v_low + v_high) / 2;
+                IF (v_values[v_mid], v_ids[v_mid]) < (v_entry.value, v_entry.player_id) THEN
+                    v_low := v_mid + 1;
+                ELSE
+                    v_high := v_mid;
+                END IF;
+            END LOOP;
+            v_values := v_values[:v_low - 1] || v_entry.value || v_values[v_low:];
+            v_ids := v_ids[:v_low - 1] || v_entry.player_id || v_ids[v_low:];
+            
+            UPDATE stat_distribution d
+            SET sample_size = array_length(v_values, 1),
+                mean = (v_sum + v_entry.value) / array_length(v_values, 1),
+                sorted_values = v_values,
+                player_ids = v_ids,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE d.season_id = p_season_id AND d.position = v_entry.position AND d.stat = v_stat
+              AND (d.sorted_values, d.player_ids) IS DISTINCT FROM (v_values, v_ids);
+            IF FOUND THEN
+                v_changed := v_changed + 1;
+            END IF;
+        END LOOP;
+    END LOOP;
+    
+    -- Same event as a full refresh, so the API reloads the season
+    IF v_changed > 0 THEN
+        PERFORM pg_notify('courtvision_changes', json_build_object(
+            'table', 'stat_distribution',
+            'op', 'REFRESH',
+            'season_ids', ARRAY[p_season_id]
+        )::text);
+    END IF;
+    
+    RETURN v_changed;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ==========================================
+-- INCREMENTAL STAT MAINTENANCE
+-- ==========================================
+-- Apply one game's box scores as increments to the running totals, so a
+-- daily update costs O(games played today) instead of a reload of every
+-- box score. Leaderboard ranks are maintained by shifting only the rows
+-- between a player's old and new position.
+
+-- Move one player's entry in one stat's leaderboard to its current rank.
+-- Players tied on the same value keep their order; the moved entry goes
+-- after them. Returns the number of leaderboard rows whose rank changed.
+CREATE OR REPLACE FUNCTION update_leaderboard_entry(
+    p_stat VARCHAR(20),
+    p_player_id INTEGER,
+    p_season_id INTEGER
+)
+RETURNS INTEGER AS $$
+DECLARE
+    v_def RECORD;
+    v_value DECIMAL(10, 2);
+    v_games INTEGER;
+    v_extra DECIMAL(12, 2);
+    v_old_rank INTEGER;
+    v_new_rank INTEGER;
+    v_moved INTEGER := 0;
+BEGIN
+    SELECT * INTO v_def FROM leaderboard_columns(p_stat);
+    
+    EXECUTE format(
+        'SELECT %s, pss.games_played, %s FROM player_season_stats pss
+         WHERE pss.player_id = $1 AND pss.season_id = $2 AND pss.games_played > 0',
+        v_def.value_expression, v_def.extra_expression
+    ) INTO v_value, v_games, v_extra USING p_player_id, p_season_id;
+    
+    IF v_games IS NULL THEN
+        RETURN 0;
+    END IF;
+    
+    -- Rank shifts of concurrent updates to one season would interleave
+    PERFORM pg_advisory_xact_lock(hashtext(v_def.leaderboard_table), p_season_id);
+    
+    EXECUTE format('SELECT rank FROM %I WHERE player_id = $1 AND season_id = $2', v_def.leaderboard_table)
+    INTO v_old_rank USING p_player_id, p_season_id;
+    
+    EXECUTE format(
+        'SELECT COUNT(*) + 1 FROM %I WHERE season_id = $1 AND player_id <> $2 AND %I >= $3',
+        v_def.leaderboard_table, v_def.value_column
+    ) INTO v_new_rank USING p_season_id, p_player_id, v_value;
+    
+    IF v_old_rank IS NULL THEN
+        EXECUTE format('UPDATE %I SET rank = rank + 1 WHERE season_id = $1 AND rank >= $2',
+                       v_def.leaderboard_table)
+        USING p_season_id, v_new_rank;
+        GET DIAGNOSTICS v_moved = ROW_COUNT;
+        
+        EXECUTE format(
+            'INSERT INTO %I (player_id, season_id, rank, %I, games_played, %I) VALUES ($1, $2, $3, $4, $5, $6)',
+            v_def.leaderboard_table, v_def.value_column, v_def.extra_column
+        ) USING p_player_id, p_season_id, v_new_rank, v_value, v_games, v_extra;
+        RETURN v_moved + 1;
+    END IF;
+    
+    IF v_new_rank < v_old_rank THEN
+        EXECUTE format('UPDATE %I SET rank = rank + 1 WHERE season_id = $1 AND rank >= $2 AND rank < $3',
+                       v_def.leaderboard_table)
+        USING p_season_id, v_new_rank, v_old_rank;
+        GET DIAGNOSTICS v_moved = ROW_COUNT;
+    ELSIF v_new_rank > v_old_rank THEN
+        EXECUTE format('UPDATE %I SET rank = rank - 1 WHERE season_id = $1 AND rank > $2 AND rank <= $3',
+                       v_def.leaderboard_table)
+        USING p_season_id, v_old_rank, v_new_rank;
+        GET DIAGNOSTICS v_moved = ROW_COUNT;
+    END IF;
+    
+    EXECUTE format(
+        'UPDATE %I SET rank = $3, %I = $4, games_played = $5, %I = $6, updated_at = CURRENT_TIMESTAMP
+         WHERE player_id = $1 AND season_id = $2',
+        v_def.leaderboard_table, v_def.value_column, v_def.extra_column
+    ) USING p_player_id, p_season_id, v_new_rank, v_value, v_games, v_extra;
+    
+    RETURN v_moved + CASE WHEN v_new_rank <> v_old_rank THEN 1 ELSE 0 END;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Apply one game's box scores to the season totals.
+-- p_game_id identifies the game: it is recorded in applied_game, and a game
+-- already recorded there, or whose box scores were loaded from
+-- PlayerStatistics.csv, is skipped, returning zeros with already_applied.
+-- An unknown p_game_id returns no row. Each player row is also written to
+-- player_game_stats, with the opponent, side and result taken from game.
+-- p_player_stats is a JSON array of objects with player_id, team_id and the
+-- PlayerStatistics.csv counting stats (minutes, points, rebounds, assists,
+-- steals, blocks, turnovers, field_goals_made, field_goals_attempted,
+-- three_pointers_made, three_pointers_attempted, free_throws_made,
+-- free_throws_attempted); p_team_stats holds team_id, win, points and
+-- points_allowed per team. Missing stats count as 0, and every player row
+-- counts as a game played, as in the full load.
+CREATE OR REPLACE FUNCTION apply_game_box_scores(
+    p_game_id VARCHAR(50),
+    p_season_id INTEGER,
+    p_player_stats JSONB,
+    p_team_stats JSONB DEFAULT '[]'::JSONB
+)
+RETURNS TABLE (
+    already_applied BOOLEAN,
+    players_updated INTEGER,
+    teams_updated INTEGER,
+    leaderboard_rows_moved INTEGER
+) AS $$
+DECLARE
+    v_player_ids INTEGER[];
+    v_player_id INTEGER;
+    v_stat VARCHAR(20);
+    v_teams INTEGER;
+    v_moved INTEGER := 0;
+    v_game_date DATE;
+    v_home_team_id INTEGER;
+    v_away_team_id INTEGER;
+    v_winner_team_id INTEGER;
+BEGIN
+    SELECT g.game_date_time::DATE, g.home_team_id, g.away_team_id, g.winner_team_id
+    INTO v_game_date, v_home_team_id, v_away_team_id, v_winner_team_id
+    FROM game g WHERE g.game_id = p_game_id;
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+    
+    -- A concurrent apply of the same game waits here, then finds the row
+    INSERT INTO applied_game (game_id, season_id)
+    VALUES (p_game_id, p_season_id)
+    ON CONFLICT (game_id) DO NOTHING;
+    IF NOT FOUND OR EXISTS (
+        SELECT 1 FROM player_game_stats pgs
+        WHERE pgs.game_date = v_game_date AND pgs.game_id = p_game_id
+    ) THEN
+        RETURN QUERY SELECT TRUE, 0, 0, 0;
+        RETURN;
+    END IF;
+    
+    PERFORM ensure_player_game_stats_partition(v_game_date);
+    
+    WITH box AS (
+        SELECT
+            b.player_id,
+            MAX(b.team_id) as team_id,
+            COUNT(*)::INTEGER as games,
+            SUM(COALESCE(b.minutes, 0)) as minutes,
+            SUM(COALESCE(b.points, 0))::INTEGER as points,
+            SUM(COALESCE(b.rebounds, 0))::INTEGER as rebounds,
+            SUM(COALESCE(b.assists, 0))::INTEGER as assists,
+            SUM(COALESCE(b.steals, 0))::INTEGER as steals,
+            SUM(COALESCE(b.blocks, 0))::INTEGER as blocks,
+            SUM(COALESCE(b.turnovers, 0))::INTEGER as turnovers,
+            SUM(COALESCE(b.field_goals_made, 0))::INTEGER as fg_made,
+            SUM(COALESCE(b.field_goals_attempted, 0))::INTEGER as fg_attempted,
+            SUM(COALESCE(b.three_pointers_made, 0))::INTEGER as three_made,
+            SUM(COALESCE(b.three_pointers_attempted, 0))::INTEGER as three_attempted,
+            SUM(COALESCE(b.free_throws_made, 0))::INTEGER as ft_made,
+            SUM(COALESCE(b.free_throws_attempted, 0))::INTEGER as ft_attempted
+        FROM jsonb_to_recordset(p_player_stats) AS b(
+            player_id INTEGER, team_id INTEGER, minutes DECIMAL, points INTEGER, rebounds INTEGER,
+            assists INTEGER, steals INTEGER, blocks INTEGER, turnovers INTEGER,
+            field_goals_made INTEGER, field_goals_attempted INTEGER,
+            three_pointers_made INTEGER, three_pointers_attempted INTEGER,
+            free_throws_made INTEGER, free_throws_attempted INTEGER
+        )
+        WHERE b.player_id IS NOT NULL
+        GROUP BY b.player_id
+    ),
+    -- Same running totals as incremental loads, so they keep this game
+    totals AS (
+        INSERT INTO load_player_stat_totals AS t
+        (player_id, season_id, team_id, first_row, games, minutes, points, rebounds, assists,
+         steals, blocks, turnovers, fg_made, fg_attempted, three_made, three_attempted,
+         ft_made, ft_attempted)
+        SELECT
+            box.player_id, p_season_id, box.team_id,
+            -- A new team key sorts last, as if from a later CSV row
+            COALESCE((
+                SELECT MAX(x.first_row) + 1 FROM load_player_stat_totals x
+                WHERE x.player_id = box.player_id AND x.season_id = p_season_id
+            ), 0),
+            box.games, box.minutes, box.points, box.rebounds, box.assists,
+            box.steals, box.blocks, box.turnovers, box.fg_made, box.fg_attempted,
+            box.three_made, box.three_attempted, box.ft_made, box.ft_attempted
+        FROM box
+        ON CONFLICT (player_id, season_id, COALESCE(team_id, 0))
+        DO UPDATE SET
+            games = t.games + EXCLUDED.games,
+            minutes = t.minutes + EXCLUDED.minutes,
+            points = t.points + EXCLUDED.points,
+            rebounds = t.rebounds + EXCLUDED.rebounds,
+            assists = t.assists + EXCLUDED.assists,
+            steals = t.steals + EXCLUDED.steals,
+            blocks = t.blocks + EXCLUDED.blocks,
+            turnovers = t.turnovers + EXCLUDED.turnovers,
+            fg_made = t.fg_made + EXCLUDED.fg_made,
+            fg_attempted = t.fg_attempted + EXCLUDED.fg_attempted,
+            three_made = t.three_made + EXCLUDED.three_made,
+            three_attempted = t.three_attempted + EXCLUDED.three_attempted,
+            ft_made = t.ft_made + EXCLUDED.ft_made,
+            ft_attempted = t.ft_attempted + EXCLUDED.ft_attempted
+    ),
+    -- The game's log rows commit with its season totals
+    logged AS (
+        INSERT INTO player_game_stats
+        (player_id, game_id, game_date, season_id, team_id, opponent_team_id, is_home, won,
+         minutes, points, rebounds, assists, steals, blocks, turnovers,
+         field_goals_made, field_goals_attempted, three_pointers_made, three_pointers_attempted,
+         free_throws_made, free_throws_attempted)
+        SELECT
+            box.player_id, p_game_id, v_game_date, p_season_id, box.team_id,
+            CASE box.team_id WHEN v_home_team_id THEN v_away_team_id WHEN v_away_team_id THEN v_home_team_id END,
+            CASE box.team_id WHEN v_home_team_id THEN TRUE WHEN v_away_team_id THEN FALSE END,
+            box.team_id = v_winner_team_id,
+            box.minutes, box.points, box.rebounds, box.assists, box.steals, box.blocks, box.turnovers,
+            box.fg_made, box.fg_attempted, box.three_made, box.three_attempted,
+            box.ft_made, box.ft_attempted
+        FROM box
+    ),
+    applied AS (
+        INSERT INTO player_season_stats AS s
+        (player_id, season_id, team_id, games_played, minutes_played, points, rebounds, assists,
+         steals, blocks, turnovers, field_goals_made, field_goals_attempted,
+         three_pointers_made, three_pointers_attempted, free_throws_made, free_throws_attempted,
+         total_minutes, total_points, total_rebounds, total_assists, total_steals, total_blocks,
+         total_turnovers)
+        SELECT
+            box.player_id, p_season_id, box.team_id, box.games,
+            box.minutes / box.games,
+            box.points::DECIMAL / box.games,
+            box.rebounds::DECIMAL / box.games,
+            box.assists::DECIMAL / box.games,
+            box.steals::DECIMAL / box.games,
+            box.blocks::DECIMAL / box.games,
+            box.turnovers::DECIMAL / box.games,
+            box.fg_made, box.fg_attempted, box.three_made, box.three_attempted,
+            box.ft_made, box.ft_attempted,
+            box.minutes, box.points, box.rebounds, box.assists, box.steals, box.blocks, box.turnovers
+        FROM box
+        ON CONFLICT (player_id, season_id)
+        DO UPDATE SET
+            team_id = COALESCE(EXCLUDED.team_id, s.team_id),
+            games_played = s.games_played + EXCLUDED.games_played,
+            total_minutes = s.total_minutes + EXCLUDED.total_minutes,
+            total_points = s.total_points + EXCLUDED.total_points,
+            total_rebounds = s.total_rebounds + EXCLUDED.total_rebounds,
+            total_assists = s.total_assists + EXCLUDED.total_assists,
+            total_steals = s.total_steals + EXCLUDED.total_steals,
+            total_blocks = s.total_blocks + EXCLUDED.total_blocks,
+            total_turnovers = s.total_turnovers + EXCLUDED.total_turnovers,
+            minutes_played = (s.total_minutes + EXCLUDED.total_minutes) / (s.games_played + EXCLUDED.games_played),
+            points = (s.total_points + EXCLUDED.total_points)::DECIMAL / (s.games_played + EXCLUDED.games_played),
+            rebounds = (s.total_rebounds + EXCLUDED.total_rebounds)::DECIMAL / (s.games_played + EXCLUDED.games_played),
+            assists = (s.total_assists + EXCLUDED.total_assists)::DECIMAL / (s.games_played + EXCLUDED.games_played),
+            steals = (s.total_steals + EXCLUDED.total_steals)::DECIMAL / (s.games_played + EXCLUDED.games_played),
+            blocks = (s.total_blocks + EXCLUDED.total_blocks)::DECIMAL / (s.games_played + EXCLUDED.games_played),
+            turnovers = (s.total_turnovers + EXCLUDED.total_turnovers)::DECIMAL / (s.games_played + EXCLUDED.games_played),
+            field_goals_made = s.field_goals_made + EXCLUDED.field_goals_made,
+            field_goals_attempted = s.field_goals_attempted + EXCLUDED.field_goals_attempted,
+            three_pointers_made = s.three_pointers_made + EXCLUDED.three_pointers_made,
+            three_pointers_attempted = s.three_pointers_attempted + EXCLUDED.three_pointers_attempted,
+            free_throws_made = s.free_throws_made + EXCLUDED.free_throws_made,
+            free_throws_attempted = s.free_throws_attempted + EXCLUDED.free_throws_attempted,
+            updated_at = CURRENT_TIMESTAMP
+        RETURNING s.player_id
+    )
+    SELECT array_agg(applied.player_id ORDER BY applied.player_id) INTO v_player_ids FROM applied;
+    
+    WITH box AS (
+        SELECT
+            b.team_id,
+            COUNT(*)::INTEGER as games,
+            (COUNT(*) FILTER (WHERE b.win))::INTEGER as wins,
+            SUM(COALESCE(b.points, 0))::INTEGER as points,
+            SUM(COALESCE(b.points_allowed, 0))::INTEGER as points_allowed
+        FROM jsonb_to_recordset(p_team_stats) AS b(
+            team_id INTEGER, win BOOLEAN, points INTEGER, points_allowed INTEGER
+        )
+        WHERE b.team_id IS NOT NULL
+        GROUP BY b.team_id
+    ),
+    totals AS (
+        INSERT INTO load_team_stat_totals AS t
+        (team_id, season_id, games, wins, losses, points, points_allowed)
+        SELECT box.team_id, p_season_id, box.games, box.wins, box.games - box.wins,
+               box.points, box.points_allowed
+        FROM box
+        ON CONFLICT (team_id, season_id)
+        DO UPDATE SET
+            games = t.games + EXCLUDED.games,
+            wins = t.wins + EXCLUDED.wins,
+            losses = t.losses + EXCLUDED.losses,
+            points = t.points + EXCLUDED.points,
+            points_allowed = t.points_allowed + EXCLUDED.points_allowed
+    )
+    INSERT INTO team_season_stats AS s
+    (team_id, season_id, wins, losses, win_percentage, points_per_game, points_allowed_per_game,
+     games_played, total_points, total_points_allowed)
+    SELECT
+        box.team_id, p_season_id, box.wins, box.games - box.wins,
+        box.wins::DECIMAL / box.games,
+        box.points::DECIMAL / box.games,
+        box.points_allowed::DECIMAL / box.games,
+        box.games, box.points, box.points_allowed
+    FROM box
+    ON CONFLICT (team_id, season_id)
+    DO UPDATE SET
+        wins = s.wins + EXCLUDED.wins,
+        losses = s.losses + EXCLUDED.losses,
+        games_played = s.games_played + EXCLUDED.games_played,
+        total_points = s.total_points + EXCLUDED.total_points,
+        total_points_allowed = s.total_points_allowed + EXCLUDED.total_points_allowed,
+        win_percentage = (s.wins + EXCLUDED.wins)::DECIMAL / (s.games_played + EXCLUDED.games_played),
+        points_per_game = (s.total_points + EXCLUDED.total_points)::DECIMAL / (s.games_played + EXCLUDED.games_played),
+        points_allowed_per_game = (s.total_points_allowed + EXCLUDED.total_points_allowed)::DECIMAL
+            / (s.games_played + EXCLUDED.games_played),
+        updated_at = CURRENT_TIMESTAMP;
+    GET DIAGNOSTICS v_teams = ROW_COUNT;
+    
+    FOREACH v_player_id IN ARRAY COALESCE(v_player_ids, '{}')
+    LOOP
+        FOREACH v_stat IN ARRAY ARRAY['points', 'assists', 'rebounds', 'steals', 'blocks', 'efficiency']
+        LOOP
+            v_moved := v_moved + update_leaderboard_entry(v_stat, v_player_id, p_season_id);
+        END LOOP;
+    END LOOP;
+    
+    -- Moves only these players' entries in the season's distributions
+    IF v_player_ids IS NOT NULL THEN
+        PERFORM update_stat_distribution_entries(p_season_id, v_player_ids);
+    END IF;
+    
+    RETURN QUERY SELECT FALSE, COALESCE(array_length(v_player_ids, 1), 0), v_teams, v_moved;
+END;
+$$ LANGUAGE plpgsql;
@@ -3,6 +3,9 @@
 -- Author: CS3620 Student
 -- Date: December 2, 2025
 
+-- Trigram operators and index support for name search
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- ==========================================
 -- LAYER A: NBA_RAW (Imported Kaggle Dataset)
 -- ==========================================
@@ -109,6 +112,14 @@ CREATE TABLE player_season_stats (
     three_pointers_attempted INTEGER DEFAULT 0,
     free_throws_made INTEGER DEFAULT 0,
     free_throws_attempted INTEGER DEFAULT 0,
+    -- Running totals; the per-game columns above are derived from these
+    total_minutes DECIMAL(12, 2) DEFAULT 0,
+    total_points INTEGER DEFAULT 0,
+    total_rebounds INTEGER DEFAULT 0,
+    total_assists INTEGER DEFAULT 0,
+    total_steals INTEGER DEFAULT 0,
+    total_blocks INTEGER DEFAULT 0,
+    total_turnovers INTEGER DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(player_id, season_id)
@@ -126,6 +137,10 @@ CREATE TABLE team_season_stats (
     points_allowed_per_game DECIMAL(10, 2),
     offensive_rating DECIMAL(10, 2),
     defensive_rating DECIMAL(10, 2),
+    -- Running totals; the per-game columns above are derived from these
+    games_played INTEGER DEFAULT 0,
+    total_points INTEGER DEFAULT 0,
+    total_points_allowed INTEGER DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     UNIQUE(team_id, season_id)
@@ -276,6 +291,45 @@ CREATE TABLE leaderboard_ast (
     UNIQUE(player_id, season_id)
 );
 
+-- Rebounds per game leaderboard
+CREATE TABLE leaderboard_reb (
+    id SERIAL PRIMARY KEY,
+    player_id INTEGER NOT NULL REFERENCES player(id) ON DELETE CASCADE,
+    season_id INTEGER NOT NULL REFERENCES season(id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL,
+    rebounds_per_game DECIMAL(10, 2) NOT NULL,
+    games_played INTEGER,
+    total_rebounds INTEGER,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(player_id, season_id)
+);
+
+-- Steals per game leaderboard
+CREATE TABLE leaderboard_stl (
+    id SERIAL PRIMARY KEY,
+    player_id INTEGER NOT NULL REFERENCES player(id) ON DELETE CASCADE,
+    season_id INTEGER NOT NULL REFERENCES season(id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL,
+    steals_per_game DECIMAL(10, 2) NOT NULL,
+    games_played INTEGER,
+    total_steals INTEGER,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(player_id, season_id)
+);
+
+-- Blocks per game leaderboard
+CREATE TABLE leaderboard_blk (
+    id SERIAL PRIMARY KEY,
+    player_id INTEGER NOT NULL REFERENCES player(id) ON DELETE CASCADE,
+    season_id INTEGER NOT NULL REFERENCES season(id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL,
+    blocks_per_game DECIMAL(10, 2) NOT NULL,
+    games_played INTEGER,
+    total_blocks INTEGER,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(player_id, season_id)
+);
+
 -- Player efficiency leaderboard
 CREATE TABLE leaderboard_efficiency (
     id SERIAL PRIMARY KEY,
@@ -289,6 +343,22 @@ CREATE TABLE leaderboard_efficiency (
     UNIQUE(player_id, season_id)
 );
 
+-- Every season's distribution of each leaderboard stat, overall ('ALL')
+-- and per position ('G-F' players count as both 'G' and 'F'). Values are
+-- sorted, so percentiles, quantiles and histograms are binary searches;
+-- player_ids[i] is the player with sorted_values[i].
+CREATE TABLE stat_distribution (
+    season_id INTEGER NOT NULL REFERENCES season(id) ON DELETE CASCADE,
+    position VARCHAR(10) NOT NULL,
+    stat VARCHAR(20) NOT NULL,
+    sample_size INTEGER NOT NULL,
+    mean DOUBLE PRECISION NOT NULL,
+    sorted_values DOUBLE PRECISION[] NOT NULL,
+    player_ids INTEGER[] NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (season_id, position, stat)
+);
+
 -- ==========================================
 -- LAYER E: AUDIT (Tracking & Logging)
 -- ==========================================
@@ -307,6 +377,11 @@ CREATE TABLE audit_log (
     user_agent TEXT
 );
 
+-- Data version behind the API's HTTP ETags, advanced by bump_data_version()
+-- after each load and each write through the API. A sequence rather than a
+-- counter row, so concurrent bumps never wait on each other.
+CREATE SEQUENCE data_version_seq;
+
 -- Game tracking (from Games.csv dataset)
 CREATE TABLE game (
     id SERIAL PRIMARY KEY,
@@ -324,22 +399,144 @@ CREATE TABLE game (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Each game twice, once from each team's side (kept by the
+-- sync_team_game_log triggers on game), so a team's games or a matchup
+-- are one index range scan instead of an OR over home and away
+CREATE TABLE team_game_log (
+    game_id INTEGER NOT NULL REFERENCES game(id) ON DELETE CASCADE,
+    game_code VARCHAR(50) NOT NULL, -- game.game_id
+    game_date_time TIMESTAMP NOT NULL,
+    team_id INTEGER NOT NULL REFERENCES team(id),
+    opponent_team_id INTEGER REFERENCES team(id),
+    is_home BOOLEAN NOT NULL,
+    team_score INTEGER,
+    opponent_score INTEGER,
+    won BOOLEAN,
+    PRIMARY KEY (game_id, team_id)
+);
+
+-- One row per player per game (from PlayerStatistics.csv), range-partitioned
+-- by season on game_date: each partition runs October 1 to October 1 and
+-- is created by ensure_player_game_stats_partition() as the loader reaches
+-- a new season. The primary key doubles as the (player_id, game_date)
+-- btree behind game logs and splits.
+CREATE TABLE player_game_stats (
+    player_id INTEGER NOT NULL REFERENCES player(id) ON DELETE CASCADE,
+    game_id VARCHAR(50) NOT NULL,
+    game_date DATE NOT NULL,
+    season_id INTEGER NOT NULL REFERENCES season(id) ON DELETE CASCADE,
+    team_id INTEGER REFERENCES team(id),
+    opponent_team_id INTEGER REFERENCES team(id),
+    is_home BOOLEAN,
+    won BOOLEAN,
+    minutes DECIMAL(6, 2) DEFAULT 0,
+    points INTEGER DEFAULT 0,
+    rebounds INTEGER DEFAULT 0,
+    assists INTEGER DEFAULT 0,
+    steals INTEGER DEFAULT 0,
+    blocks INTEGER DEFAULT 0,
+    turnovers INTEGER DEFAULT 0,
+    field_goals_made INTEGER DEFAULT 0,
+    field_goals_attempted INTEGER DEFAULT 0,
+    three_pointers_made INTEGER DEFAULT 0,
+    three_pointers_attempted INTEGER DEFAULT 0,
+    free_throws_made INTEGER DEFAULT 0,
+    free_throws_attempted INTEGER DEFAULT 0,
+    plus_minus INTEGER,
+    PRIMARY KEY (player_id, game_date, game_id)
+) PARTITION BY RANGE (game_date);
+
+-- Games whose box scores apply_game_box_scores() has added to the season
+-- totals; the key makes applying the same game twice a no-op
+CREATE TABLE applied_game (
+    game_id VARCHAR(50) PRIMARY KEY,
+    season_id INTEGER NOT NULL REFERENCES season(id) ON DELETE CASCADE,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Exact running sums behind player_season_stats and team_season_stats,
+-- which only keep rounded averages. Incremental loads (incremental_ingest.py)
+-- and apply_game_box_scores() both add to them, so a season row recomputed
+-- from its totals keeps games from either path. first_row orders a
+-- player-season's team keys like the full loader does.
+CREATE TABLE load_player_stat_totals (
+    player_id INTEGER NOT NULL,
+    season_id INTEGER NOT NULL,
+    team_id INTEGER,
+    first_row BIGINT NOT NULL,
+    games INTEGER NOT NULL,
+    minutes DOUBLE PRECISION NOT NULL,
+    points BIGINT NOT NULL,
+    rebounds BIGINT NOT NULL,
+    assists BIGINT NOT NULL,
+    steals BIGINT NOT NULL,
+    blocks BIGINT NOT NULL,
+    turnovers BIGINT NOT NULL,
+    fg_made BIGINT NOT NULL,
+    fg_attempted BIGINT NOT NULL,
+    three_made BIGINT NOT NULL,
+    three_attempted BIGINT NOT NULL,
+    ft_made BIGINT NOT NULL,
+    ft_attempted BIGINT NOT NULL
+);
+
+CREATE TABLE load_team_stat_totals (
+    team_id INTEGER NOT NULL,
+    season_id INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    points BIGINT NOT NULL,
+    points_allowed BIGINT NOT NULL,
+    PRIMARY KEY (team_id, season_id)
+);
+
 -- Create indexes for better query performance
-CREATE INDEX idx_player_name ON player(player_name);
+-- (sort key, id) indexes below also serve the keyset-paginated list functions
+CREATE INDEX idx_player_name ON player(player_name, id);
 CREATE INDEX idx_team_abbr ON team(abbreviation);
+-- Trigram indexes serve ILIKE '%...%', similarity (%) and word similarity
+-- (<%) searches on names, which the btree indexes above cannot
+CREATE INDEX idx_player_name_trgm ON player USING GIN (player_name gin_trgm_ops);
+CREATE INDEX idx_team_name_trgm ON team USING GIN (team_name gin_trgm_ops);
 CREATE INDEX idx_season_year ON season(season_year);
 CREATE INDEX idx_player_season_stats_player ON player_season_stats(player_id);
 CREATE INDEX idx_player_season_stats_season ON player_season_stats(season_id);
 CREATE INDEX idx_user_favorites_players_user ON user_favorites_players(user_id);
 CREATE INDEX idx_user_favorites_teams_user ON user_favorites_teams(user_id);
-CREATE INDEX idx_user_notes_user ON user_notes(user_id);
-CREATE INDEX idx_leaderboard_pts_season ON leaderboard_pts(season_id, rank);
-CREATE INDEX idx_leaderboard_ast_season ON leaderboard_ast(season_id, rank);
-CREATE INDEX idx_leaderboard_efficiency_season ON leaderboard_efficiency(season_id, rank);
-CREATE INDEX idx_audit_log_table ON audit_log(table_name, changed_at);
+CREATE INDEX idx_user_notes_user ON user_notes(user_id, created_at, id);
+-- Leaderboard top-N reads are index-only scans: the covering columns
+-- are everything get_top_*() returns apart from the player's name
+CREATE INDEX idx_leaderboard_pts_season ON leaderboard_pts(season_id, rank)
+    INCLUDE (player_id, points_per_game, games_played);
+CREATE INDEX idx_leaderboard_ast_season ON leaderboard_ast(season_id, rank)
+    INCLUDE (player_id, assists_per_game, games_played);
+CREATE INDEX idx_leaderboard_reb_season ON leaderboard_reb(season_id, rank)
+    INCLUDE (player_id, rebounds_per_game, games_played);
+CREATE INDEX idx_leaderboard_stl_season ON leaderboard_stl(season_id, rank)
+    INCLUDE (player_id, steals_per_game, games_played);
+CREATE INDEX idx_leaderboard_blk_season ON leaderboard_blk(season_id, rank)
+    INCLUDE (player_id, blocks_per_game, games_played);
+CREATE INDEX idx_leaderboard_efficiency_season ON leaderboard_efficiency(season_id, rank)
+    INCLUDE (player_id, efficiency_rating, games_played, minutes_played);
+CREATE INDEX idx_leaderboard_pts_value ON leaderboard_pts(season_id, points_per_game DESC);
+CREATE INDEX idx_leaderboard_ast_value ON leaderboard_ast(season_id, assists_per_game DESC);
+CREATE INDEX idx_leaderboard_reb_value ON leaderboard_reb(season_id, rebounds_per_game DESC);
+CREATE INDEX idx_leaderboard_stl_value ON leaderboard_stl(season_id, steals_per_game DESC);
+CREATE INDEX idx_leaderboard_blk_value ON leaderboard_blk(season_id, blocks_per_game DESC);
+CREATE INDEX idx_leaderboard_efficiency_value ON leaderboard_efficiency(season_id, efficiency_rating DESC);
+CREATE INDEX idx_audit_log_table ON audit_log(table_name, changed_at, id);
+CREATE INDEX idx_audit_log_changed ON audit_log(changed_at, id);
 CREATE INDEX idx_audit_log_user ON audit_log(user_id, changed_at);
-CREATE INDEX idx_game_date ON game(game_date_time);
-CREATE INDEX idx_game_teams ON game(home_team_id, away_team_id);
+CREATE INDEX idx_game_date ON game(game_date_time, id);
+CREATE INDEX idx_team_game_log_team ON team_game_log(team_id, game_date_time DESC, game_id DESC);
+CREATE INDEX idx_team_game_log_matchup ON team_game_log(team_id, opponent_team_id, game_date_time DESC, game_id DESC);
+-- Rows are merged in game date order, so a BRIN index (a few pages per
+-- partition) narrows date-range scans across all players
+CREATE INDEX idx_player_game_stats_date ON player_game_stats USING BRIN (game_date);
+-- team_id is NULL for players whose team is unknown
+CREATE UNIQUE INDEX idx_load_player_stat_totals_key
+ON load_player_stat_totals (player_id, season_id, COALESCE(team_id, 0));
 
 -- Comments
 COMMENT ON TABLE players_raw IS 'Raw player data imported from Kaggle NBA dataset';
@@ -361,6 +558,15 @@ COMMENT ON TABLE user_notes IS 'User-created notes on players and teams';
 COMMENT ON TABLE user_comparisons IS 'User-created player comparisons';
 COMMENT ON TABLE leaderboard_pts IS 'Points per game leaderboard (materialized summary)';
 COMMENT ON TABLE leaderboard_ast IS 'Assists per game leaderboard (materialized summary)';
+COMMENT ON TABLE leaderboard_reb IS 'Rebounds per game leaderboard (materialized summary)';
+COMMENT ON TABLE leaderboard_stl IS 'Steals per game leaderboard (materialized summary)';
+COMMENT ON TABLE leaderboard_blk IS 'Blocks per game leaderboard (materialized summary)';
 COMMENT ON TABLE leaderboard_efficiency IS 'Player efficiency leaderboard (materialized summary)';
+COMMENT ON TABLE stat_distribution IS 'Sorted per-season, per-position stat values behind percentile lookups (materialized summary)';
 COMMENT ON TABLE audit_log IS 'Audit trail for tracking database operations';
 COMMENT ON TABLE game IS 'Game records from NBA games dataset';
+COMMENT ON TABLE team_game_log IS 'One row per team per game, from that team''s side (maintained from game)';
+COMMENT ON TABLE player_game_stats IS 'Per-game player box scores, partitioned by season';
+COMMENT ON TABLE load_player_stat_totals IS 'Exact player-season box score sums shared by incremental loads and API applies';
+COMMENT ON TABLE load_team_stat_totals IS 'Exact team-season sums shared by incremental loads and API applies';
+COMMENT ON TABLE applied_game IS 'Games applied to the season totals through apply_game_box_scores()';
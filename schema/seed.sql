@@ -38,31 +38,22 @@ INSERT INTO player_season_stats (player_id, season_id, team_id, games_played, mi
 (9, 1, 5, 61, 35.8, 24.3, 4.2, 7.0, 1.0, 0.3, 2.4),
 (10, 1, 1, 54, 34.7, 24.7, 12.6, 3.5, 1.2, 2.3, 2.1);
 
--- Insert leaderboard data for points
-INSERT INTO leaderboard_pts (player_id, season_id, rank, points_per_game, games_played, total_points) VALUES
-(6, 1, 1, 34.6, 52, 1799),
-(5, 1, 2, 32.1, 60, 1926),
-(4, 1, 3, 30.2, 58, 1752),
-(2, 1, 4, 29.7, 62, 1841),
-(3, 1, 5, 28.3, 48, 1358),
-(8, 1, 6, 26.9, 64, 1722),
-(7, 1, 7, 26.4, 68, 1795),
-(1, 1, 8, 25.4, 55, 1397),
-(10, 1, 9, 24.7, 54, 1334),
-(9, 1, 10, 24.3, 61, 1482);
+-- Derive the running totals from the sample averages
+UPDATE player_season_stats SET
+    total_minutes = minutes_played * games_played,
+    total_points = ROUND(points * games_played),
+    total_rebounds = ROUND(rebounds * games_played),
+    total_assists = ROUND(assists * games_played),
+    total_steals = ROUND(steals * games_played),
+    total_blocks = ROUND(blocks * games_played),
+    total_turnovers = ROUND(turnovers * games_played);
 
--- Insert leaderboard data for assists
-INSERT INTO leaderboard_ast (player_id, season_id, rank, assists_per_game, games_played, total_assists) VALUES
-(5, 1, 1, 9.2, 60, 552),
-(7, 1, 2, 9.0, 68, 612),
-(1, 1, 3, 8.1, 55, 446),
-(9, 1, 4, 7.0, 61, 427),
-(4, 1, 5, 5.8, 58, 336),
-(6, 1, 6, 5.5, 52, 286),
-(2, 1, 7, 5.1, 62, 316),
-(3, 1, 8, 5.0, 48, 240),
-(8, 1, 9, 4.9, 64, 314),
-(10, 1, 10, 3.5, 54, 189);
+-- Rank every leaderboard from the sample stats
+SELECT stat, refresh_leaderboard(stat) AS rows_changed
+FROM unnest(ARRAY['points', 'assists', 'rebounds', 'steals', 'blocks', 'efficiency']) AS stat;
+
+-- Sorted stat distributions behind the percentile lookups
+SELECT refresh_stat_distributions() AS rows_changed;
 
 -- Insert sample shooting zones
 INSERT INTO shooting_zones (zone_name, description, min_distance_ft, max_distance_ft) VALUES